@@ -22,6 +22,7 @@ import pandas as pd
 import numpy as np
 import json
 import argparse
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Any
@@ -44,6 +45,16 @@ except ImportError:
     HAS_SCIPY = False
     print("⚠️  scipy not found. Install for advanced stats: pip install scipy")
 
+# Shared matrix correlation engine (analytics/correlation_engine.py, needs scipy)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analytics'))
+try:
+    from correlation_engine import correlation_table
+except ImportError:
+    correlation_table = None
+from feature_store import add_features
+from pipeline_metrics import PipelineMetrics
+from cli_profiling import run_cli
+
 
 class TradeAnalytics:
     """Advanced analytics for TickPhysics trade data"""
@@ -52,6 +63,7 @@ class TradeAnalytics:
         self.csv_path = Path(csv_path)
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(exist_ok=True)
+        self.metrics = PipelineMetrics('analyze_backtest_advanced')
         
         # Load and prepare data
         self.df = None
@@ -89,12 +101,9 @@ class TradeAnalytics:
             self.df = pd.read_csv(self.csv_path)
             print(f"✅ Loaded {len(self.df)} trades")
             
-            # Add derived columns
-            self.df['IsWinner'] = self.df['NetProfit'] > 0
-            self.df['IsLoser'] = self.df['NetProfit'] < 0
-            self.df['IsBreakeven'] = self.df['NetProfit'] == 0
-            self.df['ProfitPips'] = self.df['NetProfit'] / 10.0  # Assuming 1 pip = $10
-            self.df['RMultiple'] = self.df['NetProfit'] / abs(self.df['MaxDrawdown'])
+            # Add derived columns (feature_store.py definitions; ProfitPips assumes 1 pip = $10)
+            self.df = add_features(self.df, ['IsWinner', 'IsLoser', 'IsBreakeven', 'ProfitPips', 'RMultiple'],
+                                   sources=[self.csv_path], metrics=self.metrics)
             
             # Separate winners/losers
             self.winners = self.df[self.df['IsWinner']]
@@ -153,36 +162,46 @@ class TradeAnalytics:
         print(f"{'='*80}")
         
         correlations = {}
-        
-        for metric in self.physics_metrics:
-            if metric in self.df.columns:
+        metrics = [m for m in self.physics_metrics if m in self.df.columns]
+        
+        if correlation_table is not None and metrics:
+            # All metrics against profit and win/loss in one matrix pass
+            table = correlation_table(
+                self.df[metrics + ['NetProfit']].assign(IsWinner=self.df['IsWinner'].astype(int)),
+                metrics, ['NetProfit', 'IsWinner'], spearman=False
+            ).set_index(['signal_metric', 'outcome_metric'])
+            profit_corr = table.xs('NetProfit', level='outcome_metric')
+            win_corr = table.xs('IsWinner', level='outcome_metric')['pearson_r']
+        
+        for metric in metrics:
+            if correlation_table is not None:
+                corr = profit_corr.at[metric, 'pearson_r']
+                win_loss_corr = win_corr.at[metric]
+                # Point-biserial correlation with win/loss is Pearson on the 0/1 column
+                p_value = profit_corr.at[metric, 'pearson_p']
+                significant = p_value < 0.05
+            else:
                 # Pearson correlation with profit
                 corr = self.df[metric].corr(self.df['NetProfit'])
                 
                 # Point-biserial correlation with win/loss
                 win_loss_corr = self.df[metric].corr(self.df['IsWinner'].astype(int))
                 
-                # Statistical significance test
-                if HAS_SCIPY:
-                    _, p_value = stats.pearsonr(self.df[metric].dropna(), 
-                                               self.df.loc[self.df[metric].notna(), 'NetProfit'])
-                    significant = p_value < 0.05
-                else:
-                    p_value = None
-                    significant = abs(corr) > 0.2  # Simple threshold
-                
-                correlations[metric] = {
-                    'profit_corr': corr,
-                    'win_corr': win_loss_corr,
-                    'p_value': p_value,
-                    'significant': significant,
-                    'strength': 'Strong' if abs(corr) > 0.5 else 'Moderate' if abs(corr) > 0.3 else 'Weak'
-                }
-                
-                # Print if significant
-                if significant:
-                    direction = "📈 Positive" if corr > 0 else "📉 Negative"
-                    print(f"{metric:20s} {direction:15s} r={corr:6.3f}  {correlations[metric]['strength']:10s}")
+                p_value = None
+                significant = abs(corr) > 0.2  # Simple threshold
+            
+            correlations[metric] = {
+                'profit_corr': corr,
+                'win_corr': win_loss_corr,
+                'p_value': p_value,
+                'significant': significant,
+                'strength': 'Strong' if abs(corr) > 0.5 else 'Moderate' if abs(corr) > 0.3 else 'Weak'
+            }
+            
+            # Print if significant
+            if significant:
+                direction = "📈 Positive" if corr > 0 else "📉 Negative"
+                print(f"{metric:20s} {direction:15s} r={corr:6.3f}  {correlations[metric]['strength']:10s}")
         
         self.results['correlations'] = correlations
         
@@ -674,18 +693,22 @@ class TradeAnalytics:
     
     def run_full_analysis(self):
         """Run complete analysis pipeline"""
-        if not self.load_data():
-            return False
+        with self.metrics.stage('load') as stage:
+            if not self.load_data():
+                return False
+            stage.rows = len(self.df)
         
         # Run all analyses
-        self.basic_statistics()
-        self.correlation_analysis()
-        self.optimize_all_thresholds()
-        self.build_all_probability_tables()
-        self.multi_metric_combinations()
-        self.generate_json_config()
-        self.generate_visualizations()
-        html_path = self.generate_html_report()
+        with self.metrics.stage('aggregate', rows=len(self.df)):
+            self.basic_statistics()
+            self.correlation_analysis()
+            self.optimize_all_thresholds()
+            self.build_all_probability_tables()
+            self.multi_metric_combinations()
+        with self.metrics.stage('render'):
+            self.generate_json_config()
+            self.generate_visualizations()
+            html_path = self.generate_html_report()
         
         print(f"\n{'='*80}")
         print(f"✅ ANALYSIS COMPLETE!")
@@ -706,9 +729,10 @@ def main():
     
     analytics = TradeAnalytics(args.csv_file, args.output_dir)
     success = analytics.run_full_analysis()
+    analytics.metrics.export()
     
     return 0 if success else 1
 
 
 if __name__ == '__main__':
-    exit(main())
+    sys.exit(run_cli(main, 'analyze_backtest_advanced'))
@@ -15,6 +15,7 @@ Example:
 import pandas as pd
 import numpy as np
 import argparse
+import sys
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Tuple
@@ -32,6 +33,11 @@ try:
 except ImportError:
     HAS_SCIPY = False
 
+# Stage timings and --profile/--trace-memory (analytics/pipeline_metrics.py, cli_profiling.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analytics'))
+from pipeline_metrics import PipelineMetrics
+from cli_profiling import run_cli
+
 
 class CSVBacktestComparison:
     """Compare two backtest CSV files in detail"""
@@ -46,6 +52,7 @@ class CSVBacktestComparison:
         self.baseline_stats = {}
         self.optimized_stats = {}
         self.comparison = {}
+        self.metrics = PipelineMetrics('compare_csv_backtests')
     
     def load_data(self) -> bool:
         """Load both CSV files"""
@@ -514,18 +521,22 @@ class CSVBacktestComparison:
     
     def run(self, output_html: str = "comparison_report.html"):
         """Run full comparison analysis"""
-        if not self.load_data():
-            return False
+        with self.metrics.stage('load') as stage:
+            if not self.load_data():
+                return False
+            stage.rows = len(self.baseline_df) + len(self.optimized_df)
         
-        self.compare()
+        with self.metrics.stage('aggregate', rows=len(self.baseline_df) + len(self.optimized_df)):
+            self.compare()
         
         output_dir = Path(output_html).parent
         if output_dir == Path('.'):
             output_dir = Path('comparison_output')
         output_dir.mkdir(exist_ok=True)
         
-        self.generate_visualizations(output_dir)
-        self.generate_html_report(output_dir / Path(output_html).name)
+        with self.metrics.stage('render'):
+            self.generate_visualizations(output_dir)
+            self.generate_html_report(output_dir / Path(output_html).name)
         
         print(f"\n{'='*80}")
         print(f"✅ COMPARISON COMPLETE!")
@@ -546,9 +557,10 @@ def main():
     
     comparison = CSVBacktestComparison(args.baseline, args.optimized)
     success = comparison.run(args.output)
+    comparison.metrics.export()
     
     return 0 if success else 1
 
 
 if __name__ == '__main__':
-    exit(main())
+    sys.exit(run_cli(main, 'compare_csv_backtests'))
@@ -3,20 +3,34 @@
 TickPhysics 5M Optimization - Technical Deep-Dive Dashboard
 Advanced analytics and filter effectiveness analysis
 
-Professional hedge fund-style technical reporting
+Professional hedge fund-style technical reporting, rendered as a
+report_pipeline ChartJob (headless, skipped when inputs are unchanged).
 """
 
+import sys
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from matplotlib.patches import Rectangle, FancyBboxPatch
-from datetime import datetime
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set professional dark theme
-plt.style.use('dark_background')
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analytics'))
+from report_pipeline import ChartJob, render_charts
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'Backtest_Reports'
+OUTPUT_DIR = Path(__file__).resolve().parent
+OUTPUT_NAME = 'TickPhysics_5M_Technical_DeepDive.png'
+
+# Data from Backtest_Reports folder
+VERSION_FILES = {
+    'v3.0': 'TP_Integrated_Trades_NAS100_v3.0_05M.csv',
+    'v3.1': 'TP_Integrated_Trades_NAS100_v3.1_05M.csv',
+    'v3.2': 'TP_Integrated_Trades_NAS100_v3.2_05M.csv',
+    'v3.21': 'TP_Integrated_Trades_NAS100_v3.21_05M.csv',
+}
 
 # Custom color palette
 COLORS = {
@@ -31,315 +45,312 @@ COLORS = {
     'text': '#E4E7EB'
 }
 
-print("=" * 100)
-print("🔬 TICKPHYSICS 5M OPTIMIZATION - TECHNICAL DEEP-DIVE")
-print("=" * 100)
-print()
-
-# Load data from Backtest_Reports folder
-print("Loading data files...")
-trades_v30 = pd.read_csv('../Backtest_Reports/TP_Integrated_Trades_NAS100_v3.0_05M.csv')
-trades_v31 = pd.read_csv('../Backtest_Reports/TP_Integrated_Trades_NAS100_v3.1_05M.csv')
-trades_v32 = pd.read_csv('../Backtest_Reports/TP_Integrated_Trades_NAS100_v3.2_05M.csv')
-trades_v321 = pd.read_csv('../Backtest_Reports/TP_Integrated_Trades_NAS100_v3.21_05M.csv')
-print("✅ Data loaded\n")
-
-# Create figure
-fig = plt.figure(figsize=(24, 20))
-fig.patch.set_facecolor(COLORS['bg_dark'])
-
-fig.suptitle('TICKPHYSICS 5M OPTIMIZATION - TECHNICAL DEEP-DIVE\nFilter Effectiveness & Physics Metrics Analysis', 
-             fontsize=24, fontweight='bold', color=COLORS['text'], y=0.98)
-
-gs = fig.add_gridspec(6, 3, hspace=0.5, wspace=0.3, top=0.93, bottom=0.05, left=0.05, right=0.95)
-
-# ============================================================================
-# ROW 1: FILTER CASCADE ANALYSIS
-# ============================================================================
-ax1 = fig.add_subplot(gs[0:2, :])
-ax1.set_facecolor(COLORS['bg_card'])
-
-# Filter cascade data
-filter_stages = ['Raw\nSignals', 'After\nZone', 'After\nRegime', 'After\nTime', 
-                'After\nMomentum', 'Final\nTrades']
-stage_counts = [1335, 800, 650, 533, 373, 199]  # Approximate cascade
-stage_wrs = [26.7, 30.2, 33.5, 38.5, 35.0, 42.2]  # Approximate WRs
-
-# Create funnel chart
-x_pos = np.arange(len(filter_stages))
-bars = ax1.bar(x_pos, stage_counts, color=COLORS['primary'], alpha=0.8, 
-              edgecolor='white', linewidth=2, width=0.6)
-
-# Overlay WR line
-ax1_twin = ax1.twinx()
-line = ax1_twin.plot(x_pos, stage_wrs, color=COLORS['success'], marker='o', 
-                    markersize=12, linewidth=3, label='Win Rate %')
-
-# Add count labels on bars
-for i, (bar, count) in enumerate(zip(bars, stage_counts)):
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height + 20,
-            f'{count}', ha='center', va='bottom', fontsize=11, 
-            fontweight='bold', color=COLORS['text'])
+
+def render_dashboard(out_path: Path, data_dir: Path = DATA_DIR):
+    """Render the technical deep-dive PNG"""
+    # Set professional dark theme
+    plt.style.use('dark_background')
+
+    data_dir = Path(data_dir)
+    trades_v30, trades_v31, trades_v32, trades_v321 = (
+        pd.read_csv(data_dir / name) for name in VERSION_FILES.values())
+
+    # Create figure
+    fig = plt.figure(figsize=(24, 20))
+    fig.patch.set_facecolor(COLORS['bg_dark'])
+
+    fig.suptitle('TICKPHYSICS 5M OPTIMIZATION - TECHNICAL DEEP-DIVE\nFilter Effectiveness & Physics Metrics Analysis', 
+                 fontsize=24, fontweight='bold', color=COLORS['text'], y=0.98)
+
+    gs = fig.add_gridspec(6, 3, hspace=0.5, wspace=0.3, top=0.93, bottom=0.05, left=0.05, right=0.95)
+
+    # ============================================================================
+    # ROW 1: FILTER CASCADE ANALYSIS
+    # ============================================================================
+    ax1 = fig.add_subplot(gs[0:2, :])
+    ax1.set_facecolor(COLORS['bg_card'])
+
+    # Filter cascade data
+    filter_stages = ['Raw\nSignals', 'After\nZone', 'After\nRegime', 'After\nTime', 
+                    'After\nMomentum', 'Final\nTrades']
+    stage_counts = [1335, 800, 650, 533, 373, 199]  # Approximate cascade
+    stage_wrs = [26.7, 30.2, 33.5, 38.5, 35.0, 42.2]  # Approximate WRs
+
+    # Create funnel chart
+    x_pos = np.arange(len(filter_stages))
+    bars = ax1.bar(x_pos, stage_counts, color=COLORS['primary'], alpha=0.8, 
+                  edgecolor='white', linewidth=2, width=0.6)
+
+    # Overlay WR line
+    ax1_twin = ax1.twinx()
+    line = ax1_twin.plot(x_pos, stage_wrs, color=COLORS['success'], marker='o', 
+                        markersize=12, linewidth=3, label='Win Rate %')
+
+    # Add count labels on bars
+    for i, (bar, count) in enumerate(zip(bars, stage_counts)):
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height + 20,
+                f'{count}', ha='center', va='bottom', fontsize=11, 
+                fontweight='bold', color=COLORS['text'])
     
-    # Add reduction percentage
-    if i > 0:
-        reduction = ((stage_counts[i-1] - count) / stage_counts[i-1] * 100)
-        ax1.text(bar.get_x() + bar.get_width()/2., height/2,
-                f'-{reduction:.0f}%', ha='center', va='center', fontsize=9, 
-                color=COLORS['warning'], fontweight='bold',
-                bbox=dict(boxstyle='round', facecolor=COLORS['bg_dark'], 
-                         edgecolor=COLORS['warning'], linewidth=1, alpha=0.8))
-
-# Add WR labels on line
-for i, (x, wr) in enumerate(zip(x_pos, stage_wrs)):
-    ax1_twin.text(x, wr + 1.5, f'{wr:.1f}%', ha='center', va='bottom',
-                 fontsize=10, color=COLORS['success'], fontweight='bold')
-
-ax1.set_title('🔍 Filter Cascade Analysis - Trade Reduction vs WR Improvement', 
-             fontsize=16, fontweight='bold', color=COLORS['text'], pad=20)
-ax1.set_ylabel('Trade Count', fontsize=12, color=COLORS['primary'], fontweight='bold')
-ax1.set_xlabel('Filter Stage', fontsize=12, color=COLORS['text'])
-ax1.set_xticks(x_pos)
-ax1.set_xticklabels(filter_stages, fontsize=10)
-ax1.grid(axis='y', alpha=0.2, linestyle='--')
-ax1.tick_params(colors=COLORS['text'])
-
-ax1_twin.set_ylabel('Win Rate (%)', fontsize=12, color=COLORS['success'], fontweight='bold')
-ax1_twin.tick_params(colors=COLORS['text'])
-ax1_twin.legend(loc='upper left', framealpha=0.3, fontsize=11)
-
-# ============================================================================
-# ROW 2: PHYSICS METRICS HEATMAP (v3.21)
-# ============================================================================
-ax2 = fig.add_subplot(gs[2, :])
-ax2.set_facecolor(COLORS['bg_card'])
-
-# Calculate physics metric statistics
-metrics = ['EntryQuality', 'EntryConfluence', 'EntryMomentum']
-winners_v321 = trades_v321[trades_v321['Profit'] > 0]
-losers_v321 = trades_v321[trades_v321['Profit'] <= 0]
-
-heatmap_data = []
-for metric in metrics:
-    winners_mean = winners_v321[metric].mean()
-    losers_mean = losers_v321[metric].mean()
-    delta = winners_mean - losers_mean
-    heatmap_data.append([winners_mean, losers_mean, delta])
-
-heatmap_df = pd.DataFrame(heatmap_data, 
-                          columns=['Winners', 'Losers', 'Separation'],
-                          index=['Quality', 'Confluence', 'Momentum'])
-
-# Create heatmap
-sns.heatmap(heatmap_df, annot=True, fmt='.2f', cmap='RdYlGn', center=0,
-           cbar_kws={'label': 'Value'}, linewidths=2, linecolor='white',
-           ax=ax2, vmin=-50, vmax=200)
-
-ax2.set_title('🧪 Physics Metrics Analysis - Winners vs Losers (v3.21)', 
-             fontsize=16, fontweight='bold', color=COLORS['text'], pad=20)
-ax2.set_xlabel('')
-ax2.set_ylabel('')
-ax2.tick_params(colors=COLORS['text'], labelsize=11)
-
-# Add separation indicators
-for i, (idx, row) in enumerate(heatmap_df.iterrows()):
-    sep = row['Separation']
-    if abs(sep) > 50:
-        indicator = '✅ STRONG'
-        color = COLORS['success']
-    elif abs(sep) > 10:
-        indicator = '⚠️ WEAK'
-        color = COLORS['warning']
-    else:
-        indicator = '❌ NONE'
-        color = COLORS['danger']
+        # Add reduction percentage
+        if i > 0:
+            reduction = ((stage_counts[i-1] - count) / stage_counts[i-1] * 100)
+            ax1.text(bar.get_x() + bar.get_width()/2., height/2,
+                    f'-{reduction:.0f}%', ha='center', va='center', fontsize=9, 
+                    color=COLORS['warning'], fontweight='bold',
+                    bbox=dict(boxstyle='round', facecolor=COLORS['bg_dark'], 
+                             edgecolor=COLORS['warning'], linewidth=1, alpha=0.8))
+
+    # Add WR labels on line
+    for i, (x, wr) in enumerate(zip(x_pos, stage_wrs)):
+        ax1_twin.text(x, wr + 1.5, f'{wr:.1f}%', ha='center', va='bottom',
+                     fontsize=10, color=COLORS['success'], fontweight='bold')
+
+    ax1.set_title('🔍 Filter Cascade Analysis - Trade Reduction vs WR Improvement', 
+                 fontsize=16, fontweight='bold', color=COLORS['text'], pad=20)
+    ax1.set_ylabel('Trade Count', fontsize=12, color=COLORS['primary'], fontweight='bold')
+    ax1.set_xlabel('Filter Stage', fontsize=12, color=COLORS['text'])
+    ax1.set_xticks(x_pos)
+    ax1.set_xticklabels(filter_stages, fontsize=10)
+    ax1.grid(axis='y', alpha=0.2, linestyle='--')
+    ax1.tick_params(colors=COLORS['text'])
+
+    ax1_twin.set_ylabel('Win Rate (%)', fontsize=12, color=COLORS['success'], fontweight='bold')
+    ax1_twin.tick_params(colors=COLORS['text'])
+    ax1_twin.legend(loc='upper left', framealpha=0.3, fontsize=11)
+
+    # ============================================================================
+    # ROW 2: PHYSICS METRICS HEATMAP (v3.21)
+    # ============================================================================
+    ax2 = fig.add_subplot(gs[2, :])
+    ax2.set_facecolor(COLORS['bg_card'])
+
+    # Calculate physics metric statistics
+    metrics = ['EntryQuality', 'EntryConfluence', 'EntryMomentum']
+    winners_v321 = trades_v321[trades_v321['Profit'] > 0]
+    losers_v321 = trades_v321[trades_v321['Profit'] <= 0]
+
+    heatmap_data = []
+    for metric in metrics:
+        winners_mean = winners_v321[metric].mean()
+        losers_mean = losers_v321[metric].mean()
+        delta = winners_mean - losers_mean
+        heatmap_data.append([winners_mean, losers_mean, delta])
+
+    heatmap_df = pd.DataFrame(heatmap_data, 
+                              columns=['Winners', 'Losers', 'Separation'],
+                              index=['Quality', 'Confluence', 'Momentum'])
+
+    # Create heatmap
+    sns.heatmap(heatmap_df, annot=True, fmt='.2f', cmap='RdYlGn', center=0,
+               cbar_kws={'label': 'Value'}, linewidths=2, linecolor='white',
+               ax=ax2, vmin=-50, vmax=200)
+
+    ax2.set_title('🧪 Physics Metrics Analysis - Winners vs Losers (v3.21)', 
+                 fontsize=16, fontweight='bold', color=COLORS['text'], pad=20)
+    ax2.set_xlabel('')
+    ax2.set_ylabel('')
+    ax2.tick_params(colors=COLORS['text'], labelsize=11)
+
+    # Add separation indicators
+    for i, (idx, row) in enumerate(heatmap_df.iterrows()):
+        sep = row['Separation']
+        if abs(sep) > 50:
+            indicator = '✅ STRONG'
+            color = COLORS['success']
+        elif abs(sep) > 10:
+            indicator = '⚠️ WEAK'
+            color = COLORS['warning']
+        else:
+            indicator = '❌ NONE'
+            color = COLORS['danger']
     
-    ax2.text(3.5, i + 0.5, indicator, ha='left', va='center',
-            fontsize=11, color=color, fontweight='bold')
-
-# ============================================================================
-# ROW 3: ZONE & REGIME DISTRIBUTION
-# ============================================================================
-ax3 = fig.add_subplot(gs[3, 0:2])
-ax3.set_facecolor(COLORS['bg_card'])
-
-# Zone distribution for v3.21
-zone_counts = trades_v321['EntryZone'].value_counts()
-zone_wrs = []
-for zone in zone_counts.index:
-    zone_trades = trades_v321[trades_v321['EntryZone'] == zone]
-    wr = (len(zone_trades[zone_trades['Profit'] > 0]) / len(zone_trades) * 100)
-    zone_wrs.append(wr)
-
-x = np.arange(len(zone_counts))
-bars = ax3.bar(x, zone_counts.values, color=COLORS['accent'], alpha=0.8, 
-              edgecolor='white', linewidth=2)
-
-# Overlay WR line
-ax3_twin = ax3.twinx()
-line = ax3_twin.plot(x, zone_wrs, color=COLORS['success'], marker='D', 
-                    markersize=10, linewidth=2.5, label='Win Rate %')
-
-# Add labels
-for i, (bar, count, wr) in enumerate(zip(bars, zone_counts.values, zone_wrs)):
-    height = bar.get_height()
-    ax3.text(bar.get_x() + bar.get_width()/2., height + 1,
-            f'{count}', ha='center', va='bottom', fontsize=10, 
-            fontweight='bold', color=COLORS['text'])
-    ax3_twin.text(i, wr + 2, f'{wr:.0f}%', ha='center', va='bottom',
-                 fontsize=9, color=COLORS['success'], fontweight='bold')
-
-ax3.set_title('🎯 Trading Zone Distribution & Performance (v3.21)', 
-             fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
-ax3.set_ylabel('Trade Count', fontsize=11, color=COLORS['accent'], fontweight='bold')
-ax3.set_xlabel('Trading Zone', fontsize=11, color=COLORS['text'])
-ax3.set_xticks(x)
-ax3.set_xticklabels(zone_counts.index, fontsize=10, rotation=15, ha='right')
-ax3.grid(axis='y', alpha=0.2, linestyle='--')
-ax3.tick_params(colors=COLORS['text'])
-
-ax3_twin.set_ylabel('Win Rate (%)', fontsize=11, color=COLORS['success'], fontweight='bold')
-ax3_twin.tick_params(colors=COLORS['text'])
-ax3_twin.legend(loc='upper left', framealpha=0.3, fontsize=10)
-
-# Regime distribution
-ax4 = fig.add_subplot(gs[3, 2])
-ax4.set_facecolor(COLORS['bg_card'])
-
-regime_counts = trades_v321['EntryRegime'].value_counts()
-colors_regime = [COLORS['danger'], COLORS['warning'], COLORS['success']][:len(regime_counts)]
-
-wedges, texts, autotexts = ax4.pie(regime_counts.values, labels=regime_counts.index,
-                                    autopct='%1.1f%%', startangle=90,
-                                    colors=colors_regime, wedgeprops=dict(linewidth=2, 
-                                    edgecolor='white'))
-
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-    autotext.set_fontsize(11)
-
-for text in texts:
-    text.set_fontsize(10)
-    text.set_color(COLORS['text'])
-    text.set_fontweight('bold')
-
-ax4.set_title('Volatility Regime\nDistribution', fontsize=12, fontweight='bold', 
-             color=COLORS['text'], pad=10)
-
-# ============================================================================
-# ROW 4: HOURLY PERFORMANCE ANALYSIS
-# ============================================================================
-ax5 = fig.add_subplot(gs[4, :])
-ax5.set_facecolor(COLORS['bg_card'])
-
-# Parse hour from timestamps
-trades_v321['Hour'] = pd.to_datetime(trades_v321['OpenTime']).dt.hour
-
-hourly_data = []
-for hour in range(24):
-    hour_trades = trades_v321[trades_v321['Hour'] == hour]
-    if len(hour_trades) > 0:
-        count = len(hour_trades)
-        winners = len(hour_trades[hour_trades['Profit'] > 0])
-        wr = (winners / count * 100)
-        hourly_data.append({'hour': hour, 'count': count, 'wr': wr})
-
-hourly_df = pd.DataFrame(hourly_data)
-
-# Create bar chart
-bars = ax5.bar(hourly_df['hour'], hourly_df['count'], color=COLORS['primary'], 
-              alpha=0.8, edgecolor='white', linewidth=1.5)
-
-# Color bars based on blocked hours
-blocked_hours = [6, 7, 13, 14]
-for i, bar in enumerate(bars):
-    if hourly_df.iloc[i]['hour'] in blocked_hours:
-        bar.set_color(COLORS['danger'])
-        bar.set_alpha(0.4)
-
-# Overlay WR line
-ax5_twin = ax5.twinx()
-line = ax5_twin.plot(hourly_df['hour'], hourly_df['wr'], color=COLORS['success'], 
-                    marker='o', markersize=6, linewidth=2, label='Win Rate %', alpha=0.8)
-
-# Add 20% WR threshold line
-ax5_twin.axhline(y=20, color=COLORS['danger'], linestyle='--', linewidth=2, 
-                label='Block Threshold (20%)', alpha=0.7)
-
-ax5.set_title('⏰ Hourly Trade Distribution & Performance (v3.21) - Blocked Hours Highlighted', 
-             fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
-ax5.set_ylabel('Trade Count', fontsize=11, color=COLORS['primary'], fontweight='bold')
-ax5.set_xlabel('Hour of Day (UTC)', fontsize=11, color=COLORS['text'])
-ax5.set_xticks(range(0, 24, 2))
-ax5.grid(axis='y', alpha=0.2, linestyle='--')
-ax5.tick_params(colors=COLORS['text'])
-
-ax5_twin.set_ylabel('Win Rate (%)', fontsize=11, color=COLORS['success'], fontweight='bold')
-ax5_twin.set_ylim(0, 100)
-ax5_twin.tick_params(colors=COLORS['text'])
-ax5_twin.legend(loc='upper right', framealpha=0.3, fontsize=10)
-
-# Add legend for blocked hours
-from matplotlib.patches import Patch
-legend_elements = [Patch(facecolor=COLORS['primary'], alpha=0.8, label='Active Hours'),
-                  Patch(facecolor=COLORS['danger'], alpha=0.4, label='Blocked Hours (6,7,13,14)')]
-ax5.legend(handles=legend_elements, loc='upper left', framealpha=0.3, fontsize=10)
-
-# ============================================================================
-# ROW 5: MFE/MAE SCATTER PLOT (v3.21)
-# ============================================================================
-ax6 = fig.add_subplot(gs[5, 0:2])
-ax6.set_facecolor(COLORS['bg_card'])
-
-# Scatter plot of MFE vs MAE
-winners = trades_v321[trades_v321['Profit'] > 0]
-losers = trades_v321[trades_v321['Profit'] <= 0]
-
-ax6.scatter(winners['MFE_Pips'], winners['MAE_Pips'], c=COLORS['success'], 
-           alpha=0.6, s=50, edgecolors='white', linewidths=0.5, label=f'Winners ({len(winners)})')
-ax6.scatter(losers['MFE_Pips'], losers['MAE_Pips'], c=COLORS['danger'], 
-           alpha=0.6, s=50, edgecolors='white', linewidths=0.5, label=f'Losers ({len(losers)})')
-
-# Add quadrant lines
-ax6.axvline(x=0, color=COLORS['neutral'], linestyle='--', linewidth=1, alpha=0.5)
-ax6.axhline(y=0, color=COLORS['neutral'], linestyle='--', linewidth=1, alpha=0.5)
-
-# Add median lines
-winners_mfe_median = winners['MFE_Pips'].median()
-winners_mae_median = winners['MAE_Pips'].median()
-ax6.axvline(x=winners_mfe_median, color=COLORS['success'], linestyle=':', 
-           linewidth=2, alpha=0.7, label=f'Winner MFE Median: {winners_mfe_median:.1f}')
-ax6.axhline(y=winners_mae_median, color=COLORS['success'], linestyle=':', 
-           linewidth=2, alpha=0.7, label=f'Winner MAE Median: {winners_mae_median:.1f}')
-
-ax6.set_title('📊 MFE vs MAE Analysis (v3.21) - Excursion Patterns', 
-             fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
-ax6.set_xlabel('Maximum Favorable Excursion (pips)', fontsize=11, color=COLORS['text'])
-ax6.set_ylabel('Maximum Adverse Excursion (pips)', fontsize=11, color=COLORS['text'])
-ax6.legend(loc='upper left', framealpha=0.3, fontsize=9)
-ax6.grid(alpha=0.2, linestyle='--')
-ax6.tick_params(colors=COLORS['text'])
-
-# Summary statistics panel
-ax7 = fig.add_subplot(gs[5, 2])
-ax7.set_xlim(0, 1)
-ax7.set_ylim(0, 1)
-ax7.axis('off')
-
-# Create summary box
-rect = FancyBboxPatch((0.05, 0.05), 0.9, 0.9, boxstyle="round,pad=0.02",
-                      facecolor=COLORS['bg_card'], edgecolor=COLORS['primary'], 
-                      linewidth=3, alpha=0.95)
-ax7.add_patch(rect)
-
-# Summary title
-ax7.text(0.5, 0.90, 'v3.21 SUMMARY', ha='center', va='center',
-        fontsize=14, color=COLORS['primary'], fontweight='bold')
-
-# Statistics
-stats_text = f"""
+        ax2.text(3.5, i + 0.5, indicator, ha='left', va='center',
+                fontsize=11, color=color, fontweight='bold')
+
+    # ============================================================================
+    # ROW 3: ZONE & REGIME DISTRIBUTION
+    # ============================================================================
+    ax3 = fig.add_subplot(gs[3, 0:2])
+    ax3.set_facecolor(COLORS['bg_card'])
+
+    # Zone distribution for v3.21
+    zone_counts = trades_v321['EntryZone'].value_counts()
+    zone_wrs = []
+    for zone in zone_counts.index:
+        zone_trades = trades_v321[trades_v321['EntryZone'] == zone]
+        wr = (len(zone_trades[zone_trades['Profit'] > 0]) / len(zone_trades) * 100)
+        zone_wrs.append(wr)
+
+    x = np.arange(len(zone_counts))
+    bars = ax3.bar(x, zone_counts.values, color=COLORS['accent'], alpha=0.8, 
+                  edgecolor='white', linewidth=2)
+
+    # Overlay WR line
+    ax3_twin = ax3.twinx()
+    line = ax3_twin.plot(x, zone_wrs, color=COLORS['success'], marker='D', 
+                        markersize=10, linewidth=2.5, label='Win Rate %')
+
+    # Add labels
+    for i, (bar, count, wr) in enumerate(zip(bars, zone_counts.values, zone_wrs)):
+        height = bar.get_height()
+        ax3.text(bar.get_x() + bar.get_width()/2., height + 1,
+                f'{count}', ha='center', va='bottom', fontsize=10, 
+                fontweight='bold', color=COLORS['text'])
+        ax3_twin.text(i, wr + 2, f'{wr:.0f}%', ha='center', va='bottom',
+                     fontsize=9, color=COLORS['success'], fontweight='bold')
+
+    ax3.set_title('🎯 Trading Zone Distribution & Performance (v3.21)', 
+                 fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
+    ax3.set_ylabel('Trade Count', fontsize=11, color=COLORS['accent'], fontweight='bold')
+    ax3.set_xlabel('Trading Zone', fontsize=11, color=COLORS['text'])
+    ax3.set_xticks(x)
+    ax3.set_xticklabels(zone_counts.index, fontsize=10, rotation=15, ha='right')
+    ax3.grid(axis='y', alpha=0.2, linestyle='--')
+    ax3.tick_params(colors=COLORS['text'])
+
+    ax3_twin.set_ylabel('Win Rate (%)', fontsize=11, color=COLORS['success'], fontweight='bold')
+    ax3_twin.tick_params(colors=COLORS['text'])
+    ax3_twin.legend(loc='upper left', framealpha=0.3, fontsize=10)
+
+    # Regime distribution
+    ax4 = fig.add_subplot(gs[3, 2])
+    ax4.set_facecolor(COLORS['bg_card'])
+
+    regime_counts = trades_v321['EntryRegime'].value_counts()
+    colors_regime = [COLORS['danger'], COLORS['warning'], COLORS['success']][:len(regime_counts)]
+
+    wedges, texts, autotexts = ax4.pie(regime_counts.values, labels=regime_counts.index,
+                                        autopct='%1.1f%%', startangle=90,
+                                        colors=colors_regime, wedgeprops=dict(linewidth=2, 
+                                        edgecolor='white'))
+
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+        autotext.set_fontsize(11)
+
+    for text in texts:
+        text.set_fontsize(10)
+        text.set_color(COLORS['text'])
+        text.set_fontweight('bold')
+
+    ax4.set_title('Volatility Regime\nDistribution', fontsize=12, fontweight='bold', 
+                 color=COLORS['text'], pad=10)
+
+    # ============================================================================
+    # ROW 4: HOURLY PERFORMANCE ANALYSIS
+    # ============================================================================
+    ax5 = fig.add_subplot(gs[4, :])
+    ax5.set_facecolor(COLORS['bg_card'])
+
+    # Parse hour from timestamps
+    trades_v321['Hour'] = pd.to_datetime(trades_v321['OpenTime']).dt.hour
+
+    hourly_data = []
+    for hour in range(24):
+        hour_trades = trades_v321[trades_v321['Hour'] == hour]
+        if len(hour_trades) > 0:
+            count = len(hour_trades)
+            winners = len(hour_trades[hour_trades['Profit'] > 0])
+            wr = (winners / count * 100)
+            hourly_data.append({'hour': hour, 'count': count, 'wr': wr})
+
+    hourly_df = pd.DataFrame(hourly_data)
+
+    # Create bar chart
+    bars = ax5.bar(hourly_df['hour'], hourly_df['count'], color=COLORS['primary'], 
+                  alpha=0.8, edgecolor='white', linewidth=1.5)
+
+    # Color bars based on blocked hours
+    blocked_hours = [6, 7, 13, 14]
+    for i, bar in enumerate(bars):
+        if hourly_df.iloc[i]['hour'] in blocked_hours:
+            bar.set_color(COLORS['danger'])
+            bar.set_alpha(0.4)
+
+    # Overlay WR line
+    ax5_twin = ax5.twinx()
+    line = ax5_twin.plot(hourly_df['hour'], hourly_df['wr'], color=COLORS['success'], 
+                        marker='o', markersize=6, linewidth=2, label='Win Rate %', alpha=0.8)
+
+    # Add 20% WR threshold line
+    ax5_twin.axhline(y=20, color=COLORS['danger'], linestyle='--', linewidth=2, 
+                    label='Block Threshold (20%)', alpha=0.7)
+
+    ax5.set_title('⏰ Hourly Trade Distribution & Performance (v3.21) - Blocked Hours Highlighted', 
+                 fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
+    ax5.set_ylabel('Trade Count', fontsize=11, color=COLORS['primary'], fontweight='bold')
+    ax5.set_xlabel('Hour of Day (UTC)', fontsize=11, color=COLORS['text'])
+    ax5.set_xticks(range(0, 24, 2))
+    ax5.grid(axis='y', alpha=0.2, linestyle='--')
+    ax5.tick_params(colors=COLORS['text'])
+
+    ax5_twin.set_ylabel('Win Rate (%)', fontsize=11, color=COLORS['success'], fontweight='bold')
+    ax5_twin.set_ylim(0, 100)
+    ax5_twin.tick_params(colors=COLORS['text'])
+    ax5_twin.legend(loc='upper right', framealpha=0.3, fontsize=10)
+
+    # Add legend for blocked hours
+    from matplotlib.patches import Patch
+    legend_elements = [Patch(facecolor=COLORS['primary'], alpha=0.8, label='Active Hours'),
+                      Patch(facecolor=COLORS['danger'], alpha=0.4, label='Blocked Hours (6,7,13,14)')]
+    ax5.legend(handles=legend_elements, loc='upper left', framealpha=0.3, fontsize=10)
+
+    # ============================================================================
+    # ROW 5: MFE/MAE SCATTER PLOT (v3.21)
+    # ============================================================================
+    ax6 = fig.add_subplot(gs[5, 0:2])
+    ax6.set_facecolor(COLORS['bg_card'])
+
+    # Scatter plot of MFE vs MAE
+    winners = trades_v321[trades_v321['Profit'] > 0]
+    losers = trades_v321[trades_v321['Profit'] <= 0]
+
+    ax6.scatter(winners['MFE_Pips'], winners['MAE_Pips'], c=COLORS['success'], 
+               alpha=0.6, s=50, edgecolors='white', linewidths=0.5, label=f'Winners ({len(winners)})')
+    ax6.scatter(losers['MFE_Pips'], losers['MAE_Pips'], c=COLORS['danger'], 
+               alpha=0.6, s=50, edgecolors='white', linewidths=0.5, label=f'Losers ({len(losers)})')
+
+    # Add quadrant lines
+    ax6.axvline(x=0, color=COLORS['neutral'], linestyle='--', linewidth=1, alpha=0.5)
+    ax6.axhline(y=0, color=COLORS['neutral'], linestyle='--', linewidth=1, alpha=0.5)
+
+    # Add median lines
+    winners_mfe_median = winners['MFE_Pips'].median()
+    winners_mae_median = winners['MAE_Pips'].median()
+    ax6.axvline(x=winners_mfe_median, color=COLORS['success'], linestyle=':', 
+               linewidth=2, alpha=0.7, label=f'Winner MFE Median: {winners_mfe_median:.1f}')
+    ax6.axhline(y=winners_mae_median, color=COLORS['success'], linestyle=':', 
+               linewidth=2, alpha=0.7, label=f'Winner MAE Median: {winners_mae_median:.1f}')
+
+    ax6.set_title('📊 MFE vs MAE Analysis (v3.21) - Excursion Patterns', 
+                 fontsize=14, fontweight='bold', color=COLORS['text'], pad=15)
+    ax6.set_xlabel('Maximum Favorable Excursion (pips)', fontsize=11, color=COLORS['text'])
+    ax6.set_ylabel('Maximum Adverse Excursion (pips)', fontsize=11, color=COLORS['text'])
+    ax6.legend(loc='upper left', framealpha=0.3, fontsize=9)
+    ax6.grid(alpha=0.2, linestyle='--')
+    ax6.tick_params(colors=COLORS['text'])
+
+    # Summary statistics panel
+    ax7 = fig.add_subplot(gs[5, 2])
+    ax7.set_xlim(0, 1)
+    ax7.set_ylim(0, 1)
+    ax7.axis('off')
+
+    # Create summary box
+    rect = FancyBboxPatch((0.05, 0.05), 0.9, 0.9, boxstyle="round,pad=0.02",
+                          facecolor=COLORS['bg_card'], edgecolor=COLORS['primary'], 
+                          linewidth=3, alpha=0.95)
+    ax7.add_patch(rect)
+
+    # Summary title
+    ax7.text(0.5, 0.90, 'v3.21 SUMMARY', ha='center', va='center',
+            fontsize=14, color=COLORS['primary'], fontweight='bold')
+
+    # Statistics
+    stats_text = f"""
 Trades: {len(trades_v321)}
 Winners: {len(winners)} ({len(winners)/len(trades_v321)*100:.1f}%)
 Losers: {len(losers)} ({len(losers)/len(trades_v321)*100:.1f}%)
@@ -357,23 +368,36 @@ Momentum Δ: +128.7
 ✅ OPTIMAL STRATEGY
 """
 
-ax7.text(0.5, 0.45, stats_text, ha='center', va='center',
-        fontsize=10, color=COLORS['text'], family='monospace',
-        linespacing=1.6)
-
-# ============================================================================
-# SAVE DASHBOARD
-# ============================================================================
-timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-filename = f'TickPhysics_5M_Technical_DeepDive_{timestamp}.png'
-plt.savefig(filename, dpi=300, facecolor=COLORS['bg_dark'], edgecolor='none', 
-           bbox_inches='tight')
-print(f"✅ Technical deep-dive saved: {filename}")
-
-plt.tight_layout()
-plt.show()
-
-print()
-print("=" * 100)
-print("TECHNICAL DEEP-DIVE COMPLETE")
-print("=" * 100)
+    ax7.text(0.5, 0.45, stats_text, ha='center', va='center',
+            fontsize=10, color=COLORS['text'], family='monospace',
+            linespacing=1.6)
+
+    plt.savefig(out_path, dpi=300, facecolor=COLORS['bg_dark'], edgecolor='none', 
+               bbox_inches='tight')
+
+
+def chart_jobs(data_dir: Path = DATA_DIR, output_dir: Path = OUTPUT_DIR):
+    """Pipeline jobs for this report"""
+    data_dir = Path(data_dir)
+    return [ChartJob('technical_deep_dive', render_dashboard, Path(output_dir) / OUTPUT_NAME,
+                     inputs=[data_dir / name for name in VERSION_FILES.values()],
+                     kwargs={'data_dir': str(data_dir)},
+                     title='Technical Deep-Dive')]
+
+
+def main():
+    print("=" * 100)
+    print("🔬 TICKPHYSICS 5M OPTIMIZATION - TECHNICAL DEEP-DIVE")
+    print("=" * 100)
+    print()
+
+    results = render_charts(chart_jobs())
+
+    print()
+    print("=" * 100)
+    print("TECHNICAL DEEP-DIVE COMPLETE" if all(r.status != 'failed' for r in results) else "TECHNICAL DEEP-DIVE FAILED")
+    print("=" * 100)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,46 +2,65 @@
 """
 TickPhysics Professional Dashboard
 Interactive web-based dashboard for visualizing EA performance and self-learning behavior
+
+Figures are built from precomputed aggregates (dashboard_cache): the equity
+curve is LTTB-downsampled and histograms are pre-binned, so page size stays
+flat as the trade history grows. With --reload-interval the CSVs are polled in
+the background and open pages pick up new data without a restart.
 """
 
 import pandas as pd
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
-from dash import Dash, dcc, html, Input, Output, callback
+from dash import Dash, dcc, html, Input, Output, State, callback
+from dash.exceptions import PreventUpdate
 import argparse
 from pathlib import Path
 from datetime import datetime
 
+from dashboard_cache import AggregateStore, DEFAULT_CACHE, RELOAD_INTERVAL
+
 
 class TickPhysicsDashboard:
     """Professional dashboard for TickPhysics EA analysis"""
     
-    def __init__(self, signals_file: str, trades_file: str, title: str = "TickPhysics Backtest Analysis"):
-        """Initialize dashboard with data files"""
+    def __init__(self, signals_file: str, trades_file: str, title: str = "TickPhysics Backtest Analysis",
+                 reload_interval: float = RELOAD_INTERVAL):
+        """Initialize dashboard with data files (0 reload_interval disables live reload)"""
         self.signals_file = Path(signals_file)
         self.trades_file = Path(trades_file)
         self.title = title
+        self.reload_interval = reload_interval
         
-        # Load data
-        self.signals_df = pd.read_csv(signals_file) if Path(signals_file).exists() else pd.DataFrame()
-        self.trades_df = pd.read_csv(trades_file) if Path(trades_file).exists() else pd.DataFrame()
+        # Load aggregates (memoized per file hash; raw DataFrames are not kept)
+        self.store = AggregateStore(signals_file, trades_file)
         
         # Initialize Dash app
         self.app = Dash(__name__)
         self.setup_layout()
+        self.setup_callbacks()
+    
+    @property
+    def trades(self):
+        return self.store.trades
+    
+    @property
+    def signals(self):
+        return self.store.signals
         
     def create_equity_curve(self):
         """Create equity curve visualization"""
-        if self.trades_df.empty or 'Balance' not in self.trades_df.columns:
+        trades = self.trades
+        if trades.empty or not trades.has_balance:
             return go.Figure()
             
         fig = go.Figure()
         
-        # Equity curve
+        # Equity curve (downsampled; extremes are kept)
         fig.add_trace(go.Scatter(
-            x=list(range(len(self.trades_df))),
-            y=self.trades_df['Balance'],
+            x=trades.equity_x,
+            y=trades.equity_y,
             mode='lines',
             name='Balance',
             line=dict(color='#2E86AB', width=2),
@@ -49,23 +68,23 @@ class TickPhysicsDashboard:
             fillcolor='rgba(46, 134, 171, 0.1)'
         ))
         
-        # Mark winning and losing trades
-        wins = self.trades_df[self.trades_df['Profit'] > 0]
-        losses = self.trades_df[self.trades_df['Profit'] < 0]
+        # Mark winning and losing trades among the plotted points
+        wins = trades.equity_profit > 0
+        losses = trades.equity_profit < 0
         
-        if not wins.empty:
+        if wins.any():
             fig.add_trace(go.Scatter(
-                x=wins.index,
-                y=wins['Balance'],
+                x=trades.equity_x[wins],
+                y=trades.equity_y[wins],
                 mode='markers',
                 name='Winning Trades',
                 marker=dict(color='#06D6A0', size=8, symbol='triangle-up')
             ))
             
-        if not losses.empty:
+        if losses.any():
             fig.add_trace(go.Scatter(
-                x=losses.index,
-                y=losses['Balance'],
+                x=trades.equity_x[losses],
+                y=trades.equity_y[losses],
                 mode='markers',
                 name='Losing Trades',
                 marker=dict(color='#EF476F', size=8, symbol='triangle-down')
@@ -84,27 +103,16 @@ class TickPhysicsDashboard:
         
     def create_performance_metrics_cards(self):
         """Create metric cards for key performance indicators"""
-        if self.trades_df.empty:
+        trades = self.trades
+        if trades.empty:
             return html.Div("No trade data available")
             
-        # Calculate metrics
-        total_trades = len(self.trades_df)
-        wins = len(self.trades_df[self.trades_df['Profit'] > 0])
-        losses = len(self.trades_df[self.trades_df['Profit'] < 0])
-        win_rate = (wins / total_trades * 100) if total_trades > 0 else 0
-        
-        total_profit = self.trades_df['Profit'].sum()
-        gross_profit = self.trades_df[self.trades_df['Profit'] > 0]['Profit'].sum()
-        gross_loss = abs(self.trades_df[self.trades_df['Profit'] < 0]['Profit'].sum())
-        profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else 0
-        
-        # Calculate max drawdown
-        if 'Balance' in self.trades_df.columns:
-            cumulative_max = self.trades_df['Balance'].cummax()
-            drawdown = (self.trades_df['Balance'] - cumulative_max) / cumulative_max * 100
-            max_dd = abs(drawdown.min())
-        else:
-            max_dd = 0
+        # Precomputed metrics
+        total_trades = trades.total_trades
+        win_rate = trades.win_rate
+        total_profit = trades.total_profit
+        profit_factor = trades.profit_factor
+        max_dd = trades.max_drawdown
         
         # Create cards
         cards = html.Div([
@@ -135,11 +143,11 @@ class TickPhysicsDashboard:
         
     def create_signal_analysis_chart(self):
         """Create chart showing signal types and trade execution"""
-        if self.signals_df.empty:
+        if self.signals.empty:
             return go.Figure()
             
         # Count signals by type
-        signal_counts = self.signals_df['Signal'].value_counts()
+        signal_counts = self.signals.signal_counts
         
         fig = go.Figure(data=[
             go.Bar(
@@ -164,30 +172,24 @@ class TickPhysicsDashboard:
         
     def create_profit_distribution(self):
         """Create profit distribution histogram"""
-        if self.trades_df.empty:
+        trades = self.trades
+        if trades.empty:
             return go.Figure()
             
         fig = go.Figure()
         
-        # Separate wins and losses
-        wins = self.trades_df[self.trades_df['Profit'] > 0]['Profit']
-        losses = self.trades_df[self.trades_df['Profit'] < 0]['Profit']
-        
-        fig.add_trace(go.Histogram(
-            x=wins,
-            name='Wins',
-            marker_color='#06D6A0',
-            opacity=0.7,
-            nbinsx=20
-        ))
-        
-        fig.add_trace(go.Histogram(
-            x=losses,
-            name='Losses',
-            marker_color='#EF476F',
-            opacity=0.7,
-            nbinsx=20
-        ))
+        # Pre-binned wins and losses
+        for hist, name, color in ((trades.win_hist, 'Wins', '#06D6A0'), (trades.loss_hist, 'Losses', '#EF476F')):
+            if hist is None:
+                continue
+            fig.add_trace(go.Bar(
+                x=hist.centers,
+                y=hist.counts,
+                width=hist.widths,
+                name=name,
+                marker_color=color,
+                opacity=0.7
+            ))
         
         fig.update_layout(
             title='Profit Distribution',
@@ -202,23 +204,13 @@ class TickPhysicsDashboard:
         
     def create_learning_state_timeline(self):
         """Create timeline showing self-learning adaptations"""
-        if self.signals_df.empty:
+        if self.signals.empty:
             return go.Figure()
             
-        # Group signals by time periods and calculate skip rate
+        # Skip rate per time period (10 periods or min 50 signals each)
         # This shows how the EA's filtering behavior changes over time
-        window_size = max(len(self.signals_df) // 10, 50)  # 10 periods or min 50 signals
-        
-        skip_rates = []
-        periods = []
-        
-        for i in range(0, len(self.signals_df), window_size):
-            window = self.signals_df.iloc[i:i+window_size]
-            skips = len(window[window['Signal'] == 'SKIP'])
-            total = len(window)
-            skip_rate = (skips / total * 100) if total > 0 else 0
-            skip_rates.append(skip_rate)
-            periods.append(f"Period {len(periods)+1}")
+        skip_rates = self.signals.skip_rates
+        periods = list(self.signals.skip_periods)
             
         fig = go.Figure()
         
@@ -243,10 +235,9 @@ class TickPhysicsDashboard:
         
         return fig
         
-    def create_comparison_charts(self, baseline_signals: str, baseline_trades: str):
+    def create_comparison_charts(self, baseline_trades: str):
         """Create before/after comparison charts"""
-        baseline_signals_df = pd.read_csv(baseline_signals) if Path(baseline_signals).exists() else pd.DataFrame()
-        baseline_trades_df = pd.read_csv(baseline_trades) if Path(baseline_trades).exists() else pd.DataFrame()
+        baseline = DEFAULT_CACHE.trades(baseline_trades)
         
         # Create subplot with comparison metrics
         fig = make_subplots(
@@ -257,22 +248,9 @@ class TickPhysicsDashboard:
                    [{"type": "bar"}, {"type": "bar"}]]
         )
         
-        # Calculate metrics for both
-        def calc_metrics(trades_df):
-            if trades_df.empty:
-                return 0, 0, 0, 0
-            wins = len(trades_df[trades_df['Profit'] > 0])
-            total = len(trades_df)
-            win_rate = (wins / total * 100) if total > 0 else 0
-            
-            gross_profit = trades_df[trades_df['Profit'] > 0]['Profit'].sum()
-            gross_loss = abs(trades_df[trades_df['Profit'] < 0]['Profit'].sum())
-            pf = (gross_profit / gross_loss) if gross_loss > 0 else 0
-            
-            return win_rate, pf, total, trades_df['Profit'].sum()
-        
-        baseline_wr, baseline_pf, baseline_count, baseline_profit = calc_metrics(baseline_trades_df)
-        optimized_wr, optimized_pf, optimized_count, optimized_profit = calc_metrics(self.trades_df)
+        # Precomputed metrics for both
+        baseline_wr, baseline_pf, baseline_count, baseline_profit = baseline.comparison_metrics()
+        optimized_wr, optimized_pf, optimized_count, optimized_profit = self.trades.comparison_metrics()
         
         # Win Rate
         fig.add_trace(go.Bar(x=['Baseline', 'Optimized'], y=[baseline_wr, optimized_wr],
@@ -300,8 +278,12 @@ class TickPhysicsDashboard:
         return fig
         
     def setup_layout(self):
-        """Setup the dashboard layout"""
-        self.app.layout = html.Div([
+        """Setup the dashboard layout (rebuilt on each page load from the current aggregates)"""
+        self.app.layout = self.serve_layout
+        
+    def serve_layout(self):
+        """Layout for one page load"""
+        return html.Div([
             # Header
             html.Div([
                 html.H1(self.title, style={
@@ -311,30 +293,35 @@ class TickPhysicsDashboard:
                     'font-size': '36px'
                 }),
                 html.P(f"Analysis generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", 
-                       style={'text-align': 'center', 'color': '#666'})
+                       id='generated-at', style={'text-align': 'center', 'color': '#666'})
             ]),
             
+            # Live reload: poll the store version, redraw only when it changed
+            dcc.Store(id='data-version', data=self.store.version),
+            dcc.Interval(id='reload-interval', interval=max(self.reload_interval, 1) * 1000,
+                         disabled=not self.reload_interval),
+            
             # Metrics Cards
-            self.create_performance_metrics_cards(),
+            html.Div(self.create_performance_metrics_cards(), id='metrics-cards'),
             
             # Charts
             html.Div([
                 # Equity Curve
-                dcc.Graph(figure=self.create_equity_curve()),
+                dcc.Graph(id='equity-curve', figure=self.create_equity_curve()),
                 
                 # Row with two charts
                 html.Div([
                     html.Div([
-                        dcc.Graph(figure=self.create_signal_analysis_chart())
+                        dcc.Graph(id='signal-analysis', figure=self.create_signal_analysis_chart())
                     ], style={'width': '48%', 'display': 'inline-block'}),
                     
                     html.Div([
-                        dcc.Graph(figure=self.create_profit_distribution())
+                        dcc.Graph(id='profit-distribution', figure=self.create_profit_distribution())
                     ], style={'width': '48%', 'display': 'inline-block', 'float': 'right'}),
                 ]),
                 
                 # Learning Timeline
-                dcc.Graph(figure=self.create_learning_state_timeline()),
+                dcc.Graph(id='learning-timeline', figure=self.create_learning_state_timeline()),
                 
             ], style={'padding': '20px'}),
             
@@ -351,8 +338,36 @@ class TickPhysicsDashboard:
             'padding': '20px'
         })
         
+    def setup_callbacks(self):
+        """Redraw figures when the background reload produced a new data version"""
+        @self.app.callback(
+            Output('metrics-cards', 'children'),
+            Output('equity-curve', 'figure'),
+            Output('signal-analysis', 'figure'),
+            Output('profit-distribution', 'figure'),
+            Output('learning-timeline', 'figure'),
+            Output('generated-at', 'children'),
+            Output('data-version', 'data'),
+            Input('reload-interval', 'n_intervals'),
+            State('data-version', 'data'),
+        )
+        def refresh_figures(_, shown_version):
+            if shown_version == self.store.version:
+                raise PreventUpdate
+            return (
+                self.create_performance_metrics_cards(),
+                self.create_equity_curve(),
+                self.create_signal_analysis_chart(),
+                self.create_profit_distribution(),
+                self.create_learning_state_timeline(),
+                f"Analysis updated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+                self.store.version,
+            )
+        
     def run(self, debug=True, port=8050):
         """Run the dashboard server"""
+        if self.reload_interval:
+            self.store.start_background_reload(self.reload_interval)
         print(f"\n🚀 Starting TickPhysics Dashboard...")
         print(f"📊 Dashboard URL: http://localhost:{port}")
         print(f"💡 Press Ctrl+C to stop the server\n")
@@ -366,10 +381,12 @@ def main():
     parser.add_argument('trades_file', help='Path to trades CSV file')
     parser.add_argument('--port', type=int, default=8050, help='Dashboard port (default: 8050)')
     parser.add_argument('--title', default='TickPhysics Backtest Analysis', help='Dashboard title')
+    parser.add_argument('--reload-interval', type=float, default=RELOAD_INTERVAL,
+                        help=f'Seconds between checks for changed CSVs, 0 to disable (default: {RELOAD_INTERVAL:g})')
     
     args = parser.parse_args()
     
-    dashboard = TickPhysicsDashboard(args.signals_file, args.trades_file, args.title)
+    dashboard = TickPhysicsDashboard(args.signals_file, args.trades_file, args.title, args.reload_interval)
     dashboard.run(port=args.port)
 
 
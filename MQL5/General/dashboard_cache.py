@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Dashboard Aggregate Cache
+=========================
+TickPhysicsDashboard used to keep both CSVs as DataFrames and rebuild every
+figure from them, sending one point per trade (plus one marker per win/loss
+and the raw profit list for client-side histograms) to the browser. With live
+histories of 100k trades that is several MB of JSON per page load.
+
+Here each CSV is reduced once to the handful of arrays the figures actually
+draw:
+
+  TradeAggregates   KPI card values, an LTTB-downsampled equity curve with its
+                    win/loss markers, and pre-binned profit histograms
+  SignalAggregates  signal counts and the windowed skip-rate timeline
+
+Aggregates are memoized per file content hash (sha256, recomputed only when
+the file's size/mtime change) in a small LRU, so baseline files used for
+comparisons and a live file that is re-read stay cheap. AggregateStore keeps
+the current signals/trades aggregates for the dashboard and can poll the CSVs
+on a background thread, swapping in new aggregates when a file changes.
+
+Usage:
+    from dashboard_cache import AggregateStore
+
+    store = AggregateStore(signals_csv, trades_csv)
+    store.start_background_reload(interval=5.0)
+    store.trades.equity_x, store.trades.equity_y, store.version
+"""
+from __future__ import annotations
+import hashlib, threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from ea_csv_schema import read_ea_csv
+
+EQUITY_POINTS = 2000        # max points sent for the equity curve
+HIST_BINS = 20
+CACHE_SIZE = 8              # aggregates kept in the LRU
+RELOAD_INTERVAL = 5.0       # seconds between file checks
+_HASH_CHUNK = 1 << 20
+
+
+# ----------------------------- Downsampling -------------------------------- #
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Indices of the points kept by Largest-Triangle-Three-Buckets downsampling.
+
+    First and last points are always kept; every bucket in between contributes
+    the point forming the largest triangle with the previously kept point and
+    the average of the next bucket, so peaks and drawdowns survive.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+# ------------------------------ Aggregates --------------------------------- #
+
+@dataclass
+class Histogram:
+    """Pre-binned counts; drawn as bars instead of shipping raw values."""
+    counts: np.ndarray
+    edges: np.ndarray
+
+    @property
+    def centers(self) -> np.ndarray:
+        return (self.edges[:-1] + self.edges[1:]) / 2
+
+    @property
+    def widths(self) -> np.ndarray:
+        return np.diff(self.edges)
+
+
+@dataclass
+class TradeAggregates:
+    """Everything the dashboard draws from a Trades CSV."""
+    total_trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_rate: float = 0.0
+    total_profit: float = 0.0
+    profit_factor: float = 0.0
+    max_drawdown: float = 0.0
+    has_balance: bool = False
+    equity_x: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    equity_y: np.ndarray = field(default_factory=lambda: np.empty(0))
+    equity_profit: np.ndarray = field(default_factory=lambda: np.empty(0))
+    win_hist: Optional[Histogram] = None
+    loss_hist: Optional[Histogram] = None
+
+    @property
+    def empty(self) -> bool:
+        return self.total_trades == 0
+
+    def comparison_metrics(self) -> Tuple[float, float, int, float]:
+        """(win rate, profit factor, trade count, total profit) for before/after charts."""
+        return self.win_rate, self.profit_factor, self.total_trades, self.total_profit
+
+
+@dataclass
+class SignalAggregates:
+    """Everything the dashboard draws from a Signals CSV."""
+    signal_counts: pd.Series = field(default_factory=lambda: pd.Series(dtype='int64'))
+    skip_periods: Tuple[str, ...] = ()
+    skip_rates: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def empty(self) -> bool:
+        return self.signal_counts.empty
+
+
+def _histogram(values: np.ndarray) -> Optional[Histogram]:
+    if values.size == 0:
+        return None
+    counts, edges = np.histogram(values, bins=HIST_BINS)
+    return Histogram(counts, edges)
+
+
+def build_trade_aggregates(trades_df: pd.DataFrame, max_points: int = EQUITY_POINTS) -> TradeAggregates:
+    if trades_df.empty or 'Profit' not in trades_df.columns:
+        return TradeAggregates()
+
+    profit = pd.to_numeric(trades_df['Profit'], errors='coerce').to_numpy(dtype=np.float64)
+    win_mask, loss_mask = profit > 0, profit < 0
+    gross_profit = profit[win_mask].sum()
+    gross_loss = abs(profit[loss_mask].sum())
+    closed = int(np.isfinite(profit).sum())  # trades with a parsable profit
+    agg = TradeAggregates(
+        total_trades=len(profit),
+        wins=int(win_mask.sum()),
+        losses=int(loss_mask.sum()),
+        win_rate=float(win_mask.sum() / closed * 100) if closed else 0.0,
+        total_profit=float(np.nansum(profit)),
+        profit_factor=float(gross_profit / gross_loss) if gross_loss > 0 else 0.0,
+        win_hist=_histogram(profit[win_mask]),
+        loss_hist=_histogram(profit[loss_mask]),
+    )
+
+    if 'Balance' in trades_df.columns:
+        balance = pd.to_numeric(trades_df['Balance'], errors='coerce').to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            peak = np.fmax.accumulate(balance)
+            drawdown = (balance - peak) / peak * 100
+        agg.has_balance = True
+        agg.max_drawdown = float(abs(np.nanmin(drawdown))) if np.isfinite(drawdown).any() else 0.0
+
+        positions = np.flatnonzero(np.isfinite(balance))
+        kept = positions[lttb_indices(positions, balance[positions], max_points)]
+        agg.equity_x = kept
+        agg.equity_y = balance[kept]
+        agg.equity_profit = profit[kept]
+    return agg
+
+
+def build_signal_aggregates(signals_df: pd.DataFrame) -> SignalAggregates:
+    if signals_df.empty or 'Signal' not in signals_df.columns:
+        return SignalAggregates()
+
+    signal = signals_df['Signal']
+    # Windows of a tenth of the history (at least 50 signals) for the skip-rate timeline
+    window_size = max(len(signals_df) // 10, 50)
+    starts = np.arange(0, len(signal), window_size)
+    is_skip = (signal == 'SKIP').to_numpy(dtype=np.int64, na_value=0)
+    skips = np.add.reduceat(is_skip, starts)
+    totals = np.diff(np.append(starts, len(signal)))
+    counts = signal.value_counts()
+    return SignalAggregates(
+        signal_counts=counts[counts > 0],  # categorical columns list unused labels too
+        skip_periods=tuple(f"Period {i + 1}" for i in range(len(starts))),
+        skip_rates=skips / totals * 100,
+    )
+
+
+# --------------------------------- Cache ----------------------------------- #
+
+class AggregateCache:
+    """LRU of aggregates keyed by (kind, file content hash). Thread-safe."""
+
+    BUILDERS: Dict[str, Callable[[pd.DataFrame], object]] = {
+        'trades': build_trade_aggregates,
+        'signals': build_signal_aggregates,
+    }
+
+    def __init__(self, maxsize: int = CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: 'OrderedDict[Tuple[str, str], object]' = OrderedDict()
+        self._digests: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def file_digest(self, path: Path) -> str:
+        """sha256 of the file, recomputed only when its size or mtime changed."""
+        path = Path(path).resolve()
+        stat = path.stat()
+        signature = (stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._digests.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        # Hash outside the lock, like get() builds aggregates outside it
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+        with self._lock:
+            self._digests[path] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+    def get(self, path, kind: str):
+        """Aggregates for a CSV; empty aggregates when the file does not exist."""
+        path = Path(path)
+        if not path.exists():
+            return self.BUILDERS[kind](pd.DataFrame())
+        key = (kind, self.file_digest(path))
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+        # Build outside the lock: a slow CSV must not block readers of other entries
+        value = self.BUILDERS[kind](read_ea_csv(path))
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def trades(self, path) -> TradeAggregates:
+        return self.get(path, 'trades')
+
+    def signals(self, path) -> SignalAggregates:
+        return self.get(path, 'signals')
+
+
+# Shared by every dashboard in the process
+DEFAULT_CACHE = AggregateCache()
+
+
+class AggregateStore:
+    """Current signals/trades aggregates of one dashboard, reloadable in the background."""
+
+    def __init__(self, signals_file, trades_file, cache: AggregateCache = DEFAULT_CACHE):
+        self.signals_file = Path(signals_file)
+        self.trades_file = Path(trades_file)
+        self.cache = cache
+        self.version = 0
+        self._stamps: Tuple = ()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.refresh()
+
+    def _file_stamps(self) -> Tuple:
+        stamps = []
+        for path in (self.signals_file, self.trades_file):
+            try:
+                stat = path.stat()
+                stamps.append((stat.st_size, stat.st_mtime_ns))
+            except FileNotFoundError:
+                stamps.append(None)
+        return tuple(stamps)
+
+    def refresh(self) -> bool:
+        """Reload aggregates if either CSV changed since the last load; True when reloaded."""
+        stamps = self._file_stamps()
+        if stamps == self._stamps:
+            return False
+        signals = self.cache.signals(self.signals_file)
+        trades = self.cache.trades(self.trades_file)
+        # Swap both references together; readers always see a consistent pair
+        self.signals, self.trades = signals, trades
+        self._stamps = stamps
+        self.version += 1
+        return True
+
+    def start_background_reload(self, interval: float = RELOAD_INTERVAL):
+        """Poll the CSVs on a daemon thread and rebuild aggregates when they change."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def poll():
+            while not self._stop.wait(interval):
+                try:
+                    if self.refresh():
+                        print(f"🔄 Reloaded dashboard data (version {self.version})")
+                except Exception as e:  # partially written CSV: retry next tick
+                    print(f"⚠️  Dashboard reload failed: {e}")
+
+        self._thread = threading.Thread(target=poll, name='dashboard-reload', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
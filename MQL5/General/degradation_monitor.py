@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Backtest vs Live Degradation Monitor
+====================================
+Continuously evaluates analytics_config.VALIDATION_THRESHOLDS for live trading:
+each closed live trade updates rolling metrics (win rate, average pips, profit
+factor) over sliding windows of the last N trades and re-rates the symbol
+green / yellow / red (ALERT_LEVELS) against its backtest baseline.
+
+Every window keeps running sums (wins, pips, gross profit, gross loss) that are
+adjusted for the trade entering and the trade leaving the window, so a new
+trade costs O(1) per window regardless of history length, and symbols are
+independent so any number can be monitored from one process.
+
+Backtest baselines are computed once per backtest Trades CSV and cached in
+`.cache/degradation_baselines.json`, keyed by file hash.
+
+Status and metrics are exported as Prometheus gauges (prometheus_client,
+optional) for the rules in infra/prometheus/alerts.yml:
+
+  tp_live_degradation_status{symbol,window}   0 green, 1 yellow, 2 red, -1 warming up
+  tp_live_win_rate / tp_live_avg_pips / tp_live_profit_factor{symbol,window}
+  tp_backtest_win_rate / tp_backtest_avg_pips / tp_backtest_profit_factor{symbol}
+
+Usage:
+    python degradation_monitor.py --baseline NAS100=path/to/backtest_trades.csv \\
+        [--root LIVE_FILES_DIR] [--windows 20 50 100] [--port 9109]
+
+    monitor = DegradationMonitor(windows=(20, 50))
+    monitor.set_baseline('NAS100', baseline_from_csv(backtest_csv))
+    monitor.add_trade('NAS100', profit=12.5, pips=8.0)   # -> {20: 'green', 50: 'warming'}
+"""
+from __future__ import annotations
+import argparse, hashlib, json, math, sys, threading
+from collections import deque
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:  # optional: Prometheus export
+    from prometheus_client import Gauge, start_http_server
+except ImportError:
+    Gauge = None
+    start_http_server = None
+
+DEFAULT_WINDOWS = (20, 50, 100)
+PIPS_COLUMNS = ('Pips', 'ProfitPips', 'Profit_Pips')
+CACHE_FILE = Path(__file__).resolve().parent / '.cache' / 'degradation_baselines.json'
+STATUS_CODES = {'warming': -1, 'green': 0, 'yellow': 1, 'red': 2}
+
+# Same values as analytics_config.VALIDATION_THRESHOLDS (importing the config
+# module prints a banner and creates output folders, so the CLI loads it lazily)
+DEFAULT_THRESHOLDS = {
+    'win_rate_tolerance': 0.05,
+    'avg_pips_tolerance': 0.15,
+    'profit_factor_tolerance': 0.20,
+    'max_acceptable_degradation': 0.25,
+}
+
+
+# ------------------------------- Baselines --------------------------------- #
+
+@dataclass
+class Baseline:
+    """Backtest reference metrics of one symbol."""
+    win_rate: float             # fraction 0-1
+    avg_pips: float             # NaN when the CSV has no pips column
+    profit_factor: float
+    trades: int
+
+
+def _pips_column(header: Iterable[str]) -> Optional[str]:
+    header = set(header)
+    return next((c for c in PIPS_COLUMNS if c in header), None)
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def baseline_from_csv(path, cache_file: Optional[Path] = CACHE_FILE) -> Baseline:
+    """Backtest baseline of an EA Trades CSV (closed trades only), cached by file hash."""
+    from ea_csv_schema import read_ea_csv, read_header
+
+    path = Path(path)
+    key = _file_sha256(path)
+    cache = {}
+    if cache_file is not None and Path(cache_file).exists():
+        cache = json.loads(Path(cache_file).read_text())
+        if key in cache:
+            return Baseline(**cache[key])
+
+    pips_col = _pips_column(read_header(path))
+    df = read_ea_csv(path, usecols=['Profit'] + ([pips_col] if pips_col else []), exit_rows_only=True)
+    profit = df['Profit'].astype('float64')
+    gross_loss = -profit[profit < 0].sum()
+    baseline = Baseline(
+        win_rate=float((profit > 0).mean()) if len(profit) else math.nan,
+        avg_pips=float(df[pips_col].astype('float64').mean()) if pips_col else math.nan,
+        profit_factor=float(profit[profit > 0].sum() / gross_loss) if gross_loss > 0 else math.inf,
+        trades=len(profit),
+    )
+    if cache_file is not None:
+        cache[key] = asdict(baseline)
+        Path(cache_file).parent.mkdir(parents=True, exist_ok=True)
+        Path(cache_file).write_text(json.dumps(cache, indent=2))
+    return baseline
+
+
+# ---------------------------- Rolling Windows ------------------------------ #
+
+class RollingWindow:
+    """Win rate, average pips and profit factor of the last `size` trades, updated in O(1)."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.trades: deque = deque()
+        self.wins = 0
+        self.pips_sum = 0.0
+        self.pips_count = 0
+        self.gross_profit = 0.0
+        self.gross_loss = 0.0
+
+    def _apply(self, profit: float, pips: float, sign: int):
+        self.wins += sign * (profit > 0)
+        if profit > 0:
+            self.gross_profit += sign * profit
+        elif profit < 0:
+            self.gross_loss -= sign * profit
+        if not math.isnan(pips):
+            self.pips_sum += sign * pips
+            self.pips_count += sign
+
+    def add(self, profit: float, pips: float = math.nan):
+        self.trades.append((profit, pips))
+        self._apply(profit, pips, +1)
+        if len(self.trades) > self.size:
+            self._apply(*self.trades.popleft(), -1)
+
+    @property
+    def full(self) -> bool:
+        return len(self.trades) >= self.size
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / len(self.trades) if self.trades else math.nan
+
+    @property
+    def avg_pips(self) -> float:
+        return self.pips_sum / self.pips_count if self.pips_count else math.nan
+
+    @property
+    def profit_factor(self) -> float:
+        if self.gross_loss > 0:
+            return self.gross_profit / self.gross_loss
+        return math.inf if self.gross_profit > 0 else 0.0
+
+
+def _relative_drop(live: float, baseline: float) -> float:
+    """Fractional degradation of live vs baseline (0 when live is better or undefined)."""
+    if math.isnan(live) or math.isnan(baseline) or baseline <= 0:
+        return 0.0
+    if math.isinf(baseline):
+        return 0.0 if math.isinf(live) else 1.0 if live < 1 else 0.0
+    return max(0.0, (baseline - live) / baseline)
+
+
+def rate_window(window: RollingWindow, baseline: Baseline, thresholds: Dict[str, float]) -> str:
+    """green / yellow / red of a full window against the baseline, per VALIDATION_THRESHOLDS."""
+    if not window.full:
+        return 'warming'
+    win_rate_gap = max(0.0, baseline.win_rate - window.win_rate) if not math.isnan(baseline.win_rate) else 0.0
+    drops = {
+        'win_rate': _relative_drop(window.win_rate, baseline.win_rate),
+        'avg_pips': _relative_drop(window.avg_pips, baseline.avg_pips),
+        'profit_factor': _relative_drop(window.profit_factor, baseline.profit_factor),
+    }
+    if max(drops.values()) > thresholds['max_acceptable_degradation']:
+        return 'red'
+    if (win_rate_gap > thresholds['win_rate_tolerance']
+            or drops['avg_pips'] > thresholds['avg_pips_tolerance']
+            or drops['profit_factor'] > thresholds['profit_factor_tolerance']):
+        return 'yellow'
+    return 'green'
+
+
+# -------------------------------- Monitor ---------------------------------- #
+
+class _Gauges:
+    """Prometheus gauges shared by all monitored symbols."""
+
+    def __init__(self, registry=None):
+        kwargs = {'registry': registry} if registry is not None else {}
+        window_labels = ['symbol', 'window']
+        self.status = Gauge('tp_live_degradation_status',
+                            'Live vs backtest status: -1 warming up, 0 green, 1 yellow, 2 red',
+                            window_labels, **kwargs)
+        self.win_rate = Gauge('tp_live_win_rate', 'Rolling live win rate (0-1)', window_labels, **kwargs)
+        self.avg_pips = Gauge('tp_live_avg_pips', 'Rolling live average pips per trade', window_labels, **kwargs)
+        self.profit_factor = Gauge('tp_live_profit_factor', 'Rolling live profit factor', window_labels, **kwargs)
+        self.trades = Gauge('tp_live_window_trades', 'Trades currently in the rolling window', window_labels, **kwargs)
+        self.baseline_win_rate = Gauge('tp_backtest_win_rate', 'Backtest win rate (0-1)', ['symbol'], **kwargs)
+        self.baseline_avg_pips = Gauge('tp_backtest_avg_pips', 'Backtest average pips', ['symbol'], **kwargs)
+        self.baseline_profit_factor = Gauge('tp_backtest_profit_factor', 'Backtest profit factor', ['symbol'], **kwargs)
+
+
+class DegradationMonitor:
+    """Rolling live metrics and status per symbol and window. Thread-safe."""
+
+    def __init__(self, windows: Sequence[int] = DEFAULT_WINDOWS, thresholds: Optional[Dict[str, float]] = None,
+                 export: bool = True, registry=None):
+        self.windows = tuple(sorted(windows))
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.baselines: Dict[str, Baseline] = {}
+        self.rolling: Dict[str, Dict[int, RollingWindow]] = {}
+        self.status: Dict[str, Dict[int, str]] = {}
+        self._lock = threading.Lock()
+        self.gauges = _Gauges(registry) if export and Gauge is not None else None
+
+    def set_baseline(self, symbol: str, baseline: Baseline):
+        with self._lock:
+            self.baselines[symbol] = baseline
+            self.rolling.setdefault(symbol, {w: RollingWindow(w) for w in self.windows})
+            self.status.setdefault(symbol, {w: 'warming' for w in self.windows})
+        if self.gauges:
+            self.gauges.baseline_win_rate.labels(symbol).set(baseline.win_rate)
+            self.gauges.baseline_avg_pips.labels(symbol).set(baseline.avg_pips)
+            self.gauges.baseline_profit_factor.labels(symbol).set(baseline.profit_factor)
+
+    def add_trade(self, symbol: str, profit: float, pips: float = math.nan) -> Dict[int, str]:
+        """Feed one closed live trade; returns the new status per window."""
+        with self._lock:
+            baseline = self.baselines.get(symbol)
+            if baseline is None:
+                return {}
+            statuses = self.status[symbol]
+            for size, window in self.rolling[symbol].items():
+                window.add(profit, pips)
+                statuses[size] = rate_window(window, baseline, self.thresholds)
+                if self.gauges:
+                    labels = (symbol, str(size))
+                    self.gauges.status.labels(*labels).set(STATUS_CODES[statuses[size]])
+                    self.gauges.win_rate.labels(*labels).set(window.win_rate)
+                    self.gauges.avg_pips.labels(*labels).set(window.avg_pips)
+                    self.gauges.profit_factor.labels(*labels).set(window.profit_factor)
+                    self.gauges.trades.labels(*labels).set(len(window.trades))
+            return dict(statuses)
+
+    def overall_status(self, symbol: str) -> str:
+        """Worst status over the windows that are full."""
+        rated = [s for s in self.status.get(symbol, {}).values() if s != 'warming']
+        return max(rated, key=STATUS_CODES.get) if rated else 'warming'
+
+    def on_batch(self, batch):
+        """live_csv_watcher subscriber: feed closed trades of a RowBatch."""
+        if batch.kind != 'trades' or batch.symbol not in self.baselines:
+            return
+        pips_col = _pips_column(batch.header)
+        before = self.overall_status(batch.symbol)
+        for row in batch.exit_rows():
+            try:
+                profit = float(row.get('Profit') or 'nan')
+            except ValueError:
+                continue
+            if math.isnan(profit):
+                continue
+            try:
+                pips = float(row.get(pips_col) or 'nan') if pips_col else math.nan
+            except ValueError:
+                pips = math.nan
+            self.add_trade(batch.symbol, profit, pips)
+        after = self.overall_status(batch.symbol)
+        if after != before:
+            print(f"{'🟢' if after == 'green' else '🟡' if after == 'yellow' else '🔴' if after == 'red' else '⚪'} "
+                  f"{batch.symbol}: {before} → {after}")
+
+
+def _parse_baselines(specs: List[str]) -> List[Tuple[str, Path]]:
+    pairs = []
+    for spec in specs:
+        symbol, _, path = spec.partition('=')
+        if not path:
+            raise SystemExit(f"--baseline expects SYMBOL=path, got {spec!r}")
+        pairs.append((symbol, Path(path)))
+    return pairs
+
+
+def main():
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    parser = argparse.ArgumentParser(description='Monitor live vs backtest degradation and export Prometheus gauges')
+    parser.add_argument('--baseline', action='append', required=True, metavar='SYMBOL=CSV',
+                        help='Backtest Trades CSV per symbol (repeatable)')
+    parser.add_argument('--root', help="Live MQL5/Files directory (default: analytics_config.PATHS['live']['root'])")
+    parser.add_argument('--windows', type=int, nargs='+', default=list(DEFAULT_WINDOWS), help='Rolling window sizes')
+    parser.add_argument('--port', type=int, default=9109, help='Prometheus metrics port (0 disables)')
+    parser.add_argument('--state', help='Watcher offset file (resume without replaying history)')
+    args = parser.parse_args()
+
+    import analytics_config
+    from live_csv_watcher import LiveFilesWatcher
+
+    monitor = DegradationMonitor(args.windows, analytics_config.VALIDATION_THRESHOLDS)
+    for symbol, path in _parse_baselines(args.baseline):
+        baseline = baseline_from_csv(path)
+        monitor.set_baseline(symbol, baseline)
+        print(f"📊 {symbol} baseline: WR {baseline.win_rate:.1%}, PF {baseline.profit_factor:.2f}, "
+              f"avg pips {baseline.avg_pips:.1f} ({baseline.trades} trades)")
+
+    if args.port and start_http_server is not None:
+        start_http_server(args.port)
+        print(f"📈 Prometheus metrics on :{args.port}/metrics")
+    elif args.port:
+        print("⚠️  prometheus_client not installed; gauges not exported")
+
+    root = Path(args.root) if args.root else Path(analytics_config.PATHS['live']['root'])
+    watcher = LiveFilesWatcher(root, state_path=args.state)
+    watcher.subscribe(monitor.on_batch, kinds={'trades'})
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+EA CSV Schema Registry & Typed Reader
+=====================================
+pd.read_csv() with default inference loads every TickPhysics Trades/Signals
+column as float64 or object. Zones, regimes, exit reasons, sessions and time
+segments repeat a handful of labels across thousands of rows, and most physics
+metrics only carry two decimals, so the default frames are several times larger
+than they need to be and every groupby on a text column hashes Python strings.
+
+This module describes each EA CSV layout once and loads it with explicit dtypes:
+
+  category  low-cardinality labels (Entry_Zone, ExitReason, TradingSession, ...)
+  int16     hours, weekdays, bar counts
+  int64     Ticket
+  boolean   TRUE/FALSE flags (IsWeekend, ZoneTransitioned, ...)
+  float64   prices and account money (sums must stay exact to the cent)
+  str       timestamps (optionally parsed to datetime64)
+  float32   every other numeric column (physics metrics, pips, percentages)
+
+Unregistered columns are left to pandas inference (text stays text) and only
+their inferred float64 values are downcast to float32.
+
+Registered layouts (detected from the header, not the EAVersion field, which
+older builds filled with unrelated labels such as '4.13_PRODUCTION'):
+
+  trades  3.x    single row per trade, CamelCase (EntryZone, RunUp_Pips)
+  trades  4.1.x  ENTRY/EXIT dual-row (TP_CSV_Logger v8), CamelCase (EntryZone)
+  trades  5.x    ENTRY/EXIT dual-row, underscore prefixes (Entry_Zone, Exit_Zone)
+  signals 3.x    physics snapshot per signal
+  signals 5.x    adds slope columns (SpeedSlope, ...)
+
+Usage:
+    from ea_csv_schema import read_ea_csv
+
+    trades = read_ea_csv(path, usecols=['Profit', 'Entry_Zone', 'ExitReason'], exit_rows_only=True)
+
+    python ea_csv_schema.py <csv> [<csv> ...]      # memory/time vs default read_csv
+"""
+from __future__ import annotations
+import csv, sys, time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+TIME_FORMAT = '%Y.%m.%d %H:%M'
+
+# ----------------------------- Column Dtypes ------------------------------- #
+CATEGORY_COLUMNS: FrozenSet[str] = frozenset({
+    'EAName', 'EAVersion', 'RowType', 'Symbol', 'Type', 'SignalType',
+    'Zone', 'Regime', 'PhysicsPass', 'RejectReason',
+    'EntryZone', 'EntryRegime', 'ExitZone', 'ExitRegime',
+    'Entry_Zone', 'Entry_Regime', 'Exit_Zone', 'Exit_Regime',
+    'ExitReason', 'ExitQualityClass', 'TradingSession',
+    'TimeSegment15M', 'TimeSegment30M', 'TimeSegment1H',
+    'TimeSegment2H', 'TimeSegment3H', 'TimeSegment4H',
+    'SignalRejectReason', 'ValidationFlags',
+})
+INT16_COLUMNS: FrozenSet[str] = frozenset({
+    'Signal', 'Hour', 'DayOfWeek', 'EntryHour', 'EntryDayOfWeek', 'ExitHour', 'ExitDayOfWeek',
+    'HoldTimeBars', 'MFE_TimeBars', 'MAE_TimeBars', 'RunUp_TimeBars', 'RunDown_TimeBars',
+    'OpenPositions',
+})
+INT64_COLUMNS: FrozenSet[str] = frozenset({'Ticket', 'HoldTimeMinutes'})
+BOOL_COLUMNS: FrozenSet[str] = frozenset({'IsWeekend', 'IsPreMarket', 'ZoneTransitioned', 'SignalPhysicsPass'})
+FLOAT64_COLUMNS: FrozenSet[str] = frozenset({
+    'Price', 'OpenPrice', 'ClosePrice', 'SL', 'TP', 'MFE', 'MAE', 'RunUp_Price', 'RunDown_Price',
+    'Profit', 'Commission', 'Balance', 'Equity', 'BalanceAfter', 'EquityAfter',
+})
+TIMESTAMP_COLUMNS: FrozenSet[str] = frozenset({'Timestamp', 'OpenTime', 'CloseTime', 'SignalTimestamp'})
+DEFAULT_NUMERIC = 'float32'
+
+
+@dataclass(frozen=True)
+class EACsvSchema:
+    """One EA CSV layout: how to recognise it and how to type its columns."""
+    kind: str                          # 'trades' | 'signals'
+    version: str                       # '3.x', '4.1.x', '5.x'
+    required: FrozenSet[str]           # header columns that identify the layout
+    absent: FrozenSet[str] = frozenset()
+    dual_row: bool = False             # ENTRY/EXIT rows per trade (RowType)
+
+    @property
+    def key(self) -> str:
+        return f"{self.kind}-{self.version}"
+
+    def matches(self, header: Iterable[str]) -> bool:
+        cols = set(header)
+        return self.required <= cols and not (self.absent & cols)
+
+    def dtype_for(self, column: str) -> Any:
+        """Registered dtype of `column`, None when pandas should infer it."""
+        if column in CATEGORY_COLUMNS:
+            return 'category'
+        if column in INT16_COLUMNS:
+            return 'int16'
+        if column in INT64_COLUMNS:
+            return 'int64'
+        if column in BOOL_COLUMNS:
+            return 'boolean'
+        if column in FLOAT64_COLUMNS:
+            return 'float64'
+        if column in TIMESTAMP_COLUMNS:
+            return 'str'
+        return None
+
+    def dtypes(self, columns: Iterable[str]) -> Dict[str, Any]:
+        """Registered dtypes of `columns`; unregistered ones are omitted."""
+        typed = {c: self.dtype_for(c) for c in columns}
+        return {c: t for c, t in typed.items() if t is not None}
+
+
+# Most specific layouts first; detect_schema returns the first match
+SCHEMA_REGISTRY: List[EACsvSchema] = [
+    EACsvSchema('trades', '5.x', frozenset({'RowType', 'Ticket', 'Entry_Zone', 'ExitReason'}), dual_row=True),
+    EACsvSchema('trades', '4.1.x', frozenset({'RowType', 'Ticket', 'EntryZone', 'ExitReason'}), dual_row=True),
+    EACsvSchema('trades', '3.x', frozenset({'Ticket', 'EntryZone', 'ExitReason'}), absent=frozenset({'RowType'})),
+    EACsvSchema('signals', '5.x', frozenset({'Signal', 'SignalType', 'Zone', 'SpeedSlope'})),
+    EACsvSchema('signals', '3.x', frozenset({'Signal', 'SignalType', 'Zone'}), absent=frozenset({'SpeedSlope'})),
+]
+
+
+def get_schema(kind: str, version: str) -> EACsvSchema:
+    for schema in SCHEMA_REGISTRY:
+        if schema.kind == kind and schema.version == version:
+            return schema
+    raise KeyError(f'no EA CSV schema registered for {kind} {version}')
+
+
+def read_header(path: Path) -> List[str]:
+    with Path(path).open('r', encoding='utf-8-sig', newline='') as f:
+        return [h.strip() for h in next(csv.reader(f), [])]
+
+
+def detect_schema(header: Sequence[str]) -> Optional[EACsvSchema]:
+    for schema in SCHEMA_REGISTRY:
+        if schema.matches(header):
+            return schema
+    return None
+
+
+# ----------------------------- Typed Reader -------------------------------- #
+
+def _lenient_read(path: Path, header: List[str], columns: List[str], dtypes: Dict[str, Any]) -> pd.DataFrame:
+    """Fallback when a column does not fit its registered dtype (blank ints, text in a numeric field)."""
+    text = {c: t for c, t in dtypes.items() if t in ('category', 'str')}
+    df = pd.read_csv(path, names=header, header=0, usecols=columns, dtype=text, encoding='utf-8-sig',
+                     skipinitialspace=True)
+    for col, dtype in dtypes.items():
+        if col in text:
+            continue
+        if dtype == 'boolean':
+            df[col] = df[col].map({'TRUE': True, 'FALSE': False, True: True, False: False}).astype('boolean')
+            continue
+        numeric = pd.to_numeric(df[col], errors='coerce')
+        if numeric.notna().sum() < df[col].notna().sum():
+            df[col] = df[col].astype('category')  # text in a registered numeric column
+        elif dtype == 'int16':
+            df[col] = numeric.astype('Int16')
+        elif dtype == 'int64':
+            df[col] = numeric.astype('Int64')
+        else:
+            df[col] = numeric.astype(dtype)
+    return df
+
+
+def read_ea_csv(path, usecols: Optional[Sequence[str]] = None, schema: Optional[EACsvSchema] = None,
+                exit_rows_only: bool = False, parse_dates: bool = False) -> pd.DataFrame:
+    """
+    Load an EA Trades/Signals CSV with the registered dtypes.
+
+    `usecols` limits parsing to those columns (names absent from the file are
+    ignored). `exit_rows_only` keeps the EXIT row of dual-row trade layouts.
+    Unknown layouts fall back to name-based dtypes. Columns are named by the
+    stripped header (read_header).
+    """
+    path = Path(path)
+    header = read_header(path)
+    schema = schema or detect_schema(header) or EACsvSchema('unknown', 'unknown', frozenset())
+
+    wanted = list(header) if usecols is None else [c for c in usecols if c in header]
+    filter_rows = exit_rows_only and schema.dual_row and 'RowType' in header
+    columns = wanted + (['RowType'] if filter_rows and 'RowType' not in wanted else [])
+    dtypes = schema.dtypes(columns)
+
+    try:
+        df = pd.read_csv(path, names=header, header=0, usecols=columns, dtype=dtypes, encoding='utf-8-sig',
+                         true_values=['TRUE'], false_values=['FALSE'], skipinitialspace=True)
+    except (ValueError, TypeError):
+        df = _lenient_read(path, header, columns, dtypes)
+    inferred = [c for c in df.columns if c not in dtypes and df[c].dtype == 'float64']
+    if inferred:
+        df[inferred] = df[inferred].astype(DEFAULT_NUMERIC)
+
+    if filter_rows:
+        df = df[df['RowType'] == 'EXIT'].reset_index(drop=True)
+        if 'RowType' not in wanted:
+            df = df.drop(columns='RowType')
+    if parse_dates:
+        for col in TIMESTAMP_COLUMNS.intersection(df.columns):
+            df[col] = pd.to_datetime(df[col], format=TIME_FORMAT, errors='coerce')
+    df.attrs['ea_schema'] = schema.key
+    return df
+
+
+def main():
+    for arg in sys.argv[1:]:
+        path = Path(arg)
+        schema = detect_schema(read_header(path))
+        t0 = time.perf_counter()
+        plain = pd.read_csv(path)
+        t_plain = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        typed = read_ea_csv(path, schema=schema)
+        t_typed = time.perf_counter() - t0
+        plain_mb = plain.memory_usage(deep=True).sum() / 1e6
+        typed_mb = typed.memory_usage(deep=True).sum() / 1e6
+        print(f"📄 {path.name} [{schema.key if schema else 'unknown layout'}]")
+        print(f"   default read_csv: {plain_mb:7.2f} MB in {t_plain:.3f}s")
+        print(f"   typed read:       {typed_mb:7.2f} MB in {t_typed:.3f}s ({plain_mb / max(typed_mb, 1e-9):.1f}x smaller)")
+
+
+if __name__ == '__main__':
+    main()
@@ -55,6 +55,14 @@ from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any, List
 
+from trade_records import TradeTable
+
+# Shared stage timers / Prometheus export (analytics/pipeline_metrics.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analytics'))
+from pipeline_metrics import PipelineMetrics
+from cli_profiling import run_cli
+import tracing
+
 HEADER_EXPECTED = ['Time','Deal','Symbol','Type','Direction','Volume','Price','Order','Commission','Swap','Profit','Balance','Comment']  # trailing empty column tolerated
 TIME_FORMAT = '%Y.%m.%d %H:%M:%S'
 
@@ -136,13 +144,10 @@ def extract_mt5_metrics(csv_path: Path) -> Dict[str, Any]:
     """Parse MT5 strategy report, tolerating BOM, trailing comma, and minor header variations.
 
     We only rely on three columns: Time, Direction, Profit. If Profit missing we fail gracefully.
+    Exits are held in a compact TradeTable (see trade_records.py) rather than per-row lists.
     """
     if not csv_path.exists():
         return {'error': f'file not found: {csv_path}'}
-    trade_profits: List[float] = []
-    win_profits: List[float] = []
-    loss_profits: List[float] = []
-    exit_times: List[datetime] = []
 
     with csv_path.open('r', encoding='utf-8-sig', newline='') as f:  # utf-8-sig strips BOM if present
         reader = csv.reader(f)
@@ -152,34 +157,17 @@ def extract_mt5_metrics(csv_path: Path) -> Dict[str, Any]:
         # Strip whitespace and ignore empty trailing column
         header = [h.strip() for h in raw_header if h.strip() != '']
         header_mismatch = header[:len(HEADER_EXPECTED)] != HEADER_EXPECTED
-        # Build index map resiliently
-        header_map = {col: idx for idx, col in enumerate(raw_header)}  # use raw to keep indexes aligned with rows
-        missing_cols = [c for c in ('Profit','Direction','Time') if c not in header_map]
-        if missing_cols:
-            return {'error': f'required columns missing: {missing_cols}'}
-        idx_profit = header_map['Profit']
-        idx_direction = header_map['Direction']
-        idx_time = header_map['Time']
-        for row in reader:
-            if not row or len(row) <= idx_direction:
-                continue
-            # guard for partial rows
-            direction = row[idx_direction].strip().lower()
-            if direction != 'out':
-                continue
-            profit = clean_profit(row[idx_profit])
-            trade_profits.append(profit)
-            if profit >= 0:
-                win_profits.append(profit)
-            else:
-                loss_profits.append(profit)
-            t = parse_time(row[idx_time])
-            if t:
-                exit_times.append(t)
-
-    trade_count = len(trade_profits)
-    gross_profit = sum(p for p in trade_profits if p >= 0)
-    gross_loss = -sum(p for p in trade_profits if p < 0)
+        try:
+            table = TradeTable.from_mt5_rows(raw_header, reader)
+        except ValueError as e:
+            return {'error': str(e)}
+
+    trade_count = len(table)
+    profits = table.column('profit')
+    win_profits = [p for p in profits if p >= 0]
+    loss_profits = [p for p in profits if p < 0]
+    gross_profit = sum(win_profits)
+    gross_loss = -sum(loss_profits)
     win_rate = (len(win_profits)/trade_count*100.0) if trade_count else 0.0
     profit_factor = (gross_profit/gross_loss) if gross_loss > 0 else (gross_profit if gross_profit>0 else 0.0)
     avg_win = statistics.mean(win_profits) if win_profits else 0.0
@@ -251,28 +239,30 @@ def find_trades_signals(tester_root: Path, symbol: str, version: str) -> Dict[st
 
 
 def load_trades_csv(path: Path) -> Dict[str, Any]:
-    try:
-        import pandas as pd
-    except Exception:
-        return {'error': 'pandas not available'}
+    """Metrics from an EA Trades CSV; dual-row (v4.1+/v5.x) files count EXIT rows only."""
     if not path or not path.exists():
         return {'error': f'trades csv not found: {path}'}
-    df = pd.read_csv(path)
-    # Basic expected columns
-    profit_col = 'Profit' if 'Profit' in df.columns else None
-    if not profit_col:
-        return {'error': 'Profit column missing in Trades CSV'}
-    total = len(df)
-    pnl_series = df[profit_col].fillna(0)
-    wins = (pnl_series > 0).sum()
-    losses = (pnl_series < 0).sum()
-    win_rate = (wins/total*100.0) if total else 0.0
-    gross_profit = pnl_series[pnl_series>0].sum()
-    gross_loss = -pnl_series[pnl_series<0].sum()
+    with path.open('r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return {'error': 'empty csv'}
+        # Basic expected columns
+        if 'Profit' not in [h.strip() for h in header]:
+            return {'error': 'Profit column missing in Trades CSV'}
+        table = TradeTable.from_ea_trade_rows(header, reader)
+
+    total = len(table)
+    profits = table.column('profit')
+    win_profits = [p for p in profits if p > 0]
+    loss_profits = [p for p in profits if p < 0]
+    win_rate = (len(win_profits)/total*100.0) if total else 0.0
+    gross_profit = sum(win_profits)
+    gross_loss = -sum(loss_profits)
     profit_factor = (gross_profit/gross_loss) if gross_loss>0 else (gross_profit if gross_profit>0 else 0.0)
-    avg_win = pnl_series[pnl_series>0].mean() if wins>0 else 0.0
-    avg_loss = pnl_series[pnl_series<0].mean() if losses>0 else 0.0
-    exit_reason_counts = df['ExitReason'].value_counts().to_dict() if 'ExitReason' in df.columns else {}
+    avg_win = statistics.mean(win_profits) if win_profits else 0.0
+    avg_loss = statistics.mean(loss_profits) if loss_profits else 0.0
+    exit_reason_counts = table.value_counts('exit_reason') if 'ExitReason' in header else {}
     return {
         'trade_count': int(total),
         'win_rate_percent': round(win_rate,2),
@@ -310,7 +300,9 @@ def normalize_filename(symbol: str, version: str, timeframe: str) -> str:
     return f"TP_Integrated_MTBacktest_Report_{symbol}_{version}_{timeframe}.csv"
 
 
-def process_file(path: Path, dest_root: Path, tester_root: Path, gates: Dict[str,float], dry_run: bool=False) -> Dict[str, Any]:
+def process_file(path: Path, dest_root: Path, tester_root: Path, gates: Dict[str,float], dry_run: bool=False,
+                 metrics: Optional[PipelineMetrics] = None) -> Dict[str, Any]:
+    metrics = metrics or PipelineMetrics('ingest_mt5_batch')
     parsed = parse_filename(path)
     symbol = parsed['symbol']
     timeframe = parsed['timeframe']
@@ -320,18 +312,26 @@ def process_file(path: Path, dest_root: Path, tester_root: Path, gates: Dict[str
     normalized_name = normalize_filename(symbol, version, timeframe)
     dest_csv = symbol_folder / normalized_name
 
-    if not dry_run:
-        data = path.read_bytes()
-        dest_csv.write_bytes(data)
-
-    mt5_metrics = extract_mt5_metrics(dest_csv if not dry_run else path)
-    ts_paths = find_trades_signals(tester_root, symbol, version)
-    trades_metrics = load_trades_csv(ts_paths['trades']) if ts_paths['trades'] else {}
-    signals_metrics = load_signals_csv(ts_paths['signals']) if ts_paths['signals'] else {}
+    with metrics.stage('load'):
+        if not dry_run:
+            data = path.read_bytes()
+            dest_csv.write_bytes(data)
+
+    with metrics.stage('parse') as stage:
+        mt5_metrics = extract_mt5_metrics(dest_csv if not dry_run else path)
+        stage.rows = mt5_metrics.get('trade_count', 0)
+    # Locate the EA Trades/Signals CSVs matching the report
+    with metrics.stage('discover'):
+        ts_paths = find_trades_signals(tester_root, symbol, version)
+    with metrics.stage('parse') as stage:
+        trades_metrics = load_trades_csv(ts_paths['trades']) if ts_paths['trades'] else {}
+        signals_metrics = load_signals_csv(ts_paths['signals']) if ts_paths['signals'] else {}
+        stage.rows = trades_metrics.get('trade_count', 0) + signals_metrics.get('signal_count', 0)
 
     # Prefer trades_metrics if available for core trade values
-    primary = trades_metrics if trades_metrics and 'trade_count' in trades_metrics else mt5_metrics
-    gates_eval = evaluate_gates(primary, gates)
+    with metrics.stage('aggregate'):
+        primary = trades_metrics if trades_metrics and 'trade_count' in trades_metrics else mt5_metrics
+        gates_eval = evaluate_gates(primary, gates)
 
     # Coerce any numpy.bool_ to native bool for JSON
     def _clean(obj: Dict[str, Any]) -> Dict[str, Any]:
@@ -355,8 +355,9 @@ def process_file(path: Path, dest_root: Path, tester_root: Path, gates: Dict[str
         'gates': _clean(gates_eval),
     }
     if not dry_run:
-        summary_path = symbol_folder / f"{symbol}_v{version}_{timeframe}_summary.json"
-        summary_path.write_text(json.dumps(summary, indent=2))
+        with metrics.stage('render'):
+            summary_path = symbol_folder / f"{symbol}_v{version}_{timeframe}_summary.json"
+            summary_path.write_text(json.dumps(summary, indent=2))
     return summary
 
 
@@ -397,7 +398,10 @@ def main():
     args.dest_root.mkdir(parents=True, exist_ok=True)
 
     # Gather candidate CSVs
-    candidates = list(args.mt5_drop.glob('*.csv'))
+    metrics = PipelineMetrics('ingest_mt5_batch')
+    with metrics.stage('discover') as stage:
+        candidates = list(args.mt5_drop.glob('*.csv'))
+        stage.rows = len(candidates)
     if not candidates:
         print('⚠️ No CSV files found in drop folder.')
         return 0
@@ -411,7 +415,8 @@ def main():
             print(f"⏭️  Skipping {c.name} (symbol {symbol} not in filter set)")
             continue
         print(f"➡️  Processing {c.name} → {symbol} {meta['version']} {meta['timeframe']}")
-        summary = process_file(c, args.dest_root, args.tester_root, gates, dry_run=args.dry_run)
+        with tracing.span('ingest_mt5_batch.file', file=c.name, symbol=symbol, version=meta['version']):
+            summary = process_file(c, args.dest_root, args.tester_root, gates, dry_run=args.dry_run, metrics=metrics)
         gate_status = summary['gates']
         gate_icons = ''.join(['✅' if v else '⚠️' for v in gate_status.values()])
         primary = summary['primary_metrics']
@@ -419,7 +424,8 @@ def main():
         summaries.append(summary)
 
     # Aggregate overview
-    aggregate_overview(summaries, args.dest_root, dry_run=args.dry_run)
+    with metrics.stage('render'):
+        aggregate_overview(summaries, args.dest_root, dry_run=args.dry_run)
     passed = [s for s in summaries if all(s['gates'].values())]
     print('\n=== Promotion Candidates ===')
     if passed:
@@ -430,7 +436,8 @@ def main():
         print('  (none passed all gates)')
 
     print('\n✅ Batch ingestion complete.' if not args.dry_run else '\n(Dry run complete)')
+    metrics.export()
     return 0
 
 if __name__ == '__main__':
-    sys.exit(main())
+    sys.exit(run_cli(main, 'ingest_mt5_batch'))
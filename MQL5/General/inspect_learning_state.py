@@ -9,6 +9,8 @@ import sys
 from pathlib import Path
 from datetime import datetime
 
+from trade_records import TradeTable
+
 
 def inspect_learning_state(json_file: str):
     """Inspect and validate the JSON learning state file"""
@@ -47,17 +49,21 @@ def inspect_learning_state(json_file: str):
         print(f"   Total Trades Logged: {len(state['trades'])}")
         
         if len(state['trades']) > 0:
+            # Compact columnar view instead of walking the raw dicts repeatedly
+            trades = TradeTable.from_learning_state(state['trades'])
+            profits = trades.column('profit')
+
             # Analyze win/loss distribution
-            wins = sum(1 for t in state['trades'] if t.get('profit', 0) > 0)
-            losses = sum(1 for t in state['trades'] if t.get('profit', 0) < 0)
+            wins = sum(1 for p in profits if p > 0)
+            losses = sum(1 for p in profits if p < 0)
             print(f"   Wins: {wins} | Losses: {losses}")
             
             # Show last few trades
             print(f"\n   Last 5 Trades:")
-            for i, trade in enumerate(state['trades'][-5:], 1):
-                profit = trade.get('profit', 0)
-                symbol = "✅" if profit > 0 else "❌"
-                print(f"   {symbol} Trade {i}: Profit=${profit:.2f}, Type={trade.get('type', 'N/A')}")
+            for i, idx in enumerate(range(max(len(trades) - 5, 0), len(trades)), 1):
+                trade = trades[idx]
+                symbol = "✅" if trade.profit > 0 else "❌"
+                print(f"   {symbol} Trade {i}: Profit=${trade.profit:.2f}, Type={trade.type or 'N/A'}")
                 
     if 'learned_patterns' in state:
         print(f"\n🧠 Learned Patterns:")
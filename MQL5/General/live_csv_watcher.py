@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Live MT5 Files Watcher with Incremental CSV Tailing
+===================================================
+The EA appends rows to TP_Integrated_Trades_*.csv / TP_Integrated_Signals_*.csv
+in the live terminal's MQL5/Files directory (analytics_config.PATHS['live']).
+Consumers used to re-read those files from the start on every refresh.
+
+LiveFilesWatcher keeps a byte offset per file and parses only the complete rows
+appended since the last read:
+
+  * a partially written last line stays unread until its newline arrives,
+  * a file that shrank (truncated) or was replaced (new inode, rotation) is
+    re-read from its header,
+  * offsets can be persisted (--state) so a restart resumes where it stopped.
+
+Change notifications come from watchdog (inotify on Linux, FSEvents on macOS)
+when it is installed; otherwise, and as a safety net for missed events, the
+directory is polled every `poll_interval` seconds.
+
+Parsed rows are published as RowBatch objects to subscribers (callables), e.g.
+a DB writer, the learning engine or the live monitor:
+
+    from live_csv_watcher import LiveFilesWatcher
+
+    watcher = LiveFilesWatcher(live_root)
+    watcher.subscribe(lambda batch: print(batch.kind, batch.symbol, len(batch.rows)),
+                      kinds={'trades'})
+    watcher.run()
+
+CLI:
+    python live_csv_watcher.py [--root DIR] [--state offsets.json] [--ndjson rows.ndjson]
+                               [--learn-config EA_Config.json --learn-every 50]
+"""
+from __future__ import annotations
+import argparse, csv, fnmatch, io, json, os, re, sys, threading, time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set
+
+try:  # optional: native change notifications
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    FileSystemEventHandler = object
+    Observer = None
+
+DEFAULT_PATTERNS = ('TP_Integrated_Trades_*.csv', 'TP_Integrated_Signals_*.csv')
+POLL_INTERVAL = 1.0
+_SYMBOL_RE = re.compile(r'TP_Integrated_(?:Trades|Signals)_([A-Za-z0-9.]+?)(?:_|\.csv$)')
+
+
+@dataclass
+class RowBatch:
+    """Rows appended to one CSV since the previous read."""
+    path: Path
+    kind: str                          # 'trades' | 'signals'
+    symbol: str
+    header: List[str]
+    rows: List[Dict[str, str]]
+    reset: bool = False                # file was truncated/rotated and re-read from the top
+
+    def exit_rows(self) -> List[Dict[str, str]]:
+        """Closed trades: EXIT rows of dual-row layouts, every row of single-row layouts."""
+        if 'RowType' not in self.header:
+            return self.rows
+        return [r for r in self.rows if r.get('RowType') == 'EXIT']
+
+    def to_frame(self):
+        """Rows as a DataFrame with the EA CSV schema dtypes (requires pandas)."""
+        import pandas as pd
+        from ea_csv_schema import EACsvSchema, detect_schema
+
+        schema = detect_schema(self.header) or EACsvSchema('unknown', 'unknown', frozenset())
+        df = pd.DataFrame(self.rows, columns=self.header)
+        for col in df.columns:
+            dtype = schema.dtype_for(col)
+            if dtype == 'category':
+                df[col] = df[col].astype('category')
+            elif dtype is None:
+                numeric = pd.to_numeric(df[col], errors='coerce')
+                if numeric.notna().sum() == (df[col].fillna('') != '').sum():  # unregistered numeric column
+                    df[col] = numeric
+            elif dtype not in ('str', 'boolean'):
+                df[col] = pd.to_numeric(df[col], errors='coerce')
+        return df
+
+
+@dataclass
+class TailState:
+    """Read position of one file."""
+    offset: int = 0
+    inode: int = 0
+    header: List[str] = field(default_factory=list)
+
+
+def file_kind(path: Path) -> str:
+    return 'trades' if '_Trades_' in path.name else 'signals'
+
+
+def file_symbol(path: Path) -> str:
+    match = _SYMBOL_RE.search(path.name)
+    return match.group(1) if match else 'UNKNOWN'
+
+
+class CsvTailer:
+    """Byte-offset tailing of growing CSV files."""
+
+    def __init__(self):
+        self.states: Dict[str, TailState] = {}
+
+    def read_new(self, path: Path) -> Optional[RowBatch]:
+        """Complete rows appended since the last call (None when nothing new)."""
+        path = Path(path)
+        key = str(path)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self.states.pop(key, None)
+            return None
+
+        state = self.states.get(key)
+        reset = False
+        if state is None:
+            state = self.states[key] = TailState(inode=stat.st_ino)
+        elif stat.st_ino != state.inode or stat.st_size < state.offset:
+            # Rotated (replaced by a new file) or truncated: start over from the header
+            state.offset, state.inode, state.header = 0, stat.st_ino, []
+            reset = True
+        if stat.st_size == state.offset:
+            return None
+
+        with open(path, 'rb') as f:
+            f.seek(state.offset)
+            chunk = f.read(stat.st_size - state.offset)
+        end = chunk.rfind(b'\n')
+        if end < 0:
+            return None  # no complete line yet
+        state.offset += end + 1
+        text = chunk[:end + 1].decode('utf-8-sig' if not state.header else 'utf-8', errors='replace')
+
+        records = list(csv.reader(io.StringIO(text)))
+        if not state.header:
+            if not records:
+                return None
+            state.header = [h.strip() for h in records.pop(0)]
+        width = len(state.header)
+        rows = [dict(zip(state.header, (v.strip() for v in rec))) for rec in records if len(rec) >= width - 1 and any(rec)]
+        if not rows and not reset:
+            return None
+        return RowBatch(path, file_kind(path), file_symbol(path), state.header, rows, reset)
+
+    def forget(self, path: Path):
+        self.states.pop(str(path), None)
+
+    # Persistence: {path: [offset, inode, header]}
+    def save(self, state_path: Path):
+        data = {k: [s.offset, s.inode, s.header] for k, s in self.states.items()}
+        tmp = Path(state_path).with_suffix('.tmp')
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, state_path)
+
+    def load(self, state_path: Path):
+        state_path = Path(state_path)
+        if not state_path.exists():
+            return
+        for k, (offset, inode, header) in json.loads(state_path.read_text()).items():
+            self.states[k] = TailState(offset, inode, header)
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    def __init__(self, watcher: 'LiveFilesWatcher'):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        for attr in ('src_path', 'dest_path'):
+            path = getattr(event, attr, None)
+            if path and self.watcher.matches(Path(path)):
+                self.watcher.notify(Path(path))
+
+
+Subscriber = Callable[[RowBatch], Any]
+
+
+class LiveFilesWatcher:
+    """Watches a directory of EA CSVs and publishes newly appended rows."""
+
+    def __init__(self, root, patterns: Sequence[str] = DEFAULT_PATTERNS, poll_interval: float = POLL_INTERVAL,
+                 state_path: Optional[Path] = None, from_start: bool = True):
+        self.root = Path(root)
+        self.patterns = tuple(patterns)
+        self.poll_interval = poll_interval
+        self.state_path = Path(state_path) if state_path else None
+        self.from_start = from_start
+        self.tailer = CsvTailer()
+        if self.state_path:
+            self.tailer.load(self.state_path)
+        self._subscribers: List[tuple] = []
+        self._changed: Set[Path] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+
+    # ----------------------------- Pub/Sub --------------------------------- #
+
+    def subscribe(self, callback: Subscriber, kinds: Optional[Iterable[str]] = None,
+                  symbols: Optional[Iterable[str]] = None):
+        """Register a consumer; optionally only for 'trades'/'signals' or given symbols."""
+        self._subscribers.append((callback, set(kinds) if kinds else None, set(symbols) if symbols else None))
+
+    def publish(self, batch: RowBatch):
+        for callback, kinds, symbols in self._subscribers:
+            if kinds and batch.kind not in kinds:
+                continue
+            if symbols and batch.symbol not in symbols:
+                continue
+            try:
+                callback(batch)
+            except Exception as e:  # one failing consumer must not stop the others
+                print(f"⚠️  Subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+
+    # ---------------------------- Watching --------------------------------- #
+
+    def matches(self, path: Path) -> bool:
+        return any(fnmatch.fnmatch(path.name, p) for p in self.patterns)
+
+    def notify(self, path: Path):
+        with self._lock:
+            self._changed.add(path)
+        self._wake.set()
+
+    def files(self) -> List[Path]:
+        return sorted(p for p in self.root.iterdir() if p.is_file() and self.matches(p)) if self.root.exists() else []
+
+    def _skip_existing(self):
+        """Start at the current end of existing files (only rows appended from now on)."""
+        for path in self.files():
+            if str(path) not in self.tailer.states:
+                self.tailer.read_new(path)
+
+    def poll_once(self, paths: Optional[Iterable[Path]] = None) -> int:
+        """Read and publish new rows of the given (default: all matching) files; returns rows published."""
+        published = 0
+        known = {Path(k) for k in self.tailer.states}
+        for path in set(paths if paths is not None else self.files()) | (known if paths is None else set()):
+            batch = self.tailer.read_new(path)
+            if batch is not None:
+                self.publish(batch)
+                published += len(batch.rows)
+        if published and self.state_path:
+            self.tailer.save(self.state_path)
+        return published
+
+    def run(self, max_seconds: Optional[float] = None):
+        """Publish rows until stop() (or max_seconds); uses watchdog events when available."""
+        if not self.from_start:
+            self._skip_existing()
+        observer = None
+        if Observer is not None and self.root.exists():
+            observer = Observer()
+            observer.schedule(_ChangeHandler(self), str(self.root), recursive=False)
+            observer.start()
+        print(f"👀 Watching {self.root} ({'file events + ' if observer else ''}"
+              f"polling every {self.poll_interval:g}s)")
+
+        deadline = time.monotonic() + max_seconds if max_seconds else None
+        try:
+            self.poll_once()
+            while not self._stop.is_set():
+                timeout = self.poll_interval
+                if deadline is not None:
+                    timeout = min(timeout, max(deadline - time.monotonic(), 0))
+                woke = self._wake.wait(timeout)
+                self._wake.clear()
+                with self._lock:
+                    changed, self._changed = self._changed, set()
+                # Events: only the files that changed; timeout: full poll (catches missed events)
+                self.poll_once(changed if woke and changed else None)
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+        finally:
+            if observer is not None:
+                observer.stop()
+                observer.join()
+            if self.state_path:
+                self.tailer.save(self.state_path)
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+
+# ------------------------------- Consumers --------------------------------- #
+
+class NDJSONSink:
+    """Appends each published row as one JSON line (for a DB writer in another process)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def __call__(self, batch: RowBatch):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for row in batch.rows:
+                f.write(json.dumps({'kind': batch.kind, 'symbol': batch.symbol,
+                                    'source': batch.path.name, **row}) + '\n')
+
+
+class LearningTrigger:
+    """Runs SelfLearningEngine on a trades file after every `every` newly closed trades."""
+
+    def __init__(self, config_path: Path, every: int = 50):
+        self.config_path = Path(config_path)
+        self.every = every
+        self.pending: Dict[Path, int] = {}
+
+    def __call__(self, batch: RowBatch):
+        if batch.kind != 'trades':
+            return
+        self.pending[batch.path] = self.pending.get(batch.path, 0) + len(batch.exit_rows())
+        if self.pending[batch.path] < self.every:
+            return
+        from self_learning_engine import SelfLearningEngine
+
+        self.pending[batch.path] = 0
+        result = SelfLearningEngine(str(self.config_path), str(batch.path)).update_configuration()
+        print(f"🧠 Learning update for {batch.symbol}: {result.get('status')} {result.get('reason', '')}".rstrip())
+
+
+def main():
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    parser = argparse.ArgumentParser(description='Tail live EA Trades/Signals CSVs and publish new rows')
+    parser.add_argument('--root', help="Directory to watch (default: analytics_config.PATHS['live']['root'])")
+    parser.add_argument('--state', help='JSON file persisting read offsets across restarts')
+    parser.add_argument('--ndjson', help='Append published rows to this NDJSON file')
+    parser.add_argument('--learn-config', help='EA config JSON; run the learning engine on new trades')
+    parser.add_argument('--learn-every', type=int, default=50, help='Closed trades between learning runs')
+    parser.add_argument('--poll', type=float, default=POLL_INTERVAL, help='Polling interval / fallback (s)')
+    parser.add_argument('--from-end', action='store_true', help='Ignore rows already in the files at startup')
+    args = parser.parse_args()
+
+    if args.root:
+        root = Path(args.root)
+    else:
+        from analytics_config import PATHS
+        root = Path(PATHS['live']['root'])
+
+    watcher = LiveFilesWatcher(root, poll_interval=args.poll, state_path=args.state,
+                               from_start=not args.from_end)
+    watcher.subscribe(lambda b: print(f"📥 {b.symbol} {b.kind}: +{len(b.rows)} rows"
+                                      f"{' (file reset)' if b.reset else ''}"))
+    if args.ndjson:
+        watcher.subscribe(NDJSONSink(Path(args.ndjson)))
+    if args.learn_config:
+        watcher.subscribe(LearningTrigger(Path(args.learn_config), args.learn_every), kinds={'trades'})
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped")
+
+
+if __name__ == '__main__':
+    main()
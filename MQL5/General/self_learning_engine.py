@@ -7,11 +7,23 @@ Analyzes trade results and automatically updates EA configuration
 import pandas as pd
 import numpy as np
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Any
 import logging
 
+from ea_csv_schema import read_ea_csv
+
+# Shared bootstrap/permutation engine (analytics/resampling_engine.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'analytics'))
+try:
+    from resampling_engine import compare_subset
+except ImportError:
+    compare_subset = None
+from pipeline_metrics import PipelineMetrics
+from cli_profiling import run_cli
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,6 +40,7 @@ class SelfLearningEngine:
         self.trades_csv_path = Path(trades_csv_path)
         self.config = self.load_config()
         self.trades_df = None
+        self.metrics = PipelineMetrics('self_learning_engine')
         
     def load_config(self) -> Dict:
         """Load current EA configuration"""
@@ -47,7 +60,10 @@ class SelfLearningEngine:
             logger.error(f"❌ Trades file not found: {self.trades_csv_path}")
             return None
         
-        df = pd.read_csv(self.trades_csv_path)
+        # Typed load; dual-row (v4.1+/v5.x) files keep one EXIT row per trade
+        with self.metrics.stage('load') as stage:
+            df = read_ea_csv(self.trades_csv_path, exit_rows_only=True)
+            stage.rows = len(df)
         logger.info(f"📊 Loaded {len(df)} trades from {self.trades_csv_path.name}")
         return df
     
@@ -150,7 +166,8 @@ class SelfLearningEngine:
         # Analyze quality threshold
         quality_analysis = {}
         for threshold in [60, 65, 70, 75, 80]:
-            high_quality = self.trades_df[self.trades_df['Entry_Quality'] >= threshold]
+            kept = self.trades_df['Entry_Quality'] >= threshold
+            high_quality = self.trades_df[kept]
             if len(high_quality) > 0:
                 wins = high_quality[high_quality['Profit'] > 0]
                 quality_analysis[threshold] = {
@@ -158,6 +175,14 @@ class SelfLearningEngine:
                     'win_rate': len(wins) / len(high_quality),
                     'avg_profit': high_quality['Profit'].mean()
                 }
+                if compare_subset is not None:
+                    # Kept vs filtered-out trades: is the win-rate gain more than noise?
+                    delta = compare_subset(self.trades_df['Profit'], kept, seed=7)['win_rate']
+                    quality_analysis[threshold].update({
+                        'win_rate_delta': delta.estimate,
+                        'win_rate_ci': [delta.ci_low, delta.ci_high],
+                        'p_value': delta.p_value
+                    })
         
         # Find optimal threshold
         best_threshold = 70
@@ -171,8 +196,10 @@ class SelfLearningEngine:
                     best_score = score
                     best_threshold = threshold
         
+        p_value = quality_analysis.get(best_threshold, {}).get('p_value', np.nan)
         return {
             'optimal_min_quality': best_threshold,
+            'optimal_significant': bool(p_value < 0.05),
             'analysis': quality_analysis
         }
     
@@ -249,7 +276,8 @@ class SelfLearningEngine:
         logger.info(f"✅ Update triggered: {reason if should_update else 'FORCED'}")
         
         # Calculate current performance
-        metrics = self.calculate_performance_metrics()
+        with self.metrics.stage('aggregate', rows=len(self.trades_df)):
+            metrics = self.calculate_performance_metrics()
         logger.info(f"📊 Current Performance:")
         logger.info(f"   Win Rate: {metrics['win_rate']:.1%}")
         logger.info(f"   Profit Factor: {metrics['profit_factor']:.2f}")
@@ -257,7 +285,8 @@ class SelfLearningEngine:
         
         # Optimize time filters
         logger.info("🕐 Analyzing time patterns...")
-        allowed_hours, blocked_hours, blocked_days = self.optimize_time_filters()
+        with self.metrics.stage('aggregate', rows=len(self.trades_df)):
+            allowed_hours, blocked_hours, blocked_days = self.optimize_time_filters()
         
         logger.info(f"   Optimal Hours: {allowed_hours}")
         logger.info(f"   Blocked Hours: {blocked_hours}")
@@ -265,8 +294,11 @@ class SelfLearningEngine:
         
         # Optimize physics filters
         logger.info("🎯 Optimizing physics filters...")
-        physics_opt = self.optimize_physics_filters()
+        with self.metrics.stage('aggregate', rows=len(self.trades_df)):
+            physics_opt = self.optimize_physics_filters()
         logger.info(f"   Optimal MinQuality: {physics_opt.get('optimal_min_quality', 70)}")
+        if physics_opt and not physics_opt.get('optimal_significant'):
+            logger.info("   (win-rate gain vs filtered-out trades is not statistically significant)")
         
         # Update configuration
         old_config = self.config.copy()
@@ -296,7 +328,8 @@ class SelfLearningEngine:
         })
         
         # Save config
-        self.save_config()
+        with self.metrics.stage('render'):
+            self.save_config()
         
         logger.info("✅ Configuration updated successfully!")
         
@@ -320,10 +353,16 @@ class SelfLearningEngine:
         if self.trades_df is None:
             return "No trade data available"
         
-        metrics = self.calculate_performance_metrics()
-        hourly = self.analyze_time_of_day_performance()
-        daily = self.analyze_day_of_week_performance()
+        with self.metrics.stage('aggregate', rows=len(self.trades_df)):
+            metrics = self.calculate_performance_metrics()
+            hourly = self.analyze_time_of_day_performance()
+            daily = self.analyze_day_of_week_performance()
         
+        with self.metrics.stage('render'):
+            return self._format_report(metrics, hourly, daily)
+    
+    def _format_report(self, metrics: Dict, hourly: Dict, daily: Dict) -> str:
+        """Plain-text report body"""
         report = []
         report.append("=" * 70)
         report.append("TICKPHYSICS SELF-LEARNING REPORT")
@@ -406,7 +445,8 @@ def main():
             logger.info("\n🎉 Self-learning cycle complete! Config updated.")
         elif result['status'] == 'skipped':
             logger.info(f"\n⏸️  Update skipped: {result['reason']}")
+    engine.metrics.export()
 
 
 if __name__ == '__main__':
-    main()
+    sys.exit(run_cli(main, 'self_learning_engine'))
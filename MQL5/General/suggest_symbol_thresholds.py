@@ -12,9 +12,15 @@ Outputs recommendations to console and writes a JSON file next to the CSV.
 """
 import argparse
 import json
+import sys
 from pathlib import Path
 import pandas as pd
 
+# Stage timings and --profile/--trace-memory (analytics/pipeline_metrics.py, cli_profiling.py)
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "analytics"))
+from pipeline_metrics import PipelineMetrics
+from cli_profiling import run_cli
+
 DEFAULT_BACKTEST_DIR = Path(__file__).parent.parent / "Backtest_Reports"
 
 
@@ -99,8 +105,12 @@ def main():
     if not csv_path.exists():
         raise SystemExit(f"CSV not found: {csv_path}")
 
-    df = load_csv(csv_path)
-    rec = compute_recommendations(df, symbol, version)
+    metrics = PipelineMetrics("suggest_symbol_thresholds")
+    with metrics.stage("load") as stage:
+        df = load_csv(csv_path)
+        stage.rows = len(df)
+    with metrics.stage("aggregate", rows=len(df)):
+        rec = compute_recommendations(df, symbol, version)
 
     # Print concise summary
     print("=" * 80)
@@ -117,10 +127,12 @@ def main():
 
     # Save JSON next to CSV
     out_json = csv_path.with_name(csv_path.stem + "_recommendations.json")
-    with open(out_json, "w") as f:
-        json.dump(rec, f, indent=2)
+    with metrics.stage("render"):
+        with open(out_json, "w") as f:
+            json.dump(rec, f, indent=2)
     print(f"\nSaved: {out_json}")
+    metrics.export()
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(run_cli(main, "suggest_symbol_thresholds"))
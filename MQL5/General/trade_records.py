@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Compact Trade Records for Pure-Python Analytics Paths
+=====================================================
+Long live histories held as lists of dicts (csv.DictReader rows, JSON learning
+state) cost several hundred bytes per trade: every field is a separate str or
+float object plus a per-row hash table. TradeTable stores the same trades
+column-wise in typed `array.array` buffers (8 bytes per number) and codes the
+low-cardinality text fields (Symbol, Type, ExitReason, Zone, Regime) as int16
+indexes into shared CategoryCodes vocabularies.
+
+No third-party dependency is required; `TradeTable.to_numpy()` converts to a
+NumPy structured array when NumPy is available.
+
+Converters:
+  - read_mt5_report(path) / TradeTable.from_mt5_rows(header, rows)
+        MT5 strategy report deals (Direction == 'out' rows only)
+  - read_ea_trades(path) / TradeTable.from_ea_trade_rows(header, rows)
+        TickPhysics Trades CSV; v2.x/v3.x single-row and v4.1+/v5.x ENTRY/EXIT
+        dual-row layouts (only EXIT rows are kept for the latter)
+  - TradeTable.from_learning_state(trades)
+        'trades' list of the EA JSON learning state
+
+Benchmark (dict rows vs TradeTable, memory via tracemalloc):
+  python trade_records.py --benchmark [path/to/TP_Integrated_Trades_*.csv] [--rows 100000]
+"""
+from __future__ import annotations
+import csv, sys, time, argparse, tracemalloc
+from array import array
+from calendar import timegm
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# ----------------------------- Field Layout -------------------------------- #
+# name -> array typecode ('q' int64, 'd' float64)
+NUMERIC_FIELDS: Dict[str, str] = {
+    'ticket': 'q',
+    'open_time': 'q',       # epoch seconds (broker time), 0 if unknown
+    'close_time': 'q',
+    'profit': 'd',
+    'open_price': 'd',
+    'close_price': 'd',
+    'sl': 'd',
+    'tp': 'd',
+    'run_up_pips': 'd',
+    'run_down_pips': 'd',
+}
+CATEGORY_FIELDS = ('symbol', 'type', 'exit_reason', 'zone', 'regime')
+CODE_TYPECODE = 'h'  # int16 category codes
+
+# EA Trades CSV column aliases across versions (first match wins)
+EA_COLUMN_ALIASES: Dict[str, Sequence[str]] = {
+    'ticket': ('Ticket',),
+    'open_time': ('OpenTime',),
+    'close_time': ('CloseTime',),
+    'profit': ('Profit',),
+    'open_price': ('OpenPrice',),
+    'close_price': ('ClosePrice',),
+    'sl': ('SL',),
+    'tp': ('TP',),
+    'run_up_pips': ('RunUp_Pips', 'RunUpPips'),
+    'run_down_pips': ('RunDown_Pips', 'RunDownPips'),
+    'symbol': ('Symbol',),
+    'type': ('Type',),
+    'exit_reason': ('ExitReason',),
+    'zone': ('Entry_Zone', 'EntryZone'),
+    'regime': ('Entry_Regime', 'EntryRegime'),
+}
+
+# ----------------------------- Parsing Helpers ----------------------------- #
+
+def parse_number(s: Any) -> float:
+    """Parse MT5/EA numeric text ('24 619.6', '- 3.17', '−1.0', '') to float."""
+    if isinstance(s, (int, float)):
+        return float(s)
+    if s is None:
+        return 0.0
+    try:
+        return float(s)
+    except ValueError:
+        pass
+    s = s.replace(' ', '').replace(' ', '').replace('+', '').replace('−', '-')
+    if s in ('', '.', '-'):
+        return 0.0
+    try:
+        return float(s)
+    except ValueError:
+        return 0.0
+
+
+def parse_mt5_time(s: Any) -> int:
+    """'YYYY.MM.DD HH:MM[:SS]' -> epoch seconds; 0 for empty/placeholder/invalid."""
+    if not s:
+        return 0
+    s = s.strip()
+    try:
+        sec = int(s[17:19]) if len(s) >= 19 else 0
+        return timegm((int(s[0:4]), int(s[5:7]), int(s[8:10]),
+                       int(s[11:13]), int(s[14:16]), sec, 0, 0, 0))
+    except (ValueError, IndexError):
+        return 0
+
+
+class CategoryCodes:
+    """Interns category labels as small integer codes ('' is always code 0)."""
+    __slots__ = ('labels', '_index')
+
+    def __init__(self, labels: Iterable[str] = ()):
+        self.labels: List[str] = ['']
+        self._index: Dict[str, int] = {'': 0}
+        for label in labels:
+            self.code(label)
+
+    def code(self, label: Any) -> int:
+        label = '' if label is None else str(label).strip()
+        idx = self._index.get(label)
+        if idx is None:
+            idx = len(self.labels)
+            self._index[label] = idx
+            self.labels.append(label)
+        return idx
+
+    def label(self, code: int) -> str:
+        return self.labels[code]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+
+@dataclass(slots=True)
+class TradeRecord:
+    """Row view of one trade (decoded labels)."""
+    ticket: int
+    open_time: int
+    close_time: int
+    profit: float
+    open_price: float
+    close_price: float
+    sl: float
+    tp: float
+    run_up_pips: float
+    run_down_pips: float
+    symbol: str
+    type: str
+    exit_reason: str
+    zone: str
+    regime: str
+
+
+# ----------------------------- Trade Table --------------------------------- #
+
+class TradeTable:
+    """Column-oriented, typed trade storage with categorical text fields."""
+    __slots__ = ('columns', 'categories')
+
+    def __init__(self, categories: Optional[Dict[str, CategoryCodes]] = None):
+        self.columns: Dict[str, array] = {name: array(tc) for name, tc in NUMERIC_FIELDS.items()}
+        for name in CATEGORY_FIELDS:
+            self.columns[name] = array(CODE_TYPECODE)
+        # Vocabularies may be shared between tables (e.g. backtest vs live)
+        self.categories: Dict[str, CategoryCodes] = categories or {name: CategoryCodes() for name in CATEGORY_FIELDS}
+
+    # -- building --
+    def append(self, **fields: Any) -> None:
+        cols = self.columns
+        for name in NUMERIC_FIELDS:
+            value = fields.get(name) or 0
+            cols[name].append(int(value) if NUMERIC_FIELDS[name] == 'q' else float(value))
+        for name in CATEGORY_FIELDS:
+            cols[name].append(self.categories[name].code(fields.get(name)))
+
+    def extend(self, n: int, fields: Dict[str, Sequence[Any]]) -> None:
+        """Append n trades given column-wise (missing fields are zero / '')."""
+        cols = self.columns
+        for name, tc in NUMERIC_FIELDS.items():
+            values = fields.get(name)
+            cols[name].extend(values if values is not None else array(tc, bytes(8 * n)))
+        for name in CATEGORY_FIELDS:
+            values = fields.get(name)
+            if values is None:
+                cols[name].extend(array(CODE_TYPECODE, bytes(2 * n)))
+            else:
+                code = self.categories[name].code
+                cols[name].extend([code(v) for v in values])
+
+    # -- access --
+    def __len__(self) -> int:
+        return len(self.columns['ticket'])
+
+    def __getitem__(self, i: int) -> TradeRecord:
+        cols = self.columns
+        values = {name: cols[name][i] for name in NUMERIC_FIELDS}
+        for name in CATEGORY_FIELDS:
+            values[name] = self.categories[name].label(cols[name][i])
+        return TradeRecord(**values)
+
+    def __iter__(self) -> Iterator[TradeRecord]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def column(self, name: str) -> array:
+        """Typed column buffer (category fields return their int16 codes)."""
+        return self.columns[name]
+
+    def labels(self, name: str) -> List[str]:
+        vocab = self.categories[name].labels
+        return [vocab[c] for c in self.columns[name]]
+
+    def value_counts(self, name: str) -> Dict[str, int]:
+        """Label -> count for a category field, most frequent first."""
+        counts = [0] * len(self.categories[name])
+        for c in self.columns[name]:
+            counts[c] += 1
+        vocab = self.categories[name].labels
+        pairs = [(vocab[c], n) for c, n in enumerate(counts) if n and c]  # '' (missing) excluded
+        return dict(sorted(pairs, key=lambda p: -p[1]))
+
+    def indices(self, name: str, label: str) -> List[int]:
+        """Row indexes whose category field equals label."""
+        code = self.categories[name]._index.get(label)
+        if code is None:
+            return []
+        return [i for i, c in enumerate(self.columns[name]) if c == code]
+
+    def nbytes(self) -> int:
+        """Approximate buffer footprint in bytes (vocabularies excluded)."""
+        return sum(col.itemsize * len(col) for col in self.columns.values())
+
+    def to_numpy(self):
+        """NumPy structured array with int16 codes for category fields."""
+        import numpy as np
+        dtype = [(name, 'i8' if tc == 'q' else 'f8') for name, tc in NUMERIC_FIELDS.items()]
+        dtype += [(name, 'i2') for name in CATEGORY_FIELDS]
+        out = np.empty(len(self), dtype=dtype)
+        for name, col in self.columns.items():
+            out[name] = np.frombuffer(col, dtype=out.dtype[name]) if len(col) else []
+        return out
+
+    # -- converters --
+    def _read_rows(self, rows: Iterable[Sequence[str]], readers: Dict[str, int],
+                   convert: Dict[str, Callable[[str], Any]], required: int,
+                   keep: Optional[Callable[[Sequence[str]], bool]] = None) -> int:
+        """
+        Append one trade per kept row in a single pass over `rows`: field ->
+        column index in `readers`, parsed by `convert[field]`. Rows must reach
+        column `required`; shorter optional columns read as zero / ''.
+        Returns the number of trades added.
+        """
+        cols = self.columns
+        plan = []
+        for name, i in readers.items():
+            if name in CATEGORY_FIELDS:
+                code, parse = self.categories[name].code, convert.get(name)
+                plan.append((cols[name].append, i, (lambda v, c=code, p=parse: c(p(v))) if parse else code, 0))
+            else:
+                plan.append((cols[name].append, i, convert[name], 0 if NUMERIC_FIELDS[name] == 'q' else 0.0))
+        n = 0
+        for r in rows:
+            if len(r) <= required or (keep is not None and not keep(r)):
+                continue
+            width = len(r)
+            for append, i, parse, default in plan:
+                append(parse(r[i]) if i < width else default)
+            n += 1
+        for name, col in cols.items():  # fields without a source column
+            if name not in readers:
+                col.extend(array(col.typecode, bytes(col.itemsize * n)))
+        return n
+
+    @staticmethod
+    def _numeric_parsers(names: Iterable[str]) -> Dict[str, Callable[[str], Any]]:
+        parsers: Dict[str, Callable[[str], Any]] = {}
+        for name in names:
+            if name in CATEGORY_FIELDS:
+                continue
+            if name.endswith('_time'):
+                parsers[name] = parse_mt5_time
+            elif NUMERIC_FIELDS[name] == 'q':
+                parsers[name] = lambda v: int(parse_number(v))
+            else:
+                parsers[name] = parse_number
+        return parsers
+
+    @classmethod
+    def from_mt5_rows(cls, header: Sequence[str], rows: Iterable[Sequence[str]],
+                      categories: Optional[Dict[str, CategoryCodes]] = None) -> 'TradeTable':
+        """MT5 report rows; only closing deals (Direction == 'out') become trades."""
+        idx = {h.strip(): i for i, h in enumerate(header)}
+        missing = [c for c in ('Profit', 'Direction', 'Time') if c not in idx]
+        if missing:
+            raise ValueError(f'required columns missing: {missing}')
+        i_dir = idx['Direction']
+        readers = {'close_time': idx['Time'], 'profit': idx['Profit']}
+        for name, column in (('ticket', 'Deal'), ('close_price', 'Price'), ('symbol', 'Symbol'), ('type', 'Type')):
+            if column in idx:
+                readers[name] = idx[column]
+        convert = cls._numeric_parsers(readers)
+        convert['type'] = str.upper
+
+        table = cls(categories)
+        table._read_rows(rows, readers, convert, required=max(i_dir, idx['Time'], idx['Profit']),
+                         keep=lambda r: r[i_dir].strip().lower() == 'out')
+        return table
+
+    @classmethod
+    def from_ea_trade_rows(cls, header: Sequence[str], rows: Iterable[Sequence[str]],
+                           categories: Optional[Dict[str, CategoryCodes]] = None) -> 'TradeTable':
+        """EA Trades CSV rows (all versions); dual-row files keep EXIT rows only."""
+        idx = {h.strip(): i for i, h in enumerate(header)}
+        readers: Dict[str, int] = {}
+        for name, aliases in EA_COLUMN_ALIASES.items():
+            for alias in aliases:
+                if alias in idx:
+                    readers[name] = idx[alias]
+                    break
+        i_rowtype = idx.get('RowType')
+        # Ticket / Profit (when present) must be on the row; later columns are optional
+        required = max([readers[n] for n in ('ticket', 'profit') if n in readers] +
+                       ([i_rowtype] if i_rowtype is not None else []), default=0)
+        keep = (lambda r: r[i_rowtype].strip() == 'EXIT') if i_rowtype is not None else None
+
+        table = cls(categories)
+        table._read_rows(rows, readers, cls._numeric_parsers(readers), required, keep)
+        return table
+
+    @classmethod
+    def from_learning_state(cls, trades: Iterable[Dict[str, Any]],
+                            categories: Optional[Dict[str, CategoryCodes]] = None) -> 'TradeTable':
+        """'trades' entries of the EA JSON learning state (lower-case keys)."""
+        table = cls(categories)
+        for t in trades:
+            table.append(
+                ticket=t.get('ticket', 0),
+                open_time=t.get('open_time', 0) if isinstance(t.get('open_time'), (int, float)) else parse_mt5_time(t.get('open_time')),
+                close_time=t.get('close_time', 0) if isinstance(t.get('close_time'), (int, float)) else parse_mt5_time(t.get('close_time')),
+                profit=parse_number(t.get('profit', 0)),
+                symbol=t.get('symbol'),
+                type=t.get('type'),
+                exit_reason=t.get('exit_reason'),
+                zone=t.get('zone'),
+                regime=t.get('regime'),
+            )
+        return table
+
+
+def read_mt5_report(path: Path, categories: Optional[Dict[str, CategoryCodes]] = None) -> TradeTable:
+    with Path(path).open('r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError('empty csv')
+        return TradeTable.from_mt5_rows(header, reader, categories)
+
+
+def read_ea_trades(path: Path, categories: Optional[Dict[str, CategoryCodes]] = None) -> TradeTable:
+    with Path(path).open('r', encoding='utf-8-sig', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            raise ValueError('empty csv')
+        return TradeTable.from_ea_trade_rows(header, reader, categories)
+
+
+# ----------------------------- Benchmark ----------------------------------- #
+
+def _synthetic_rows(n: int) -> List[List[str]]:
+    """EA v3.x-style rows for benchmarking without a CSV on disk."""
+    header = ['Ticket', 'OpenTime', 'CloseTime', 'Symbol', 'Type', 'OpenPrice', 'ClosePrice',
+              'SL', 'TP', 'EntryZone', 'EntryRegime', 'ExitReason', 'Profit', 'RunUp_Pips', 'RunDown_Pips']
+    zones, regimes, reasons = ('BULL', 'BEAR', 'AVOID', 'TRANSITION'), ('NORMAL', 'HIGH', 'LOW'), ('SL', 'TP', 'EA')
+    rows = [header]
+    for i in range(n):
+        price = 21000.0 + (i % 500)
+        rows.append([str(i + 2), '2025.01.07 11:15', '2025.01.07 12:30', 'NAS100', 'BUY' if i % 2 else 'SELL',
+                     f'{price:.1f}', f'{price + 7.5:.1f}', f'{price - 50:.1f}', f'{price + 100:.1f}',
+                     zones[i % 4], regimes[i % 3], reasons[i % 3], f'{(i % 41) - 20:.2f}',
+                     f'{(i % 97) * 1.5:.1f}', f'{-(i % 89) * 1.25:.1f}'])
+    return rows
+
+
+def _measure(fn):
+    """(result, retained bytes, seconds); timed separately since tracemalloc slows allocation."""
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    result = fn()
+    current, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, elapsed
+
+
+def benchmark(path: Optional[Path] = None, rows: int = 100_000) -> Dict[str, Any]:
+    """Compare list-of-dicts (csv.DictReader) against TradeTable on the same rows."""
+    if path:
+        with Path(path).open('r', encoding='utf-8-sig', newline='') as f:
+            raw = list(csv.reader(f))
+    else:
+        raw = _synthetic_rows(rows)
+    header, body = raw[0], raw[1:]
+    n = len(body)
+
+    dicts, dict_bytes, dict_secs = _measure(lambda: [dict(zip(header, r)) for r in body])
+    del dicts
+    table, table_bytes, table_secs = _measure(lambda: TradeTable.from_ea_trade_rows(header, body))
+
+    def _dict_scan():
+        return sum(float(r['Profit']) for r in (dict(zip(header, b)) for b in body) if float(r['Profit']) > 0)
+    _t0 = time.perf_counter(); _dict_scan(); dict_scan = time.perf_counter() - _t0
+    _t0 = time.perf_counter(); sum(p for p in table.column('profit') if p > 0); table_scan = time.perf_counter() - _t0
+
+    return {
+        'trades': n,
+        'kept_trades': len(table),
+        'dict_bytes_per_trade': dict_bytes / max(n, 1),
+        'table_bytes_per_trade': table_bytes / max(len(table), 1),
+        'dict_build_sec': dict_secs,
+        'table_build_sec': table_secs,
+        'dict_profit_scan_sec': dict_scan,
+        'table_profit_scan_sec': table_scan,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Compact trade records (benchmark / conversion check).')
+    ap.add_argument('path', nargs='?', type=Path, help='EA Trades CSV (optional; synthetic rows otherwise)')
+    ap.add_argument('--benchmark', action='store_true', help='Compare memory/throughput with dict rows')
+    ap.add_argument('--rows', type=int, default=100_000, help='Synthetic row count when no CSV is given')
+    args = ap.parse_args()
+
+    if args.benchmark:
+        r = benchmark(args.path, args.rows)
+        print(f"📊 Trade record benchmark ({r['trades']:,} rows, {r['kept_trades']:,} trades kept)")
+        print(f"   Memory:  dict rows {r['dict_bytes_per_trade']:8.1f} B/trade | TradeTable {r['table_bytes_per_trade']:6.1f} B/trade "
+              f"({r['dict_bytes_per_trade'] / max(r['table_bytes_per_trade'], 1):.1f}x smaller)")
+        print(f"   Build:   dict rows {r['dict_build_sec']:8.3f} s       | TradeTable {r['table_build_sec']:6.3f} s")
+        print(f"   Scan:    dict rows {r['dict_profit_scan_sec']:8.3f} s       | TradeTable {r['table_profit_scan_sec']:6.3f} s")
+        return 0
+
+    if not args.path:
+        ap.error('path required unless --benchmark')
+    table = read_ea_trades(args.path)
+    print(f"✅ {args.path.name}: {len(table)} trades, {table.nbytes():,} bytes")
+    print(f"   ExitReason: {table.value_counts('exit_reason')}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
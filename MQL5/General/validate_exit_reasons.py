@@ -4,10 +4,15 @@ Exit Reason Validation Script
 Validates that TP_Trade_Tracker correctly logs exit reasons (SL/TP/MANUAL)
 """
 
-import pandas as pd
+import csv
 import sys
 from pathlib import Path
 
+from trade_records import EA_COLUMN_ALIASES, TradeTable
+
+def _mean(values):
+    return sum(values) / len(values) if values else float('nan')
+
 def validate_exit_reasons(csv_path):
     """
     Validate exit reason detection in trade CSV
@@ -20,11 +25,14 @@ def validate_exit_reasons(csv_path):
         print(f"❌ ERROR: CSV file not found: {csv_path}")
         return False
     
-    # Load CSV
+    # Load CSV into a compact columnar table (dual-row files keep EXIT rows)
     try:
-        df = pd.read_csv(csv_path)
+        with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.reader(f)
+            header = [h.strip() for h in next(reader, [])]
+            trades = TradeTable.from_ea_trade_rows(header, reader)
         print(f"✅ Loaded CSV: {csv_path}")
-        print(f"📊 Total trades: {len(df)}")
+        print(f"📊 Total trades: {len(trades)}")
         print()
     except Exception as e:
         print(f"❌ ERROR loading CSV: {e}")
@@ -32,7 +40,7 @@ def validate_exit_reasons(csv_path):
     
     # Check required columns
     required_cols = ['ExitReason', 'ClosePrice', 'SL', 'TP', 'Profit']
-    missing = [col for col in required_cols if col not in df.columns]
+    missing = [col for col in required_cols if col not in header]
     if missing:
         print(f"❌ Missing columns: {missing}")
         return False
@@ -40,72 +48,51 @@ def validate_exit_reasons(csv_path):
     print("✅ All required columns present")
     print()
     
+    ticket = trades.column('ticket')
+    close_price = trades.column('close_price')
+    profit = trades.column('profit')
+    
     # Analyze exit reasons
     print("📋 EXIT REASON DISTRIBUTION")
     print("-" * 70)
-    exit_counts = df['ExitReason'].value_counts()
+    exit_counts = trades.value_counts('exit_reason')
     for reason, count in exit_counts.items():
-        pct = (count / len(df)) * 100
+        pct = (count / len(trades)) * 100
         print(f"  {reason:12s}: {count:3d} trades ({pct:5.1f}%)")
     print()
     
-    # Validate SL exits
-    print("🔍 VALIDATING SL EXITS")
-    print("-" * 70)
-    sl_exits = df[df['ExitReason'] == 'SL']
-    if len(sl_exits) > 0:
-        sl_valid = 0
-        sl_invalid = 0
-        
-        for idx, row in sl_exits.iterrows():
-            close_price = row['ClosePrice']
-            sl = row['SL']
+    # Validate SL/TP exits
+    sl_exits = trades.indices('exit_reason', 'SL')
+    for reason, level_name in (('SL', 'sl'), ('TP', 'tp')):
+        print(f"🔍 VALIDATING {reason} EXITS")
+        print("-" * 70)
+        exits = sl_exits if reason == 'SL' else trades.indices('exit_reason', reason)
+        level = trades.column(level_name)
+        if exits:
+            valid = 0
+            invalid = 0
             tolerance = 5.0  # pips (adjust for symbol)
             
-            # Check if close price is within tolerance of SL
-            if abs(close_price - sl) <= tolerance:
-                sl_valid += 1
-            else:
-                sl_invalid += 1
-                print(f"  ⚠️  Trade #{int(row['Ticket'])}: Close={close_price:.2f}, SL={sl:.2f}, Diff={abs(close_price-sl):.2f}")
-        
-        print(f"  ✅ Valid SL exits: {sl_valid}/{len(sl_exits)}")
-        if sl_invalid > 0:
-            print(f"  ⚠️  Invalid SL exits: {sl_invalid}/{len(sl_exits)}")
-    else:
-        print("  ℹ️  No SL exits found")
-    print()
-    
-    # Validate TP exits
-    print("🔍 VALIDATING TP EXITS")
-    print("-" * 70)
-    tp_exits = df[df['ExitReason'] == 'TP']
-    if len(tp_exits) > 0:
-        tp_valid = 0
-        tp_invalid = 0
-        
-        for idx, row in tp_exits.iterrows():
-            close_price = row['ClosePrice']
-            tp = row['TP']
-            tolerance = 5.0  # pips
+            for i in exits:
+                # Check if close price is within tolerance of the SL/TP level
+                diff = abs(close_price[i] - level[i])
+                if diff <= tolerance:
+                    valid += 1
+                else:
+                    invalid += 1
+                    print(f"  ⚠️  Trade #{ticket[i]}: Close={close_price[i]:.2f}, {reason}={level[i]:.2f}, Diff={diff:.2f}")
             
-            if abs(close_price - tp) <= tolerance:
-                tp_valid += 1
-            else:
-                tp_invalid += 1
-                print(f"  ⚠️  Trade #{int(row['Ticket'])}: Close={close_price:.2f}, TP={tp:.2f}, Diff={abs(close_price-tp):.2f}")
-        
-        print(f"  ✅ Valid TP exits: {tp_valid}/{len(tp_exits)}")
-        if tp_invalid > 0:
-            print(f"  ⚠️  Invalid TP exits: {tp_invalid}/{len(tp_exits)}")
-    else:
-        print("  ℹ️  No TP exits found")
-    print()
+            print(f"  ✅ Valid {reason} exits: {valid}/{len(exits)}")
+            if invalid > 0:
+                print(f"  ⚠️  Invalid {reason} exits: {invalid}/{len(exits)}")
+        else:
+            print(f"  ℹ️  No {reason} exits found")
+        print()
     
     # Check for "MANUAL" as default (potential bug)
     print("🔍 CHECKING FOR POTENTIAL BUGS")
     print("-" * 70)
-    if exit_counts.get('MANUAL', 0) == len(df):
+    if exit_counts.get('MANUAL', 0) == len(trades):
         print("  ❌ CRITICAL: All trades marked as MANUAL - detection broken!")
         return False
     else:
@@ -115,33 +102,36 @@ def validate_exit_reasons(csv_path):
     # Profit analysis by exit reason
     print("💰 PROFIT ANALYSIS BY EXIT REASON")
     print("-" * 70)
-    for reason in exit_counts.index:
-        subset = df[df['ExitReason'] == reason]
-        avg_profit = subset['Profit'].mean()
-        win_rate = (subset['Profit'] > 0).sum() / len(subset) * 100
+    by_reason = {reason: trades.indices('exit_reason', reason) for reason in exit_counts}
+    for reason, rows in by_reason.items():
+        avg_profit = _mean([profit[i] for i in rows])
+        win_rate = sum(1 for i in rows if profit[i] > 0) / len(rows) * 100
         print(f"  {reason:12s}: Avg Profit = ${avg_profit:7.2f}, Win Rate = {win_rate:5.1f}%")
     print()
     
     # RunUp/RunDown analysis (if available)
-    if 'RunUpPips' in df.columns and 'RunDownPips' in df.columns:
+    has_excursions = all(any(alias in header for alias in EA_COLUMN_ALIASES[name])
+                         for name in ('run_up_pips', 'run_down_pips'))
+    if has_excursions:
+        run_up = trades.column('run_up_pips')
+        run_down = trades.column('run_down_pips')
         print("📊 RUNUP/RUNDOWN ANALYSIS BY EXIT REASON")
         print("-" * 70)
-        for reason in exit_counts.index:
-            subset = df[df['ExitReason'] == reason]
-            avg_runup = subset['RunUpPips'].mean()
-            avg_rundown = subset['RunDownPips'].mean()
+        for reason, rows in by_reason.items():
+            avg_runup = _mean([run_up[i] for i in rows])
+            avg_rundown = _mean([run_down[i] for i in rows])
             print(f"  {reason:12s}: RunUp = {avg_runup:6.2f} pips, RunDown = {avg_rundown:6.2f} pips")
         print()
         
         # Shake-out detection for SL exits
-        if len(sl_exits) > 0:
+        if sl_exits:
             print("🎯 SHAKE-OUT DETECTION (SL Exits with Large RunDown)")
             print("-" * 70)
-            shakeouts = sl_exits[sl_exits['RunDownPips'] > 20.0]  # Adjust threshold
-            if len(shakeouts) > 0:
+            shakeouts = [i for i in sl_exits if run_down[i] > 20.0]  # Adjust threshold
+            if shakeouts:
                 print(f"  ⚠️  Potential shake-outs: {len(shakeouts)}/{len(sl_exits)} SL exits")
-                for idx, row in shakeouts.head(5).iterrows():
-                    print(f"    Trade #{int(row['Ticket'])}: RunDown = {row['RunDownPips']:.2f} pips (SL too tight?)")
+                for i in shakeouts[:5]:
+                    print(f"    Trade #{ticket[i]}: RunDown = {run_down[i]:.2f} pips (SL too tight?)")
             else:
                 print("  ✅ No obvious shake-outs detected")
             print()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""
+Bar Cache
+=========
+Per-symbol / per-timeframe bars materialized as contiguous, memory-mapped
+NumPy column files, so simulators, indicator runs and the excursion tools
+open bars without querying Postgres or parsing bar files on every run.
+
+Each cache entry is a directory:
+
+    .cache/bars/NAS100_M1/
+        meta.json            format, symbol, timeframe, rows, utc, first/last ts,
+                             columns, generation, source
+        ts.<gen>.i8          int64 epoch nanoseconds
+        open.<gen>.f8        float64 (high, low, close, volume, spread alike)
+
+`meta.json` is the header: readers map exactly `rows` rows of the column
+files named by its generation, so bytes appended after it was written are
+never seen. Entries are refreshed incrementally — new bars from the `candles`
+table (or a newer bar file) are appended to the column files and the header
+is replaced atomically; a bar already cached is rewritten in place when it
+changed (the bar that was still forming). A full rebuild writes a new
+generation, swaps the header and unlinks the old files; readers that mapped
+them keep valid pages until they close.
+
+Opening an entry is zero-copy (`np.memmap`, read-only, shared mapping): every
+worker process that opens the same entry shares the page-cache pages instead
+of holding its own copy. Hand workers the symbol and cache directory and let
+them call `open_bars` — pickling the arrays themselves would copy them.
+
+One writer per entry at a time (refresh jobs); any number of readers.
+
+Usage:
+    from bar_cache import open_bars, refresh_from_candles
+
+    refresh_from_candles('NAS100', 'M1')          # first call builds, later calls append
+    bars = open_bars('NAS100', 'M1')              # BarArrays over read-only memmaps
+    load_bars('cache', 'NAS100')                  # the same through bar_store
+
+    python bar_cache.py --refresh NAS100 --refresh US30 --timeframe M1
+    python bar_cache.py bars/NAS100_M1.parquet bars/US30_M5.parquet
+    python bar_cache.py --list
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarArrays, read_bar_file, read_candles
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+
+CACHE_ENV = 'TP_BAR_CACHE_DIR'
+DEFAULT_CACHE_DIR = Path('.cache') / 'bars'
+CACHE_FORMAT_VERSION = 1
+META_NAME = 'meta.json'
+DEFAULT_TIMEFRAME = 'M1'
+COLUMNS = {'ts': 'i8', 'open': 'f8', 'high': 'f8', 'low': 'f8', 'close': 'f8', 'volume': 'f8', 'spread': 'f8'}
+REQUIRED_COLUMNS = ('ts', 'open', 'high', 'low', 'close')
+
+
+def default_cache_dir() -> Path:
+    """TP_BAR_CACHE_DIR, else ./.cache/bars."""
+    return Path(os.environ.get(CACHE_ENV) or DEFAULT_CACHE_DIR)
+
+
+def entry_dir(symbol: str, timeframe: str = DEFAULT_TIMEFRAME, cache_dir=None) -> Path:
+    """Directory of the cache entry of one symbol / timeframe."""
+    return Path(cache_dir or default_cache_dir()) / f"{symbol}_{timeframe.upper()}"
+
+
+def read_meta(entry: Path) -> Optional[Dict]:
+    """The entry's header, or None when it has not been built."""
+    try:
+        with open(Path(entry) / META_NAME) as f:
+            meta = json.load(f)
+    except FileNotFoundError:
+        return None
+    if meta.get('format') != CACHE_FORMAT_VERSION:
+        raise ValueError(f"{entry}: cache format {meta.get('format')} (expected {CACHE_FORMAT_VERSION}); rebuild it")
+    return meta
+
+
+def list_entries(cache_dir=None) -> List[Dict]:
+    """Headers of every entry in a cache directory."""
+    root = Path(cache_dir or default_cache_dir())
+    if not root.is_dir():
+        return []
+    return [meta for meta in (read_meta(path) for path in sorted(root.iterdir()) if path.is_dir()) if meta]
+
+
+def _column_path(entry: Path, name: str, generation: int) -> Path:
+    return entry / f"{name}.{generation}.{COLUMNS[name]}"
+
+
+def _write_meta(entry: Path, meta: Dict) -> None:
+    tmp_path = entry / f"{META_NAME}.tmp{os.getpid()}"
+    with open(tmp_path, 'w') as f:
+        json.dump(meta, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, entry / META_NAME)
+
+
+def _arrays(bars: BarArrays, columns) -> Dict[str, np.ndarray]:
+    """Column arrays in cache dtypes; a cached column the bars lack is NaN."""
+    arrays = {}
+    for name in columns:
+        values = getattr(bars, name)
+        arrays[name] = np.full(len(bars), np.nan) if values is None else np.ascontiguousarray(
+            values, dtype=COLUMNS[name])
+    return arrays
+
+
+def _timestamp(ns: Optional[int]) -> Optional[str]:
+    return None if ns is None else pd.Timestamp(ns).isoformat()
+
+
+def _stamp(meta: Dict, ts: np.ndarray, rows: int) -> Dict:
+    meta['rows'] = rows
+    if rows:
+        meta['first_ts'] = meta.get('first_ts') or _timestamp(int(ts[0]))
+        meta['last_ts'] = _timestamp(int(ts[-1]))
+        meta['last_ns'] = int(ts[-1])
+    meta['updated'] = datetime.now(timezone.utc).isoformat(timespec='seconds')
+    return meta
+
+
+# --------------------------------- Writing ---------------------------------- #
+
+def write_entry(bars: BarArrays, timeframe: str = DEFAULT_TIMEFRAME, cache_dir=None,
+                source: str = '') -> Dict:
+    """(Re)build an entry from `bars` as a new generation; returns its header."""
+    entry = entry_dir(bars.symbol, timeframe, cache_dir)
+    entry.mkdir(parents=True, exist_ok=True)
+    previous = read_meta(entry)
+    generation = previous['generation'] + 1 if previous else 1
+    columns = [name for name in COLUMNS if name in REQUIRED_COLUMNS or getattr(bars, name) is not None]
+
+    arrays = _arrays(bars, columns)
+    for name, values in arrays.items():
+        with open(_column_path(entry, name, generation), 'wb') as f:
+            values.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+    meta = _stamp({'format': CACHE_FORMAT_VERSION, 'symbol': bars.symbol, 'timeframe': timeframe.upper(),
+                   'utc': bool(bars.utc), 'columns': columns, 'generation': generation, 'source': source,
+                   'first_ts': None, 'last_ts': None, 'last_ns': None},
+                  arrays['ts'], len(bars))
+    _write_meta(entry, meta)
+
+    if previous:  # open mappings of the old generation stay valid after the unlink
+        for name in previous['columns']:
+            _column_path(entry, name, previous['generation']).unlink(missing_ok=True)
+    return meta
+
+
+def append_entry(bars: BarArrays, timeframe: str = DEFAULT_TIMEFRAME, cache_dir=None,
+                 source: Optional[str] = None) -> Dict:
+    """
+    Add the bars newer than the entry's last bar (building the entry if
+    missing); a bar at the cached last time replaces it in place and older
+    bars are ignored. Returns the header with `appended` set to the number of
+    bars added.
+    """
+    entry = entry_dir(bars.symbol, timeframe, cache_dir)
+    meta = read_meta(entry)
+    if meta is None or not meta['rows']:
+        meta = write_entry(bars, timeframe, cache_dir, source or '')
+        meta['appended'] = meta['rows']
+        return meta
+    if bool(bars.utc) != meta['utc']:
+        clocks = {True: 'UTC', False: 'broker time'}
+        raise ValueError(f"{entry}: cached bars are {clocks[meta['utc']]}, new bars are {clocks[bool(bars.utc)]}")
+
+    last_ns, rows, generation = meta['last_ns'], meta['rows'], meta['generation']
+    same = int(np.searchsorted(bars.ts, last_ns, side='left'))
+    newer = int(np.searchsorted(bars.ts, last_ns, side='right'))
+    if newer == same == len(bars):  # empty batch, or only bars older than the cache
+        meta['appended'] = 0
+        return meta
+    arrays = _arrays(bars, meta['columns'])
+    for name, values in arrays.items():
+        itemsize = values.itemsize
+        with open(_column_path(entry, name, generation), 'r+b') as f:
+            f.truncate(rows * itemsize)  # drop the tail of an append that never reached the header
+            if newer > same:
+                f.seek((rows - 1) * itemsize)
+                values[newer - 1:newer].tofile(f)
+            f.seek(rows * itemsize)
+            values[newer:].tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+    if newer == len(bars):  # only the last cached bar was rewritten; the header stays as it is
+        meta['appended'] = 0
+        return meta
+    if source is not None:
+        meta['source'] = source
+    meta = _stamp(meta, arrays['ts'], rows + len(bars) - newer)
+    _write_meta(entry, meta)
+    meta['appended'] = len(bars) - newer
+    return meta
+
+
+# --------------------------------- Reading ---------------------------------- #
+
+def _map(path: Path, dtype: str, rows: int) -> np.ndarray:
+    if not rows:  # mmap cannot map an empty file
+        return np.empty(0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode='r', shape=(rows,))
+
+
+def open_entry(entry) -> BarArrays:
+    """BarArrays over read-only shared memory maps of a cache entry directory."""
+    entry = Path(entry)
+    meta = read_meta(entry)
+    if meta is None:
+        raise FileNotFoundError(f"No bar cache entry at {entry}")
+    arrays = {name: _map(_column_path(entry, name, meta['generation']), COLUMNS[name], meta['rows'])
+              for name in meta['columns']}
+    return BarArrays(meta['symbol'], arrays['ts'], arrays['open'], arrays['high'], arrays['low'],
+                     arrays['close'], arrays.get('volume'), arrays.get('spread'), utc=meta['utc'])
+
+
+def find_entry(cache_dir, symbol: str, timeframe: Optional[str] = None) -> Optional[Path]:
+    """The entry of `symbol` (at `timeframe`, else the first cached one) in a cache directory."""
+    root = Path(cache_dir or default_cache_dir())
+    pattern = f"{symbol}_{timeframe.upper()}" if timeframe else f"{symbol}_*"
+    for path in sorted(root.glob(pattern)):
+        if (path / META_NAME).exists():
+            return path
+    return None
+
+
+def open_bars(symbol: str, timeframe: str = DEFAULT_TIMEFRAME, cache_dir=None) -> BarArrays:
+    """Cached bars of one symbol / timeframe (zero-copy)."""
+    return open_entry(entry_dir(symbol, timeframe, cache_dir))
+
+
+# -------------------------------- Refreshing -------------------------------- #
+
+def refresh_from_candles(symbol: str, timeframe: str = DEFAULT_TIMEFRAME, cache_dir=None,
+                         dsn: Optional[str] = None, start=None) -> Dict:
+    """
+    Bring an entry up to date with the `candles` table: the first call loads
+    from `start` (or everything), later calls fetch only from the last cached bar.
+    """
+    meta = read_meta(entry_dir(symbol, timeframe, cache_dir))
+    if meta and meta['rows']:
+        if not meta['utc']:
+            raise ValueError(f"{symbol} {timeframe}: cached bars are in broker time; "
+                             f"they cannot be extended from the candles table (UTC)")
+        start = pd.Timestamp(meta['last_ns'], tz='UTC')
+    return append_entry(read_candles(symbol, start, None, dsn), timeframe, cache_dir, 'candles')
+
+
+_TIMEFRAME_IN_NAME = re.compile(r'_((?:M|H|D|W|MN|T)\d+)(?:_|$)', re.IGNORECASE)
+
+
+def timeframe_from_name(path: Path) -> Optional[str]:
+    """'M5' from 'NAS100_M5.parquet' / 'NAS100_M5_2025.arrow'."""
+    match = _TIMEFRAME_IN_NAME.search(Path(path).stem)
+    return match.group(1).upper() if match else None
+
+
+def import_file(path, symbol: Optional[str] = None, timeframe: Optional[str] = None, cache_dir=None,
+                rebuild: bool = False) -> Dict:
+    """
+    Cache a Parquet / Arrow bar file (e.g. tick_bars.py output). Bars newer
+    than the entry are appended unless `rebuild`, which replaces the entry.
+    """
+    path = Path(path)
+    symbol = symbol or path.stem.split('_')[0]
+    timeframe = timeframe or timeframe_from_name(path) or DEFAULT_TIMEFRAME
+    bars = read_bar_file(path, symbol)
+    if rebuild:
+        meta = write_entry(bars, timeframe, cache_dir, str(path))
+        meta['appended'] = meta['rows']
+        return meta
+    return append_entry(bars, timeframe, cache_dir, str(path))
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description='Build / refresh the memory-mapped bar cache')
+    parser.add_argument('inputs', nargs='*', type=Path, help='Parquet / Arrow bar files to cache')
+    parser.add_argument('--refresh', action='append', metavar='SYMBOL', default=[],
+                        help='Append new bars of SYMBOL from the candles table (repeatable)')
+    parser.add_argument('--timeframe', default=None,
+                        help=f'Timeframe label (default: from the file name, else {DEFAULT_TIMEFRAME})')
+    parser.add_argument('--symbol', default=None, help='Symbol for file inputs (default: file name up to the first _)')
+    parser.add_argument('--start', default=None, help='First bar when an entry is built from candles')
+    parser.add_argument('--dsn', default=None, help='Postgres URL (default: TP_POSTGRES_URL / POSTGRES_URL)')
+    parser.add_argument('--rebuild', action='store_true', help='Replace entries from files instead of appending')
+    parser.add_argument('--cache-dir', type=Path, default=None,
+                        help=f'Cache directory (default: {CACHE_ENV} or {DEFAULT_CACHE_DIR})')
+    parser.add_argument('--list', action='store_true', help='List cached entries')
+    args = parser.parse_args()
+
+    if not (args.inputs or args.refresh or args.list):
+        parser.error('give bar files, --refresh SYMBOL or --list')
+
+    metrics = PipelineMetrics('bar_cache')
+    for path in args.inputs:
+        with metrics.stage('load') as stage:
+            meta = import_file(path, args.symbol, args.timeframe, args.cache_dir, args.rebuild)
+            stage.rows = meta['appended']
+        print(f"✅ {meta['symbol']} {meta['timeframe']}: +{meta['appended']:,} bars "
+              f"({meta['rows']:,} cached, last {meta['last_ts']}) <- {path.name}")
+    for symbol in args.refresh:
+        with metrics.stage('load') as stage:
+            meta = refresh_from_candles(symbol, args.timeframe or DEFAULT_TIMEFRAME, args.cache_dir, args.dsn,
+                                        args.start)
+            stage.rows = meta['appended']
+        print(f"✅ {symbol} {meta['timeframe']}: +{meta['appended']:,} bars from candles "
+              f"({meta['rows']:,} cached, last {meta['last_ts']})")
+    if args.list:
+        entries = list_entries(args.cache_dir)
+        if not entries:
+            print(f"No cached bars in {args.cache_dir or default_cache_dir()}")
+        for meta in entries:
+            clock = 'UTC' if meta['utc'] else 'broker'
+            print(f"{meta['symbol']:<12} {meta['timeframe']:<5} {meta['rows']:>12,} bars  "
+                  f"{meta['first_ts']} .. {meta['last_ts']} ({clock})  {', '.join(meta['columns'][5:]) or '-'}")
+    metrics.export()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'bar_cache'))
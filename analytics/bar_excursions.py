@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Bar Excursions
+==============
+Recompute MFE/MAE, time-to-MFE/MAE and post-exit RunUp/RunDown for every
+trade by replaying it over stored bars, so runs from EA versions that did not
+log excursions (v2.x, v3.x), or only an MT5 report, get the same columns as
+the current trades CSV.
+
+For each trade, the bar holding the open and the bar holding the close are
+found with searchsorted on the bar times. The excursion extremes are then
+segment reductions (maximum/minimum.reduceat) over the high / low arrays for
+every trade at once, and the bar at which each extreme was first reached is
+found on the gathered windows a memory-bounded chunk of trades at a time.
+Bars come from bar_store.py (memory-mapped Parquet / Arrow files, the
+bar_cache.py cache, or the `candles` hypertable).
+
+Definitions follow TP_Trade_Tracker.mqh: MFE >= 0 and MAE <= 0 in pips from
+the open price, RunUp >= 0 and RunDown <= 0 from the close price over the
+PostExitMonitorBars chart bars after the close bar, TimeBars in chart bars
+since the entry (close) bar. Bars are coarser than the EA's tick sampling:
+the whole entry and exit bars are included, so extremes are upper bounds.
+
+Usage:
+    from bar_excursions import load_trades, replay_file
+
+    trades = load_trades('X_trades.csv')              # or an MT5 report / joined .arrow
+    result = replay_file('X_trades.csv', 'bars/')     # one row per trade
+
+    python bar_excursions.py X_MT5Report.csv --bars bars/ --chart-minutes 5 --out-dir excursions/
+    python bar_excursions.py X_trades.csv --bars candles --compare
+    python bar_excursions.py X_trades.csv --bars cache
+"""
+
+import argparse
+import re
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarArrays, load_bars
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+from time_segments import DEFAULT_BROKER, BrokerClock, broker_to_utc
+
+DEFAULT_POST_EXIT_BARS = 50     # PostExitMonitorBars in the EAs
+CHUNK_ELEMENTS = 5_000_000      # gathered bar positions held in memory per chunk
+OUTPUT_SUFFIX = '_excursions.csv'
+EXCURSION_FIELDS = ['Pips', 'HoldTimeBars',
+                    'MFE_Price', 'MFE_Pips', 'MFE_TimeBars', 'MAE_Price', 'MAE_Pips', 'MAE_TimeBars',
+                    'RunUp_Price', 'RunUp_Pips', 'RunUp_TimeBars', 'RunDown_Price', 'RunDown_Pips',
+                    'RunDown_TimeBars']
+_LOAD_MARGIN = np.timedelta64(2, 'D')  # bars loaded around the trades (clock offsets, post-exit window)
+
+
+# --------------------------------- Trades ----------------------------------- #
+
+def load_trades(path) -> pd.DataFrame:
+    """
+    Closed trades as Key, Symbol, Direction (Long/Short), OpenTime, CloseTime
+    (broker time), OpenPrice, ClosePrice, plus any excursion columns the EA logged.
+
+    Accepts an EA trades CSV, an MT5 report, or joined trades (.json / .arrow).
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        with open(path, encoding='utf-8-sig', errors='replace') as f:
+            header = f.readline()
+        if 'RowType' in header:
+            return _ea_trades(path)
+        from trade_join import pair_mt5_deals, read_mt5_deals
+
+        entries, exits = pair_mt5_deals(read_mt5_deals(path))
+        return pd.DataFrame({
+            'Key': entries['Deal'].to_numpy(),
+            'Symbol': entries['Symbol'].astype(str).to_numpy(),
+            'Direction': np.where(entries['Type'].astype(str).str.lower() == 'buy', 'Long', 'Short'),
+            'OpenTime': entries['Time'].to_numpy(),
+            'CloseTime': exits['Time'].to_numpy(),
+            'OpenPrice': entries['Price'].to_numpy(np.float64),
+            'ClosePrice': exits['Price'].to_numpy(np.float64),
+        })
+
+    from processed_dataset_cache import load_processed_trades
+
+    columns = {'IN_Deal': 'Key', 'Symbol_OP_03': 'Symbol', 'Trade_Direction': 'Direction',
+               'IN_MT_MASTER_DATE_TIME': 'OpenTime', 'OUT_MT_MASTER_DATE_TIME': 'CloseTime',
+               'IN_Symbol_Price_OP_03': 'OpenPrice', 'OUT_Symbol_Price_OP_01': 'ClosePrice',
+               **{f'EA_{name}': f'Logged_{name}' for name in EXCURSION_FIELDS if 'Price' not in name}}
+    trades = load_processed_trades(path, columns=list(columns)).rename(columns=columns)
+    for col in ('OpenTime', 'CloseTime'):
+        trades[col] = pd.to_datetime(trades[col], errors='coerce').astype('datetime64[ns]')
+    trades['Direction'] = trades['Direction'].astype(str)
+    trades['Symbol'] = trades['Symbol'].astype(str)
+    return trades
+
+
+def _ea_trades(path: Path) -> pd.DataFrame:
+    from trade_join import _first_price, index_ea_trades, read_ea_trades
+
+    index = index_ea_trades(read_ea_trades(path))
+    entry, exit_ = index.entry[index.has_entry & index.has_exit], index.exit[index.has_entry & index.has_exit]
+
+    def times(rows, column):
+        value = rows[column] if column in rows else pd.Series(pd.NaT, index=rows.index)
+        return (value.fillna(rows['Timestamp']) if 'Timestamp' in rows else value).to_numpy('datetime64[ns]')
+
+    trades = pd.DataFrame({
+        'Key': entry['Ticket'].to_numpy(),
+        'Symbol': entry['Symbol'].astype(str).to_numpy(),
+        'Direction': np.where(entry['Type'].astype(str).str.upper() == 'BUY', 'Long', 'Short'),
+        'OpenTime': times(entry, 'OpenTime'),
+        'CloseTime': times(exit_, 'CloseTime'),
+        'OpenPrice': _first_price(entry, 'OpenPrice').to_numpy(np.float64),
+        'ClosePrice': _first_price(exit_, 'ClosePrice').to_numpy(np.float64),
+    })
+    for name in EXCURSION_FIELDS:
+        if 'Price' not in name and name in exit_:
+            trades[f'Logged_{name}'] = pd.to_numeric(exit_[name], errors='coerce').to_numpy()
+    return trades
+
+
+def pip_size(symbol: str, price: float) -> float:
+    """
+    Price units per pip as TP_Trade_Tracker.CalculatePips counts them: JPY
+    pairs 0.01, symbols quoted with <= 3 digits (indices, metals, energies) 1,
+    other forex 0.0001. Digits are not in the trade data, so they are inferred
+    from the price level.
+    """
+    if 'JPY' in symbol.upper():
+        return 0.01
+    return 1.0 if price >= 20 else 0.0001
+
+
+def chart_minutes_from_name(name: str) -> Optional[int]:
+    """Chart timeframe from run names like `TP_NAS100_M05_...` (M1..M30, H1..H4)."""
+    match = re.search(r'_(M|H)(\d{1,2})(?:_|$)', name)
+    if not match:
+        return None
+    return int(match.group(2)) * (60 if match.group(1) == 'H' else 1)
+
+
+# -------------------------------- Reductions -------------------------------- #
+
+def segment_reduce(ufunc: np.ufunc, values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    ufunc.reduce(values[lo[i]:hi[i]]) for every i (hi > lo), windows may overlap.
+
+    reduceat on interleaved (lo, hi) indices reduces each [lo, hi) directly
+    on `values` (a memory-mapped array is not copied); windows reaching the
+    end of the array are served from a suffix accumulation instead.
+    """
+    n = len(values)
+    out = np.empty(len(lo), dtype=values.dtype)
+    inner = hi < n
+    if inner.any():
+        idx = np.empty(2 * int(inner.sum()), dtype=np.intp)
+        idx[0::2], idx[1::2] = lo[inner], hi[inner]
+        out[inner] = ufunc.reduceat(values, idx)[0::2]
+    if (~inner).any():
+        first = int(lo[~inner].min())
+        suffix = ufunc.accumulate(values[first:][::-1])[::-1]
+        out[~inner] = suffix[lo[~inner] - first]
+    return out
+
+
+def first_match(lo: np.ndarray, hi: np.ndarray, *pairs: Tuple[np.ndarray, np.ndarray]) -> List[np.ndarray]:
+    """
+    For each (values, target) pair: index of the first values[j] == target[i]
+    with lo[i] <= j < hi[i] (hi[i] if none). The windows are gathered once per
+    chunk of trades and shared by all pairs.
+    """
+    outs = [hi.copy() for _ in pairs]
+    lengths = hi - lo
+    ends = np.cumsum(lengths)
+    start = 0
+    while start < len(lo):
+        # Chunk of trades whose windows fit in CHUNK_ELEMENTS gathered positions
+        base = ends[start - 1] if start else 0
+        stop = max(start + 1, int(np.searchsorted(ends, base + CHUNK_ELEMENTS, side='right')))
+        chunk_len = lengths[start:stop]
+        offsets = ends[start:stop] - chunk_len - base
+        total = int(ends[stop - 1] - base)
+        if total:
+            steps = np.arange(total)
+            positions = np.repeat(lo[start:stop] - offsets, chunk_len) + steps
+            nonempty = chunk_len > 0
+            for (values, target), out in zip(pairs, outs):
+                hit = values[positions] == np.repeat(target[start:stop], chunk_len)
+                firsts = np.full(stop - start, total)
+                firsts[nonempty] = np.minimum.reduceat(np.where(hit, steps, total), offsets[nonempty])
+                found = firsts < total
+                out[start:stop][found] = positions[firsts[found]]
+        start = stop
+    return outs
+
+
+# --------------------------------- Replay ----------------------------------- #
+
+def replay(bars: BarArrays, open_ns: np.ndarray, close_ns: np.ndarray, open_price: np.ndarray,
+           close_price: np.ndarray, is_buy: np.ndarray, pip: float,
+           post_exit_bars: int = DEFAULT_POST_EXIT_BARS, chart_ns: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Excursion columns (EXCURSION_FIELDS + Bars_Covered) for trades of one
+    symbol; times are int64 ns in the bars' clock. Trades outside the bar
+    range get NaN.
+    """
+    ts, high, low = bars.ts, bars.high, bars.low
+    count = len(open_ns)
+    bar_ns = bars.bar_ns
+    chart_ns = chart_ns or bar_ns or 1
+    nan = np.full(count, np.nan)
+    if not len(ts) or not count:
+        return {**{name: nan.copy() for name in EXCURSION_FIELDS}, 'Bars_Covered': np.zeros(count, dtype=bool)}
+
+    entry_bar = np.searchsorted(ts, open_ns, side='right') - 1
+    exit_bar = np.searchsorted(ts, close_ns, side='right') - 1
+    covered = ((entry_bar >= 0) & (exit_bar >= entry_bar) & (close_ns < ts[-1] + bar_ns)
+               & np.isfinite(open_price) & np.isfinite(close_price))
+    # Dummy one-bar windows for uncovered trades keep the reductions simple
+    lo = np.where(covered, entry_bar, 0)
+    hi = np.where(covered, exit_bar + 1, 1)
+
+    window_high = segment_reduce(np.maximum, high, lo, hi)
+    window_low = segment_reduce(np.minimum, low, lo, hi)
+    high_at, low_at = first_match(lo, hi, (high, window_high), (low, window_low))
+
+    sign = np.where(is_buy, 1.0, -1.0)
+    fav_price = np.where(is_buy, window_high, window_low)
+    adv_price = np.where(is_buy, window_low, window_high)
+    mfe = np.maximum(sign * (fav_price - open_price), 0.0) / pip
+    mae = np.minimum(sign * (adv_price - open_price), 0.0) / pip
+
+    def elapsed(at, origin):
+        return (ts[np.minimum(at, len(ts) - 1)] - ts[origin]) // chart_ns
+
+    mfe_bars = np.where(mfe > 0, elapsed(np.where(is_buy, high_at, low_at), lo), 0)
+    mae_bars = np.where(mae < 0, elapsed(np.where(is_buy, low_at, high_at), lo), 0)
+
+    # Post-exit monitor: the chart bars after the close bar
+    post_lo = np.minimum(hi, len(ts))
+    post_hi = np.searchsorted(ts, ts[hi - 1] + (post_exit_bars + 1) * chart_ns, side='left')
+    has_post = covered & (post_hi > post_lo)
+    plo = np.where(has_post, post_lo, 0)
+    phi = np.where(has_post, post_hi, 1)
+    post_high = segment_reduce(np.maximum, high, plo, phi)
+    post_low = segment_reduce(np.minimum, low, plo, phi)
+    post_high_at, post_low_at = first_match(plo, phi, (high, post_high), (low, post_low))
+    run_up = np.maximum(sign * (np.where(is_buy, post_high, post_low) - close_price), 0.0) / pip
+    run_down = np.minimum(sign * (np.where(is_buy, post_low, post_high) - close_price), 0.0) / pip
+    run_up_bars = np.where(run_up > 0, elapsed(np.where(is_buy, post_high_at, post_low_at), hi - 1), 0)
+    run_down_bars = np.where(run_down < 0, elapsed(np.where(is_buy, post_low_at, post_high_at), hi - 1), 0)
+
+    def masked(values, mask=covered):
+        return np.where(mask, values, np.nan)
+
+    return {
+        'Pips': masked(sign * (close_price - open_price) / pip),
+        'HoldTimeBars': masked((ts[hi - 1] - ts[lo]) // chart_ns),
+        'MFE_Price': masked(open_price + sign * mfe * pip),
+        'MFE_Pips': masked(mfe),
+        'MFE_TimeBars': masked(mfe_bars),
+        'MAE_Price': masked(open_price + sign * mae * pip),
+        'MAE_Pips': masked(mae),
+        'MAE_TimeBars': masked(mae_bars),
+        'RunUp_Price': masked(close_price + sign * run_up * pip, has_post),
+        'RunUp_Pips': masked(run_up, has_post),
+        'RunUp_TimeBars': masked(run_up_bars, has_post),
+        'RunDown_Price': masked(close_price + sign * run_down * pip, has_post),
+        'RunDown_Pips': masked(run_down, has_post),
+        'RunDown_TimeBars': masked(run_down_bars, has_post),
+        'Bars_Covered': covered,
+    }
+
+
+def replay_trades(trades: pd.DataFrame, bar_source, post_exit_bars: int = DEFAULT_POST_EXIT_BARS,
+                  chart_minutes: Optional[int] = None, pip: Optional[float] = None,
+                  broker: BrokerClock = DEFAULT_BROKER, dsn: Optional[str] = None,
+                  bar_cache: Optional[Dict[str, BarArrays]] = None) -> pd.DataFrame:
+    """
+    `trades` (load_trades) with EXCURSION_FIELDS and Bars_Covered added,
+    replayed symbol by symbol over bars from `bar_source` (see bar_store.load_bars).
+
+    File bars are read once per symbol and kept in `bar_cache` when given;
+    the candles table is queried for each symbol's trade range.
+    """
+    result = trades.copy()
+    for name in EXCURSION_FIELDS:
+        result[name] = np.nan
+    result['Bars_Covered'] = False
+    chart_ns = int(chart_minutes * 60 * 1e9) if chart_minutes else None
+
+    for symbol, group in trades.groupby('Symbol', sort=True):
+        open_times = group['OpenTime'].to_numpy('datetime64[ns]')
+        close_times = group['CloseTime'].to_numpy('datetime64[ns]')
+        valid = ~(np.isnat(open_times) | np.isnat(close_times))
+        if not valid.any():
+            continue
+        start = open_times[valid].min() - _LOAD_MARGIN
+        end = close_times[valid].max() + _LOAD_MARGIN
+        if bar_cache is None:
+            bars = load_bars(bar_source, symbol, pd.Timestamp(start, tz='UTC'), pd.Timestamp(end, tz='UTC'), dsn)
+        elif symbol in bar_cache:
+            bars = bar_cache[symbol]
+        else:
+            bars = bar_cache[symbol] = load_bars(bar_source, symbol, dsn=dsn)
+        if bars.utc:
+            open_ns = broker_to_utc(open_times, broker).view(np.int64)
+            close_ns = broker_to_utc(close_times, broker).view(np.int64)
+        else:
+            open_ns, close_ns = open_times.view(np.int64), close_times.view(np.int64)
+        open_price = group['OpenPrice'].to_numpy(np.float64)
+        unit = pip or pip_size(symbol, float(np.nanmedian(open_price)) if len(open_price) else 0.0)
+        values = replay(bars, np.where(valid, open_ns, np.iinfo(np.int64).min), close_ns, open_price,
+                        group['ClosePrice'].to_numpy(np.float64), (group['Direction'] == 'Long').to_numpy(),
+                        unit, post_exit_bars, chart_ns)
+        for name, column in values.items():
+            result.loc[group.index, name] = column
+    return result
+
+
+def replay_file(path, bar_source, **kwargs) -> pd.DataFrame:
+    """load_trades + replay_trades; the chart timeframe defaults to the one in the file name."""
+    if kwargs.get('chart_minutes') is None:
+        kwargs['chart_minutes'] = chart_minutes_from_name(Path(path).stem)
+    return replay_trades(load_trades(path), bar_source, **kwargs)
+
+
+def compare_logged(result: pd.DataFrame) -> pd.DataFrame:
+    """Replayed vs EA-logged excursions where both exist: correlation and median absolute difference."""
+    rows = []
+    for name in ('MFE_Pips', 'MAE_Pips', 'MFE_TimeBars', 'MAE_TimeBars', 'RunUp_Pips', 'RunDown_Pips'):
+        logged = f'Logged_{name}'
+        if logged not in result:
+            continue
+        both = result[[name, logged]].dropna()
+        if both.empty:
+            continue
+        rows.append({'field': name, 'trades': len(both),
+                     'correlation': both[name].corr(both[logged]),
+                     'median_abs_diff': float((both[name] - both[logged]).abs().median())})
+    return pd.DataFrame(rows)
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description='Recompute MFE/MAE and RunUp/RunDown by replaying trades over bars')
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='EA trades CSV, MT5 report CSV, or joined trades (.json/.arrow)')
+    parser.add_argument('--bars', required=True,
+                        help="Bar source: a Parquet/Arrow bar file, a directory of per-symbol files or cache entries, "
+                             "'cache' (bar_cache.py) or 'candles'")
+    parser.add_argument('--dsn', default=None, help='Postgres URL for --bars candles (default: TP_POSTGRES_URL)')
+    parser.add_argument('--chart-minutes', type=int, default=None,
+                        help='Chart timeframe for TimeBars / the post-exit window (default: from the file name, '
+                             'else the bar spacing)')
+    parser.add_argument('--post-exit-bars', type=int, default=DEFAULT_POST_EXIT_BARS,
+                        help='RunUp/RunDown monitor window in chart bars (default: %(default)s)')
+    parser.add_argument('--pip-size', type=float, default=None, help='Price units per pip (default: per symbol)')
+    parser.add_argument('--broker-utc-offset', type=float, default=DEFAULT_BROKER.utc_offset_hours,
+                        help='Trade server standard UTC offset, for UTC bars (default: %(default)s)')
+    parser.add_argument('--broker-dst', choices=['us', 'eu', 'none'], default=DEFAULT_BROKER.dst,
+                        help='Trade server DST rule, for UTC bars (default: %(default)s)')
+    parser.add_argument('--out-dir', type=Path, default=None,
+                        help=f'Where to write <input>{OUTPUT_SUFFIX} (default: next to the input)')
+    parser.add_argument('--compare', action='store_true', help='Compare with the excursions the EA logged')
+    args = parser.parse_args()
+
+    broker = BrokerClock(args.broker_utc_offset, args.broker_dst)
+    metrics = PipelineMetrics('bar_excursions')
+    bar_cache: Optional[Dict[str, BarArrays]] = None if args.bars == 'candles' else {}
+    written: List[Path] = []
+    for path in args.inputs:
+        with metrics.stage('load') as stage:
+            trades = load_trades(path)
+            stage.rows = len(trades)
+        if trades.empty:
+            print(f"⚠️  {path.name}: no closed trades")
+            continue
+        chart_minutes = args.chart_minutes or chart_minutes_from_name(path.stem)
+        with metrics.stage('aggregate', rows=len(trades)):
+            result = replay_trades(trades, args.bars, args.post_exit_bars, chart_minutes, args.pip_size,
+                                   broker, args.dsn, bar_cache)
+        with metrics.stage('render', rows=len(result)):
+            out_dir = args.out_dir or path.parent
+            out_dir.mkdir(parents=True, exist_ok=True)
+            output = out_dir / f"{path.stem}{OUTPUT_SUFFIX}"
+            result.to_csv(output, index=False)
+            written.append(output)
+            covered = int(result['Bars_Covered'].sum())
+            timeframe = f"M{chart_minutes}" if chart_minutes else 'bar-spacing'
+            print(f"✅ {path.name}: {covered:,}/{len(result):,} trades replayed ({timeframe} TimeBars) -> {output}")
+            if args.compare:
+                comparison = compare_logged(result)
+                if comparison.empty:
+                    print("   No logged excursions to compare")
+                else:
+                    print(comparison.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    metrics.export()
+    return 0 if written else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'bar_excursions'))
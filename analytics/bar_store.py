@@ -0,0 +1,278 @@
+"""
+Bar Store
+=========
+OHLC bars as contiguous NumPy arrays for the bar-replay engines, read from
+
+  * Parquet bar files (memory-mapped reads, row groups filtered by symbol),
+  * Arrow IPC / Feather files (memory-mapped, zero-copy),
+  * bar_cache.py entries (memory-mapped NumPy columns, zero-copy), or
+  * the backend's `candles` hypertable (COPY ... TO STDOUT, one round trip).
+
+Bar files may hold one symbol or many (a `symbol` column). Column names are
+matched case-insensitively: a time column (ts / time / timestamp / datetime)
+and open, high, low, close; volume and spread are optional. Timezone-aware
+times are UTC; naive times are taken as broker wall-clock time (MT5 exports).
+
+The database is only needed for `read_candles`; it uses psycopg and
+TP_POSTGRES_URL (or the backend's POSTGRES_URL).
+
+Usage:
+    from bar_store import load_bars
+
+    bars = load_bars('bars/NAS100_M1.parquet', 'NAS100')
+    bars = load_bars('candles', 'NAS100', start=..., end=...)
+    bars = load_bars('cache', 'NAS100')          # the default bar cache directory
+    bars.ts, bars.high, bars.low
+"""
+
+import io
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+try:  # optional: only for the candles hypertable
+    import psycopg
+except ImportError:
+    psycopg = None
+
+DSN_ENVS = ('TP_POSTGRES_URL', 'POSTGRES_URL')
+CANDLES_SOURCE = 'candles'
+CACHE_SOURCE = 'cache'
+CACHE_META = 'meta.json'
+TIME_COLUMNS = ('ts', 'time', 'timestamp', 'datetime', 'date')
+PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+OPTIONAL_COLUMNS = ('volume', 'spread')
+BAR_FILE_SUFFIXES = ('.parquet', '.arrow', '.feather', '.ipc')
+
+
+@dataclass
+class BarArrays:
+    """One symbol's bars sorted by time; `ts` is int64 epoch nanoseconds (UTC when `utc`)."""
+    symbol: str
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: Optional[np.ndarray] = None
+    spread: Optional[np.ndarray] = None
+    utc: bool = True
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @property
+    def bar_ns(self) -> int:
+        """Typical bar spacing (median of the first thousand gaps)."""
+        if len(self.ts) < 2:
+            return 0
+        return int(np.median(np.diff(self.ts[:1001])))
+
+    def between(self, start_ns: int, end_ns: int) -> 'BarArrays':
+        """Bars with start_ns <= ts <= end_ns (views, no copy)."""
+        lo = np.searchsorted(self.ts, start_ns, side='left')
+        hi = np.searchsorted(self.ts, end_ns, side='right')
+        return BarArrays(self.symbol, *(None if a is None else a[lo:hi] for a in (
+            self.ts, self.open, self.high, self.low, self.close, self.volume, self.spread)), utc=self.utc)
+
+
+# -------------------------------- Bar files --------------------------------- #
+
+def _column_map(names) -> Dict[str, str]:
+    """Canonical name -> file column name."""
+    lower = {name.lower(): name for name in names}
+    found = {}
+    for canonical in TIME_COLUMNS:
+        if canonical in lower:
+            found['ts'] = lower[canonical]
+            break
+    for canonical in PRICE_COLUMNS + OPTIONAL_COLUMNS + ('symbol',):
+        if canonical in lower:
+            found[canonical] = lower[canonical]
+    missing = [c for c in ('ts',) + PRICE_COLUMNS if c not in found]
+    if missing:
+        raise ValueError(f"bar data has no {missing} column(s) (columns: {list(names)})")
+    return found
+
+
+def _numeric(column: pa.ChunkedArray) -> np.ndarray:
+    if pa.types.is_decimal(column.type) or not pa.types.is_floating(column.type):
+        column = pc.cast(column, pa.float64())
+    return column.to_numpy()
+
+
+def _times(column: pa.ChunkedArray):
+    """(int64 ns, is_utc) from a timestamp / date / text column."""
+    kind = column.type
+    if pa.types.is_string(kind) or pa.types.is_large_string(kind):
+        column = pc.strptime(pc.replace_substring(column, '.', '-'), format='%Y-%m-%d %H:%M:%S', unit='ns',
+                             error_is_null=True)
+        kind = column.type
+    if pa.types.is_date(kind):
+        column = pc.cast(column, pa.timestamp('ns'))
+        kind = column.type
+    if not pa.types.is_timestamp(kind):
+        raise ValueError(f"bar time column has unsupported type {kind}")
+    utc = kind.tz is not None
+    if kind.unit != 'ns':
+        column = pc.cast(column, pa.timestamp('ns', tz=kind.tz))
+    return column.to_numpy().astype('datetime64[ns]').view(np.int64), utc
+
+
+def bars_from_table(table: pa.Table, symbol: str = '') -> BarArrays:
+    """BarArrays from an Arrow table of one symbol's bars (sorted here if needed)."""
+    columns = _column_map(table.column_names)
+    ts, utc = _times(table.column(columns['ts']))
+    arrays = {name: _numeric(table.column(columns[name])) for name in PRICE_COLUMNS + OPTIONAL_COLUMNS
+              if name in columns}
+    if len(ts) > 1 and np.any(ts[1:] < ts[:-1]):
+        order = np.argsort(ts, kind='stable')
+        ts = ts[order]
+        arrays = {name: values[order] for name, values in arrays.items()}
+    return BarArrays(symbol, ts, arrays['open'], arrays['high'], arrays['low'], arrays['close'],
+                     arrays.get('volume'), arrays.get('spread'), utc=utc)
+
+
+def read_bar_file(path, symbol: Optional[str] = None) -> BarArrays:
+    """
+    Bars of `symbol` from a Parquet or Arrow IPC file.
+
+    Arrow IPC files are memory-mapped and, when the columns are already
+    float64 / timestamp[ns] without nulls, used without copying; so are
+    bar_cache.py entry directories.
+    """
+    path = Path(path)
+    if path.is_dir():
+        from bar_cache import open_entry
+        return open_entry(path)
+    if path.suffix == '.parquet':
+        names = pq.read_schema(path).names
+        columns = _column_map(names)
+        filters = [(columns['symbol'], '=', symbol)] if symbol and 'symbol' in columns else None
+        table = pq.read_table(path, columns=list(columns.values()), filters=filters, memory_map=True)
+    else:
+        with pa.memory_map(str(path), 'r') as source:
+            table = ipc.open_file(source).read_all()
+        columns = _column_map(table.column_names)
+        if symbol and 'symbol' in columns:
+            table = table.filter(pc.equal(table.column(columns['symbol']), symbol))
+    return bars_from_table(table, symbol or path.stem)
+
+
+def find_bar_file(directory, symbol: str) -> Optional[Path]:
+    """
+    `<symbol>.parquet`, `<symbol>_*.parquet` (or Arrow) in a directory of bar
+    files, else a `<symbol>_<TF>` entry of a bar cache directory.
+    """
+    directory = Path(directory)
+    for suffix in BAR_FILE_SUFFIXES:
+        for pattern in (f"{symbol}{suffix}", f"{symbol}_*{suffix}"):
+            matches = sorted(directory.glob(pattern))
+            if matches:
+                return matches[0]
+    entries = sorted(path for path in directory.glob(f"{symbol}_*") if (path / CACHE_META).exists())
+    return entries[0] if entries else None
+
+
+# ---------------------------- Candles hypertable ---------------------------- #
+
+def default_dsn() -> Optional[str]:
+    """libpq URL from the environment (SQLAlchemy driver suffixes removed)."""
+    for env in DSN_ENVS:
+        value = os.environ.get(env)
+        if value:
+            return value.replace('postgresql+psycopg://', 'postgresql://').replace('postgresql+asyncpg://',
+                                                                                 'postgresql://')
+    return None
+
+
+def read_candles(symbol: str, start=None, end=None, dsn: Optional[str] = None) -> BarArrays:
+    """
+    Bars of `symbol` from the `candles` hypertable (UTC), optionally limited to [start, end].
+
+    The rows are streamed with COPY in CSV form and parsed by Arrow, which is
+    far cheaper than fetching Numeric rows through the cursor.
+    """
+    if psycopg is None:
+        raise RuntimeError("psycopg is not installed; install it to read bars from the candles table")
+    dsn = dsn or default_dsn()
+    if not dsn:
+        raise RuntimeError(f"No database configured (set {' or '.join(DSN_ENVS)})")
+
+    conditions, params = ['s.name = %s'], [symbol]
+    if start is not None:
+        conditions.append('c.ts >= %s')
+        params.append(start)
+    if end is not None:
+        conditions.append('c.ts <= %s')
+        params.append(end)
+    query = (
+        "COPY (SELECT (extract(epoch FROM c.ts) * 1000000)::bigint AS ts_us, c.open::float8, c.high::float8, "
+        "c.low::float8, c.close::float8, coalesce(c.volume, 0)::float8 "
+        "FROM candles c JOIN symbols s ON s.id = c.symbol_id "
+        f"WHERE {' AND '.join(conditions)} ORDER BY c.ts) TO STDOUT (FORMAT csv)"
+    )
+    buffer = io.BytesIO()
+    with psycopg.connect(dsn) as conn, conn.cursor() as cur:
+        with cur.copy(query, params) as copy:
+            for chunk in copy:
+                buffer.write(chunk)
+    return _bars_from_copy(buffer.getvalue(), symbol)
+
+
+def _bars_from_copy(data: bytes, symbol: str) -> BarArrays:
+    from pyarrow import csv as pa_csv
+
+    names = ['ts_us', 'open', 'high', 'low', 'close', 'volume']
+    if not data:
+        empty = np.empty(0)
+        return BarArrays(symbol, np.empty(0, dtype=np.int64), empty, empty, empty, empty, empty)
+    table = pa_csv.read_csv(
+        io.BytesIO(data),
+        read_options=pa_csv.ReadOptions(column_names=names),
+        convert_options=pa_csv.ConvertOptions(column_types={'ts_us': pa.int64(),
+                                                            **{n: pa.float64() for n in names[1:]}}),
+    )
+    ts = table.column('ts_us').to_numpy() * 1000
+    return BarArrays(symbol, ts, *(table.column(n).to_numpy() for n in names[1:]), utc=True)
+
+
+# --------------------------------- Loading ---------------------------------- #
+
+def load_bars(source, symbol: str, start=None, end=None, dsn: Optional[str] = None) -> BarArrays:
+    """
+    Bars of `symbol` from `source`: 'candles' (the hypertable), 'cache' (the
+    default bar_cache.py directory), a bar file, a cache entry, or a directory
+    of per-symbol bar files / cache entries. File sources are trimmed to
+    [start, end] when given (naive times in the bars' clock, aware ones as UTC).
+    """
+    if str(source) == CANDLES_SOURCE:
+        return read_candles(symbol, start, end, dsn)
+    if str(source) == CACHE_SOURCE:
+        from bar_cache import default_cache_dir
+        source = default_cache_dir()
+    path = Path(source)
+    if path.is_dir() and not (path / CACHE_META).exists():
+        found = find_bar_file(path, symbol)
+        if found is None:
+            raise FileNotFoundError(f"No bar file for {symbol} in {path}")
+        path = found
+    bars = read_bar_file(path, symbol)
+    if start is None and end is None:
+        return bars
+    start_ns = _nanoseconds(start) if start is not None else np.iinfo(np.int64).min
+    end_ns = _nanoseconds(end) if end is not None else np.iinfo(np.int64).max
+    return bars.between(start_ns, end_ns)
+
+
+def _nanoseconds(value) -> int:
+    stamp = pd.Timestamp(value)
+    return (stamp.tz_convert(None) if stamp.tzinfo is not None else stamp).as_unit('ns').value
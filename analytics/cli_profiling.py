@@ -0,0 +1,275 @@
+"""
+CLI Profiling
+=============
+Shared profiling switches for the analytics / ingestion command-line scripts.
+
+Wrap a script's entry point and it accepts, on top of its own arguments:
+
+    --profile              cProfile the run; prints the top functions and saves
+                           `<name>_<stamp>.pstats` (open with `python -m pstats`)
+    --profile-collapsed    also write `<name>_<stamp>.collapsed`, folded stacks
+                           for flamegraph.pl / speedscope (implies --profile)
+    --trace-memory [N]     tracemalloc: peak traced memory and top N allocation sites,
+                           live at the stage end (or end of main) with the most
+                           traced memory
+    --timings              only the JSON sidecar (cheapest; no profiler overhead)
+    --profile-dir DIR      where outputs go (default: ./profiles)
+
+Whenever one of them is given, a JSON sidecar `<name>_<stamp>.json` records the
+command line, wall time, exit code, the per-stage timings of every
+PipelineMetrics created during the run, and the profile / memory tops, so a
+slower run can be compared against an earlier one.
+
+The collapsed stacks are reconstructed from cProfile's caller edges (time of a
+function shared by its callers in proportion), not sampled, so they are exact
+per edge but approximate for deep paths through functions with many callers.
+
+Usage:
+    from cli_profiling import run_cli
+
+    if __name__ == '__main__':
+        sys.exit(run_cli(main, 'ingest_mt5_batch'))
+"""
+
+import argparse
+import cProfile
+import io
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from pipeline_metrics import collect_runs, on_stage_end, peak_rss_bytes
+
+DEFAULT_PROFILE_DIR = 'profiles'
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 15
+_MAX_STACK_DEPTH = 64
+_MIN_STACK_SECONDS = 1e-6
+
+
+def _profiling_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(add_help=False, allow_abbrev=False, usage=argparse.SUPPRESS)
+    group = parser.add_argument_group('profiling options')
+    group.add_argument('--profile', action='store_true', help='cProfile the run (pstats summary + .pstats file)')
+    group.add_argument('--profile-collapsed', action='store_true',
+                       help='Also write collapsed stacks for flamegraphs (implies --profile)')
+    group.add_argument('--trace-memory', nargs='?', type=int, const=TOP_ALLOCATIONS, default=None, metavar='N',
+                       help=f'tracemalloc top N allocation sites (default {TOP_ALLOCATIONS})')
+    group.add_argument('--timings', action='store_true', help='Write the per-stage timing JSON sidecar only')
+    group.add_argument('--profile-dir', type=Path, default=Path(DEFAULT_PROFILE_DIR),
+                       help=f'Output directory (default: ./{DEFAULT_PROFILE_DIR})')
+    return parser
+
+
+# ------------------------------ Reporting ---------------------------------- #
+
+def _func_label(func) -> str:
+    filename, line, name = func
+    if filename == '~':  # built-in
+        return name.strip('<>')
+    return f"{Path(filename).name}:{line}:{name}"
+
+
+def top_functions(stats: pstats.Stats, n: int = TOP_FUNCTIONS) -> List[Dict]:
+    """Top functions by cumulative time as plain records."""
+    rows = []
+    for func, (cc, nc, tt, ct, _callers) in stats.stats.items():
+        rows.append({'function': _func_label(func), 'calls': nc, 'primitive_calls': cc,
+                     'self_seconds': round(tt, 6), 'cumulative_seconds': round(ct, 6)})
+    rows.sort(key=lambda r: r['cumulative_seconds'], reverse=True)
+    return rows[:n]
+
+
+def collapsed_stacks(stats: pstats.Stats) -> List[str]:
+    """
+    Folded stacks ("root;child;leaf microseconds") from the cProfile call graph.
+
+    A function's self time is spread over the paths reaching it in proportion
+    to the cumulative time each caller edge contributed.
+    """
+    entries = stats.stats
+    children: Dict = {}
+    for func, (_cc, _nc, _tt, _ct, callers) in entries.items():
+        for caller in callers:
+            children.setdefault(caller, []).append(func)
+    roots = [func for func, value in entries.items() if not value[4]]
+
+    folded: Dict[str, float] = {}
+
+    def walk(func, path, scale):
+        _cc, _nc, tt, ct, _callers = entries[func]
+        key = ';'.join(path)
+        folded[key] = folded.get(key, 0.0) + tt * scale
+        if len(path) >= _MAX_STACK_DEPTH:
+            return
+        for child in children.get(func, ()):
+            child_label = _func_label(child)
+            if child_label in path:  # recursion: time already counted on the outer frame
+                continue
+            edge_ct = entries[child][4][func][3]
+            child_ct = entries[child][3]
+            if child_ct <= 0 or edge_ct * scale < _MIN_STACK_SECONDS:
+                continue
+            walk(child, path + [child_label], scale * edge_ct / child_ct)
+
+    for root in roots:
+        walk(root, [_func_label(root)], 1.0)
+    return [f"{stack} {int(round(seconds * 1e6))}" for stack, seconds in folded.items()
+            if seconds * 1e6 >= 1]
+
+
+def top_allocations(snapshot: tracemalloc.Snapshot, n: int = TOP_ALLOCATIONS) -> List[Dict]:
+    # The profiling machinery itself is not an allocation site of the script
+    stats = snapshot.filter_traces([
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, cProfile.__file__),
+        tracemalloc.Filter(False, pstats.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    ]).statistics('lineno')
+    return [{'location': f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}",
+             'size_bytes': s.size, 'count': s.count} for s in stats[:n]]
+
+
+# --------------------------------- Runner ---------------------------------- #
+
+class _AllocationSampler:
+    """
+    Keeps the tracemalloc snapshot taken when traced memory was highest,
+    sampled at every PipelineMetrics stage end and when main() returns, so the
+    sites reported are the ones holding memory while the script ran rather
+    than what is left once it has finished.
+    """
+
+    def __init__(self, profiler: Optional[cProfile.Profile]):
+        self.profiler = profiler
+        self.snapshot: Optional[tracemalloc.Snapshot] = None
+        self.size = -1
+        self.at = ''
+
+    def sample(self, at: str):
+        current, _peak = tracemalloc.get_traced_memory()
+        if current <= self.size:
+            return
+        if self.profiler:  # keep the snapshot out of the profile
+            self.profiler.disable()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.size, self.at = current, at
+        if self.profiler:
+            self.profiler.enable()
+
+    def on_stage_end(self, pipeline: str, stage: str):
+        self.sample(f"{pipeline}.{stage}")
+
+
+def run_cli(main: Callable[[], Optional[int]], name: Optional[str] = None) -> int:
+    """
+    Run `main()` under the profiling options found in sys.argv; returns its exit code.
+
+    The options are removed from sys.argv before main() parses its own
+    arguments; without any of them main() runs untouched.
+    """
+    name = name or Path(sys.argv[0]).stem
+    parser = _profiling_parser()
+    opts, rest = parser.parse_known_args(sys.argv[1:])
+    sys.argv = [sys.argv[0]] + rest
+
+    if '-h' in rest or '--help' in rest:
+        # main()'s own help exits; show the shared options after it
+        try:
+            return main() or 0
+        finally:
+            print('\n' + parser.format_help().strip())
+
+    opts.profile = opts.profile or opts.profile_collapsed
+    if not (opts.profile or opts.trace_memory is not None or opts.timings):
+        return main() or 0
+
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    out_dir = Path(opts.profile_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / f"{name}_{stamp}"
+
+    profiler = cProfile.Profile() if opts.profile else None
+    sampler = None
+    if opts.trace_memory is not None:
+        sampler = _AllocationSampler(profiler)
+        tracemalloc.start()
+    exit_code = 0
+    started = time.time()
+    start = time.perf_counter()
+    with collect_runs() as runs, on_stage_end(sampler.on_stage_end if sampler else lambda *_: None):
+        try:
+            if profiler:
+                profiler.enable()
+            try:
+                exit_code = main() or 0
+            finally:
+                if profiler:
+                    profiler.disable()
+                if sampler:
+                    sampler.sample('end of main')
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+            if e.code is not None and not isinstance(e.code, int):
+                print(e.code, file=sys.stderr)
+        except BaseException:
+            exit_code = 1
+            raise
+        finally:
+            wall = time.perf_counter() - start
+            report = {
+                'script': name,
+                'argv': rest,
+                'started': datetime.fromtimestamp(started).isoformat(timespec='seconds'),
+                'wall_seconds': round(wall, 6),
+                'exit_code': exit_code,
+                'peak_rss_bytes': peak_rss_bytes(),
+                # First instance per pipeline: later same-named ones are per-item helpers merged into it
+                'stages': {run.pipeline: run.as_dict() for run in reversed(runs)},
+            }
+            _finish(opts, profiler, sampler, stem, report)
+    return exit_code
+
+
+def _finish(opts, profiler, sampler: Optional[_AllocationSampler], stem: Path, report: Dict):
+    """Print summaries and write the profile files and JSON sidecar."""
+    print(f"\n{'=' * 80}\n⏱️  PROFILE: {report['script']} ({report['wall_seconds']:.3f}s wall)\n{'=' * 80}")
+    for pipeline, stages in report['stages'].items():
+        for stage, values in stages.items():
+            print(f"   {pipeline}.{stage:<12} {values['seconds']:9.3f}s  x{values['calls']:<4} {values['rows']:>10,} rows")
+
+    if profiler is not None:
+        stream = io.StringIO()
+        stats = pstats.Stats(profiler, stream=stream)
+        stats.sort_stats('cumulative').print_stats(TOP_FUNCTIONS)
+        print(stream.getvalue())
+        pstats_path = stem.with_suffix('.pstats')
+        stats.dump_stats(str(pstats_path))
+        report['pstats'] = str(pstats_path)
+        report['top_functions'] = top_functions(stats)
+        if opts.profile_collapsed:
+            collapsed_path = stem.with_suffix('.collapsed')
+            collapsed_path.write_text('\n'.join(collapsed_stacks(stats)) + '\n')
+            report['collapsed'] = str(collapsed_path)
+            print(f"🔥 Collapsed stacks: {collapsed_path} (flamegraph.pl / speedscope)")
+
+    if sampler is not None:
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report['traced_memory_peak_bytes'] = peak
+        report['top_allocations_at'] = sampler.at
+        report['top_allocations'] = top_allocations(sampler.snapshot, opts.trace_memory) if sampler.snapshot else []
+        print(f"🧠 Traced memory peak: {peak / 1e6:,.1f} MB; top allocation sites at {sampler.at} "
+              f"({sampler.size / 1e6:,.1f} MB live):")
+        for alloc in report['top_allocations']:
+            print(f"   {alloc['location']:<45} {alloc['size_bytes'] / 1e6:9.2f} MB  {alloc['count']:>8,} blocks")
+
+    sidecar = stem.with_suffix('.json')
+    sidecar.write_text(json.dumps(report, indent=2))
+    print(f"📄 Timing sidecar: {sidecar}")
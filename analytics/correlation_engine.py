@@ -0,0 +1,276 @@
+"""
+Correlation Engine
+==================
+Matrix-form Pearson/Spearman correlations between a block of signal metrics
+and a block of outcome metrics.
+
+The analyzers used to call `stats.pearsonr` / `stats.spearmanr` once per
+(signal, outcome) pair, re-filling or re-masking whole columns each time. Here
+both blocks are centred once and every pairwise sum the correlation needs
+(n, Σx, Σy, Σx², Σy², Σxy over pair-complete rows) comes out of a handful of
+matrix products, so adding metrics grows the cost with the matrix size rather
+than with a Python loop per pair.
+
+NaNs are handled pairwise: each (signal, outcome) pair uses only the rows
+where both values are present, exactly like calling pearsonr on the filtered
+pair. Spearman sorts each column once; with NaNs, the ranks on each pair's
+complete rows are read off the sorted order from tie-group counts (no per-pair
+re-sort), so results match spearmanr on the filtered pair.
+
+Usage:
+    from correlation_engine import correlation_table, batch_correlation_tables
+
+    table = correlation_table(df, signal_cols, outcome_cols)
+    # columns: signal_metric, outcome_metric, n_samples,
+    #          pearson_r, pearson_p, spearman_r, spearman_p
+"""
+
+import warnings
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+_EPS = 1e-12
+
+
+@dataclass
+class CorrelationMatrix:
+    """Signal x outcome correlation coefficients, p-values and pair counts."""
+    r: np.ndarray
+    p_value: np.ndarray
+    n: np.ndarray
+
+
+def _as_block(df: pd.DataFrame, columns: Sequence[str]) -> np.ndarray:
+    return df[list(columns)].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _p_values(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """Two-sided p-values of r under H0: rho = 0 (same test as scipy.stats.pearsonr)."""
+    dof = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t_sq = r * r * dof / np.clip(1.0 - r * r, 0.0, None)
+        p = 2.0 * stats.t.sf(np.sqrt(t_sq), dof)
+    p = np.where(np.abs(r) >= 1.0, 0.0, p)
+    return np.where((dof > 0) & np.isfinite(r), p, np.nan)
+
+
+def pearson_matrix(x: np.ndarray, y: np.ndarray, min_periods: int = 3) -> CorrelationMatrix:
+    """
+    Pairwise-complete Pearson correlations between columns of x (n x p) and y (n x q).
+
+    Pairs with fewer than `min_periods` complete rows, or with a constant
+    column on their complete rows, get NaN.
+    """
+    mx = ~np.isnan(x)
+    my = ~np.isnan(y)
+    # Centre on column means first; the pairwise formula is shift-invariant and
+    # this avoids cancellation for large-valued columns such as prices.
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)  # all-NaN columns
+        x0 = np.where(mx, x - np.nanmean(x, axis=0), 0.0)
+        y0 = np.where(my, y - np.nanmean(y, axis=0), 0.0)
+    fx = mx.astype(np.float64)
+    fy = my.astype(np.float64)
+
+    n = fx.T @ fy
+    sx = x0.T @ fy
+    sy = fx.T @ y0
+    sxx = (x0 * x0).T @ fy
+    syy = fx.T @ (y0 * y0)
+    sxy = x0.T @ y0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        var_x = sxx - sx * sx / n
+        var_y = syy - sy * sy / n
+        r = cov / np.sqrt(var_x * var_y)
+    # Degenerate pairs: too few rows or (numerically) zero variance
+    valid = (n >= min_periods) & (var_x > _EPS * sxx) & (var_y > _EPS * syy)
+    r = np.where(valid, r, np.nan)
+    r = np.clip(r, -1.0, 1.0)
+    return CorrelationMatrix(r=r, p_value=_p_values(r, n), n=n.astype(np.int64))
+
+
+def _rank_columns(a: np.ndarray) -> np.ndarray:
+    """Average ranks per column, NaNs kept in place."""
+    out = np.full(a.shape, np.nan)
+    for j in range(a.shape[1]):
+        present = ~np.isnan(a[:, j])
+        out[present, j] = stats.rankdata(a[present, j])
+    return out
+
+
+def _mask_groups(present: np.ndarray):
+    """Columns of an (n x k) presence matrix grouped by identical NaN masks: [(mask, columns)]."""
+    groups: Dict[bytes, List[int]] = {}
+    for j, packed in enumerate(np.packbits(present, axis=0).T):
+        groups.setdefault(packed.tobytes(), []).append(j)
+    return [(present[:, cols[0]], np.array(cols)) for cols in groups.values()]
+
+
+def _centred_group_ranks(counts: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """
+    Centred average rank of each tie group on a row subset, from the subset
+    count of every group in sort order (k x G): the count of the lower groups
+    plus half its own, minus the mean rank (n + 1) / 2.
+    """
+    mid = counts * -0.5
+    mid += np.cumsum(counts, axis=1)
+    mid -= n[:, None] / 2.0
+    return mid
+
+
+def _column_subset_ranks(order: np.ndarray, starts: np.ndarray, group: np.ndarray, within: np.ndarray):
+    """
+    Centred ranks of one column on each row subset in `within` (k x n), in the
+    column's sort order and 0 outside the subset, plus subset sizes and rank
+    sums of squares. The column is sorted once; each subset only re-counts its
+    tie groups, so there is no re-sort per pair.
+    """
+    picked = within[:, order]
+    counts = np.add.reduceat(picked, starts, axis=1, dtype=np.int64)
+    n = counts.sum(axis=1)
+    mid = _centred_group_ranks(counts, n)
+    ranks = mid[:, group]
+    ranks *= picked
+    return ranks, n, np.einsum('ij,ij,ij->i', counts, mid, mid)
+
+
+@dataclass
+class _BlockTies:
+    """Per-row sort orders (NaNs last) and tie groups of a (k x n) block; group ids run row by row."""
+    order: np.ndarray
+    group: np.ndarray
+    starts: np.ndarray     # flat index where each group begins
+    group_row: np.ndarray  # row of each group
+    first: np.ndarray      # first group of each row
+
+    @classmethod
+    def of(cls, block: np.ndarray) -> '_BlockTies':
+        order = np.argsort(block, axis=1, kind='stable')
+        values = np.take_along_axis(block, order, axis=1)
+        new_group = np.ones(block.shape, dtype=bool)
+        new_group[:, 1:] = values[:, 1:] != values[:, :-1]
+        group = np.cumsum(new_group).reshape(block.shape) - 1
+        first = group[:, 0]
+        group_row = np.repeat(np.arange(len(block)), np.diff(np.r_[first, group[-1, -1] + 1]))
+        return cls(order, group, np.flatnonzero(new_group), group_row, first)
+
+
+def _block_subset_ranks(ties: _BlockTies, within: np.ndarray):
+    """
+    Centred ranks of each row of a block on its own row subset `within[r]`
+    (k x n), in the original row order and 0 outside the subset, plus subset
+    sizes and rank sums of squares.
+    """
+    picked = np.take_along_axis(within, ties.order, axis=1)
+    counts = np.add.reduceat(picked.ravel(), ties.starts, dtype=np.int64)
+    n = picked.sum(axis=1)
+    # As _centred_group_ranks, with running counts restarting at each row's first group
+    cum = np.cumsum(counts)
+    row_offset = (cum - counts)[ties.first] + n / 2.0
+    mid = counts * -0.5
+    mid += cum
+    mid -= row_offset[ties.group_row]
+    ranks = mid[ties.group]
+    ranks *= picked
+    out = np.empty(within.shape)
+    np.put_along_axis(out, ties.order, ranks, axis=1)
+    mid *= mid
+    mid *= counts
+    return out, n, np.add.reduceat(mid, ties.first)
+
+
+def spearman_matrix(x: np.ndarray, y: np.ndarray, min_periods: int = 3) -> CorrelationMatrix:
+    """Pairwise-complete Spearman correlations (Pearson on ranks)."""
+    result = pearson_matrix(_rank_columns(x), _rank_columns(y), min_periods)
+    mx = ~np.isnan(x)
+    my = ~np.isnan(y)
+    if mx.all() and my.all():
+        return result
+
+    # With NaNs, each pair must be ranked on its own complete rows to match
+    # spearmanr. Columns are grouped by NaN mask, so a pair's rows are fixed by
+    # (signal mask group, outcome mask group): outcomes are ranked once per
+    # signal group, and each signal once per outcome group, reusing its single
+    # sort. Shared masks (metrics missing together) therefore cost one ranking
+    # per group; distinct masks degrade to one vectorized pass per signal.
+    y_ties = _BlockTies.of(np.ascontiguousarray(y.T))
+    my_rows = my.T
+    y_groups = _mask_groups(my)
+    y_group_masks = np.array([mask for mask, _ in y_groups])
+    r = np.full(result.r.shape, np.nan)
+    for mask_a, cols_a in _mask_groups(mx):
+        dy, n_y, var_y = _block_subset_ranks(y_ties, my_rows & mask_a)
+        within_x = y_group_masks & mask_a
+        for i in cols_a:
+            order = np.argsort(x[:, i], kind='stable')
+            values = x[order, i]
+            new_group = np.r_[True, values[1:] != values[:-1]]
+            dx_sorted, _, var_x = _column_subset_ranks(order, np.flatnonzero(new_group),
+                                                       np.cumsum(new_group) - 1, within_x)
+            dx = np.empty(dx_sorted.shape)
+            dx[:, order] = dx_sorted
+            for b, (_, cols_b) in enumerate(y_groups):
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    r_ib = (dy[cols_b] @ dx[b]) / np.sqrt(var_x[b] * var_y[cols_b])
+                valid = (n_y[cols_b] >= min_periods) & (var_x[b] > 0) & (var_y[cols_b] > 0)
+                r[i, cols_b] = np.where(valid, np.clip(r_ib, -1.0, 1.0), np.nan)
+    result.r = r
+    result.p_value = _p_values(result.r, result.n)
+    return result
+
+
+def correlation_table(df: pd.DataFrame, signal_cols: Iterable[str], outcome_cols: Iterable[str],
+                      min_periods: int = 3, spearman: bool = True) -> pd.DataFrame:
+    """
+    Long-format correlation table for every (signal, outcome) pair present in df.
+
+    Columns missing from df are skipped, like the per-pair loops did.
+    """
+    signals = [c for c in signal_cols if c in df.columns]
+    outcomes = [c for c in outcome_cols if c in df.columns]
+    columns = ['signal_metric', 'outcome_metric', 'n_samples',
+               'pearson_r', 'pearson_p', 'spearman_r', 'spearman_p']
+    if not signals or not outcomes or df.empty:
+        return pd.DataFrame(columns=columns)
+
+    x = _as_block(df, signals)
+    y = _as_block(df, outcomes)
+    pearson = pearson_matrix(x, y, min_periods)
+    rank = spearman_matrix(x, y, min_periods) if spearman else None
+
+    p, q = len(signals), len(outcomes)
+    return pd.DataFrame({
+        'signal_metric': np.repeat(signals, q),
+        'outcome_metric': np.tile(outcomes, p),
+        'n_samples': pearson.n.ravel(),
+        'pearson_r': pearson.r.ravel(),
+        'pearson_p': pearson.p_value.ravel(),
+        'spearman_r': rank.r.ravel() if rank is not None else np.nan,
+        'spearman_p': rank.p_value.ravel() if rank is not None else np.nan,
+    }, columns=columns)
+
+
+def batch_correlation_tables(frames: Mapping[str, pd.DataFrame], signal_cols: Sequence[str],
+                             outcome_cols: Sequence[str], min_periods: int = 3,
+                             spearman: bool = True) -> pd.DataFrame:
+    """correlation_table for several datasets, stacked with a 'dataset' column."""
+    tables: List[pd.DataFrame] = []
+    for name, df in frames.items():
+        table = correlation_table(df, signal_cols, outcome_cols, min_periods, spearman)
+        table.insert(0, 'dataset', name)
+        tables.append(table)
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True)
+
+
+def correlation_matrix_frame(table: pd.DataFrame, value: str = 'pearson_r') -> pd.DataFrame:
+    """Signal x outcome matrix of one value column from a correlation_table."""
+    return table.pivot(index='signal_metric', columns='outcome_metric', values=value)
+
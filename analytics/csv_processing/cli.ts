@@ -12,12 +12,16 @@
  *     --trades path/to/EA_Trades.csv \
  *     --signals path/to/EA_Signals.csv \
  *     --output path/to/output
+ *
+ * Streaming mode (NDJSON, one trade per line; flat memory for large runs):
+ *   npm run process -- --format ndjson
  */
 
 import { Command } from 'commander';
 import * as path from 'path';
 import * as fs from 'fs';
 import { CSVProcessor } from './csvProcessor';
+import { ProcessedDataset } from './types';
 
 const program = new Command();
 
@@ -91,7 +95,7 @@ program
   .option('--signals <path>', 'Path to EA signals CSV (optional if using auto-discovery)')
   .option('--dir <path>', `Directory to search for CSV files (default: ${DEFAULT_CSV_DIRECTORY})`)
   .option('--output <path>', 'Output directory for processed files', './output')
-  .option('--format <type>', 'Output format: json, csv, or both', 'both')
+  .option('--format <type>', 'Output format: json, csv, both, or ndjson (streamed, one trade per line)', 'both')
   .option('--mt5-to-cst-offset <hours>', 'MT5 to CST offset in hours (negative value: subtract from MT5). Default: -8', '-8')
   .action(async (options) => {
     try {
@@ -153,28 +157,42 @@ program
   const mt5ToCstOffset = parseInt(options.mt5ToCstOffset || options.mt5ToCstOffsetHours || '-8', 10) || -8;
   const processor = new CSVProcessor(mt5ToCstOffset);
       
-      // Process all CSVs
-      const dataset = await processor.processAll(
-        mt5Path,
-        tradesPath,
-        signalsPath
-      );
-      
       // Generate output filenames
       const timestamp = new Date().toISOString().replace(/[:.]/g, '-').split('T')[0];
       const baseFilename = `processed_trades_${timestamp}`;
       
-      // Export results
-      console.log('\n📁 Exporting results...');
-      
-      if (options.format === 'json' || options.format === 'both') {
-        const jsonPath = path.join(options.output, `${baseFilename}.json`);
-        await processor.exportJSON(dataset, jsonPath);
-      }
-      
-      if (options.format === 'csv' || options.format === 'both') {
-        const csvPath = path.join(options.output, `${baseFilename}.csv`);
-        await processor.exportCSV(dataset, csvPath);
+      let dataset: Omit<ProcessedDataset, 'trades'>;
+      
+      if (options.format === 'ndjson') {
+        // Stream trades to disk as they are joined; nothing is buffered in memory
+        const ndjsonPath = path.join(options.output, `${baseFilename}.ndjson`);
+        dataset = await processor.processToNDJSON(
+          mt5Path,
+          tradesPath,
+          signalsPath,
+          ndjsonPath
+        );
+      } else {
+        // Process all CSVs
+        const fullDataset = await processor.processAll(
+          mt5Path,
+          tradesPath,
+          signalsPath
+        );
+        dataset = fullDataset;
+        
+        // Export results
+        console.log('\n📁 Exporting results...');
+        
+        if (options.format === 'json' || options.format === 'both') {
+          const jsonPath = path.join(options.output, `${baseFilename}.json`);
+          await processor.exportJSON(fullDataset, jsonPath);
+        }
+        
+        if (options.format === 'csv' || options.format === 'both') {
+          const csvPath = path.join(options.output, `${baseFilename}.csv`);
+          await processor.exportCSV(fullDataset, csvPath);
+        }
       }
       
       // Print summary
@@ -187,15 +205,16 @@ program
       console.log(`Data Quality Score:  ${dataset.statistics.dataQualityScore}/100`);
       console.log(`Processing Time:     ${dataset.statistics.processingTimeMs}ms`);
       
-      if (dataset.validation.criticalErrors.length > 0) {
-        console.log(`\n⚠️  Critical Errors:   ${dataset.validation.criticalErrors.length}`);
-        dataset.validation.criticalErrors.slice(0, 5).forEach(err => {
+      const { criticalErrors, warnings, criticalErrorCount, warningCount } = dataset.validation;
+      if (criticalErrors.length > 0) {
+        console.log(`\n⚠️  Critical Errors:   ${criticalErrorCount ?? criticalErrors.length}`);
+        criticalErrors.slice(0, 5).forEach(err => {
           console.log(`   - ${err.message}`);
         });
       }
       
-      if (dataset.validation.warnings.length > 0) {
-        console.log(`\n⚠️  Warnings:          ${dataset.validation.warnings.length}`);
+      if (warnings.length > 0) {
+        console.log(`\n⚠️  Warnings:          ${warningCount ?? warnings.length}`);
       }
       
       console.log('\n✅ Processing complete!');
@@ -4,22 +4,27 @@ Comprehensive Performance Analysis
 Analyzes ALL trades (wins AND losses) to identify patterns and optimization opportunities
 """
 
-import json
+import sys
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from processed_dataset_cache import load_processed_dataset
+from resampling_engine import compare_subset
+
+RESAMPLE_SEED = 7  # fixed so the significance notes in a report are reproducible
+
 class ComprehensivePerformanceAnalyzer:
     def __init__(self, json_path: str):
-        """Load processed trade data"""
-        with open(json_path, 'r') as f:
-            data = json.load(f)
+        """Load processed trade data (memory-mapped from the columnar cache when fresh)"""
+        dataset = load_processed_dataset(json_path)
         
-        self.trades_df = pd.DataFrame(data['trades'])
-        self.metadata = data['metadata']
-        self.statistics = data['statistics']
+        self.trades_df = dataset.trades
+        self.metadata = dataset.metadata
+        self.statistics = dataset.statistics
         
         # Convert numeric columns
         numeric_cols = [col for col in self.trades_df.columns if any(x in col for x in 
@@ -455,23 +460,41 @@ class ComprehensivePerformanceAnalyzer:
         if summary['profit_factor'] < 1.5:
             recommendations.append(f"⚠️  Profit factor ({summary['profit_factor']:.2f}) is low. Focus on reducing loss size or increasing winners.")
         
-        # Direction bias
+        profits = self.trades_df['OUT_Profit_OP_01'].to_numpy(dtype=float)
+
+        def significance(mask, metric: str, scale: float = 1.0, fmt: str = '.2f', values=profits) -> str:
+            delta = compare_subset(values, mask, seed=RESAMPLE_SEED)[metric]
+            verdict = '' if delta.significant else ' — not statistically significant'
+            return f" [{delta.describe(scale, fmt)}{verdict}]"
+
+        # Direction bias (only decided trades, matching the win rates above)
+        decided = self.trades_df['Trade_Result'].isin(['Win', 'Loss']).to_numpy()
+        is_long = (self.trades_df['Trade_Direction'] == 'Long').to_numpy()
         if win_loss['long_win_rate'] > win_loss['short_win_rate'] + 10:
-            recommendations.append(f"✅ LONG trades perform significantly better ({win_loss['long_win_rate']:.1f}% vs {win_loss['short_win_rate']:.1f}%). Consider favoring longs.")
+            note = significance(is_long[decided], 'win_rate', 100, '.1f', profits[decided]) if decided.any() else ''
+            recommendations.append(f"✅ LONG trades perform significantly better ({win_loss['long_win_rate']:.1f}% vs {win_loss['short_win_rate']:.1f}%). Consider favoring longs.{note}")
         elif win_loss['short_win_rate'] > win_loss['long_win_rate'] + 10:
-            recommendations.append(f"✅ SHORT trades perform significantly better ({win_loss['short_win_rate']:.1f}% vs {win_loss['long_win_rate']:.1f}%). Consider favoring shorts.")
+            note = significance(~is_long[decided], 'win_rate', 100, '.1f', profits[decided]) if decided.any() else ''
+            recommendations.append(f"✅ SHORT trades perform significantly better ({win_loss['short_win_rate']:.1f}% vs {win_loss['long_win_rate']:.1f}%). Consider favoring shorts.{note}")
         
-        # Physics thresholds
+        # Physics thresholds: expectancy of trades kept by the threshold vs those it would exclude
         for metric, data in physics.items():
             if data['difference'] > 0:
-                recommendations.append(f"📊 {metric}: Winners average {data['win_avg']:.2f} vs losers {data['loss_avg']:.2f}. Set minimum threshold at {data['loss_avg']*1.1:.2f}")
+                threshold = data['loss_avg'] * 1.1
+                kept = (self.trades_df[metric] >= threshold).to_numpy()
+                recommendations.append(f"📊 {metric}: Winners average {data['win_avg']:.2f} vs losers {data['loss_avg']:.2f}. Set minimum threshold at {threshold:.2f}"
+                                       f"{significance(kept, 'expectancy')}")
         
         # Time-based recommendations
         best_segment = max(time_patterns['segments'].items(), key=lambda x: x[1]['win_rate'])
         worst_segment = min(time_patterns['segments'].items(), key=lambda x: x[1]['win_rate'])
         
-        recommendations.append(f"⏰ Best time segment: {best_segment[0]} ({best_segment[1]['win_rate']:.1f}% WR, ${best_segment[1]['profit']:.2f})")
-        recommendations.append(f"⚠️  Worst time segment: {worst_segment[0]} ({worst_segment[1]['win_rate']:.1f}% WR, ${worst_segment[1]['profit']:.2f}). Consider avoiding.")
+        segments = self.trades_df['IN_Segment_01H_OP_01'].to_numpy()
+        best_note = significance(segments == best_segment[0], 'win_rate', 100, '.1f')
+        worst_note = significance(segments == worst_segment[0], 'win_rate', 100, '.1f')
+        
+        recommendations.append(f"⏰ Best time segment: {best_segment[0]} ({best_segment[1]['win_rate']:.1f}% WR, ${best_segment[1]['profit']:.2f}){best_note}")
+        recommendations.append(f"⚠️  Worst time segment: {worst_segment[0]} ({worst_segment[1]['win_rate']:.1f}% WR, ${worst_segment[1]['profit']:.2f}). Consider avoiding.{worst_note}")
         
         return recommendations
     
@@ -5,6 +5,7 @@
 
 import * as fs from 'fs';
 import * as path from 'path';
+import { once } from 'events';
 import { parse } from 'csv-parse/sync';
 import { stringify } from 'csv-stringify/sync';
 import {
@@ -21,6 +22,9 @@ import {
 import { TimeSegmentCalculator } from './timeSegmentCalculator';
 import { loadEAInputs, getFilterInputs, getAllInputs } from './eaInputParser';
 
+/** Validation issues kept per severity; the totals are always counted in full */
+const MAX_VALIDATION_SAMPLES = 100;
+
 export class CSVProcessor {
   private mt5ToCstOffsetHours: number;
 
@@ -35,6 +39,85 @@ export class CSVProcessor {
     eaTradesPath: string,
     eaSignalsPath: string
   ): Promise<ProcessedDataset> {
+    const processedTrades: ProcessedTradeData[] = [];
+    
+    const result = await this.runPipeline(
+      mt5ReportPath,
+      eaTradesPath,
+      eaSignalsPath,
+      (trade) => { processedTrades.push(trade); }
+    );
+    
+    return {
+      metadata: result.metadata,
+      trades: processedTrades,
+      statistics: result.statistics,
+      validation: result.validation
+    };
+  }
+
+  /**
+   * Process all three CSV files and stream the joined trades to NDJSON.
+   *
+   * Each trade is written as soon as it is joined, so the processed trades are
+   * never held in memory together. Layout (one JSON document per line):
+   *   {"__section":"metadata", ...metadata}
+   *   {...trade}                                   (one line per trade)
+   *   {"__section":"summary","statistics":{...},"validation":{...}}
+   */
+  async processToNDJSON(
+    mt5ReportPath: string,
+    eaTradesPath: string,
+    eaSignalsPath: string,
+    outputPath: string
+  ): Promise<Omit<ProcessedDataset, 'trades'>> {
+    const dir = path.dirname(outputPath);
+    if (!fs.existsSync(dir)) fs.mkdirSync(dir, { recursive: true });
+    
+    const stream = fs.createWriteStream(outputPath, { encoding: 'utf-8' });
+    const writeLine = async (record: unknown): Promise<void> => {
+      if (!stream.write(JSON.stringify(record) + '\n')) {
+        await once(stream, 'drain');
+      }
+    };
+    
+    try {
+      const result = await this.runPipeline(
+        mt5ReportPath,
+        eaTradesPath,
+        eaSignalsPath,
+        (trade) => writeLine(trade),
+        (metadata) => writeLine({ __section: 'metadata', ...metadata })
+      );
+      
+      await writeLine({
+        __section: 'summary',
+        statistics: result.statistics,
+        validation: result.validation
+      });
+      
+      console.log(`✅ Exported NDJSON to: ${outputPath}`);
+      return result;
+    } finally {
+      stream.end();
+      await once(stream, 'close');
+    }
+  }
+
+  /**
+   * Shared load → pair → index → join pipeline.
+   * Joined trades are handed to onTrade one at a time; reconciliation and
+   * validation are accumulated incrementally (issue counts plus the first
+   * MAX_VALIDATION_SAMPLES of each severity) and missing-exit rows are written
+   * to their report as they are found.
+   */
+  private async runPipeline(
+    mt5ReportPath: string,
+    eaTradesPath: string,
+    eaSignalsPath: string,
+    onTrade: (trade: ProcessedTradeData, index: number) => void | Promise<void>,
+    onMetadata?: (metadata: ProcessedDataset['metadata']) => void | Promise<void>
+  ): Promise<Omit<ProcessedDataset, 'trades'>> {
     const startTime = Date.now();
     
     console.log('🚀 Starting CSV processing...');
@@ -67,23 +150,52 @@ export class CSVProcessor {
     const eaSignalMap = this.indexEASignals(eaSignalRows);
     console.log(`✅ Indexed ${eaSignalMap.size} EA signals`);
     
+    // Metadata only depends on the inputs, so it can be emitted before the join
+    const metadata = this.buildMetadata(mt5ReportPath, eaTradesPath, eaSignalsPath, pairedMT5Trades.length);
+    if (onMetadata) await onMetadata(metadata);
+    
     // Step 5: Join all data
     console.log('\n🔄 Joining all datasets...');
-    const processedTrades: ProcessedTradeData[] = [];
     let matchedEATrades = 0;
     let matchedSignals = 0;
+    let mt5TotalProfit = 0;
+    let eaTotalProfit = 0;
+    const criticalErrors: ValidationError[] = [];
+    const warnings: ValidationError[] = [];
+    let criticalErrorCount = 0;
+    let warningCount = 0;
+    const report = (issue: ValidationError): void => {
+      if (issue.severity === 'CRITICAL') {
+        if (criticalErrorCount++ < MAX_VALIDATION_SAMPLES) criticalErrors.push(issue);
+      } else if (warningCount++ < MAX_VALIDATION_SAMPLES) {
+        warnings.push(issue);
+      }
+    };
+    const missingExits = this.openMissingEAExitReport();
     
-    for (const mt5Trade of pairedMT5Trades) {
-      const processed = this.joinTradeData(
-        mt5Trade,
-        eaTradeMap,
-        eaSignalMap
-      );
+    try {
+      for (let index = 0; index < pairedMT5Trades.length; index++) {
+        const processed = this.joinTradeData(
+          pairedMT5Trades[index],
+          eaTradeMap,
+          eaSignalMap
+        );
+      
+        if (processed.EA_Entry_PhysicsScore > 0) matchedEATrades++;
+        if (processed.Signal_Entry_Matched || processed.Signal_Exit_Matched) matchedSignals++;
       
-      if (processed.EA_Entry_PhysicsScore > 0) matchedEATrades++;
-      if (processed.Signal_Entry_Matched || processed.Signal_Exit_Matched) matchedSignals++;
+        // Sum MT5 net profit as Profit + Commission + Swap to match MT5 "Total Net Profit"
+        mt5TotalProfit += (processed.OUT_Profit_OP_01 || 0) + (processed.OUT_Commission || 0) + (processed.OUT_Swap || 0);
+        // Sum EA profit ignoring nulls to avoid NaN
+        eaTotalProfit += (processed.EA_Profit === null || processed.EA_Profit === undefined) ? 0 : processed.EA_Profit;
       
-      processedTrades.push(processed);
+        this.validateTrade(processed, index, report);
+        if (this.isMissingEAExit(processed)) await missingExits.write(processed);
+      
+        await onTrade(processed, index);
+      }
+    } finally {
+      await missingExits.close();
     }
     
     console.log(`✅ Matched ${matchedEATrades} EA trades`);
@@ -91,10 +203,6 @@ export class CSVProcessor {
     
     // Step 6: Profit Reconciliation Check (QA)
     console.log('\n💰 Profit Reconciliation Check...');
-  // Sum MT5 net profit as Profit + Commission + Swap to match MT5 "Total Net Profit"
-  const mt5TotalProfit = processedTrades.reduce((sum, t) => sum + (t.OUT_Profit_OP_01 || 0) + (t.OUT_Commission || 0) + (t.OUT_Swap || 0), 0);
-  // Sum EA profit ignoring nulls to avoid NaN
-  const eaTotalProfit = processedTrades.reduce((sum, t) => sum + ((t.EA_Profit === null || t.EA_Profit === undefined) ? 0 : t.EA_Profit), 0);
     const profitDiff = Math.abs(mt5TotalProfit - eaTotalProfit);
     const profitMatchPercent = mt5TotalProfit !== 0 ? (1 - profitDiff / Math.abs(mt5TotalProfit)) * 100 : 0;
     
@@ -114,14 +222,14 @@ export class CSVProcessor {
     
     // Step 7: Validate results
     console.log('\n✔️  Validating results...');
-    const validation = this.validateDataset(processedTrades);
-    console.log(`✅ Data quality score: ${validation.dataQualityScore}/100`);
+    const dataQualityScore = this.dataQualityScore(criticalErrorCount, warningCount);
+    console.log(`✅ Data quality score: ${dataQualityScore}/100`);
     
-    if (validation.criticalErrors.length > 0) {
-      console.log(`⚠️  ${validation.criticalErrors.length} critical errors found`);
+    if (criticalErrorCount > 0) {
+      console.log(`⚠️  ${criticalErrorCount} critical errors found`);
     }
-    if (validation.warnings.length > 0) {
-      console.log(`⚠️  ${validation.warnings.length} warnings found`);
+    if (warningCount > 0) {
+      console.log(`⚠️  ${warningCount} warnings found`);
     }
     
     const processingTime = Date.now() - startTime;
@@ -133,61 +241,72 @@ export class CSVProcessor {
       eaTradesMatched: matchedEATrades,
       eaSignalsMatched: matchedSignals,
       processingTimeMs: processingTime,
-      dataQualityScore: validation.dataQualityScore
+      dataQualityScore
     };
     
     console.log(`\n✅ Processing complete in ${processingTime}ms`);
-  // Export detailed missing EA exit report (if any)
-  this.exportMissingEAExitReport(processedTrades);
-  
-  // Try to parse optimization metadata from trades filename (v5.0.0.3+ format)
-  const tradesFilename = path.basename(eaTradesPath);
-  const optimizationMeta = parseOptimizationFilename(tradesFilename);
-  
-  // Try to load EA input values from source file
-  let eaInputs: Record<string, any> | undefined;
-  let allEaInputs: Record<string, any> | undefined;
-  if (optimizationMeta?.eaVersion) {
-    console.log(`\n� Loading EA input values for v${optimizationMeta.eaVersion}...`);
-    const fullInputs = loadEAInputs(optimizationMeta.eaVersion);
-    if (fullInputs) {
-      eaInputs = getFilterInputs(fullInputs);
-      allEaInputs = getAllInputs(fullInputs);
-      console.log(`✅ Loaded ${Object.keys(eaInputs).length} filter inputs from EA source`);
-    }
-  }
-  
-  if (optimizationMeta) {
-    console.log(`\n�📊 Optimization Run Detected:`);
-    console.log(`   Pass: ${optimizationMeta.pass} | Sample: ${optimizationMeta.sampleType}`);
-    console.log(`   Date Range: ${optimizationMeta.dateRange} | Broker: ${optimizationMeta.broker}`);
-    console.log(`   EA Version: v${optimizationMeta.eaVersion}`);
-  }
     
-  return {
-      metadata: {
-        processingTimestamp: new Date().toISOString(),
-        dataModelVersion: '2.1.0',
-        totalTrades: processedTrades.length,
-        sourceFiles: {
-          mt5Report: path.basename(mt5ReportPath),
-          eaTradesCSV: path.basename(eaTradesPath),
-          eaSignalsCSV: path.basename(eaSignalsPath)
-        },
-        optimizationRun: optimizationMeta || undefined,
-        eaInputs: eaInputs,
-        allEaInputs: allEaInputs
-      },
-      trades: processedTrades,
+    return {
+      metadata,
       statistics,
       validation: {
-        isValid: validation.criticalErrors.length === 0,
-        criticalErrors: validation.criticalErrors,
-        warnings: validation.warnings
+        isValid: criticalErrorCount === 0,
+        criticalErrors,
+        warnings,
+        criticalErrorCount,
+        warningCount
       }
     };
   }
 
+  /**
+   * Build dataset metadata (source files, optimization run, EA inputs)
+   */
+  private buildMetadata(
+    mt5ReportPath: string,
+    eaTradesPath: string,
+    eaSignalsPath: string,
+    totalTrades: number
+  ): ProcessedDataset['metadata'] {
+    // Try to parse optimization metadata from trades filename (v5.0.0.3+ format)
+    const tradesFilename = path.basename(eaTradesPath);
+    const optimizationMeta = parseOptimizationFilename(tradesFilename);
+    
+    // Try to load EA input values from source file
+    let eaInputs: Record<string, any> | undefined;
+    let allEaInputs: Record<string, any> | undefined;
+    if (optimizationMeta?.eaVersion) {
+      console.log(`\n📥 Loading EA input values for v${optimizationMeta.eaVersion}...`);
+      const fullInputs = loadEAInputs(optimizationMeta.eaVersion);
+      if (fullInputs) {
+        eaInputs = getFilterInputs(fullInputs);
+        allEaInputs = getAllInputs(fullInputs);
+        console.log(`✅ Loaded ${Object.keys(eaInputs).length} filter inputs from EA source`);
+      }
+    }
+    
+    if (optimizationMeta) {
+      console.log(`\n📊 Optimization Run Detected:`);
+      console.log(`   Pass: ${optimizationMeta.pass} | Sample: ${optimizationMeta.sampleType}`);
+      console.log(`   Date Range: ${optimizationMeta.dateRange} | Broker: ${optimizationMeta.broker}`);
+      console.log(`   EA Version: v${optimizationMeta.eaVersion}`);
+    }
+    
+    return {
+      processingTimestamp: new Date().toISOString(),
+      dataModelVersion: '2.1.0',
+      totalTrades,
+      sourceFiles: {
+        mt5Report: path.basename(mt5ReportPath),
+        eaTradesCSV: path.basename(eaTradesPath),
+        eaSignalsCSV: path.basename(eaSignalsPath)
+      },
+      optimizationRun: optimizationMeta || undefined,
+      eaInputs: eaInputs,
+      allEaInputs: allEaInputs
+    };
+  }
+
   /**
    * Load MT5 backtest report CSV
    * Handles both raw MT5 reports (with settings/orders sections) and pre-cleaned CSVs
@@ -1080,88 +1199,100 @@ export class CSVProcessor {
     const criticalErrors: ValidationError[] = [];
     const warnings: ValidationError[] = [];
     
-    trades.forEach((trade, index) => {
-      // Check for trade ID consistency
-      // In MT5, entry and exit Trade IDs may differ; treat as a warning by default
-      if (trade.IN_Trade_ID !== trade.OUT_Trade_ID) {
-        warnings.push({
-          type: 'TRADE_ID_MISMATCH',
-          tradeIndex: index,
-          message: `Trade ID mismatch: IN=${trade.IN_Trade_ID}, OUT=${trade.OUT_Trade_ID}`,
-          severity: 'WARNING'
-        });
-      }
-      
-      // Check for symbol consistency between entry and exit
-      if (trade.Symbol_OP_03 !== trade.OUT_Symbol) {
-        criticalErrors.push({
-          type: 'SYMBOL_MISMATCH',
-          tradeIndex: index,
-          message: `Symbol inconsistency: IN=${trade.Symbol_OP_03}, OUT=${trade.OUT_Symbol}`,
-          severity: 'CRITICAL'
-        });
-      }
-
-      // Check EA ENTRY symbol matches MT5 entry symbol
-      if (trade.EA_Entry_Symbol && trade.Symbol_OP_03 !== trade.EA_Entry_Symbol) {
-        criticalErrors.push({
-          type: 'SYMBOL_MISMATCH_EA_ENTRY',
-          tradeIndex: index,
-          message: `EA Entry symbol (${trade.EA_Entry_Symbol}) does not match MT5 entry (${trade.Symbol_OP_03})`,
-          severity: 'CRITICAL'
-        });
-      }
-
-      // Check EA EXIT symbol matches MT5 exit symbol
-      if (trade.EA_Exit_Symbol && trade.OUT_Symbol && trade.OUT_Symbol !== trade.EA_Exit_Symbol) {
-        criticalErrors.push({
-          type: 'SYMBOL_MISMATCH_EA_EXIT',
-          tradeIndex: index,
-          message: `EA Exit symbol (${trade.EA_Exit_Symbol}) does not match MT5 exit (${trade.OUT_Symbol})`,
-          severity: 'CRITICAL'
-        });
-      }
-      
-      // Warn if no EA data
-      if (trade.EA_Entry_PhysicsScore === 0) {
-        warnings.push({
-          type: 'NO_EA_DATA',
-          tradeIndex: index,
-          message: 'No matching EA trade data found',
-          severity: 'WARNING'
-        });
-      }
-      
-      // Warn if no entry or exit signal
-      if (!trade.Signal_Entry_Matched) {
-        warnings.push({
-          type: 'NO_ENTRY_SIGNAL_MATCH',
-          tradeIndex: index,
-          message: 'No matching entry signal found',
-          severity: 'WARNING'
-        });
-      }
-      
-      if (!trade.Signal_Exit_Matched) {
-        warnings.push({
-          type: 'NO_EXIT_SIGNAL_MATCH',
-          tradeIndex: index,
-          message: 'No matching exit signal found',
-          severity: 'WARNING'
-        });
-      }
-    });
-    
-    const totalIssues = criticalErrors.length + warnings.length;
-    const dataQualityScore = Math.max(0, 100 - (criticalErrors.length * 10) - (warnings.length * 2));
+    trades.forEach((trade, index) => this.validateTrade(trade, index, issue => {
+      (issue.severity === 'CRITICAL' ? criticalErrors : warnings).push(issue);
+    }));
     
     return {
-      dataQualityScore,
+      dataQualityScore: this.dataQualityScore(criticalErrors.length, warnings.length),
       criticalErrors,
       warnings
     };
   }
 
+  /**
+   * Validate a single joined trade, reporting any issues found
+   */
+  private validateTrade(
+    trade: ProcessedTradeData,
+    index: number,
+    report: (issue: ValidationError) => void
+  ): void {
+    // Check for trade ID consistency
+    // In MT5, entry and exit Trade IDs may differ; treat as a warning by default
+    if (trade.IN_Trade_ID !== trade.OUT_Trade_ID) {
+      report({
+        type: 'TRADE_ID_MISMATCH',
+        tradeIndex: index,
+        message: `Trade ID mismatch: IN=${trade.IN_Trade_ID}, OUT=${trade.OUT_Trade_ID}`,
+        severity: 'WARNING'
+      });
+    }
+    
+    // Check for symbol consistency between entry and exit
+    if (trade.Symbol_OP_03 !== trade.OUT_Symbol) {
+      report({
+        type: 'SYMBOL_MISMATCH',
+        tradeIndex: index,
+        message: `Symbol inconsistency: IN=${trade.Symbol_OP_03}, OUT=${trade.OUT_Symbol}`,
+        severity: 'CRITICAL'
+      });
+    }
+
+    // Check EA ENTRY symbol matches MT5 entry symbol
+    if (trade.EA_Entry_Symbol && trade.Symbol_OP_03 !== trade.EA_Entry_Symbol) {
+      report({
+        type: 'SYMBOL_MISMATCH_EA_ENTRY',
+        tradeIndex: index,
+        message: `EA Entry symbol (${trade.EA_Entry_Symbol}) does not match MT5 entry (${trade.Symbol_OP_03})`,
+        severity: 'CRITICAL'
+      });
+    }
+
+    // Check EA EXIT symbol matches MT5 exit symbol
+    if (trade.EA_Exit_Symbol && trade.OUT_Symbol && trade.OUT_Symbol !== trade.EA_Exit_Symbol) {
+      report({
+        type: 'SYMBOL_MISMATCH_EA_EXIT',
+        tradeIndex: index,
+        message: `EA Exit symbol (${trade.EA_Exit_Symbol}) does not match MT5 exit (${trade.OUT_Symbol})`,
+        severity: 'CRITICAL'
+      });
+    }
+    
+    // Warn if no EA data
+    if (trade.EA_Entry_PhysicsScore === 0) {
+      report({
+        type: 'NO_EA_DATA',
+        tradeIndex: index,
+        message: 'No matching EA trade data found',
+        severity: 'WARNING'
+      });
+    }
+    
+    // Warn if no entry or exit signal
+    if (!trade.Signal_Entry_Matched) {
+      report({
+        type: 'NO_ENTRY_SIGNAL_MATCH',
+        tradeIndex: index,
+        message: 'No matching entry signal found',
+        severity: 'WARNING'
+      });
+    }
+    
+    if (!trade.Signal_Exit_Matched) {
+      report({
+        type: 'NO_EXIT_SIGNAL_MATCH',
+        tradeIndex: index,
+        message: 'No matching exit signal found',
+        severity: 'WARNING'
+      });
+    }
+  }
+
+  private dataQualityScore(criticalErrorCount: number, warningCount: number): number {
+    return Math.max(0, 100 - (criticalErrorCount * 10) - (warningCount * 2));
+  }
+
   /**
    * Export processed dataset to JSON
    */
@@ -1183,22 +1314,13 @@ export class CSVProcessor {
     console.log(`✅ Exported CSV to: ${outputPath}`);
   }
 
-  /**
-   * Export a simple CSV listing EA tickets with missing EXIT row data
-   */
-  exportMissingEAExitReport(trades: ProcessedTradeData[], outputDir = path.join(__dirname, 'output')): void {
-    const missing = trades.filter(t => {
-      const missingFields = t.DataQuality?.missingFields || [];
-      return missingFields.includes('EA_Exit_Data') || !t.EA_Exit_Symbol || t.EA_Exit_PhysicsScore === 0;
-    });
-
-    if (missing.length === 0) {
-      console.log('✅ No missing EA exit rows detected');
-      return;
-    }
+  private isMissingEAExit(t: ProcessedTradeData): boolean {
+    const missingFields = t.DataQuality?.missingFields || [];
+    return missingFields.includes('EA_Exit_Data') || !t.EA_Exit_Symbol || t.EA_Exit_PhysicsScore === 0;
+  }
 
-    // Build CSV rows
-    const rows = missing.map(t => ({
+  private missingEAExitRow(t: ProcessedTradeData): Record<string, string | number> {
+    return {
       Ticket: t.IN_Trade_ID,
       IN_Deal: t.IN_Deal,
       IN_Order: t.IN_Trade_ID,
@@ -1210,16 +1332,70 @@ export class CSVProcessor {
       EA_Exit_Symbol: t.EA_Exit_Symbol || '',
       EA_Exit_PhysicsScore: t.EA_Exit_PhysicsScore || 0,
       MissingFields: (t.DataQuality?.missingFields || []).join(';')
-    }));
+    };
+  }
 
+  /**
+   * Open the missing EA exit report for row-at-a-time writing.
+   * The file is created on the first missing exit; only the CSV line of each
+   * trade is kept, never the trade itself.
+   */
+  private openMissingEAExitReport(outputDir = path.join(__dirname, 'output')): {
+    write: (trade: ProcessedTradeData) => Promise<void>;
+    close: () => Promise<void>;
+  } {
+    const outPath = path.join(outputDir, `ea_exit_missing_trades_detailed.csv`);
+    let stream: fs.WriteStream | null = null;
+    let failed = false;
+    let rows = 0;
+
+    const write = async (trade: ProcessedTradeData): Promise<void> => {
+      if (failed) return;
+      try {
+        const row = this.missingEAExitRow(trade);
+        if (!stream) {
+          if (!fs.existsSync(outputDir)) fs.mkdirSync(outputDir, { recursive: true });
+          stream = fs.createWriteStream(outPath, { encoding: 'utf-8' });
+          stream.on('error', err => {
+            failed = true;
+            console.warn('⚠️  Failed to write EA missing exits report:', err);
+          });
+        }
+        if (!stream.write(stringify([row], { header: rows === 0 }))) {
+          await once(stream, 'drain');
+        }
+        rows++;
+      } catch (err) {
+        failed = true;
+        console.warn('⚠️  Failed to write EA missing exits report:', err);
+      }
+    };
+
+    const close = async (): Promise<void> => {
+      if (!stream) {
+        console.log('✅ No missing EA exit rows detected');
+        return;
+      }
+      const closed = once(stream, 'close').catch(() => undefined);
+      stream.end();
+      await closed;
+      if (!failed) console.log(`✅ Exported ${rows} missing EA exit trades to: ${outPath}`);
+    };
+
+    return { write, close };
+  }
+
+  /**
+   * Export a simple CSV listing EA tickets with missing EXIT row data
+   */
+  async exportMissingEAExitReport(trades: ProcessedTradeData[], outputDir = path.join(__dirname, 'output')): Promise<void> {
+    const report = this.openMissingEAExitReport(outputDir);
     try {
-      if (!fs.existsSync(outputDir)) fs.mkdirSync(outputDir, { recursive: true });
-      const csv = stringify(rows, { header: true });
-      const outPath = path.join(outputDir, `ea_exit_missing_trades_detailed.csv`);
-      fs.writeFileSync(outPath, csv, 'utf-8');
-      console.log(`✅ Exported missing EA exit trades report to: ${outPath}`);
-    } catch (err) {
-      console.warn('⚠️  Failed to write EA missing exits report:', err);
+      for (const t of trades) {
+        if (this.isMissingEAExit(t)) await report.write(t);
+      }
+    } finally {
+      await report.close();
     }
   }
 }
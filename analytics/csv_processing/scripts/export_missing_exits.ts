@@ -15,7 +15,7 @@ async function main() {
   const trades = content.trades;
 
   const p = new CSVProcessor(-8);
-  p.exportMissingEAExitReport(trades, path.join(__dirname, '../output'));
+  await p.exportMissingEAExitReport(trades, path.join(__dirname, '../output'));
 }
 
 main().catch(err => {
@@ -529,6 +529,9 @@ export interface ValidationResult {
   isValid: boolean;
   criticalErrors: ValidationError[];
   warnings: ValidationError[];
+  /** Totals when criticalErrors/warnings hold only the first issues found */
+  criticalErrorCount?: number;
+  warningCount?: number;
 }
 
 export interface ProcessingStatistics {
@@ -0,0 +1,412 @@
+#!/usr/bin/env python3
+"""
+Feature Store
+=============
+Per-trade derived features (IsWin, ProfitCategory, RMultiple, direction,
+outcome, ...) defined once and materialized once per dataset.
+
+Each analyzer used to derive its own columns on every run, with slightly
+different rules (an outcome from Trade_Result in one script, from a profit
+threshold in another). Here every feature is a named, vectorized definition
+over the trades frame, and its definition hash covers the name, the input
+columns, the dtype and the function's source, so editing a definition is
+enough to invalidate exactly that feature.
+
+Features are stored as typed Arrow IPC columns next to the source file:
+
+    Backtest_Reports/X_trades.csv
+    Backtest_Reports/.cache/feature_store/X_trades.csv.raw.<key16>/
+        manifest.json                   # rows + definition hash per feature
+        IsWin.<def12>.arrow             # one uncompressed column per feature
+
+The key hashes the source contents and the view (how the frame was built
+from the sources: 'raw' for the file as its default loader reads it), so a
+changed source gets a fresh store. Each stored feature also records a
+fingerprint of its input columns (values and row order), so a frame built
+differently from the same sources is never served misaligned columns. On
+load, features whose definition hash and input fingerprint match are
+memory-mapped; only missing, redefined or re-fed ones are computed and
+written back. pyarrow is optional: without it features are computed in
+memory every time.
+
+For one-line arithmetic features the store buys one shared definition per
+name, not speed: hashing the inputs and mapping the stored column costs
+about as much as recomputing it.
+
+Usage:
+    from feature_store import add_features, materialize
+
+    df = add_features(df, ['IsWin', 'ProfitCategory'], sources=[trades_csv])
+    features = materialize(frame, ['direction', 'outcome'], sources=[csv_path], view='ea_trades')
+
+    python feature_store.py --list                      # definitions and their hashes
+    python feature_store.py X_trades.csv processed.json # materialize every applicable feature
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+
+try:  # optional dependency; features are computed in memory without it
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+STORE_DIR_NAME = 'feature_store'
+STORE_FORMAT_VERSION = '1'
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_VIEW = 'raw'
+_HASH_CHUNK = 1 << 20
+
+# (path, size, mtime_ns) -> sha256 of the contents, so repeated lookups in one process read the file once
+_source_digests: Dict[Tuple[str, int, int], str] = {}
+
+
+@dataclass(frozen=True)
+class FeatureDef:
+    """A named feature: `func(frame)` over the first present column of each `requires` group."""
+    name: str
+    func: Callable[[pd.DataFrame], pd.Series]
+    requires: Tuple[Tuple[str, ...], ...]
+    dtype: str
+    description: str = ''
+
+    @property
+    def definition_hash(self) -> str:
+        try:
+            source = inspect.getsource(self.func)
+        except (OSError, TypeError):  # e.g. defined in an interactive session
+            source = self.func.__qualname__
+        payload = json.dumps([STORE_FORMAT_VERSION, self.name, self.requires, self.dtype, source])
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def available(self, frame: pd.DataFrame) -> bool:
+        return all(any(col in frame.columns for col in group) for group in self.requires)
+
+    def inputs(self, frame: pd.DataFrame) -> List[str]:
+        """The columns of `frame` this feature reads: the first present one of each group."""
+        return [next(col for col in group if col in frame.columns) for group in self.requires]
+
+
+FEATURES: Dict[str, FeatureDef] = {}
+
+
+def feature(name: str, requires: Sequence[Sequence[str]], dtype: str, description: str = ''):
+    """Register a feature definition (decorator)."""
+    def register(func):
+        FEATURES[name] = FeatureDef(name, func, tuple(tuple(group) for group in requires), dtype, description)
+        return func
+    return register
+
+
+def _first(frame: pd.DataFrame, *columns: str) -> pd.Series:
+    for col in columns:
+        if col in frame.columns:
+            return frame[col]
+    raise KeyError(f"none of {columns} in frame")
+
+
+# ------------------------------- Definitions -------------------------------- #
+
+@feature('IsWin', [('Profit',)], 'int8', 'Profit > 0 as 0/1')
+def _is_win(df):
+    return (df['Profit'] > 0).astype('int8')
+
+
+@feature('ProfitCategory', [('Profit',)], 'category', 'Profit bucketed at -5 / 0 / 5 / 10')
+def _profit_category(df):
+    return pd.cut(df['Profit'], bins=[-np.inf, -5, 0, 5, 10, np.inf],
+                  labels=['Large Loss', 'Small Loss', 'Small Win', 'Medium Win', 'Large Win'])
+
+
+@feature('RiskAdjustedReturn', [('Profit',), ('RiskPercent',)], 'float64', 'Profit / RiskPercent (0 when RiskPercent is 0)')
+def _risk_adjusted_return(df):
+    returns = df['Profit'] / df['RiskPercent']
+    return returns.mask(df['RiskPercent'] == 0, 0.0).astype('float64')
+
+
+@feature('IsWinner', [('NetProfit',)], 'bool', 'NetProfit > 0')
+def _is_winner(df):
+    return df['NetProfit'] > 0
+
+
+@feature('IsLoser', [('NetProfit',)], 'bool', 'NetProfit < 0')
+def _is_loser(df):
+    return df['NetProfit'] < 0
+
+
+@feature('IsBreakeven', [('NetProfit',)], 'bool', 'NetProfit == 0')
+def _is_breakeven(df):
+    return df['NetProfit'] == 0
+
+
+@feature('ProfitPips', [('NetProfit',)], 'float64', 'NetProfit / 10 (1 pip = $10)')
+def _profit_pips(df):
+    return (df['NetProfit'] / 10.0).astype('float64')
+
+
+@feature('RMultiple', [('NetProfit',), ('MaxDrawdown',)], 'float64', 'NetProfit / |MaxDrawdown|')
+def _r_multiple(df):
+    return (df['NetProfit'] / df['MaxDrawdown'].abs()).astype('float64')
+
+
+@feature('direction', [('Trade_Direction', 'Type')], 'category', 'BUY / SELL from Trade_Direction or the MT5 deal Type')
+def _direction(df):
+    if 'Trade_Direction' in df.columns:
+        values = df['Trade_Direction'].astype(object).map({'Long': 'BUY', 'Short': 'SELL'})
+    else:
+        values = pd.Series(np.where(df['Type'].astype(str).str.lower().str.startswith('buy'), 'BUY', 'SELL'),
+                           index=df.index)
+    return pd.Categorical(values, categories=['BUY', 'SELL'])
+
+
+@feature('outcome', [('Trade_Result', 'EA_Profit', 'Profit')], 'category',
+         'TP / SL from Trade_Result, else profit beyond +/-0.01')
+def _outcome(df):
+    if 'Trade_Result' in df.columns:
+        values = df['Trade_Result'].astype(object).map({'Win': 'TP', 'Loss': 'SL'})
+    else:
+        profit = pd.to_numeric(_first(df, 'EA_Profit', 'Profit'), errors='coerce').fillna(0.0)
+        values = pd.Series(np.select([profit > 0.01, profit < -0.01], ['TP', 'SL'], None), index=df.index)
+    return pd.Categorical(values, categories=['TP', 'SL'])
+
+
+def compute(frame: pd.DataFrame, name: str) -> pd.Series:
+    """Evaluate one feature over `frame` (no store involved)."""
+    definition = FEATURES[name]
+    if not definition.available(frame):
+        missing = [group for group in definition.requires if not any(col in frame.columns for col in group)]
+        raise KeyError(f"feature '{name}' needs one of {' / '.join(missing[0])}")
+    values = definition.func(frame)
+    series = pd.Series(values, index=frame.index, name=name)
+    return series if definition.dtype == 'category' else series.astype(definition.dtype)
+
+
+# ---------------------------------- Store ----------------------------------- #
+
+def _file_digest(path: Path) -> str:
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _source_digests:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+                digest.update(chunk)
+        _source_digests[key] = digest.hexdigest()
+    return _source_digests[key]
+
+
+def dataset_key(sources: Sequence, view: str = DEFAULT_VIEW) -> str:
+    """Hash of the source contents (in order) and the view that built the frame from them."""
+    digest = hashlib.sha256(f"{STORE_FORMAT_VERSION}:{view}".encode())
+    for source in sources:
+        digest.update(_file_digest(Path(source)).encode())
+    return digest.hexdigest()
+
+
+def store_dir_for(sources: Sequence, view: str = DEFAULT_VIEW, key: Optional[str] = None) -> Path:
+    """Store directory of a dataset: next to its first source, under .cache/feature_store."""
+    first = Path(sources[0])
+    key = key or dataset_key(sources, view)
+    # The full file name, so `bt.csv` and `bt.json` in one directory get separate stores
+    return first.parent / '.cache' / STORE_DIR_NAME / f"{first.name}.{view}.{key[:16]}"
+
+
+def _fingerprint(frame: pd.DataFrame, columns: Sequence[str], column_hashes: Dict[str, bytes]) -> str:
+    """Hash of the values and row order of `columns` (per-column hashes memoized in `column_hashes`)."""
+    digest = hashlib.sha256()
+    for col in columns:
+        if col not in column_hashes:
+            hashed = pd.util.hash_pandas_object(frame[col], index=False).to_numpy()
+            column_hashes[col] = hashlib.sha256(hashed.tobytes()).digest()
+        digest.update(col.encode() + b'\0' + column_hashes[col])
+    return digest.hexdigest()
+
+
+def read_manifest(store_dir: Path) -> Dict:
+    try:
+        return json.loads((Path(store_dir) / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(store_dir: Path, manifest: Dict) -> None:
+    tmp_path = store_dir / f"{MANIFEST_NAME}.tmp{os.getpid()}"
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, store_dir / MANIFEST_NAME)
+
+
+def _write_feature(store_dir: Path, series: pd.Series, definition_hash: str) -> str:
+    file_name = f"{series.name}.{definition_hash[:12]}.arrow"
+    table = pa.table({series.name: pa.Array.from_pandas(series.reset_index(drop=True))})
+    tmp_path = store_dir / f"{file_name}.tmp{os.getpid()}"
+    # Uncompressed so the column can be memory-mapped without decompression
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, store_dir / file_name)
+    for stale in store_dir.glob(f"{series.name}.*.arrow"):
+        if stale.name != file_name:
+            stale.unlink(missing_ok=True)
+    return file_name
+
+
+def _read_feature(store_dir: Path, name: str, file_name: str, index: pd.Index) -> pd.Series:
+    table = feather.read_table(store_dir / file_name, memory_map=True)
+    series = table.column(name).to_pandas()
+    series.index = index
+    return series.rename(name)
+
+
+def _drop_stale_stores(store_dir: Path) -> None:
+    """Stores of older contents of the same source file and view."""
+    prefix = store_dir.name.rsplit('.', 1)[0]
+    for stale in store_dir.parent.glob(f"{prefix}.*"):
+        if stale != store_dir and stale.is_dir() and stale.name.rsplit('.', 1)[0] == prefix:
+            for path in stale.iterdir():
+                path.unlink(missing_ok=True)
+            stale.rmdir()
+
+
+def materialize(frame: pd.DataFrame, names: Optional[Iterable[str]] = None, sources: Optional[Sequence] = None,
+                view: str = DEFAULT_VIEW, metrics: Optional[PipelineMetrics] = None) -> pd.DataFrame:
+    """
+    Features `names` (default: every one `frame` has inputs for) aligned with `frame`.
+
+    With `sources` (the files `frame` was built from, via `view`), stored
+    features with a matching definition hash and input fingerprint are
+    memory-mapped and the others are computed and stored; without them
+    everything is computed in memory.
+    """
+    metrics = metrics or PipelineMetrics('feature_store')
+    names = list(names) if names is not None else [n for n, d in FEATURES.items() if d.available(frame)]
+    unknown = [name for name in names if name not in FEATURES]
+    if unknown:
+        raise KeyError(f"unknown feature(s): {', '.join(unknown)} (see feature_store.py --list)")
+
+    store_dir = store_dir_for(sources, view) if sources and pa is not None else None
+    stored = read_manifest(store_dir) if store_dir is not None else {}
+    if stored.get('rows') != len(frame):
+        stored = {}
+    entries = stored.get('features', {})
+
+    columns: Dict[str, pd.Series] = {}
+    fingerprints: Dict[str, str] = {}
+    column_hashes: Dict[str, bytes] = {}
+    with metrics.stage('load') as stage:
+        for name in names:
+            entry = entries.get(name)
+            if (not entry or entry.get('definition') != FEATURES[name].definition_hash
+                    or not FEATURES[name].available(frame)):
+                continue
+            # A frame built differently from the same sources (a changed merge or loader) must not
+            # be served columns stored for another row order
+            fingerprints[name] = _fingerprint(frame, FEATURES[name].inputs(frame), column_hashes)
+            if entry.get('inputs') == fingerprints[name]:
+                try:
+                    columns[name] = _read_feature(store_dir, name, entry['file'], frame.index)
+                    stage.rows += len(frame)
+                except (OSError, KeyError, pa.ArrowException):
+                    pass  # unreadable file: recomputed below
+
+    missing = [name for name in names if name not in columns]
+    if missing:
+        with metrics.stage('aggregate', rows=len(frame) * len(missing)):
+            for name in missing:
+                columns[name] = compute(frame, name)
+        if store_dir is not None:
+            try:
+                store_dir.mkdir(parents=True, exist_ok=True)
+                manifest = {'rows': len(frame), 'view': view,
+                            'sources': [str(Path(s).name) for s in sources],
+                            'features': dict(entries) if stored else {}}
+                for name in missing:
+                    definition_hash = FEATURES[name].definition_hash
+                    if name not in fingerprints:
+                        fingerprints[name] = _fingerprint(frame, FEATURES[name].inputs(frame), column_hashes)
+                    manifest['features'][name] = {
+                        'definition': definition_hash,
+                        'inputs': fingerprints[name],
+                        'dtype': FEATURES[name].dtype,
+                        'file': _write_feature(store_dir, columns[name], definition_hash),
+                    }
+                _write_manifest(store_dir, manifest)
+                _drop_stale_stores(store_dir)
+            except (OSError, pa.ArrowException) as e:
+                print(f"⚠️  Could not store features for {Path(sources[0]).name}: {e}")
+
+    return pd.DataFrame({name: columns[name] for name in names}, index=frame.index)
+
+
+def add_features(frame: pd.DataFrame, names: Optional[Iterable[str]] = None, sources: Optional[Sequence] = None,
+                 view: str = DEFAULT_VIEW, metrics: Optional[PipelineMetrics] = None) -> pd.DataFrame:
+    """
+    A new frame: `frame` with the features as columns (replacing same-named ones).
+
+    The features are joined in one concat rather than inserted one column at a
+    time, which would fragment wide frames (pandas' PerformanceWarning).
+    """
+    features = materialize(frame, names, sources, view, metrics)
+    kept = frame.drop(columns=[name for name in features.columns if name in frame.columns])
+    return pd.concat([kept, features], axis=1)
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def _load_source(path: Path) -> pd.DataFrame:
+    """A source as its default loader reads it (the 'raw' view)."""
+    if path.suffix == '.csv':
+        return pd.read_csv(path)
+    from processed_dataset_cache import load_processed_trades
+    return load_processed_trades(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Materialize per-trade derived features')
+    parser.add_argument('inputs', nargs='*', type=Path, help='Trade CSVs or processed JSON / NDJSON / Arrow files')
+    parser.add_argument('--features', default=None, help='Comma-separated feature names (default: all applicable)')
+    parser.add_argument('--list', action='store_true', help='List feature definitions and their hashes')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, definition in FEATURES.items():
+            inputs = ', '.join(' | '.join(group) for group in definition.requires)
+            print(f"{name:<20} {definition.dtype:<9} {definition.definition_hash[:12]}  [{inputs}] {definition.description}")
+        return 0
+    if not args.inputs:
+        parser.error('give trade files or --list')
+    if pa is None:
+        print("❌ pyarrow is not installed; nothing to store")
+        return 1
+
+    metrics = PipelineMetrics('feature_store')
+    names = args.features.split(',') if args.features else None
+    for path in args.inputs:
+        with metrics.stage('load') as stage:
+            frame = _load_source(path)
+            stage.rows = len(frame)
+        store_dir = store_dir_for([path])
+        before = read_manifest(store_dir).get('features', {})
+        features = materialize(frame, names, sources=[path], metrics=metrics)
+        fresh = [n for n in features.columns
+                 if before.get(n, {}).get('definition') == FEATURES[n].definition_hash]
+        print(f"✅ {path.name}: {len(features.columns)} features x {len(frame):,} trades "
+              f"({len(fresh)} stored, {len(features.columns) - len(fresh)} computed) -> {store_dir}")
+    metrics.export()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'feature_store'))
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo Equity
+==================
+Drawdown distribution, time under water and risk of ruin for a run's trade
+P/L sequence.
+
+A backtest is one ordering of its trades. This engine replays the same trades
+as many alternative histories:
+
+    bootstrap     trades drawn with replacement (the trade distribution)
+    permutation   the actual trades in a random order (sequence risk only;
+                  final equity is identical, drawdowns are not)
+
+Paths are rows of a 2-D matrix (paths x trades). Equity, running peak,
+drawdown, under-water runs and ruin are computed with cumulative operations
+(cumsum, maximum.accumulate) over the whole matrix at once, a chunk of paths
+at a time to bound memory. Runs of 100k+ paths are split across a process
+pool in seeded blocks (SeedSequence.spawn, as in resampling_engine.py), so a
+given seed gives the same result for any worker count.
+
+Per path: max drawdown (money and % of peak), longest stretch under water
+(trades), fraction of trades under water, final equity, and whether equity
+ever fell to the ruin level (start equity x (1 - ruin fraction)).
+
+Usage:
+    from monte_carlo_equity import simulate, load_trade_profits
+
+    profits, start = load_trade_profits('X_MT5Report.csv')
+    result = simulate(profits, start, n_paths=100_000, seed=7)
+    result.ruin_probability, result.percentiles('max_drawdown_pct')
+
+    python monte_carlo_equity.py X_MT5Report.csv --paths 100000 --ruin 0.5 --json mc.json
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+
+METHODS = ('bootstrap', 'permutation')
+PATH_METRICS = ('max_drawdown', 'max_drawdown_pct', 'longest_underwater', 'underwater_fraction',
+                'final_equity', 'ruined')
+DEFAULT_PATHS = 10_000
+DEFAULT_START_EQUITY = 10_000.0
+DEFAULT_RUIN_FRACTION = 0.5
+PERCENTILES = (5, 25, 50, 75, 95, 99)
+CHUNK_ELEMENTS = 2_000_000      # path rows x trades held in memory per chunk
+PARALLEL_MIN_ELEMENTS = 50_000_000
+BLOCK_PATHS = 5_000             # paths per seeded block
+
+
+# ------------------------------ Path matrices ------------------------------- #
+
+def sample_profits(profits: np.ndarray, n_paths: int, method: str, rng: np.random.Generator) -> np.ndarray:
+    """(n_paths, n_trades) matrix of resampled or permuted trade P/L."""
+    if method == 'bootstrap':
+        return profits[rng.integers(0, len(profits), (n_paths, len(profits)))]
+    if method == 'permutation':
+        return rng.permuted(np.broadcast_to(profits, (n_paths, len(profits))), axis=1)
+    raise ValueError(f"Unknown method '{method}' (expected one of {METHODS})")
+
+
+def equity_paths(profits, start_equity: float = DEFAULT_START_EQUITY, n_paths: int = 1_000,
+                 method: str = 'bootstrap', seed=None) -> np.ndarray:
+    """
+    Equity after each trade for n_paths simulated histories, shape (n_paths, n_trades + 1).
+
+    Column 0 is the start equity. Holds the whole matrix, so meant for
+    plotting-sized runs; use simulate() for the statistics of large runs.
+    """
+    profits = _clean(profits)
+    rng = np.random.default_rng(seed)
+    matrix = sample_profits(profits, n_paths, method, rng)
+    equity = np.empty((n_paths, len(profits) + 1))
+    equity[:, 0] = start_equity
+    np.cumsum(matrix, axis=1, out=equity[:, 1:])
+    equity[:, 1:] += start_equity
+    return equity
+
+
+def path_metrics(profits: np.ndarray, start_equity: float,
+                 ruin_fraction: float = DEFAULT_RUIN_FRACTION) -> Dict[str, np.ndarray]:
+    """Drawdown / under-water / ruin statistics of each row of a 2-D P/L matrix."""
+    profits = np.atleast_2d(profits)
+    n_paths, n_trades = profits.shape
+    equity = start_equity + np.cumsum(profits, axis=1)
+    # Peak includes the start equity: a losing first trade is already a drawdown
+    peak = np.maximum(np.maximum.accumulate(equity, axis=1), start_equity)
+    drawdown = peak - equity
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown_pct = np.where(peak > 0, drawdown / peak * 100.0, 0.0)
+
+    underwater = drawdown > 1e-9
+    # Longest under-water run: distance to the last trade that was at a peak
+    steps = np.arange(1, n_trades + 1)
+    last_peak = np.maximum.accumulate(np.where(underwater, 0, steps), axis=1)
+    run_length = steps - last_peak
+
+    ruin_level = start_equity * (1.0 - ruin_fraction)
+    return {
+        'max_drawdown': drawdown.max(axis=1, initial=0.0),
+        'max_drawdown_pct': drawdown_pct.max(axis=1, initial=0.0),
+        'longest_underwater': run_length.max(axis=1, initial=0),
+        'underwater_fraction': underwater.mean(axis=1) if n_trades else np.zeros(n_paths),
+        'final_equity': equity[:, -1] if n_trades else np.full(n_paths, start_equity),
+        'ruined': equity.min(axis=1, initial=np.inf) <= ruin_level,
+    }
+
+
+# -------------------------------- Simulation -------------------------------- #
+
+def _chunks(n_paths: int, width: int):
+    size = max(1, CHUNK_ELEMENTS // max(width, 1))
+    for start in range(0, n_paths, size):
+        yield min(size, n_paths - start)
+
+
+def _simulate_job(profits: np.ndarray, start_equity: float, method: str, ruin_fraction: float,
+                  n_paths: int, seed) -> Dict[str, np.ndarray]:
+    """Path metrics for one seeded block, a memory-bounded chunk at a time."""
+    rng = np.random.default_rng(seed)
+    out = {m: [] for m in PATH_METRICS}
+    for size in _chunks(n_paths, len(profits)):
+        stats = path_metrics(sample_profits(profits, size, method, rng), start_equity, ruin_fraction)
+        for m in PATH_METRICS:
+            out[m].append(stats[m])
+    return {m: np.concatenate(v) for m, v in out.items()}
+
+
+@dataclass
+class MonteCarloResult:
+    """Per-path metrics of a simulation plus the same metrics for the actual trade order."""
+    method: str
+    n_paths: int
+    n_trades: int
+    start_equity: float
+    ruin_fraction: float
+    paths: Dict[str, np.ndarray]
+    observed: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def ruin_probability(self) -> float:
+        return float(self.paths['ruined'].mean()) if self.n_paths else float('nan')
+
+    def percentiles(self, metric: str, q=PERCENTILES) -> Dict[int, float]:
+        values = self.paths[metric].astype(np.float64)
+        return {int(p): float(v) for p, v in zip(q, np.percentile(values, q))}
+
+    def exceedance(self, metric: str, value: float) -> float:
+        """Share of paths with `metric` at or above `value` (e.g. the backtest's max drawdown)."""
+        return float(np.mean(self.paths[metric] >= value - 1e-9))
+
+    def summary(self) -> Dict:
+        metrics = [m for m in PATH_METRICS if m != 'ruined']
+        return {
+            'method': self.method,
+            'paths': self.n_paths,
+            'trades': self.n_trades,
+            'start_equity': self.start_equity,
+            'ruin_level': self.start_equity * (1.0 - self.ruin_fraction),
+            'ruin_probability': self.ruin_probability,
+            'observed': self.observed,
+            'percentiles': {m: self.percentiles(m) for m in metrics},
+            'mean': {m: float(self.paths[m].mean()) for m in metrics},
+            'observed_max_drawdown_exceedance': self.exceedance('max_drawdown', self.observed['max_drawdown']),
+        }
+
+
+def _clean(profits) -> np.ndarray:
+    profits = np.asarray(profits, dtype=np.float64)
+    return profits[~np.isnan(profits)]
+
+
+def simulate(profits, start_equity: float = DEFAULT_START_EQUITY, n_paths: int = DEFAULT_PATHS,
+             method: str = 'bootstrap', ruin_fraction: float = DEFAULT_RUIN_FRACTION,
+             seed=None, workers: Optional[int] = None) -> MonteCarloResult:
+    """
+    Simulate n_paths trade histories and return their drawdown / ruin statistics.
+
+    workers=None uses a process pool only when paths x trades is large enough
+    to pay for it; blocks are seeded independently of the worker count.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method '{method}' (expected one of {METHODS})")
+    profits = _clean(profits)
+    observed = {m: float(v[0]) for m, v in path_metrics(profits[None, :], start_equity, ruin_fraction).items()}
+    if len(profits) == 0 or n_paths <= 0:
+        empty = {m: np.empty(0) for m in PATH_METRICS}
+        return MonteCarloResult(method, 0, len(profits), start_equity, ruin_fraction, empty, observed)
+
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    counts = [min(BLOCK_PATHS, n_paths - start) for start in range(0, n_paths, BLOCK_PATHS)]
+    seeds = root.spawn(len(counts))  # one stream per block: same result for any worker count
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_paths * len(profits) >= PARALLEL_MIN_ELEMENTS else 1
+    workers = max(1, min(workers, len(counts)))
+
+    args = (profits, start_equity, method, ruin_fraction)
+    if workers == 1:
+        parts = [_simulate_job(*args, count, block_seed) for count, block_seed in zip(counts, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(_simulate_job, *zip(*[args] * len(counts)), counts, seeds))
+    paths = {m: np.concatenate([p[m] for p in parts]) for m in PATH_METRICS}
+    return MonteCarloResult(method, n_paths, len(profits), start_equity, ruin_fraction, paths, observed)
+
+
+# --------------------------------- Inputs ----------------------------------- #
+
+def load_trade_profits(path) -> Tuple[np.ndarray, Optional[float]]:
+    """
+    Closed-trade P/L in close order and the starting balance (None if unknown).
+
+    Accepts an MT5 report (net of commission and swap), an EA trades CSV
+    (EXIT rows), or processed / joined trades (.json, .ndjson, .arrow).
+    """
+    path = Path(path)
+    if path.suffix == '.csv':
+        from trade_join import read_ea_trades, read_mt5_deals
+
+        with open(path, encoding='utf-8-sig', errors='replace') as f:
+            header = f.readline()
+        if 'RowType' in header:
+            ea = read_ea_trades(path)
+            exits = ea[ea['RowType'] == 'EXIT'].sort_values('CloseTime', kind='stable')
+            entries = ea[ea['RowType'] == 'ENTRY']
+            start = entries['Balance'].iloc[0] if 'Balance' in ea and len(entries) else None
+            return exits['Profit'].to_numpy(np.float64), _start(start)
+
+        deals = read_mt5_deals(path).sort_values('Deal', kind='stable')
+        closes = deals[deals['Direction'].isin(['out', 'in/out', 'out by'])]
+        net = closes['Profit'].fillna(0) + closes['Commission'].fillna(0) + closes['Swap'].fillna(0)
+        start = deals['Balance'].iloc[0] - deals['Profit'].fillna(0).iloc[0] if len(deals) else None
+        return net.to_numpy(np.float64), _start(start)
+
+    from processed_dataset_cache import load_processed_trades
+
+    columns = ['OUT_Profit_OP_01', 'OUT_Commission', 'OUT_Swap', 'IN_Balance_OP_01', 'IN_Deal']
+    trades = load_processed_trades(path, columns=columns)
+    if trades.empty:
+        return np.empty(0), None
+    if 'IN_Deal' in trades:
+        trades = trades.sort_values('IN_Deal', kind='stable')
+    net = sum(pd.to_numeric(trades[c], errors='coerce').fillna(0)
+              for c in ('OUT_Profit_OP_01', 'OUT_Commission', 'OUT_Swap') if c in trades)
+    start = trades['IN_Balance_OP_01'].iloc[0] if 'IN_Balance_OP_01' in trades else None
+    return np.asarray(net, dtype=np.float64), _start(start)
+
+
+def _start(value) -> Optional[float]:
+    value = pd.to_numeric(value, errors='coerce')
+    return float(value) if pd.notna(value) and value > 0 else None
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def format_summary(summary: Dict) -> str:
+    observed = summary['observed']
+    lines = [
+        f"🎲 {summary['paths']:,} {summary['method']} paths x {summary['trades']:,} trades "
+        f"(start ${summary['start_equity']:,.2f}, ruin at ${summary['ruin_level']:,.2f})",
+        f"   Risk of ruin: {summary['ruin_probability'] * 100:.2f}%",
+        f"   Backtest max drawdown ${observed['max_drawdown']:,.2f} ({observed['max_drawdown_pct']:.1f}%) "
+        f"is reached or exceeded in {summary['observed_max_drawdown_exceedance'] * 100:.1f}% of paths",
+        '',
+        f"   {'Metric':<22}" + ''.join(f"{'p' + str(p):>12}" for p in PERCENTILES) + f"{'actual':>12}",
+    ]
+    for metric, values in summary['percentiles'].items():
+        lines.append(f"   {metric:<22}" + ''.join(f"{values[p]:>12,.2f}" for p in PERCENTILES)
+                     + f"{observed[metric]:>12,.2f}")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monte Carlo equity / drawdown / risk-of-ruin simulation')
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='MT5 report CSV, EA trades CSV, or processed/joined trades (.json/.arrow)')
+    parser.add_argument('--paths', type=int, default=DEFAULT_PATHS, help='Simulated paths (default: %(default)s)')
+    parser.add_argument('--method', choices=METHODS, default='bootstrap', help='Path generator (default: %(default)s)')
+    parser.add_argument('--ruin', type=float, default=DEFAULT_RUIN_FRACTION,
+                        help='Ruin = losing this fraction of the start equity (default: %(default)s)')
+    parser.add_argument('--start-equity', type=float, default=None,
+                        help=f'Start equity (default: from the input, else {DEFAULT_START_EQUITY:,.0f})')
+    parser.add_argument('--seed', type=int, default=None, help='Random seed for reproducible runs')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: automatic)')
+    parser.add_argument('--json', type=Path, default=None, help='Write the summaries to this JSON file')
+    args = parser.parse_args()
+
+    metrics = PipelineMetrics('monte_carlo_equity')
+    summaries: List[Dict] = []
+    for path in args.inputs:
+        with metrics.stage('load') as stage:
+            profits, start = load_trade_profits(path)
+            stage.rows = len(profits)
+        start_equity = args.start_equity or start or DEFAULT_START_EQUITY
+        with metrics.stage('aggregate', rows=args.paths * len(profits)):
+            result = simulate(profits, start_equity, args.paths, args.method, args.ruin, args.seed, args.workers)
+        if not result.n_paths:
+            print(f"⚠️  {path.name}: no closed trades")
+            continue
+        with metrics.stage('render'):
+            summary = {'source': path.name, **result.summary()}
+            summaries.append(summary)
+            print(f"\n📈 {path.name}")
+            print(format_summary(summary))
+
+    if args.json and summaries:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(summaries, indent=2))
+        print(f"\n📄 Summary: {args.json}")
+    metrics.export()
+    return 0 if summaries else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'monte_carlo_equity'))
@@ -3,6 +3,14 @@ Multi-Dataset Signal-Trade Correlation Analysis
 ================================================
 Analyzes correlations across multiple versions, timeframes, and symbols
 to identify robust patterns that hold across different market conditions.
+
+Datasets are analyzed in a process pool. Each dataset's stats and correlations
+are cached as JSON under `<output_dir>/.cache/`, keyed by the signals file
+hash, the trades file hash and ANALYZER_VERSION, so a rerun only analyzes new
+or changed backtests; the cross-dataset robustness step reads the cache.
+
+Usage:
+    python multi_dataset_correlation_analysis.py [--workers N] [--no-cache]
 """
 
 import pandas as pd
@@ -10,12 +18,24 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from scipy import stats
 from typing import Dict
 import json
+import argparse
+import hashlib
+import os
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 warnings.filterwarnings('ignore')
 
+from correlation_engine import correlation_table
+from pipeline_metrics import PipelineMetrics
+import tracing
+
+# Bump when analyze_dataset output changes so cached results are recomputed
+ANALYZER_VERSION = '2'
+CACHE_DIR_NAME = '.cache'
+_HASH_CHUNK = 1 << 20
+
 # Set style
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (16, 10)
@@ -24,17 +44,20 @@ plt.rcParams['figure.figsize'] = (16, 10)
 class MultiDatasetAnalyzer:
     """Analyzes correlations across multiple backtest datasets."""
     
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, cache_dir: str = None):
         """
         Initialize the multi-dataset analyzer.
         
         Args:
             base_path: Path to the Backtest_Reports directory
+            cache_dir: Directory for per-dataset result caches (None disables caching)
         """
         self.base_path = Path(base_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self.datasets = []
         self.all_correlations = []
         self.summary_stats = {}
+        self.metrics = PipelineMetrics('multi_dataset_correlation')
         
     def discover_datasets(self):
         """Automatically discover all available signal/trade pairs."""
@@ -104,25 +127,32 @@ class MultiDatasetAnalyzer:
         return self.datasets
     
     def analyze_dataset(self, dataset_info: Dict) -> Dict:
-        """Analyze a single dataset."""
+        """Analyze a single dataset; stage timings come back under 'timings'."""
+        # Per-dataset metrics: this may run in a worker process
+        metrics = PipelineMetrics(self.metrics.pipeline)
         try:
             # Load data
-            signals_df = pd.read_csv(dataset_info['signals_file'])
-            trades_df = pd.read_csv(dataset_info['trades_file'])
+            with metrics.stage('load') as stage:
+                signals_df = pd.read_csv(dataset_info['signals_file'])
+                trades_df = pd.read_csv(dataset_info['trades_file'])
+                stage.rows = len(signals_df) + len(trades_df)
             
             # Convert timestamps
-            signals_df['Timestamp'] = pd.to_datetime(signals_df['Timestamp'], errors='coerce')
-            trades_df['OpenTime'] = pd.to_datetime(trades_df['OpenTime'], errors='coerce')
+            with metrics.stage('parse', rows=len(signals_df) + len(trades_df)):
+                signals_df['Timestamp'] = pd.to_datetime(signals_df['Timestamp'], errors='coerce')
+                trades_df['OpenTime'] = pd.to_datetime(trades_df['OpenTime'], errors='coerce')
             
             # Merge
-            merged_df = pd.merge(
-                trades_df,
-                signals_df,
-                left_on='OpenTime',
-                right_on='Timestamp',
-                how='inner',
-                suffixes=('_trade', '_signal')
-            )
+            with metrics.stage('join') as stage:
+                merged_df = pd.merge(
+                    trades_df,
+                    signals_df,
+                    left_on='OpenTime',
+                    right_on='Timestamp',
+                    how='inner',
+                    suffixes=('_trade', '_signal')
+                )
+                stage.rows = len(merged_df)
             
             if len(merged_df) == 0:
                 print(f"  ⚠️  {dataset_info['name']}: No matching trades found")
@@ -136,40 +166,24 @@ class MultiDatasetAnalyzer:
                             'Acceleration', 'Entropy', 'Jerk']
             outcome_metrics = ['Profit', 'ProfitPercent', 'IsWin', 'RRatio', 'Pips']
             
-            correlations = []
-            for sig in signal_metrics:
-                if sig not in merged_df.columns:
-                    continue
-                for out in outcome_metrics:
-                    if out not in merged_df.columns:
-                        continue
-                    
-                    # Filter out invalid values
-                    valid_mask = (~merged_df[sig].isna()) & (~merged_df[out].isna())
-                    if valid_mask.sum() < 10:  # Need at least 10 samples
-                        continue
-                    
-                    try:
-                        corr, p_value = stats.pearsonr(
-                            merged_df.loc[valid_mask, sig],
-                            merged_df.loc[valid_mask, out]
-                        )
-                        
-                        if not np.isnan(corr):
-                            correlations.append({
-                                'dataset': dataset_info['name'],
-                                'symbol': dataset_info['symbol'],
-                                'version': dataset_info['version'],
-                                'timeframe': dataset_info['timeframe'],
-                                'signal_metric': sig,
-                                'outcome_metric': out,
-                                'correlation': corr,
-                                'p_value': p_value,
-                                'n_samples': valid_mask.sum(),
-                                'significant': p_value < 0.05
-                            })
-                    except Exception:
-                        continue
+            # All signal x outcome pairs in one matrix pass (pairwise NaN handling)
+            with metrics.stage('aggregate', rows=len(merged_df)):
+                table = correlation_table(merged_df, signal_metrics, outcome_metrics,
+                                          min_periods=10, spearman=False)
+            table = table[table['pearson_r'].notna()]
+            
+            correlations = [{
+                'dataset': dataset_info['name'],
+                'symbol': dataset_info['symbol'],
+                'version': dataset_info['version'],
+                'timeframe': dataset_info['timeframe'],
+                'signal_metric': row.signal_metric,
+                'outcome_metric': row.outcome_metric,
+                'correlation': row.pearson_r,
+                'p_value': row.pearson_p,
+                'n_samples': row.n_samples,
+                'significant': row.pearson_p < 0.05
+            } for row in table.itertuples(index=False)]
             
             # Calculate dataset stats
             stats_dict = {
@@ -190,26 +204,96 @@ class MultiDatasetAnalyzer:
             return {
                 'stats': stats_dict,
                 'correlations': correlations,
-                'merged_data': merged_df
+                'merged_data': merged_df,
+                'timings': metrics.as_dict()
             }
             
         except Exception as e:
             print(f"  ✗ {dataset_info['name']}: Error - {str(e)}")
             return None
     
-    def analyze_all_datasets(self):
-        """Analyze all discovered datasets."""
+    def _cache_path(self, dataset_info: Dict) -> Path:
+        """Result cache file for a dataset: name + hash of both inputs and the analyzer version."""
+        digest = hashlib.sha256()
+        for key in ('signals_file', 'trades_file'):
+            digest.update(_file_sha256(dataset_info[key]).encode())
+        digest.update(ANALYZER_VERSION.encode())
+        return self.cache_dir / f"{dataset_info['name']}.{digest.hexdigest()[:16]}.json"
+    
+    def _load_cached(self, cache_path: Path) -> Dict:
+        try:
+            with open(cache_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _store_cached(self, cache_path: Path, result: Dict):
+        """Write stats + correlations atomically and drop older caches of the dataset."""
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'stats': result['stats'], 'correlations': result['correlations']}
+        tmp_path = cache_path.with_suffix(f'.tmp{os.getpid()}')
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, default=_json_default)
+        os.replace(tmp_path, cache_path)
+        
+        prefix = cache_path.name.rsplit('.', 2)[0]
+        for stale in cache_path.parent.glob(f'{prefix}.*.json'):
+            if stale != cache_path and stale.name.rsplit('.', 2)[0] == prefix:
+                stale.unlink(missing_ok=True)
+    
+    def analyze_all_datasets(self, workers: int = None):
+        """
+        Analyze all discovered datasets.
+        
+        Cached results are reused; the remaining datasets run in a process pool
+        (`workers` processes, default os.cpu_count(); 1 runs serially).
+        """
         print("\n🔬 Analyzing all datasets...\n")
         
+        results_by_name = {}
+        pending = []
+        for dataset_info in self.datasets:
+            cache_path = self._cache_path(dataset_info) if self.cache_dir else None
+            cached = self._load_cached(cache_path) if cache_path and cache_path.exists() else None
+            if cached is not None:
+                results_by_name[dataset_info['name']] = cached
+                print(f"  ✓ {dataset_info['name']}: cached "
+                      f"({cached['stats']['total_trades']} trades, {len(cached['correlations'])} correlations)")
+            else:
+                pending.append((dataset_info, cache_path))
+        
+        if pending:
+            infos = [info for info, _ in pending]
+            # Workers continue this trace (a span per dataset under the parent's)
+            carrier = tracing.inject_context()
+            if workers == 1 or len(pending) == 1:
+                fresh = [_analyze_for_pool(self, info, carrier) for info in infos]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    fresh = list(pool.map(_analyze_for_pool, [self] * len(infos), infos,
+                                          [carrier] * len(infos)))
+            for (dataset_info, cache_path), result in zip(pending, fresh):
+                if not result:
+                    continue
+                results_by_name[dataset_info['name']] = result
+                self.metrics.merge(result.get('timings'))
+                if cache_path:
+                    try:
+                        self._store_cached(cache_path, result)
+                    except OSError as e:
+                        print(f"  ⚠️  Could not cache {dataset_info['name']}: {e}")
+        
+        # Keep discovery order regardless of completion order
         results = []
         for dataset_info in self.datasets:
-            result = self.analyze_dataset(dataset_info)
+            result = results_by_name.get(dataset_info['name'])
             if result:
                 results.append(result)
                 self.all_correlations.extend(result['correlations'])
                 self.summary_stats[dataset_info['name']] = result['stats']
         
-        print(f"\n✅ Analyzed {len(results)} datasets successfully")
+        n_cached = len(self.datasets) - len(pending)
+        print(f"\n✅ Analyzed {len(results)} datasets successfully ({n_cached} from cache)")
         print(f"📊 Total correlations calculated: {len(self.all_correlations)}\n")
         
         return results
@@ -503,26 +587,27 @@ class MultiDatasetAnalyzer:
         print("\n📈 GENERATING VISUALIZATIONS...")
         print("-" * 80)
         
-        self.create_robustness_heatmap(
-            output_path / 'multi_dataset_robustness_heatmap.png'
-        )
-        
-        self.create_consistency_chart(
-            output_path / 'multi_dataset_consistency_chart.png'
-        )
-        
-        self.create_symbol_comparison(
-            output_path / 'multi_dataset_symbol_comparison.png'
-        )
-        
-        # 6. Save all correlations
-        corr_df.to_csv(output_path / 'all_correlations.csv', index=False)
-        print("✓ All correlations saved to all_correlations.csv")
-        
-        # 7. Save summary stats
-        summary_df = pd.DataFrame(self.summary_stats.values())
-        summary_df.to_csv(output_path / 'dataset_summary.csv', index=False)
-        print("✓ Dataset summary saved to dataset_summary.csv")
+        with self.metrics.stage('render', rows=len(corr_df)):
+            self.create_robustness_heatmap(
+                output_path / 'multi_dataset_robustness_heatmap.png'
+            )
+            
+            self.create_consistency_chart(
+                output_path / 'multi_dataset_consistency_chart.png'
+            )
+            
+            self.create_symbol_comparison(
+                output_path / 'multi_dataset_symbol_comparison.png'
+            )
+            
+            # 6. Save all correlations
+            corr_df.to_csv(output_path / 'all_correlations.csv', index=False)
+            print("✓ All correlations saved to all_correlations.csv")
+            
+            # 7. Save summary stats
+            summary_df = pd.DataFrame(self.summary_stats.values())
+            summary_df.to_csv(output_path / 'dataset_summary.csv', index=False)
+            print("✓ Dataset summary saved to dataset_summary.csv")
         
         # 8. Create JSON summary
         summary = {
@@ -550,8 +635,40 @@ class MultiDatasetAnalyzer:
         print("="*80 + "\n")
 
 
+def _file_sha256(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    """NumPy scalars in stats/correlation records -> built-in types."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _analyze_for_pool(analyzer: 'MultiDatasetAnalyzer', dataset_info: Dict, trace_carrier: Dict = None) -> Dict:
+    """Worker entry point; the merged frame is not sent back to the parent."""
+    with tracing.remote_context(trace_carrier):
+        with tracing.span(f"{analyzer.metrics.pipeline}.dataset", dataset=dataset_info['name'],
+                          pid=os.getpid()):
+            result = analyzer.analyze_dataset(dataset_info)
+    tracing.force_flush()
+    if result:
+        result.pop('merged_data', None)
+    return result
+
+
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description='Multi-dataset signal-trade correlation analysis')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every dataset')
+    args = parser.parse_args()
+    
     base_path = Path(__file__).parent.parent / 'MQL5' / 'Backtest_Reports'
     output_dir = Path(__file__).parent.parent / 'analytics' / 'multi_dataset_analysis'
     
@@ -559,20 +676,25 @@ def main():
     print("=" * 80)
     
     # Create analyzer
-    analyzer = MultiDatasetAnalyzer(str(base_path))
+    cache_dir = None if args.no_cache else output_dir / CACHE_DIR_NAME
+    analyzer = MultiDatasetAnalyzer(str(base_path), cache_dir=cache_dir)
     
     # Discover datasets
-    datasets = analyzer.discover_datasets()
+    with analyzer.metrics.stage('discover') as stage:
+        datasets = analyzer.discover_datasets()
+        stage.rows = len(datasets)
     
     if len(datasets) == 0:
         print("❌ No datasets found!")
         return
     
-    # Analyze all
-    analyzer.analyze_all_datasets()
+    # Analyze all (cached datasets are not recomputed)
+    with tracing.span('multi_dataset_correlation.analyze', datasets=len(datasets)):
+        analyzer.analyze_all_datasets(workers=args.workers)
     
     # Generate report
     analyzer.generate_multi_dataset_report(str(output_dir))
+    analyzer.metrics.export()
 
 
 if __name__ == "__main__":
@@ -22,9 +22,282 @@ from datetime import datetime
 from typing import Dict, List, Tuple
 import json
 
-# Set style
-plt.style.use('dark_background')
-sns.set_palette("husl")
+from report_pipeline import ChartJob, render_charts
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+BACKTEST_DIR = PROJECT_ROOT / "MQL5" / "Backtest_Reports"
+OUTPUT_DIR = PROJECT_ROOT / "analytics" / "version_comparison_output"
+
+
+def set_style():
+    """Chart style, applied inside each render job"""
+    plt.style.use('dark_background')
+    sns.set_palette("husl")
+
+
+def render_win_rate_comparison(out_path: Path, results: Dict, versions: Dict):
+    """Compare win rates across versions"""
+    set_style()
+    
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
+    
+    # Overall win rate comparison
+    versions_list = []
+    win_rates = []
+    colors = []
+    
+    for version, data in results.items():
+        if data is None:
+            continue
+        versions_list.append(versions[version]['name'])
+        win_rates.append(data['win_rate'])
+        colors.append(versions[version]['color'])
+    
+    bars1 = ax1.bar(versions_list, win_rates, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    ax1.set_ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
+    ax1.set_title('Overall Win Rate Comparison', fontsize=14, fontweight='bold', pad=20)
+    ax1.grid(axis='y', alpha=0.3, linestyle='--')
+    ax1.set_ylim(0, 100)
+    
+    # Add value labels on bars
+    for bar in bars1:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height,
+                f'{height:.1f}%',
+                ha='center', va='bottom', fontweight='bold', fontsize=11)
+    
+    # Win rate improvement chart
+    if len(win_rates) > 1:
+        improvements = []
+        labels = []
+        for i in range(1, len(win_rates)):
+            improvement = win_rates[i] - win_rates[0]
+            improvements.append(improvement)
+            labels.append(f"{versions_list[i]}\nvs {versions_list[0]}")
+        
+        bar_colors = ['green' if x > 0 else 'red' for x in improvements]
+        bars2 = ax2.bar(labels, improvements, color=bar_colors, alpha=0.7, edgecolor='white', linewidth=2)
+        ax2.set_ylabel('Win Rate Improvement (%)', fontsize=12, fontweight='bold')
+        ax2.set_title('Win Rate Improvement vs Baseline', fontsize=14, fontweight='bold', pad=20)
+        ax2.axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
+        ax2.grid(axis='y', alpha=0.3, linestyle='--')
+        
+        for bar in bars2:
+            height = bar.get_height()
+            ax2.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{height:+.1f}%',
+                    ha='center', va='bottom' if height > 0 else 'top',
+                    fontweight='bold', fontsize=11)
+    
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
+    plt.close()
+
+def render_profit_comparison(out_path: Path, results: Dict, versions: Dict):
+    """Compare profitability across versions"""
+    set_style()
+    
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    
+    versions_list = []
+    total_profits = []
+    profit_factors = []
+    sharpe_ratios = []
+    colors = []
+    
+    for version, data in results.items():
+        if data is None:
+            continue
+        versions_list.append(versions[version]['name'])
+        total_profits.append(data['total_profit'])
+        profit_factors.append(data['profit_factor'])
+        sharpe_ratios.append(data['sharpe_ratio'])
+        colors.append(versions[version]['color'])
+    
+    # Total Profit
+    bars1 = axes[0, 0].bar(versions_list, total_profits, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    axes[0, 0].set_ylabel('Total Profit ($)', fontsize=12, fontweight='bold')
+    axes[0, 0].set_title('Total Profit Comparison', fontsize=14, fontweight='bold', pad=20)
+    axes[0, 0].grid(axis='y', alpha=0.3, linestyle='--')
+    axes[0, 0].axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
+    
+    for bar in bars1:
+        height = bar.get_height()
+        axes[0, 0].text(bar.get_x() + bar.get_width()/2., height,
+                       f'${height:,.0f}',
+                       ha='center', va='bottom' if height > 0 else 'top',
+                       fontweight='bold', fontsize=10)
+    
+    # Profit Factor
+    bars2 = axes[0, 1].bar(versions_list, profit_factors, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    axes[0, 1].set_ylabel('Profit Factor', fontsize=12, fontweight='bold')
+    axes[0, 1].set_title('Profit Factor Comparison', fontsize=14, fontweight='bold', pad=20)
+    axes[0, 1].grid(axis='y', alpha=0.3, linestyle='--')
+    axes[0, 1].axhline(y=1.0, color='yellow', linestyle='--', linewidth=2, alpha=0.5, label='Break-even')
+    axes[0, 1].legend()
+    
+    for bar in bars2:
+        height = bar.get_height()
+        axes[0, 1].text(bar.get_x() + bar.get_width()/2., height,
+                       f'{height:.2f}',
+                       ha='center', va='bottom',
+                       fontweight='bold', fontsize=10)
+    
+    # Sharpe Ratio
+    bars3 = axes[1, 0].bar(versions_list, sharpe_ratios, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    axes[1, 0].set_ylabel('Sharpe Ratio', fontsize=12, fontweight='bold')
+    axes[1, 0].set_title('Risk-Adjusted Returns (Sharpe Ratio)', fontsize=14, fontweight='bold', pad=20)
+    axes[1, 0].grid(axis='y', alpha=0.3, linestyle='--')
+    axes[1, 0].axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
+    
+    for bar in bars3:
+        height = bar.get_height()
+        axes[1, 0].text(bar.get_x() + bar.get_width()/2., height,
+                       f'{height:.3f}',
+                       ha='center', va='bottom' if height > 0 else 'top',
+                       fontweight='bold', fontsize=10)
+    
+    # Trade Count
+    trade_counts = [results[v]['total_trades'] for v in results if results[v] is not None]
+    bars4 = axes[1, 1].bar(versions_list, trade_counts, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
+    axes[1, 1].set_ylabel('Number of Trades', fontsize=12, fontweight='bold')
+    axes[1, 1].set_title('Trade Count Comparison', fontsize=14, fontweight='bold', pad=20)
+    axes[1, 1].grid(axis='y', alpha=0.3, linestyle='--')
+    
+    for bar in bars4:
+        height = bar.get_height()
+        axes[1, 1].text(bar.get_x() + bar.get_width()/2., height,
+                       f'{int(height):,}',
+                       ha='center', va='bottom',
+                       fontweight='bold', fontsize=10)
+    
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
+    plt.close()
+
+def render_asset_performance_comparison(out_path: Path, results: Dict, versions: Dict):
+    """Compare performance across assets for each version"""
+    set_style()
+    
+    # Collect all unique assets
+    all_assets = set()
+    for version, data in results.items():
+        if data and 'by_asset' in data:
+            all_assets.update(data['by_asset'].keys())
+    
+    assets_list = sorted(list(all_assets))
+    
+    fig, axes = plt.subplots(2, 1, figsize=(16, 10))
+    
+    # Win Rate by Asset
+    x = np.arange(len(assets_list))
+    width = 0.25
+    
+    for i, (version, data) in enumerate(results.items()):
+        if data is None:
+            continue
+        
+        win_rates = []
+        for asset in assets_list:
+            if asset in data['by_asset']:
+                win_rates.append(data['by_asset'][asset]['win_rate'])
+            else:
+                win_rates.append(0)
+        
+        offset = width * (i - 1)
+        axes[0].bar(x + offset, win_rates, width, 
+                   label=versions[version]['name'],
+                   color=versions[version]['color'],
+                   alpha=0.8, edgecolor='white', linewidth=1)
+    
+    axes[0].set_xlabel('Asset', fontsize=12, fontweight='bold')
+    axes[0].set_ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
+    axes[0].set_title('Win Rate by Asset - Version Comparison', fontsize=14, fontweight='bold', pad=20)
+    axes[0].set_xticks(x)
+    axes[0].set_xticklabels(assets_list)
+    axes[0].legend()
+    axes[0].grid(axis='y', alpha=0.3, linestyle='--')
+    axes[0].set_ylim(0, 100)
+    
+    # Trade Count by Asset
+    for i, (version, data) in enumerate(results.items()):
+        if data is None:
+            continue
+        
+        trade_counts = []
+        for asset in assets_list:
+            if asset in data['by_asset']:
+                trade_counts.append(data['by_asset'][asset]['trades'])
+            else:
+                trade_counts.append(0)
+        
+        offset = width * (i - 1)
+        axes[1].bar(x + offset, trade_counts, width,
+                   label=versions[version]['name'],
+                   color=versions[version]['color'],
+                   alpha=0.8, edgecolor='white', linewidth=1)
+    
+    axes[1].set_xlabel('Asset', fontsize=12, fontweight='bold')
+    axes[1].set_ylabel('Number of Trades', fontsize=12, fontweight='bold')
+    axes[1].set_title('Trade Count by Asset - Version Comparison', fontsize=14, fontweight='bold', pad=20)
+    axes[1].set_xticks(x)
+    axes[1].set_xticklabels(assets_list)
+    axes[1].legend()
+    axes[1].grid(axis='y', alpha=0.3, linestyle='--')
+    
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
+    plt.close()
+
+def render_feature_evolution(out_path: Path, results: Dict, versions: Dict):
+    """Show feature evolution across versions"""
+    set_style()
+    
+    fig, ax = plt.subplots(figsize=(14, 8))
+    
+    versions_list = ['v4.1.3', 'v4.1.4', 'v4.1.5']
+    all_features = set()
+    
+    # Collect all features
+    for version in versions_list:
+        if version in versions:
+            all_features.update(versions[version]['features'])
+    
+    features_list = sorted(list(all_features))
+    
+    # Create feature matrix
+    feature_matrix = np.zeros((len(features_list), len(versions_list)))
+    
+    for i, version in enumerate(versions_list):
+        if version in versions:
+            for j, feature in enumerate(features_list):
+                if feature in versions[version]['features']:
+                    feature_matrix[j, i] = 1
+    
+    # Plot heatmap
+    im = ax.imshow(feature_matrix, cmap='Greens', aspect='auto', alpha=0.8)
+    
+    # Set ticks
+    ax.set_xticks(np.arange(len(versions_list)))
+    ax.set_yticks(np.arange(len(features_list)))
+    ax.set_xticklabels([versions[v]['name'] for v in versions_list])
+    ax.set_yticklabels(features_list)
+    
+    # Add checkmarks
+    for i in range(len(features_list)):
+        for j in range(len(versions_list)):
+            if feature_matrix[i, j] == 1:
+                ax.text(j, i, '✓', ha='center', va='center',
+                       color='white', fontsize=20, fontweight='bold')
+    
+    ax.set_title('Feature Evolution Across Versions', fontsize=14, fontweight='bold', pad=20)
+    ax.set_xlabel('EA Version', fontsize=12, fontweight='bold')
+    ax.set_ylabel('Features', fontsize=12, fontweight='bold')
+    
+    plt.tight_layout()
+    plt.savefig(out_path, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
+    plt.close()
+
 
 class MultiVersionAnalyzer:
     """Analyzes and compares multiple EA versions"""
@@ -189,276 +462,27 @@ class MultiVersionAnalyzer:
         
         return df_comparison
     
-    def plot_win_rate_comparison(self):
-        """Compare win rates across versions"""
-        print("\n📈 Creating win rate comparison chart...")
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(16, 6))
-        
-        # Overall win rate comparison
-        versions_list = []
-        win_rates = []
-        colors = []
-        
-        for version, data in self.results.items():
-            if data is None:
-                continue
-            versions_list.append(self.versions[version]['name'])
-            win_rates.append(data['win_rate'])
-            colors.append(self.versions[version]['color'])
-        
-        bars1 = ax1.bar(versions_list, win_rates, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        ax1.set_ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
-        ax1.set_title('Overall Win Rate Comparison', fontsize=14, fontweight='bold', pad=20)
-        ax1.grid(axis='y', alpha=0.3, linestyle='--')
-        ax1.set_ylim(0, 100)
-        
-        # Add value labels on bars
-        for bar in bars1:
-            height = bar.get_height()
-            ax1.text(bar.get_x() + bar.get_width()/2., height,
-                    f'{height:.1f}%',
-                    ha='center', va='bottom', fontweight='bold', fontsize=11)
-        
-        # Win rate improvement chart
-        if len(win_rates) > 1:
-            improvements = []
-            labels = []
-            for i in range(1, len(win_rates)):
-                improvement = win_rates[i] - win_rates[0]
-                improvements.append(improvement)
-                labels.append(f"{versions_list[i]}\nvs {versions_list[0]}")
-            
-            bar_colors = ['green' if x > 0 else 'red' for x in improvements]
-            bars2 = ax2.bar(labels, improvements, color=bar_colors, alpha=0.7, edgecolor='white', linewidth=2)
-            ax2.set_ylabel('Win Rate Improvement (%)', fontsize=12, fontweight='bold')
-            ax2.set_title('Win Rate Improvement vs Baseline', fontsize=14, fontweight='bold', pad=20)
-            ax2.axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
-            ax2.grid(axis='y', alpha=0.3, linestyle='--')
-            
-            for bar in bars2:
-                height = bar.get_height()
-                ax2.text(bar.get_x() + bar.get_width()/2., height,
-                        f'{height:+.1f}%',
-                        ha='center', va='bottom' if height > 0 else 'top',
-                        fontweight='bold', fontsize=11)
-        
-        plt.tight_layout()
-        output_file = self.output_dir / 'win_rate_comparison.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
-        plt.close()
-        print(f"   ✅ Saved to {output_file}")
-    
-    def plot_profit_comparison(self):
-        """Compare profitability across versions"""
-        print("\n💰 Creating profit comparison chart...")
-        
-        fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-        
-        versions_list = []
-        total_profits = []
-        profit_factors = []
-        sharpe_ratios = []
-        colors = []
-        
-        for version, data in self.results.items():
-            if data is None:
-                continue
-            versions_list.append(self.versions[version]['name'])
-            total_profits.append(data['total_profit'])
-            profit_factors.append(data['profit_factor'])
-            sharpe_ratios.append(data['sharpe_ratio'])
-            colors.append(self.versions[version]['color'])
-        
-        # Total Profit
-        bars1 = axes[0, 0].bar(versions_list, total_profits, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        axes[0, 0].set_ylabel('Total Profit ($)', fontsize=12, fontweight='bold')
-        axes[0, 0].set_title('Total Profit Comparison', fontsize=14, fontweight='bold', pad=20)
-        axes[0, 0].grid(axis='y', alpha=0.3, linestyle='--')
-        axes[0, 0].axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
-        
-        for bar in bars1:
-            height = bar.get_height()
-            axes[0, 0].text(bar.get_x() + bar.get_width()/2., height,
-                           f'${height:,.0f}',
-                           ha='center', va='bottom' if height > 0 else 'top',
-                           fontweight='bold', fontsize=10)
-        
-        # Profit Factor
-        bars2 = axes[0, 1].bar(versions_list, profit_factors, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        axes[0, 1].set_ylabel('Profit Factor', fontsize=12, fontweight='bold')
-        axes[0, 1].set_title('Profit Factor Comparison', fontsize=14, fontweight='bold', pad=20)
-        axes[0, 1].grid(axis='y', alpha=0.3, linestyle='--')
-        axes[0, 1].axhline(y=1.0, color='yellow', linestyle='--', linewidth=2, alpha=0.5, label='Break-even')
-        axes[0, 1].legend()
-        
-        for bar in bars2:
-            height = bar.get_height()
-            axes[0, 1].text(bar.get_x() + bar.get_width()/2., height,
-                           f'{height:.2f}',
-                           ha='center', va='bottom',
-                           fontweight='bold', fontsize=10)
-        
-        # Sharpe Ratio
-        bars3 = axes[1, 0].bar(versions_list, sharpe_ratios, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        axes[1, 0].set_ylabel('Sharpe Ratio', fontsize=12, fontweight='bold')
-        axes[1, 0].set_title('Risk-Adjusted Returns (Sharpe Ratio)', fontsize=14, fontweight='bold', pad=20)
-        axes[1, 0].grid(axis='y', alpha=0.3, linestyle='--')
-        axes[1, 0].axhline(y=0, color='white', linestyle='-', linewidth=1, alpha=0.5)
-        
-        for bar in bars3:
-            height = bar.get_height()
-            axes[1, 0].text(bar.get_x() + bar.get_width()/2., height,
-                           f'{height:.3f}',
-                           ha='center', va='bottom' if height > 0 else 'top',
-                           fontweight='bold', fontsize=10)
-        
-        # Trade Count
-        trade_counts = [self.results[v]['total_trades'] for v in self.results if self.results[v] is not None]
-        bars4 = axes[1, 1].bar(versions_list, trade_counts, color=colors, alpha=0.8, edgecolor='white', linewidth=2)
-        axes[1, 1].set_ylabel('Number of Trades', fontsize=12, fontweight='bold')
-        axes[1, 1].set_title('Trade Count Comparison', fontsize=14, fontweight='bold', pad=20)
-        axes[1, 1].grid(axis='y', alpha=0.3, linestyle='--')
-        
-        for bar in bars4:
-            height = bar.get_height()
-            axes[1, 1].text(bar.get_x() + bar.get_width()/2., height,
-                           f'{int(height):,}',
-                           ha='center', va='bottom',
-                           fontweight='bold', fontsize=10)
-        
-        plt.tight_layout()
-        output_file = self.output_dir / 'profit_comparison.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
-        plt.close()
-        print(f"   ✅ Saved to {output_file}")
+    def chart_jobs(self) -> List[ChartJob]:
+        """Pipeline jobs for the comparison charts (call after results are loaded)"""
+        kwargs = {'results': self.results, 'versions': self.versions}
+        charts = [
+            ('win_rate_comparison', render_win_rate_comparison, 'Win Rate Comparison'),
+            ('profit_comparison', render_profit_comparison, 'Profit Comparison'),
+            ('asset_performance_comparison', render_asset_performance_comparison, 'Asset Performance Comparison'),
+            ('feature_evolution', render_feature_evolution, 'Feature Evolution'),
+        ]
+        return [ChartJob(name, render, self.output_dir / f'{name}.png', kwargs=kwargs, title=title)
+                for name, render, title in charts]
     
-    def plot_asset_performance_comparison(self):
-        """Compare performance across assets for each version"""
-        print("\n🌍 Creating asset performance comparison...")
-        
-        # Collect all unique assets
-        all_assets = set()
-        for version, data in self.results.items():
-            if data and 'by_asset' in data:
-                all_assets.update(data['by_asset'].keys())
-        
-        assets_list = sorted(list(all_assets))
-        
-        fig, axes = plt.subplots(2, 1, figsize=(16, 10))
-        
-        # Win Rate by Asset
-        x = np.arange(len(assets_list))
-        width = 0.25
-        
-        for i, (version, data) in enumerate(self.results.items()):
-            if data is None:
-                continue
-            
-            win_rates = []
-            for asset in assets_list:
-                if asset in data['by_asset']:
-                    win_rates.append(data['by_asset'][asset]['win_rate'])
-                else:
-                    win_rates.append(0)
-            
-            offset = width * (i - 1)
-            axes[0].bar(x + offset, win_rates, width, 
-                       label=self.versions[version]['name'],
-                       color=self.versions[version]['color'],
-                       alpha=0.8, edgecolor='white', linewidth=1)
-        
-        axes[0].set_xlabel('Asset', fontsize=12, fontweight='bold')
-        axes[0].set_ylabel('Win Rate (%)', fontsize=12, fontweight='bold')
-        axes[0].set_title('Win Rate by Asset - Version Comparison', fontsize=14, fontweight='bold', pad=20)
-        axes[0].set_xticks(x)
-        axes[0].set_xticklabels(assets_list)
-        axes[0].legend()
-        axes[0].grid(axis='y', alpha=0.3, linestyle='--')
-        axes[0].set_ylim(0, 100)
-        
-        # Trade Count by Asset
-        for i, (version, data) in enumerate(self.results.items()):
-            if data is None:
-                continue
-            
-            trade_counts = []
-            for asset in assets_list:
-                if asset in data['by_asset']:
-                    trade_counts.append(data['by_asset'][asset]['trades'])
-                else:
-                    trade_counts.append(0)
-            
-            offset = width * (i - 1)
-            axes[1].bar(x + offset, trade_counts, width,
-                       label=self.versions[version]['name'],
-                       color=self.versions[version]['color'],
-                       alpha=0.8, edgecolor='white', linewidth=1)
-        
-        axes[1].set_xlabel('Asset', fontsize=12, fontweight='bold')
-        axes[1].set_ylabel('Number of Trades', fontsize=12, fontweight='bold')
-        axes[1].set_title('Trade Count by Asset - Version Comparison', fontsize=14, fontweight='bold', pad=20)
-        axes[1].set_xticks(x)
-        axes[1].set_xticklabels(assets_list)
-        axes[1].legend()
-        axes[1].grid(axis='y', alpha=0.3, linestyle='--')
-        
-        plt.tight_layout()
-        output_file = self.output_dir / 'asset_performance_comparison.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
-        plt.close()
-        print(f"   ✅ Saved to {output_file}")
-    
-    def plot_feature_evolution(self):
-        """Show feature evolution across versions"""
-        print("\n🔧 Creating feature evolution timeline...")
-        
-        fig, ax = plt.subplots(figsize=(14, 8))
-        
-        versions_list = ['v4.1.3', 'v4.1.4', 'v4.1.5']
-        all_features = set()
-        
-        # Collect all features
-        for version in versions_list:
-            if version in self.versions:
-                all_features.update(self.versions[version]['features'])
-        
-        features_list = sorted(list(all_features))
-        
-        # Create feature matrix
-        feature_matrix = np.zeros((len(features_list), len(versions_list)))
-        
-        for i, version in enumerate(versions_list):
-            if version in self.versions:
-                for j, feature in enumerate(features_list):
-                    if feature in self.versions[version]['features']:
-                        feature_matrix[j, i] = 1
-        
-        # Plot heatmap
-        im = ax.imshow(feature_matrix, cmap='Greens', aspect='auto', alpha=0.8)
-        
-        # Set ticks
-        ax.set_xticks(np.arange(len(versions_list)))
-        ax.set_yticks(np.arange(len(features_list)))
-        ax.set_xticklabels([self.versions[v]['name'] for v in versions_list])
-        ax.set_yticklabels(features_list)
-        
-        # Add checkmarks
-        for i in range(len(features_list)):
-            for j in range(len(versions_list)):
-                if feature_matrix[i, j] == 1:
-                    ax.text(j, i, '✓', ha='center', va='center',
-                           color='white', fontsize=20, fontweight='bold')
-        
-        ax.set_title('Feature Evolution Across Versions', fontsize=14, fontweight='bold', pad=20)
-        ax.set_xlabel('EA Version', fontsize=12, fontweight='bold')
-        ax.set_ylabel('Features', fontsize=12, fontweight='bold')
-        
-        plt.tight_layout()
-        output_file = self.output_dir / 'feature_evolution.png'
-        plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='#1a1a1a')
-        plt.close()
-        print(f"   ✅ Saved to {output_file}")
+    def load_all_versions(self):
+        """Load trades and calculate metrics for every configured version"""
+        for version in ['v4.1.3', 'v4.1.4', 'v4.1.5']:
+            df = self.load_version_data(version)
+            if df is not None:
+                self.results[version] = self.calculate_metrics(df, version)
+            else:
+                self.results[version] = None
+                print(f"   ⚠️  Skipping {version} (no data found)")
     
     def create_executive_dashboard(self):
         """Create HTML dashboard with all visualizations"""
@@ -770,21 +794,13 @@ class MultiVersionAnalyzer:
         print(f"Output Directory: {self.output_dir}")
         
         # Load data for each version
-        for version in ['v4.1.3', 'v4.1.4', 'v4.1.5']:
-            df = self.load_version_data(version)
-            if df is not None:
-                self.results[version] = self.calculate_metrics(df, version)
-            else:
-                self.results[version] = None
-                print(f"   ⚠️  Skipping {version} (no data found)")
+        self.load_all_versions()
         
-        # Create visualizations
+        # Create visualizations (rendered in parallel, unchanged charts skipped)
         if any(self.results.values()):
             self.create_version_comparison_table()
-            self.plot_win_rate_comparison()
-            self.plot_profit_comparison()
-            self.plot_asset_performance_comparison()
-            self.plot_feature_evolution()
+            print("\n📈 Rendering comparison charts...")
+            render_charts(self.chart_jobs())
             self.create_executive_dashboard()
             
             print("\n" + "=" * 80)
@@ -802,12 +818,18 @@ class MultiVersionAnalyzer:
             print("\n❌ No data available for any version!")
 
 
+def chart_jobs(backtest_dir: Path = BACKTEST_DIR, output_dir: Path = OUTPUT_DIR) -> List[ChartJob]:
+    """Comparison chart jobs for report_pipeline (loads every version first)"""
+    analyzer = MultiVersionAnalyzer(backtest_dir, output_dir)
+    analyzer.load_all_versions()
+    return analyzer.chart_jobs() if any(analyzer.results.values()) else []
+
+
 def main():
     """Main execution"""
     # Setup paths
-    project_root = Path(__file__).parent.parent
-    backtest_dir = project_root / "MQL5" / "Backtest_Reports"
-    output_dir = project_root / "analytics" / "version_comparison_output"
+    backtest_dir = BACKTEST_DIR
+    output_dir = OUTPUT_DIR
     
     print(f"\n📂 Searching for backtest files in: {backtest_dir}")
     print(f"📂 Output directory: {output_dir}\n")
@@ -14,13 +14,17 @@ Author: Claude AI
 Date: 2025-11-28
 """
 
-import json
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Any
 from dataclasses import dataclass
 
+from processed_dataset_cache import load_processed_trades
+from resampling_engine import compare_subset
+
+RESAMPLE_SEED = 7  # fixed so reruns print the same p-values
+
 # Physics metrics to analyze (the ones that have Min thresholds)
 # Using actual column names from processed data
 PHYSICS_METRICS = [
@@ -50,19 +54,18 @@ class OutlierStats:
     outlier_loss_count: int  # Losses above win's 95th percentile
     outlier_loss_pct: float
     potential_savings: float  # Sum of profits if these outliers were avoided
+    # Expectancy of trades under the ceiling minus trades above it (bootstrap CI, permutation p)
+    ceiling_delta: float = np.nan
+    ceiling_ci_low: float = np.nan
+    ceiling_ci_high: float = np.nan
+    ceiling_p_value: float = np.nan
 
 
 def load_trades(json_path: Path) -> pd.DataFrame:
-    """Load trades from processed JSON file."""
-    with open(json_path) as f:
-        data = json.load(f)
-    
-    trades = data.get('trades', [])
-    if not trades:
-        return pd.DataFrame()
-    
-    # Convert to DataFrame directly - it's already flat!
-    df = pd.DataFrame(trades)
+    """Load trades from processed JSON file (via the columnar cache)."""
+    df = load_processed_trades(json_path)
+    if df.empty:
+        return df
     
     # Normalize direction: Trade_Direction is "Long" or "Short"
     # Map to BUY/SELL for consistency
@@ -121,6 +124,10 @@ def analyze_outliers(df: pd.DataFrame, metric: str, direction: str) -> OutlierSt
     outlier_pct = (outlier_count / len(losses) * 100) if len(losses) > 0 else 0
     potential_savings = outlier_losses['profit'].sum() * -1  # Convert losses to savings
     
+    # Is the savings real or noise? Compare trades the ceiling keeps vs removes
+    valid = dir_df['metric_val'].notna() & dir_df['profit'].notna()
+    ceiling = compare_subset(dir_df.loc[valid, 'profit'], ~outlier_mask[valid], seed=RESAMPLE_SEED)['expectancy']
+    
     return OutlierStats(
         metric=metric,
         direction=direction,
@@ -133,7 +140,11 @@ def analyze_outliers(df: pd.DataFrame, metric: str, direction: str) -> OutlierSt
         loss_p99=loss_p99,
         outlier_loss_count=outlier_count,
         outlier_loss_pct=outlier_pct,
-        potential_savings=potential_savings
+        potential_savings=potential_savings,
+        ceiling_delta=ceiling.estimate,
+        ceiling_ci_low=ceiling.ci_low,
+        ceiling_ci_high=ceiling.ci_high,
+        ceiling_p_value=ceiling.p_value
     )
 
 
@@ -236,14 +247,16 @@ def main():
     # Sort by potential savings
     all_stats.sort(key=lambda x: x.potential_savings, reverse=True)
     
-    print(f"{'Metric':<25} {'Dir':<5} {'Win μ':>10} {'Win P95':>10} {'Loss P95':>10} {'Outlier#':>8} {'Outlier%':>9} {'Savings$':>12}")
-    print("-" * 100)
+    print(f"{'Metric':<25} {'Dir':<5} {'Win μ':>10} {'Win P95':>10} {'Loss P95':>10} {'Outlier#':>8} {'Outlier%':>9} {'Savings$':>12} {'ΔExp$':>8} {'p':>6}")
+    print("-" * 116)
     
     for s in all_stats:
         metric_short = s.metric.replace('EA_Entry_', '')
-        print(f"{metric_short:<25} {s.direction:<5} {s.win_mean:>10.2f} {s.win_p95:>10.2f} {s.loss_p95:>10.2f} {s.outlier_loss_count:>8} {s.outlier_loss_pct:>8.1f}% ${s.potential_savings:>11.2f}")
+        print(f"{metric_short:<25} {s.direction:<5} {s.win_mean:>10.2f} {s.win_p95:>10.2f} {s.loss_p95:>10.2f} {s.outlier_loss_count:>8} {s.outlier_loss_pct:>8.1f}% ${s.potential_savings:>11.2f} {s.ceiling_delta:>8.2f} {s.ceiling_p_value:>6.3f}")
     
     print()
+    print("ΔExp$ = expectancy of trades under the ceiling minus trades above it; p from a label permutation test")
+    print()
     
     # =========================================================================
     # ANALYSIS 2: Multi-Metric Outlier Losses
@@ -0,0 +1,212 @@
+"""
+Pipeline Metrics
+================
+Stage timings, row counts and memory high-water marks for the batch analytics
+and ingestion pipelines, exported in Prometheus format.
+
+The backend's /metrics endpoint only covers the API; the heavy scripts run as
+short-lived batch jobs, so they are measured in-process and exported once at
+the end of a run, either
+
+  * pushed to a Pushgateway (TP_METRICS_PUSHGATEWAY=host:9091), or
+  * written as `tp_pipeline_<name>.prom` for node_exporter's textfile
+    collector (TP_METRICS_TEXTFILE_DIR=/var/lib/node_exporter/textfile).
+
+Without either setting (or without prometheus_client) the metrics are only
+printed as a stage summary. Each stage is also an OpenTelemetry span
+(`<pipeline>.<stage>`, see tracing.py) when tracing is configured.
+
+Stages use a fixed vocabulary so dashboards line up across pipelines:
+discover, load, parse, join, aggregate, render. Repeated stages (one per file or
+dataset) accumulate. PipelineMetrics holds plain numbers only, so it can be
+pickled into worker processes; workers return `as_dict()` and the parent
+`merge()`s it.
+
+Exported gauges (labels: pipeline, stage):
+    tp_pipeline_stage_duration_seconds
+    tp_pipeline_stage_calls
+    tp_pipeline_stage_rows_processed
+    tp_pipeline_stage_memory_peak_bytes    process peak RSS when the stage ended
+    tp_pipeline_duration_seconds / tp_pipeline_last_run_timestamp_seconds (pipeline)
+
+Usage:
+    from pipeline_metrics import PipelineMetrics
+
+    metrics = PipelineMetrics('signal_trade_correlation')
+    with metrics.stage('load') as stage:
+        df = pd.read_csv(path)
+        stage.rows = len(df)
+    metrics.export()
+"""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:  # optional: Prometheus export
+    from prometheus_client import CollectorRegistry, Gauge, push_to_gateway, write_to_textfile
+except ImportError:
+    CollectorRegistry = None
+
+try:  # peak RSS (not available on Windows)
+    import resource
+except ImportError:
+    resource = None
+
+import tracing
+
+STAGES = ('discover', 'load', 'parse', 'join', 'aggregate', 'render')
+PUSHGATEWAY_ENV = 'TP_METRICS_PUSHGATEWAY'
+TEXTFILE_DIR_ENV = 'TP_METRICS_TEXTFILE_DIR'
+
+# Lists receiving every PipelineMetrics created inside collect_runs()
+_collectors: List[list] = []
+# Callbacks run with (pipeline, stage) after every stage inside on_stage_end()
+_stage_hooks: List[Callable[[str, str], None]] = []
+
+
+def peak_rss_bytes() -> int:
+    """Peak resident set size of this process so far (0 when unavailable)."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return int(peak if sys.platform == 'darwin' else peak * 1024)  # macOS reports bytes, Linux KiB
+
+
+@dataclass
+class StageStats:
+    """Accumulated measurements of one stage."""
+    seconds: float = 0.0
+    calls: int = 0
+    rows: int = 0
+    peak_rss: int = 0
+
+
+class _StageTimer:
+    """Handle yielded by PipelineMetrics.stage(); set or add to `rows` inside the block."""
+
+    def __init__(self, rows: int = 0):
+        self.rows = rows
+
+
+@contextmanager
+def collect_runs():
+    """Yield a list that gathers every PipelineMetrics created in this block (used by cli_profiling)."""
+    runs: list = []
+    _collectors.append(runs)
+    try:
+        yield runs
+    finally:
+        _collectors.remove(runs)
+
+
+@contextmanager
+def on_stage_end(callback: Callable[[str, str], None]):
+    """Call `callback(pipeline, stage)` after every stage ends in this block (used by cli_profiling)."""
+    _stage_hooks.append(callback)
+    try:
+        yield
+    finally:
+        _stage_hooks.remove(callback)
+
+
+class PipelineMetrics:
+    """Measurements of one pipeline run."""
+
+    def __init__(self, pipeline: str, pushgateway: Optional[str] = None, textfile_dir: Optional[str] = None):
+        self.pipeline = pipeline
+        self.pushgateway = pushgateway or os.environ.get(PUSHGATEWAY_ENV)
+        self.textfile_dir = textfile_dir or os.environ.get(TEXTFILE_DIR_ENV)
+        self.stages: Dict[str, StageStats] = {}
+        self.started = time.time()
+        for runs in _collectors:
+            runs.append(self)
+
+    @contextmanager
+    def stage(self, name: str, rows: int = 0):
+        """Time a block as `name`; rows processed can be set on the yielded handle."""
+        timer = _StageTimer(rows)
+        with tracing.span(f"{self.pipeline}.{name}", pipeline=self.pipeline, stage=name) as span:
+            start = time.perf_counter()
+            try:
+                yield timer
+            finally:
+                self.record(name, time.perf_counter() - start, timer.rows)
+                if span is not None:
+                    span.set_attribute('rows', int(timer.rows or 0))
+                for hook in _stage_hooks:
+                    hook(self.pipeline, name)
+
+    def record(self, name: str, seconds: float, rows: int = 0, calls: int = 1, peak_rss: Optional[int] = None):
+        stats = self.stages.setdefault(name, StageStats())
+        stats.seconds += seconds
+        stats.calls += calls
+        stats.rows += int(rows or 0)
+        stats.peak_rss = max(stats.peak_rss, peak_rss_bytes() if peak_rss is None else peak_rss)
+
+    def as_dict(self) -> Dict[str, dict]:
+        return {name: asdict(stats) for name, stats in self.stages.items()}
+
+    def merge(self, stages: Optional[Dict[str, dict]]):
+        """Add measurements returned by a worker process (as_dict())."""
+        for name, stats in (stages or {}).items():
+            self.record(name, stats['seconds'], stats['rows'], stats['calls'], stats['peak_rss'])
+
+    def summary(self) -> str:
+        lines = [f"⏱️  {self.pipeline} stages:"]
+        for name, stats in self.stages.items():
+            rate = f", {stats.rows / stats.seconds:,.0f} rows/s" if stats.rows and stats.seconds > 0 else ''
+            lines.append(f"   {name:<10} {stats.seconds:8.3f}s  x{stats.calls:<4} {stats.rows:>10,} rows"
+                         f"  peak {stats.peak_rss / 1e6:,.0f} MB{rate}")
+        lines.append(f"   {'total':<10} {time.time() - self.started:8.3f}s")
+        return '\n'.join(lines)
+
+    def _registry(self):
+        registry = CollectorRegistry()
+        labels = ['pipeline', 'stage']
+        gauges = {
+            'seconds': Gauge('tp_pipeline_stage_duration_seconds', 'Wall time spent in the stage during the last run',
+                             labels, registry=registry),
+            'calls': Gauge('tp_pipeline_stage_calls', 'Times the stage ran during the last run',
+                           labels, registry=registry),
+            'rows': Gauge('tp_pipeline_stage_rows_processed', 'Rows processed by the stage during the last run',
+                          labels, registry=registry),
+            'peak_rss': Gauge('tp_pipeline_stage_memory_peak_bytes', 'Process peak RSS when the stage ended',
+                              labels, registry=registry),
+        }
+        for name, stats in self.stages.items():
+            for field, gauge in gauges.items():
+                gauge.labels(self.pipeline, name).set(getattr(stats, field))
+        Gauge('tp_pipeline_duration_seconds', 'Wall time of the last run', ['pipeline'],
+              registry=registry).labels(self.pipeline).set(time.time() - self.started)
+        Gauge('tp_pipeline_last_run_timestamp_seconds', 'Unix time the last run finished', ['pipeline'],
+              registry=registry).labels(self.pipeline).set(time.time())
+        return registry
+
+    def export(self, verbose: bool = True) -> Optional[str]:
+        """Push / write the metrics if configured; returns where they went."""
+        tracing.force_flush()
+        if verbose:
+            print(self.summary())
+        if not (self.pushgateway or self.textfile_dir):
+            return None
+        if CollectorRegistry is None:
+            print("⚠️  prometheus_client not installed; pipeline metrics not exported")
+            return None
+
+        registry = self._registry()
+        try:
+            if self.pushgateway:
+                push_to_gateway(self.pushgateway, job=f"tp_pipeline_{self.pipeline}", registry=registry)
+                return self.pushgateway
+            path = Path(self.textfile_dir) / f"tp_pipeline_{self.pipeline}.prom"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            write_to_textfile(str(path), registry)
+            return str(path)
+        except OSError as e:  # metrics must never fail the pipeline itself
+            print(f"⚠️  Could not export pipeline metrics: {e}")
+            return None
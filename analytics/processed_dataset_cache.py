@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Processed Dataset Cache - Columnar cache for csvProcessor.ts JSON output
+
+The processed JSON written by analytics/csv_processing/csvProcessor.ts holds
+every trade as an object with ~170 fields. Decoding it, building a DataFrame
+from a list of dicts and coercing numerics costs far more than the analysis
+that follows, and every analyzer repeats it on every run.
+
+This module materializes the JSON once into an Arrow IPC (Feather v2) file
+next to the source:
+
+    output/processed_trades_2025-11-27.json
+    output/.cache/processed_trades_2025-11-27.<sha256[:16]>.arrow
+
+The cache file name carries the source content hash, so a changed JSON is
+never served stale. Later loads memory-map the Arrow file instead of decoding
+JSON. Nested objects (DataQuality, SourceFiles) are stored as JSON strings;
+metadata/statistics/validation travel in the Arrow schema metadata.
+Streamed `--format ndjson` output (see processed_ndjson.py) is accepted too.
+
+pyarrow is optional: without it the loader falls back to the plain JSON path.
+
+Usage:
+    from processed_dataset_cache import load_processed_dataset, load_processed_trades
+
+    dataset = load_processed_dataset('output/processed_trades_2025-11-27.json')
+    df = load_processed_trades(json_path, columns=['EA_Profit', 'Trade_Result'])
+
+    python processed_dataset_cache.py output/*.json     # warm the cache
+"""
+
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from processed_ndjson import read_sections, read_trades
+
+try:  # optional dependency; JSON fallback below
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    pa = None
+    feather = None
+
+CACHE_DIR_NAME = '.cache'
+CACHE_FORMAT_VERSION = '2'
+_METADATA_KEY = b'processed_dataset'
+_HASH_CHUNK = 1 << 20
+NUMERIC_SHARE = 0.95  # share of a text column's values that must parse for it to become numeric
+
+
+@dataclass
+class ProcessedDataset:
+    """Trades plus the top-level sections of a processed JSON file."""
+    trades: pd.DataFrame
+    metadata: Dict = field(default_factory=dict)
+    statistics: Dict = field(default_factory=dict)
+    validation: Dict = field(default_factory=dict)
+    from_cache: bool = False
+
+
+def source_hash(json_path: Path) -> str:
+    """Content hash of the source JSON (hex sha256)."""
+    digest = hashlib.sha256()
+    with open(json_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    digest.update(CACHE_FORMAT_VERSION.encode())
+    return digest.hexdigest()
+
+
+def cache_path_for(json_path: Path, digest: Optional[str] = None) -> Path:
+    """Location of the Arrow cache file for a processed JSON file."""
+    json_path = Path(json_path)
+    digest = digest or source_hash(json_path)
+    # NDJSON keeps its suffix so `x.ndjson` and `x.json` never share a cache name
+    name = json_path.name if json_path.suffix == '.ndjson' else json_path.stem
+    return json_path.parent / CACHE_DIR_NAME / f"{name}.{digest[:16]}.arrow"
+
+
+def _trades_frame(trades) -> pd.DataFrame:
+    """Build a typed DataFrame from the JSON trade objects (or an untyped frame)."""
+    df = pd.DataFrame(trades)
+
+    columns = {}
+    for col in df.columns:
+        column = df[col]
+        values = column.dropna()
+        if not pd.api.types.is_string_dtype(column.dtype) or values.empty:  # object / str columns only
+            columns[col] = column
+        # Nested objects are kept as JSON text so the column stays flat
+        elif values.map(lambda v: isinstance(v, (dict, list))).any():
+            columns[col] = column.map(lambda v: json.dumps(v) if isinstance(v, (dict, list)) else v)
+        elif values.map(lambda v: isinstance(v, bool)).all():
+            columns[col] = column.astype('boolean')
+        # Numeric strings become real numbers (stray tokens such as 'N/A' become NaN); text is left alone
+        elif pd.to_numeric(values, errors='coerce').notna().mean() >= NUMERIC_SHARE:
+            columns[col] = pd.to_numeric(column, errors='coerce')
+        else:
+            columns[col] = column
+
+    # One constructor call: replacing ~170 columns one at a time fragments the frame
+    return pd.DataFrame(columns, index=df.index)
+
+
+def _read_json(json_path: Path) -> ProcessedDataset:
+    if json_path.suffix == '.ndjson':
+        return _read_ndjson(json_path)
+
+    with open(json_path) as f:
+        data = json.load(f)
+
+    trades = data.get('trades', [])
+    return ProcessedDataset(
+        trades=_trades_frame(trades) if trades else pd.DataFrame(),
+        metadata=data.get('metadata', {}),
+        statistics=data.get('statistics', {}),
+        validation=data.get('validation', {}),
+    )
+
+
+def _read_ndjson(ndjson_path: Path) -> ProcessedDataset:
+    """Streamed csvProcessor output: trades arrive as typed batches."""
+    metadata, summary = read_sections(ndjson_path)
+    trades = read_trades(ndjson_path)
+    return ProcessedDataset(
+        trades=_trades_frame(trades) if not trades.empty else trades,
+        metadata=metadata,
+        statistics=summary.get('statistics', {}),
+        validation=summary.get('validation', {}),
+    )
+
+
+def write_arrow_dataset(dataset: ProcessedDataset, path: Path) -> None:
+    """Write a dataset as an uncompressed Arrow IPC file (atomic replace)."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    table = pa.Table.from_pandas(dataset.trades, preserve_index=False)
+    sections = {
+        'metadata': dataset.metadata,
+        'statistics': dataset.statistics,
+        'validation': dataset.validation,
+    }
+    schema_metadata = dict(table.schema.metadata or {})
+    schema_metadata[_METADATA_KEY] = json.dumps(sections, default=str).encode()
+    table = table.replace_schema_metadata(schema_metadata)
+
+    tmp_path = path.with_suffix(f'.tmp{os.getpid()}')
+    # Uncompressed so the file can be memory-mapped without decompression
+    feather.write_feather(table, tmp_path, compression='uncompressed')
+    os.replace(tmp_path, path)
+
+
+def read_arrow_sections(path: Path) -> Dict:
+    """metadata/statistics/validation of an Arrow dataset file without reading its columns."""
+    with pa.memory_map(str(path)) as source:
+        schema = pa.ipc.open_file(source).schema
+    return json.loads((schema.metadata or {}).get(_METADATA_KEY, b'{}'))
+
+
+def _write_cache(dataset: ProcessedDataset, cache_path: Path) -> None:
+    """Write the dataset atomically and drop older caches of the same source."""
+    write_arrow_dataset(dataset, cache_path)
+
+    # Only `<source>.<digest>.arrow` of this exact source: `trades_v4.1.json` is not `trades_v4.2.json`
+    prefix = cache_path.name.rsplit('.', 2)[0]
+    for stale in cache_path.parent.glob(f'{prefix}.*.arrow'):
+        if stale != cache_path and stale.name.rsplit('.', 2)[0] == prefix:
+            stale.unlink(missing_ok=True)
+
+
+def read_arrow_dataset(path: Path, columns: Optional[List[str]] = None) -> ProcessedDataset:
+    """Memory-map an Arrow dataset file (a cache file or trade_join.py output)."""
+    table = feather.read_table(path, columns=columns, memory_map=True)
+
+    raw = (table.schema.metadata or {}).get(_METADATA_KEY, b'{}')
+    sections = json.loads(raw)
+    return ProcessedDataset(
+        trades=table.to_pandas(),  # consolidated: one block per column would fragment later inserts
+        metadata=sections.get('metadata', {}),
+        statistics=sections.get('statistics', {}),
+        validation=sections.get('validation', {}),
+        from_cache=True,
+    )
+
+
+def load_processed_dataset(json_path, columns: Optional[List[str]] = None,
+                           use_cache: bool = True) -> ProcessedDataset:
+    """
+    Load a processed dataset, transparently using the Arrow cache when fresh.
+
+    A missing or stale cache is rebuilt from the JSON on first use. Passing
+    `columns` reads only those columns from the cache. An `.arrow` path (e.g.
+    written by trade_join.py) is read directly.
+    """
+    json_path = Path(json_path)
+    if json_path.suffix == '.arrow':
+        if pa is None:
+            raise ImportError(f"pyarrow is required to read {json_path.name}")
+        return read_arrow_dataset(json_path, columns)
+
+    if not use_cache or pa is None:
+        dataset = _read_json(json_path)
+    else:
+        cache_path = cache_path_for(json_path)
+        if cache_path.exists():
+            return read_arrow_dataset(cache_path, columns)
+
+        dataset = _read_json(json_path)
+        try:
+            _write_cache(dataset, cache_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️  Could not write cache for {json_path.name}: {e}")
+
+    if columns is not None and not dataset.trades.empty:
+        dataset.trades = dataset.trades[[c for c in columns if c in dataset.trades.columns]]
+    return dataset
+
+
+def load_processed_trades(json_path, columns: Optional[List[str]] = None,
+                          use_cache: bool = True) -> pd.DataFrame:
+    """Trades DataFrame of a processed dataset (see load_processed_dataset)."""
+    return load_processed_dataset(json_path, columns=columns, use_cache=use_cache).trades
+
+
+def main():
+    if pa is None:
+        print("❌ pyarrow is not installed; nothing to cache")
+        sys.exit(1)
+
+    for arg in sys.argv[1:]:
+        json_path = Path(arg)
+        cache_path = cache_path_for(json_path)
+        if cache_path.exists():
+            print(f"✓ {json_path.name}: cache fresh ({cache_path.name})")
+            continue
+        dataset = _read_json(json_path)
+        _write_cache(dataset, cache_path)
+        print(f"✅ {json_path.name}: cached {len(dataset.trades)} trades -> {cache_path.name}")
+
+
+if __name__ == '__main__':
+    main()
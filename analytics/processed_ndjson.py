@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Processed NDJSON Reader - Streams csvProcessor.ts `--format ndjson` output
+
+The NDJSON layout written by CSVProcessor.processToNDJSON is:
+
+    {"__section": "metadata", ...}          first line
+    {...trade...}                           one line per joined trade
+    {"__section": "summary", "statistics": {...}, "validation": {...}}
+
+Trades are decoded a batch at a time and converted into typed NumPy arrays
+(one array per column), so memory is bounded by the batch size rather than
+by the number of trades or optimization passes in the file.
+
+Usage:
+    from processed_ndjson import iter_trade_batches, read_sections
+
+    metadata, summary = read_sections(path)
+    for batch in iter_trade_batches(path, columns=['EA_Profit', 'Trade_Result']):
+        profits = batch['EA_Profit']            # float64 array
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+SECTION_KEY = '__section'
+DEFAULT_BATCH_SIZE = 5000
+
+
+def _typed_array(values: List) -> np.ndarray:
+    """Convert one column of a batch into the narrowest sensible NumPy array."""
+    present = [v for v in values if v is not None]
+
+    if not present:
+        return np.full(len(values), np.nan)
+    if all(isinstance(v, bool) for v in present):
+        if len(present) == len(values):
+            return np.array(values, dtype=bool)
+        return np.array(values, dtype=object)
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        if len(present) == len(values) and all(isinstance(v, int) for v in present):
+            return np.array(values, dtype=np.int64)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+    # Text (and nested objects, kept as JSON text)
+    return np.array(
+        [json.dumps(v) if isinstance(v, (dict, list)) else v for v in values],
+        dtype=object,
+    )
+
+
+def _batch_arrays(records: List[Dict], columns: Optional[List[str]]) -> Dict[str, np.ndarray]:
+    if columns is None:
+        columns = list(records[0].keys())
+        seen = set(columns)
+        for record in records[1:]:
+            for key in record:
+                if key not in seen:
+                    seen.add(key)
+                    columns.append(key)
+    return {col: _typed_array([r.get(col) for r in records]) for col in columns}
+
+
+def iter_trade_batches(ndjson_path, columns: Optional[List[str]] = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Yield trades in batches of at most `batch_size` as {column: ndarray}.
+
+    Integer columns without nulls are int64, other numeric columns float64
+    (None -> NaN), all-bool columns bool; text stays object. A final line cut
+    off mid-write (no trailing newline) is skipped.
+    """
+    batch: List[Dict] = []
+    with open(ndjson_path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                if line.endswith('\n'):
+                    raise
+                break  # last line cut off mid-write
+            if SECTION_KEY in record:
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield _batch_arrays(batch, columns)
+                batch = []
+    if batch:
+        yield _batch_arrays(batch, columns)
+
+
+def iter_trade_frames(ndjson_path, columns: Optional[List[str]] = None,
+                      batch_size: int = DEFAULT_BATCH_SIZE) -> Iterator[pd.DataFrame]:
+    """Same as iter_trade_batches, one DataFrame per batch."""
+    for arrays in iter_trade_batches(ndjson_path, columns, batch_size):
+        yield pd.DataFrame(arrays)
+
+
+def _last_line(f) -> bytes:
+    """Read the last non-empty line of a binary file without scanning it."""
+    f.seek(0, os.SEEK_END)
+    end = f.tell()
+    block = 1 << 16
+    data = b''
+    pos = end
+    while pos > 0:
+        step = min(block, pos)
+        pos -= step
+        f.seek(pos)
+        data = f.read(step) + data
+        stripped = data.rstrip()
+        if b'\n' in stripped:
+            return stripped.rsplit(b'\n', 1)[1]
+    return data.rstrip()
+
+
+def _section_line(line: bytes) -> Dict:
+    """Decoded line, or {} when it is empty or was cut off mid-write."""
+    try:
+        record = json.loads(line or b'{}')
+    except json.JSONDecodeError:
+        return {}
+    return record if isinstance(record, dict) else {}
+
+
+def read_sections(ndjson_path) -> Tuple[Dict, Dict]:
+    """
+    Return (metadata, summary) from the first and last lines.
+
+    summary holds 'statistics' and 'validation'; it is empty if the file
+    was truncated before the summary line was written (an undecodable first
+    or last line counts as missing).
+    """
+    with open(ndjson_path, 'rb') as f:
+        first = _section_line(f.readline())
+        last = _section_line(_last_line(f))
+
+    metadata, summary = {}, {}
+    if first.get(SECTION_KEY) == 'metadata':
+        metadata = {k: v for k, v in first.items() if k != SECTION_KEY}
+    if last.get(SECTION_KEY) == 'summary':
+        summary = {k: v for k, v in last.items() if k != SECTION_KEY}
+    return metadata, summary
+
+
+def read_trades(ndjson_path, columns: Optional[List[str]] = None,
+                batch_size: int = DEFAULT_BATCH_SIZE) -> pd.DataFrame:
+    """Read every trade into one DataFrame (batches are concatenated as they arrive)."""
+    frames = list(iter_trade_frames(ndjson_path, columns, batch_size))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+if __name__ == '__main__':
+    import sys
+
+    for arg in sys.argv[1:]:
+        metadata, summary = read_sections(arg)
+        total = sum(len(next(iter(b.values()))) for b in iter_trade_batches(arg, columns=['EA_Profit']))
+        print(f"{Path(arg).name}: {total} trades "
+              f"(metadata says {metadata.get('totalTrades', '?')}, "
+              f"quality {summary.get('statistics', {}).get('dataQualityScore', '?')}/100)")
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""
+Report Pipeline
+===============
+Headless, parallel and incremental rendering of report charts.
+
+The dashboard and partner-report scripts used to build every matplotlib figure
+serially, at import time, in one process. Here each figure is declared as a
+ChartJob: a module-level render function, the output PNG, the data files it
+reads and its keyword arguments. render_charts() then
+
+  * renders the jobs on a process pool with the Agg backend (no display needed),
+  * skips a job when its fingerprint (input file hashes, the source of the
+    render module and of the repo-local modules it imports, declared `deps`,
+    arguments, matplotlib version) matches the previous run and the PNG exists,
+  * writes each PNG atomically and records the fingerprint next to it under
+    `.cache/`, so an interrupted run never leaves a half-written chart behind.
+
+write_gallery() assembles the rendered PNGs into one HTML page.
+
+Render functions take the output path as their first argument and must set
+their own style (plt.style.use, sns.set_palette): each job runs inside an
+rcParams context, so styles never leak between charts sharing a worker.
+
+Usage:
+    from report_pipeline import ChartJob, render_charts, write_gallery
+
+    jobs = [ChartJob('executive', render_dashboard, out_dir / 'executive.png',
+                     inputs=[trades_csv], deps=[style_py], kwargs={'data_dir': data_dir})]
+    results = render_charts(jobs, workers=4)
+    write_gallery(results, out_dir / 'index.html', title='Executive Report')
+
+    python report_pipeline.py                      # every registered report
+    python report_pipeline.py --only partner --force --workers 2
+"""
+
+import argparse
+import ast
+import hashlib
+import html
+import importlib
+import inspect
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Sequence
+
+import matplotlib
+
+matplotlib.use('Agg')  # headless: never open a window, also inherited by workers
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+PIPELINE_VERSION = '1'
+CACHE_DIR_NAME = '.cache'
+_HASH_CHUNK = 1 << 20
+
+_THIS_FILE = Path(__file__).resolve()
+REPO_ROOT = _THIS_FILE.parent.parent
+
+# Report scripts that expose chart_jobs(); name -> (directory, module)
+REPORTS = {
+    'executive': (REPO_ROOT / 'MQL5' / 'General', 'create_executive_dashboard'),
+    'technical': (REPO_ROOT / 'MQL5' / 'General', 'create_technical_dashboard'),
+    'composite': (REPO_ROOT / 'MQL5' / 'General', 'create_composite_dashboard'),
+    'partner': (REPO_ROOT / 'MQL5' / 'General', 'generate_partner_report'),
+    'multi_asset': (REPO_ROOT / 'analytics', 'create_multi_asset_dashboard'),
+    'multi_version': (REPO_ROOT / 'analytics', 'multi_version_comparison_analysis'),
+}
+
+
+@dataclass
+class ChartJob:
+    """One independent figure: render(output, **kwargs) reads `inputs` and writes a PNG.
+
+    `deps` lists extra source files the chart depends on that are not reachable
+    through the render module's imports (e.g. a style sheet or a config file).
+    """
+    name: str
+    render: Callable[..., Any]
+    output: Path
+    inputs: Sequence[Path] = ()
+    deps: Sequence[Path] = ()
+    kwargs: Dict[str, Any] = field(default_factory=dict)
+    title: Optional[str] = None
+
+
+@dataclass
+class ChartResult:
+    """Outcome of one job: 'rendered', 'cached', 'empty' (nothing to plot) or 'failed'."""
+    name: str
+    output: Path
+    status: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+    title: Optional[str] = None
+
+
+# ----------------------------- Fingerprints -------------------------------- #
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    if hasattr(value, 'item'):  # numpy scalars
+        return value.item()
+    return str(value)
+
+
+def _repo_source(obj) -> Optional[Path]:
+    """Source file of a module/function/class if it lives in this repo (not a venv)."""
+    if obj is None:
+        return None
+    try:
+        source = inspect.getsourcefile(obj)
+    except TypeError:  # builtins and C extensions
+        return None
+    if not source:
+        return None
+    path = Path(source).resolve()
+    if not path.is_relative_to(REPO_ROOT) or 'site-packages' in path.parts or path == _THIS_FILE:
+        return None
+    return path
+
+
+def _imported_names(path: Path) -> List[str]:
+    """Module names imported anywhere in a source file (`from m import x` yields m and m.x)."""
+    names = []
+    for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'), str(path))):
+        if isinstance(node, ast.Import):
+            names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+            names.extend(f"{node.module}.{alias.name}" for alias in node.names)
+    return names
+
+
+@lru_cache(maxsize=None)
+def _module_sources(module_name: str) -> FrozenSet[Path]:
+    """Repo-local source files a loaded module depends on, following its imports transitively."""
+    sources = set()
+    pending = [module_name]
+    seen = set()
+    while pending:
+        name = pending.pop()
+        if name in seen:
+            continue
+        seen.add(name)
+        path = _repo_source(sys.modules.get(name))
+        if path is None:
+            continue
+        sources.add(path)
+        pending.extend(_imported_names(path))
+    return frozenset(sources)
+
+
+def job_fingerprint(job: ChartJob, file_hashes: Optional[Dict[Path, str]] = None) -> str:
+    """Hash of everything the chart depends on; unchanged fingerprint -> skip rendering."""
+    file_hashes = {} if file_hashes is None else file_hashes
+    digest = hashlib.sha256()
+    digest.update(f"{PIPELINE_VERSION}|{matplotlib.__version__}|".encode())
+    digest.update(f"{job.render.__module__}.{job.render.__qualname__}|".encode())
+
+    sources = set(_module_sources(job.render.__module__))
+    render_source = inspect.getsourcefile(job.render)
+    if render_source:
+        sources.add(Path(render_source).resolve())
+    sources.update(Path(p).resolve() for p in job.deps)
+    for path in sorted(sources):
+        if path not in file_hashes:
+            file_hashes[path] = _file_sha256(path) if path.exists() else 'missing'
+        digest.update(f"|{path}:{file_hashes[path]}".encode())
+
+    for path in sorted(Path(p).resolve() for p in job.inputs):
+        if path not in file_hashes:
+            file_hashes[path] = _file_sha256(path) if path.exists() else 'missing'
+        digest.update(f"|{path}:{file_hashes[path]}".encode())
+
+    digest.update(json.dumps(job.kwargs, sort_keys=True, default=_json_default).encode())
+    return digest.hexdigest()
+
+
+def _fingerprint_path(output: Path) -> Path:
+    return output.parent / CACHE_DIR_NAME / f"{output.name}.sha256"
+
+
+def _is_fresh(job: ChartJob, fingerprint: str) -> bool:
+    marker = _fingerprint_path(job.output)
+    return job.output.exists() and marker.exists() and marker.read_text().strip() == fingerprint
+
+
+# ------------------------------- Rendering --------------------------------- #
+
+def _init_worker():
+    matplotlib.use('Agg', force=True)
+
+
+def _render_job(job: ChartJob) -> ChartResult:
+    """Render one job to a temp file and move it into place (runs in a worker)."""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    output = Path(job.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output.with_name(f".{output.stem}.tmp{os.getpid()}{output.suffix}")
+    try:
+        with matplotlib.rc_context():
+            job.render(tmp_path, **job.kwargs)
+        if tmp_path.exists():
+            os.replace(tmp_path, output)
+            status, error = 'rendered', None
+        else:  # nothing to plot for this data
+            status, error = 'empty', None
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        status, error = 'failed', traceback.format_exc(limit=3)
+    finally:
+        plt.close('all')
+    return ChartResult(job.name, output, status, time.perf_counter() - start, error, job.title)
+
+
+def render_charts(jobs: Sequence[ChartJob], workers: Optional[int] = None,
+                  force: bool = False, verbose: bool = True) -> List[ChartResult]:
+    """
+    Render every stale job, in parallel when more than one needs rendering.
+
+    Results come back in job order. Failed jobs are reported, not raised, so
+    one broken chart does not abort the rest of the report.
+    """
+    file_hashes: Dict[Path, str] = {}
+    fingerprints = {}
+    results: Dict[int, ChartResult] = {}
+    pending = []
+
+    for i, job in enumerate(jobs):
+        job.output = Path(job.output)
+        fingerprints[i] = job_fingerprint(job, file_hashes)
+        if not force and _is_fresh(job, fingerprints[i]):
+            results[i] = ChartResult(job.name, job.output, 'cached', title=job.title)
+        else:
+            pending.append(i)
+
+    workers = workers or os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending)))
+    if workers == 1:
+        _init_worker()
+        rendered = [_render_job(jobs[i]) for i in pending]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            rendered = list(pool.map(_render_job, [jobs[i] for i in pending]))
+
+    for i, result in zip(pending, rendered):
+        results[i] = result
+        if result.status == 'rendered':
+            marker = _fingerprint_path(result.output)
+            marker.parent.mkdir(parents=True, exist_ok=True)
+            marker.write_text(fingerprints[i])
+
+    ordered = [results[i] for i in range(len(jobs))]
+    if verbose:
+        for result in ordered:
+            if result.status == 'failed':
+                print(f"❌ {result.name}: {result.error.strip().splitlines()[-1]}")
+            elif result.status == 'cached':
+                print(f"✓ {result.name}: unchanged ({result.output.name})")
+            elif result.status == 'empty':
+                print(f"⚪ {result.name}: no data to plot")
+            else:
+                print(f"✅ {result.name}: {result.output.name} in {result.seconds:.1f}s")
+    return ordered
+
+
+def write_gallery(results: Sequence[ChartResult], html_path: Path, title: str) -> Path:
+    """Single HTML page showing every successfully rendered chart (relative image links)."""
+    html_path = Path(html_path)
+    html_path.parent.mkdir(parents=True, exist_ok=True)
+
+    figures = []
+    for result in results:
+        if result.status in ('failed', 'empty') or not result.output.exists():
+            continue
+        src = os.path.relpath(result.output, html_path.parent)
+        caption = html.escape(result.title or result.name)
+        figures.append(f'<figure><img src="{html.escape(src)}" alt="{caption}">'
+                       f'<figcaption>{caption}</figcaption></figure>')
+
+    page = f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{html.escape(title)}</title>
+<style>
+body {{ background: #0A0E1A; color: #E4E7EB; font-family: 'Segoe UI', Tahoma, sans-serif; margin: 20px; }}
+h1 {{ color: #00D9FF; }}
+figure {{ margin: 0 0 30px; }}
+img {{ max-width: 100%; border: 1px solid #141824; }}
+figcaption {{ color: #8B92A8; margin-top: 6px; }}
+</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+{chr(10).join(figures)}
+</body>
+</html>
+"""
+    tmp_path = html_path.with_suffix(f'.tmp{os.getpid()}')
+    tmp_path.write_text(page, encoding='utf-8')
+    os.replace(tmp_path, html_path)
+    return html_path
+
+
+# --------------------------------- CLI ------------------------------------- #
+
+def load_report_jobs(name: str) -> List[ChartJob]:
+    """chart_jobs() of a registered report script."""
+    directory, module_name = REPORTS[name]
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+    return importlib.import_module(module_name).chart_jobs()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Render report charts in parallel, skipping unchanged ones')
+    parser.add_argument('--only', nargs='+', choices=sorted(REPORTS), help='Reports to render (default: all)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-render charts even if inputs are unchanged')
+    args = parser.parse_args()
+
+    jobs: List[ChartJob] = []
+    for name in args.only or sorted(REPORTS):
+        try:
+            report_jobs = load_report_jobs(name)
+        except Exception as e:
+            print(f"⚠️  {name}: could not collect charts ({e})")
+            continue
+        for job in report_jobs:
+            job.name = f"{name}/{job.name}"
+        jobs.extend(report_jobs)
+
+    start = time.perf_counter()
+    results = render_charts(jobs, workers=args.workers, force=args.force)
+    counts = {s: sum(r.status == s for r in results) for s in ('rendered', 'cached', 'empty', 'failed')}
+    print(f"\n📊 {len(results)} charts: {counts['rendered']} rendered, {counts['cached']} unchanged, "
+          f"{counts['empty']} empty, {counts['failed']} failed in {time.perf_counter() - start:.1f}s")
+    sys.exit(1 if counts['failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+"""
+Resampling Engine
+=================
+Bootstrap confidence intervals and permutation p-values for the trade
+statistics that drive recommendations (win rate, profit factor, expectancy).
+
+Replicates are generated as index/permutation matrices and reduced row-wise
+in NumPy, a chunk of replicates at a time, so 10k replicates over 1k trades is
+a few hundred milliseconds. Large jobs are split across a process pool with
+independent seeds (numpy SeedSequence.spawn per block of replicates), so
+results are reproducible for a given seed regardless of the worker count.
+
+Profit factor is capped at PROFIT_FACTOR_CAP, for the point estimates and for
+every replicate alike: a group or resample with gains but no losses scores the
+cap instead of inf. Without the cap, resamples with no losses give inf - x or
+inf - inf deltas, and those would drop out of the percentiles without notice.
+Replicates that are still not finite are excluded from the interval and
+counted in `dropped`.
+
+Usage:
+    from resampling_engine import compare_groups, bootstrap_metrics
+
+    result = compare_groups(kept_profits, excluded_profits, n_resamples=10_000, seed=7)
+    result['expectancy'].estimate, result['expectancy'].ci_low, result['expectancy'].p_value
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+METRICS = ('win_rate', 'profit_factor', 'expectancy')
+DEFAULT_RESAMPLES = 10_000
+CHUNK_ELEMENTS = 2_000_000      # replicate rows x trades held in memory per chunk
+PARALLEL_MIN_ELEMENTS = 50_000_000
+BLOCK_RESAMPLES = 2_500           # replicates per seeded block
+PROFIT_FACTOR_CAP = 100.0         # profit factor of a group with gains and no losses
+
+
+@dataclass
+class Interval:
+    """Point estimate with a percentile bootstrap confidence interval."""
+    estimate: float
+    ci_low: float
+    ci_high: float
+    dropped: int = 0  # non-finite replicates left out of the interval
+
+
+@dataclass
+class DeltaResult:
+    """Difference of a metric between two groups (a - b)."""
+    estimate: float
+    ci_low: float
+    ci_high: float
+    p_value: float
+    dropped: int = 0  # non-finite bootstrap replicates left out of the interval
+
+    @property
+    def significant(self) -> bool:
+        return bool(self.p_value < 0.05)
+
+    def describe(self, scale: float = 1.0, fmt: str = '.2f') -> str:
+        return (f"Δ {self.estimate * scale:{fmt}}, 95% CI [{self.ci_low * scale:{fmt}}, "
+                f"{self.ci_high * scale:{fmt}}], p={self.p_value:.3f}")
+
+
+def row_metrics(profits: np.ndarray) -> Dict[str, np.ndarray]:
+    """Win rate (fraction), profit factor (capped) and expectancy of each row of a 2-D profit matrix."""
+    profits = np.atleast_2d(profits)
+    n = profits.shape[1]
+    gains = np.where(profits > 0, profits, 0.0).sum(axis=1)
+    losses = -np.where(profits < 0, profits, 0.0).sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        profit_factor = np.where(losses > 0, gains / losses, np.where(gains > 0, np.inf, 0.0))
+        profit_factor = np.minimum(profit_factor, PROFIT_FACTOR_CAP)
+        return {
+            'win_rate': (profits > 0).sum(axis=1) / n if n else np.full(len(profits), np.nan),
+            'profit_factor': profit_factor,
+            'expectancy': profits.sum(axis=1) / n if n else np.full(len(profits), np.nan),
+        }
+
+
+def _chunks(n_resamples: int, width: int):
+    size = max(1, CHUNK_ELEMENTS // max(width, 1))
+    for start in range(0, n_resamples, size):
+        yield min(size, n_resamples - start)
+
+
+def _bootstrap_job(a: np.ndarray, b: Optional[np.ndarray], n_resamples: int, seed) -> Dict[str, np.ndarray]:
+    """Metric replicates of a (or of a - b with independent resampling of each group)."""
+    rng = np.random.default_rng(seed)
+    out = {m: [] for m in METRICS}
+    for size in _chunks(n_resamples, len(a) + (len(b) if b is not None else 0)):
+        stats = row_metrics(a[rng.integers(0, len(a), (size, len(a)))])
+        if b is not None:
+            other = row_metrics(b[rng.integers(0, len(b), (size, len(b)))])
+            stats = {m: stats[m] - other[m] for m in METRICS}
+        for m in METRICS:
+            out[m].append(stats[m])
+    return {m: np.concatenate(v) for m, v in out.items()}
+
+
+def _permutation_job(pooled: np.ndarray, n_a: int, n_resamples: int, seed) -> Dict[str, np.ndarray]:
+    """Metric deltas (first n_a vs rest) under random relabelling of the pooled trades."""
+    rng = np.random.default_rng(seed)
+    out = {m: [] for m in METRICS}
+    for size in _chunks(n_resamples, len(pooled)):
+        shuffled = rng.permuted(np.broadcast_to(pooled, (size, len(pooled))), axis=1)
+        first, rest = row_metrics(shuffled[:, :n_a]), row_metrics(shuffled[:, n_a:])
+        for m in METRICS:
+            out[m].append(first[m] - rest[m])
+    return {m: np.concatenate(v) for m, v in out.items()}
+
+
+def _run(job, args, n_resamples: int, width: int, seed, workers: Optional[int]) -> Dict[str, np.ndarray]:
+    """Run a replicate job in fixed-size blocks, across processes when large enough to pay off."""
+    root = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    counts = [min(BLOCK_RESAMPLES, n_resamples - start) for start in range(0, n_resamples, BLOCK_RESAMPLES)]
+    seeds = root.spawn(len(counts))  # one stream per block: same result for any worker count
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_resamples * width >= PARALLEL_MIN_ELEMENTS else 1
+    workers = max(1, min(workers, len(counts)))
+
+    if workers == 1:
+        parts = [job(*args, count, block_seed) for count, block_seed in zip(counts, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(job, *zip(*[args] * len(counts)), counts, seeds))
+    return {m: np.concatenate([p[m] for p in parts]) for m in METRICS}
+
+
+def _percentile_interval(replicates: np.ndarray, confidence: float):
+    """(low, high, dropped): percentile interval of the finite replicates and how many were not."""
+    finite = replicates[np.isfinite(replicates)]
+    dropped = int(replicates.size - finite.size)
+    if finite.size == 0:
+        return np.nan, np.nan, dropped
+    tail = (1.0 - confidence) / 2.0 * 100.0
+    low, high = np.percentile(finite, [tail, 100.0 - tail])
+    return float(low), float(high), dropped
+
+
+def _clean(profits) -> np.ndarray:
+    profits = np.asarray(profits, dtype=np.float64)
+    return profits[~np.isnan(profits)]
+
+
+def bootstrap_metrics(profits, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+                      seed=None, workers: Optional[int] = None) -> Dict[str, Interval]:
+    """Bootstrap confidence intervals for win rate, profit factor and expectancy."""
+    a = _clean(profits)
+    point = {m: float(v[0]) for m, v in row_metrics(a[None, :]).items()}
+    if len(a) == 0:
+        return {m: Interval(np.nan, np.nan, np.nan) for m in METRICS}
+    reps = _run(_bootstrap_job, (a, None), n_resamples, len(a), seed, workers)
+    return {m: Interval(point[m], *_percentile_interval(reps[m], confidence)) for m in METRICS}
+
+
+def compare_groups(a, b, n_resamples: int = DEFAULT_RESAMPLES, confidence: float = 0.95,
+                   seed=None, workers: Optional[int] = None) -> Dict[str, DeltaResult]:
+    """
+    Metric deltas between two groups of trade profits (a - b).
+
+    Confidence intervals come from resampling each group independently; the
+    two-sided p-value from permuting group labels over the pooled trades.
+    Groups with no trades give NaN results.
+    """
+    a, b = _clean(a), _clean(b)
+    if len(a) == 0 or len(b) == 0:
+        return {m: DeltaResult(np.nan, np.nan, np.nan, np.nan) for m in METRICS}
+
+    point_a, point_b = row_metrics(a[None, :]), row_metrics(b[None, :])
+    observed = {m: float(point_a[m][0] - point_b[m][0]) for m in METRICS}
+
+    boot_seed, perm_seed = np.random.SeedSequence(seed).spawn(2)
+    perm = _run(_permutation_job, (np.concatenate([a, b]), len(a)), n_resamples, len(a) + len(b),
+                perm_seed, workers)
+    boot = _run(_bootstrap_job, (a, b), n_resamples, len(a) + len(b), boot_seed, workers)
+
+    results = {}
+    for m in METRICS:
+        null = perm[m][np.isfinite(perm[m])]
+        if not np.isfinite(observed[m]) or null.size == 0:
+            p_value = np.nan
+        else:
+            p_value = (np.count_nonzero(np.abs(null) >= abs(observed[m]) - 1e-12) + 1) / (null.size + 1)
+        low, high, dropped = _percentile_interval(boot[m], confidence)
+        results[m] = DeltaResult(observed[m], low, high, float(p_value), dropped)
+    return results
+
+
+def compare_subset(profits, mask, **kwargs) -> Dict[str, DeltaResult]:
+    """compare_groups for trades selected by a boolean mask vs the remaining trades."""
+    profits = np.asarray(profits, dtype=np.float64)
+    mask = np.asarray(mask, dtype=bool)
+    return compare_groups(profits[mask], profits[~mask], **kwargs)
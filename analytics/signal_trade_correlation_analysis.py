@@ -10,10 +10,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
-from scipy import stats
 from typing import Dict, List, Tuple
 import json
 
+from correlation_engine import correlation_table
+from feature_store import add_features
+from pipeline_metrics import PipelineMetrics
+
 # Set style for better visualizations
 sns.set_style("whitegrid")
 plt.rcParams['figure.figsize'] = (14, 8)
@@ -30,50 +33,45 @@ class SignalTradeAnalyzer:
             signals_path: Path to the signals CSV file
             trades_path: Path to the trades CSV file
         """
-        self.signals_df = pd.read_csv(signals_path)
-        self.trades_df = pd.read_csv(trades_path)
+        self.metrics = PipelineMetrics('signal_trade_correlation')
+        self.sources = [trades_path, signals_path]
+        with self.metrics.stage('load') as stage:
+            self.signals_df = pd.read_csv(signals_path)
+            self.trades_df = pd.read_csv(trades_path)
+            stage.rows = len(self.signals_df) + len(self.trades_df)
         self.merged_df = None
         self.correlations = {}
         
     def prepare_data(self):
         """Merge signals and trades data on timestamp and prepare for analysis."""
         # Convert timestamps
-        self.signals_df['Timestamp'] = pd.to_datetime(self.signals_df['Timestamp'])
-        self.trades_df['OpenTime'] = pd.to_datetime(self.trades_df['OpenTime'])
+        with self.metrics.stage('parse', rows=len(self.signals_df) + len(self.trades_df)):
+            self.signals_df['Timestamp'] = pd.to_datetime(self.signals_df['Timestamp'])
+            self.trades_df['OpenTime'] = pd.to_datetime(self.trades_df['OpenTime'])
         
         # Merge on timestamp (signals should match trade entry)
-        self.merged_df = pd.merge(
-            self.trades_df,
-            self.signals_df,
-            left_on='OpenTime',
-            right_on='Timestamp',
-            how='inner',
-            suffixes=('_trade', '_signal')
-        )
-        
-        # Add derived metrics
-        self._add_derived_metrics()
+        with self.metrics.stage('join') as stage:
+            self.merged_df = pd.merge(
+                self.trades_df,
+                self.signals_df,
+                left_on='OpenTime',
+                right_on='Timestamp',
+                how='inner',
+                suffixes=('_trade', '_signal')
+            )
+            
+            # Add derived metrics
+            self._add_derived_metrics()
+            stage.rows = len(self.merged_df)
         
         print(f"✓ Merged {len(self.merged_df)} trades with signals")
         print(f"  Total signals: {len(self.signals_df)}")
         print(f"  Total trades: {len(self.trades_df)}")
         
     def _add_derived_metrics(self):
-        """Add derived trading performance metrics."""
-        # Win/loss binary indicator
-        self.merged_df['IsWin'] = (self.merged_df['Profit'] > 0).astype(int)
-        
-        # Profit categories
-        self.merged_df['ProfitCategory'] = pd.cut(
-            self.merged_df['Profit'],
-            bins=[-np.inf, -5, 0, 5, 10, np.inf],
-            labels=['Large Loss', 'Small Loss', 'Small Win', 'Medium Win', 'Large Win']
-        )
-        
-        # Risk-adjusted return
-        self.merged_df['RiskAdjustedReturn'] = (
-            self.merged_df['Profit'] / self.merged_df['RiskPercent']
-        ).replace([np.inf, -np.inf], 0)
+        """Add derived trading performance metrics (IsWin, ProfitCategory, RiskAdjustedReturn) from the feature store."""
+        self.merged_df = add_features(self.merged_df, ['IsWin', 'ProfitCategory', 'RiskAdjustedReturn'],
+                                      sources=self.sources, view='signal_trade_merge', metrics=self.metrics)
         
     def analyze_correlations(self) -> pd.DataFrame:
         """
@@ -94,40 +92,21 @@ class SignalTradeAnalyzer:
             'MFE', 'MAE', 'IsWin', 'HoldTimeBars'
         ]
         
-        correlation_results = []
-        
-        for signal_metric in signal_metrics:
-            if signal_metric not in self.merged_df.columns:
-                continue
-                
-            for outcome_metric in outcome_metrics:
-                if outcome_metric not in self.merged_df.columns:
-                    continue
-                    
-                # Calculate Pearson correlation
-                corr, p_value = stats.pearsonr(
-                    self.merged_df[signal_metric].fillna(0),
-                    self.merged_df[outcome_metric].fillna(0)
-                )
-                
-                # Calculate Spearman correlation (rank-based, more robust)
-                spearman_corr, spearman_p = stats.spearmanr(
-                    self.merged_df[signal_metric].fillna(0),
-                    self.merged_df[outcome_metric].fillna(0)
-                )
-                
-                correlation_results.append({
-                    'SignalMetric': signal_metric,
-                    'OutcomeMetric': outcome_metric,
-                    'PearsonCorr': corr,
-                    'PearsonPValue': p_value,
-                    'SpearmanCorr': spearman_corr,
-                    'SpearmanPValue': spearman_p,
-                    'Significant': p_value < 0.05,
-                    'AbsCorr': abs(corr)
-                })
-        
-        self.correlations = pd.DataFrame(correlation_results)
+        # Full signal x outcome Pearson/Spearman matrices in one pass
+        # (NaNs dropped pairwise rather than filled with 0)
+        with self.metrics.stage('aggregate', rows=len(self.merged_df)):
+            table = correlation_table(self.merged_df, signal_metrics, outcome_metrics)
+        
+        self.correlations = pd.DataFrame({
+            'SignalMetric': table['signal_metric'],
+            'OutcomeMetric': table['outcome_metric'],
+            'PearsonCorr': table['pearson_r'],
+            'PearsonPValue': table['pearson_p'],
+            'SpearmanCorr': table['spearman_r'],
+            'SpearmanPValue': table['spearman_p'],
+            'Significant': table['pearson_p'] < 0.05,
+            'AbsCorr': table['pearson_r'].abs()
+        })
         self.correlations = self.correlations.sort_values('AbsCorr', ascending=False)
         
         return self.correlations
@@ -402,31 +381,33 @@ class SignalTradeAnalyzer:
         print("\n📈 GENERATING VISUALIZATIONS...")
         print("-" * 70)
         
-        self.create_correlation_heatmap(
-            output_path / 'correlation_heatmap.png'
-        )
-        
-        self.create_scatter_plots(
-            output_path / 'top_correlations_scatter.png'
-        )
-        
-        self.create_quality_performance_chart(
-            output_path / 'quality_performance.png'
-        )
-        
-        # Save data to CSV
-        self.correlations.to_csv(
-            output_path / 'correlation_results.csv',
-            index=False
-        )
-        print(f"✓ Correlation results saved to correlation_results.csv")
-        
-        # Save merged data
-        self.merged_df.to_csv(
-            output_path / 'merged_signals_trades.csv',
-            index=False
-        )
-        print(f"✓ Merged data saved to merged_signals_trades.csv")
+        with self.metrics.stage('render') as stage:
+            self.create_correlation_heatmap(
+                output_path / 'correlation_heatmap.png'
+            )
+            
+            self.create_scatter_plots(
+                output_path / 'top_correlations_scatter.png'
+            )
+            
+            self.create_quality_performance_chart(
+                output_path / 'quality_performance.png'
+            )
+            
+            # Save data to CSV
+            self.correlations.to_csv(
+                output_path / 'correlation_results.csv',
+                index=False
+            )
+            print(f"✓ Correlation results saved to correlation_results.csv")
+            
+            # Save merged data
+            self.merged_df.to_csv(
+                output_path / 'merged_signals_trades.csv',
+                index=False
+            )
+            print(f"✓ Merged data saved to merged_signals_trades.csv")
+            stage.rows = len(self.merged_df)
         
         # Save summary statistics
         summary = {
@@ -482,6 +463,7 @@ def main():
     
     # Generate comprehensive report
     analyzer.generate_report(str(output_dir))
+    analyzer.metrics.export()
 
 
 if __name__ == "__main__":
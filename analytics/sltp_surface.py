@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+"""
+SL/TP Surface
+=============
+Expectancy, profit factor and win rate of every stop-loss x take-profit pair
+on a grid, replayed from the excursions the EA logs for each trade
+(MFE_Pips, MAE_Pips, MFE_TimeBars, MAE_TimeBars).
+
+For one trade and levels (sl, tp):
+
+    MFE >= tp and MAE >= sl   whichever excursion peaked first wins
+                              (MFE_TimeBars vs MAE_TimeBars; same bar = SL)
+    MFE >= tp only            +tp
+    MAE >= sl only            -sl
+    neither                   the trade's actual Pips
+
+Instead of looping trades x grid cells, each trade's excursions are located
+on the level axes with searchsorted: the trade hits every SL level below
+index ks and every TP level below index kt. Counts and P/L sums of the
+trades are binned on (ks, kt) and turned into 2-D prefix sums, from which
+every outcome class of every cell follows by inclusion-exclusion, i.e.
+O(N log G + G^2) for N trades and G levels per axis.
+
+The excursions only cover the trade's own lifetime, so a level beyond where
+the run actually exited (its own SL/TP or signal exit) falls back to the
+actual result: surfaces are exact inside the tested SL/TP and conservative
+outside it.
+
+Usage:
+    from sltp_surface import load_excursions, surfaces
+
+    trades = load_excursions('X_trades.csv')
+    for s in surfaces(trades, sl_levels=range(5, 205, 5), tp_levels=range(5, 305, 5)):
+        s.best()
+
+    python sltp_surface.py X_trades.csv --sl 5:200:5 --tp 5:300:5 --json sltp.json --plot-dir charts/
+"""
+
+import argparse
+import json
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+
+EXCURSION_COLUMNS = ['Symbol', 'Direction', 'Pips', 'MFE_Pips', 'MAE_Pips', 'MFE_TimeBars', 'MAE_TimeBars']
+DEFAULT_LEVELS = 40             # levels per axis when no grid is given
+DEFAULT_LEVEL_QUANTILE = 0.95   # automatic grids span up to this excursion quantile
+DEFAULT_MIN_TRADES = 30
+SURFACES = ('expectancy', 'profit_factor', 'win_rate', 'total_pips', 'tp_rate', 'sl_rate')
+
+# Joined-dataset (trade_join) column -> excursion column
+_JOINED_COLUMNS = {'Symbol_OP_03': 'Symbol', 'Trade_Direction': 'Direction', 'EA_Pips': 'Pips',
+                   'EA_MFE_Pips': 'MFE_Pips', 'EA_MAE_Pips': 'MAE_Pips',
+                   'EA_MFE_TimeBars': 'MFE_TimeBars', 'EA_MAE_TimeBars': 'MAE_TimeBars'}
+
+
+# --------------------------------- Inputs ----------------------------------- #
+
+def load_excursions(path) -> pd.DataFrame:
+    """
+    One row per closed trade with EXCURSION_COLUMNS (Direction is Long/Short).
+
+    Accepts an EA trades CSV (EXIT rows, one per ticket), bar-replayed excursions
+    (bar_excursions.py) or a joined trades dataset (.json / .arrow from
+    trade_join.py; trades without an EA match are dropped).
+    """
+    path = Path(path)
+    if path.suffix == '.csv' and path.name.endswith('_excursions.csv'):
+        trades = pd.read_csv(path, usecols=EXCURSION_COLUMNS, dtype={'Symbol': str, 'Direction': str})
+    elif path.suffix == '.csv':
+        from trade_join import index_ea_trades, read_ea_trades
+
+        # The EA logs some EXIT rows more than once; keep one per ticket as the join does
+        index = index_ea_trades(read_ea_trades(path))
+        exits = index.exit[index.has_exit]
+        trades = pd.DataFrame({
+            'Symbol': exits['Symbol'].astype(str),
+            'Direction': np.where(exits['Type'].astype(str).str.upper() == 'BUY', 'Long', 'Short'),
+            **{c: exits[c] for c in EXCURSION_COLUMNS[2:]},
+        })
+    else:
+        from processed_dataset_cache import load_processed_trades
+
+        trades = load_processed_trades(path, columns=list(_JOINED_COLUMNS) + ['EA_Match_Method'])
+        if 'EA_Match_Method' in trades:
+            trades = trades[trades['EA_Match_Method'].astype(str) != 'none']
+        trades = trades.rename(columns=_JOINED_COLUMNS)
+        missing = [c for c in EXCURSION_COLUMNS if c not in trades]
+        if missing:
+            raise ValueError(f"{path.name}: no excursion columns {missing}")
+        trades = trades[EXCURSION_COLUMNS].astype({'Symbol': str, 'Direction': str})
+
+    for column in EXCURSION_COLUMNS[2:]:
+        trades[column] = pd.to_numeric(trades[column], errors='coerce')
+    # MAE is logged as a negative move; the engine works with distances
+    trades['MFE_Pips'] = trades['MFE_Pips'].abs()
+    trades['MAE_Pips'] = trades['MAE_Pips'].abs()
+    return trades.dropna(subset=['Pips', 'MFE_Pips', 'MAE_Pips']).reset_index(drop=True)
+
+
+def parse_levels(spec: Optional[str]) -> Optional[np.ndarray]:
+    """'start:stop:step' (stop inclusive) or 'a,b,c'; None/'' for an automatic grid."""
+    if not spec:
+        return None
+    if ':' in spec:
+        start, stop, step = (float(v) for v in spec.split(':'))
+        return np.arange(start, stop + step / 2, step)
+    return np.array(sorted(float(v) for v in spec.split(',')))
+
+
+def auto_levels(excursions: np.ndarray, n: int = DEFAULT_LEVELS,
+                quantile: float = DEFAULT_LEVEL_QUANTILE) -> np.ndarray:
+    """n evenly spaced positive levels up to the given quantile of the excursions."""
+    excursions = excursions[excursions > 0]
+    top = float(np.quantile(excursions, quantile)) if len(excursions) else 1.0
+    return np.linspace(top / n, top, n)
+
+
+# -------------------------------- Surfaces ---------------------------------- #
+
+def _prefix(ks: np.ndarray, kt: np.ndarray, shape: Tuple[int, int], weights=None) -> np.ndarray:
+    """2-D prefix sums of (ks, kt) bins: [j, k] = sum of weights with ks <= j and kt <= k."""
+    flat = np.bincount(ks * shape[1] + kt, weights=weights, minlength=shape[0] * shape[1])
+    return flat.reshape(shape).cumsum(axis=0).cumsum(axis=1)
+
+
+def _classes(ks: np.ndarray, kt: np.ndarray, shape: Tuple[int, int], weights=None) -> Dict[str, np.ndarray]:
+    """
+    Per grid cell, the sum of weights of trades in each hit class.
+
+    With C the prefix sums, cell (j, k) has: neither hit C[j, k]; TP only
+    C[j, -1] - C[j, k]; SL only C[-1, k] - C[j, k]; both
+    C[-1, -1] - C[j, -1] - C[-1, k] + C[j, k].
+    """
+    c = _prefix(ks, kt, shape, weights)
+    rows, cols, total = c[:, -1:], c[-1:, :], c[-1, -1]
+    cell = c[:-1, :-1]
+    return {
+        'neither': cell,
+        'tp_only': rows[:-1] - cell,
+        'sl_only': cols[:, :-1] - cell,
+        'both': total - rows[:-1] - cols[:, :-1] + cell,
+    }
+
+
+@dataclass
+class SLTPSurface:
+    """Surfaces of one trade group over sl_levels (rows) x tp_levels (columns); P/L in pips."""
+    group: Dict[str, str]
+    sl_levels: np.ndarray
+    tp_levels: np.ndarray
+    trades: int
+    surfaces: Dict[str, np.ndarray]
+    baseline: Dict[str, float] = field(default_factory=dict)
+
+    def best(self, metric: str = 'expectancy', min_trades: int = 0) -> Dict:
+        """The cell maximising `metric` (ties: tighter SL, then nearer TP)."""
+        values = np.nan_to_num(self.surfaces[metric], nan=-np.inf, posinf=np.finfo(float).max)
+        j, k = np.unravel_index(int(np.argmax(values)), values.shape)
+        return {
+            'sl': float(self.sl_levels[j]),
+            'tp': float(self.tp_levels[k]),
+            'enough_trades': self.trades >= min_trades,
+            **{name: _number(self.surfaces[name][j, k]) for name in SURFACES},
+        }
+
+    def frame(self) -> pd.DataFrame:
+        """Long format: one row per (sl, tp) cell."""
+        sl, tp = np.meshgrid(self.sl_levels, self.tp_levels, indexing='ij')
+        data = {**self.group, 'sl': sl.ravel(), 'tp': tp.ravel()}
+        data.update({name: self.surfaces[name].ravel() for name in SURFACES})
+        return pd.DataFrame(data)
+
+    def summary(self, min_trades: int = DEFAULT_MIN_TRADES) -> Dict:
+        return {
+            **self.group,
+            'trades': self.trades,
+            'sl_levels': [float(self.sl_levels[0]), float(self.sl_levels[-1]), len(self.sl_levels)],
+            'tp_levels': [float(self.tp_levels[0]), float(self.tp_levels[-1]), len(self.tp_levels)],
+            'baseline': self.baseline,
+            'best_expectancy': self.best('expectancy', min_trades),
+            'best_profit_factor': self.best('profit_factor', min_trades),
+        }
+
+
+def _number(value) -> Optional[float]:
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def surface(pips, mfe, mae, mfe_bars, mae_bars, sl_levels, tp_levels,
+            group: Optional[Dict[str, str]] = None) -> SLTPSurface:
+    """Evaluate every (sl, tp) cell for one group of trades (levels in pips, ascending)."""
+    pips = np.asarray(pips, dtype=np.float64)
+    sl_levels = np.sort(np.asarray(sl_levels, dtype=np.float64))
+    tp_levels = np.sort(np.asarray(tp_levels, dtype=np.float64))
+    n = len(pips)
+    shape = (len(sl_levels) + 1, len(tp_levels) + 1)
+
+    # Trade hits SL levels [0, ks) and TP levels [0, kt)
+    ks = np.searchsorted(sl_levels, np.asarray(mae, dtype=np.float64), side='right')
+    kt = np.searchsorted(tp_levels, np.asarray(mfe, dtype=np.float64), side='right')
+    tp_first = (np.nan_to_num(np.asarray(mfe_bars, dtype=np.float64), nan=np.inf)
+                < np.nan_to_num(np.asarray(mae_bars, dtype=np.float64), nan=np.inf))
+
+    count = _classes(ks, kt, shape)
+    tp_first_both = _classes(ks, kt, shape, tp_first.astype(np.float64))['both']
+    wins_neither = _classes(ks, kt, shape, np.where(pips > 0, pips, 0.0))['neither']
+    losses_neither = _classes(ks, kt, shape, np.where(pips < 0, -pips, 0.0))['neither']
+    winners_neither = _classes(ks, kt, shape, (pips > 0).astype(np.float64))['neither']
+
+    tp_hits = count['tp_only'] + tp_first_both
+    sl_hits = count['sl_only'] + count['both'] - tp_first_both
+    sl, tp = sl_levels[:, None], tp_levels[None, :]
+    gross_profit = tp_hits * np.maximum(tp, 0) + wins_neither
+    gross_loss = sl_hits * np.maximum(sl, 0) + losses_neither
+    total = gross_profit - gross_loss
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        surfaces = {
+            'expectancy': total / n if n else np.full(total.shape, np.nan),
+            'profit_factor': np.where(gross_loss > 0, gross_profit / gross_loss,
+                                      np.where(gross_profit > 0, np.inf, np.nan)),
+            'win_rate': (tp_hits + winners_neither) / n * 100.0 if n else np.full(total.shape, np.nan),
+            'total_pips': total,
+            'tp_rate': tp_hits / n * 100.0 if n else np.full(total.shape, np.nan),
+            'sl_rate': sl_hits / n * 100.0 if n else np.full(total.shape, np.nan),
+        }
+    wins, losses = pips[pips > 0].sum(), -pips[pips < 0].sum()
+    baseline = {
+        'expectancy': _number(pips.mean()) if n else None,
+        'profit_factor': (_number(wins / losses) if losses > 0 else None),
+        'win_rate': _number((pips > 0).mean() * 100.0) if n else None,
+        'total_pips': float(pips.sum()),
+    }
+    return SLTPSurface(group or {}, sl_levels, tp_levels, n, surfaces, baseline)
+
+
+def surfaces(trades: pd.DataFrame, sl_levels=None, tp_levels=None,
+             by: Sequence[str] = ('Symbol', 'Direction'), include_all: bool = True) -> List[SLTPSurface]:
+    """
+    One surface per group of `by` (plus each symbol over both directions when
+    include_all). Levels default to an automatic grid per group.
+    """
+    groups: List[Tuple[Dict[str, str], pd.DataFrame]] = []
+    by = list(by)
+    if by:
+        for key, frame in trades.groupby(by, sort=True, observed=True):
+            key = key if isinstance(key, tuple) else (key,)
+            groups.append(({c: str(v) for c, v in zip(by, key)}, frame))
+    if include_all and 'Direction' in by and trades['Direction'].nunique() > 1:
+        rest = [c for c in by if c != 'Direction']
+        parts = trades.groupby(rest, sort=True, observed=True) if rest else [((), trades)]
+        for key, frame in parts:
+            key = key if isinstance(key, tuple) else (key,)
+            groups.append(({**{c: str(v) for c, v in zip(rest, key)}, 'Direction': 'All'}, frame))
+    if not by:
+        groups.append(({}, trades))
+
+    result = []
+    for group, frame in groups:
+        sl = np.asarray(sl_levels, dtype=np.float64) if sl_levels is not None \
+            else auto_levels(frame['MAE_Pips'].to_numpy(np.float64))
+        tp = np.asarray(tp_levels, dtype=np.float64) if tp_levels is not None \
+            else auto_levels(frame['MFE_Pips'].to_numpy(np.float64))
+        result.append(surface(frame['Pips'], frame['MFE_Pips'], frame['MAE_Pips'],
+                              frame['MFE_TimeBars'], frame['MAE_TimeBars'], sl, tp, group))
+    return result
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def _label(s: SLTPSurface) -> str:
+    return ' '.join(s.group.values()) or 'all trades'
+
+
+def format_summary(s: SLTPSurface, min_trades: int = DEFAULT_MIN_TRADES) -> str:
+    summary = s.summary(min_trades)
+    base = summary['baseline']
+    lines = [f"🎯 {_label(s)}: {s.trades:,} trades, {len(s.sl_levels)} SL x {len(s.tp_levels)} TP levels"
+             + ('' if s.trades >= min_trades else f"  ⚠️ fewer than {min_trades} trades")]
+    pf = f"{base['profit_factor']:.2f}" if base['profit_factor'] is not None else 'n/a'
+    lines.append(f"   Actual exits:      expectancy {base['expectancy']:8.2f} pips   PF {pf:>6}   "
+                 f"win {base['win_rate']:5.1f}%")
+    for metric in ('best_expectancy', 'best_profit_factor'):
+        best = summary[metric]
+        pf = f"{best['profit_factor']:.2f}" if best['profit_factor'] is not None else 'n/a'
+        lines.append(f"   Best {metric[5:]:<14} SL {best['sl']:7.1f} / TP {best['tp']:7.1f}: "
+                     f"expectancy {best['expectancy']:8.2f} pips   PF {pf:>6}   win {best['win_rate']:5.1f}%")
+    return '\n'.join(lines)
+
+
+def plot_surface(s: SLTPSurface, path: Path, metric: str = 'expectancy'):
+    """Heatmap of one surface (SL rows, TP columns) with the best cell marked."""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    values = s.surfaces[metric]
+    fig, ax = plt.subplots(figsize=(10, 7))
+    image = ax.imshow(np.where(np.isfinite(values), values, np.nan), origin='lower', aspect='auto', cmap='RdYlGn',
+                      extent=[s.tp_levels[0], s.tp_levels[-1], s.sl_levels[0], s.sl_levels[-1]])
+    best = s.best(metric)
+    ax.plot(best['tp'], best['sl'], marker='*', color='black', markersize=14)
+    ax.set_xlabel('Take profit (pips)')
+    ax.set_ylabel('Stop loss (pips)')
+    ax.set_title(f"{_label(s)}: {metric.replace('_', ' ')} ({s.trades} trades)")
+    fig.colorbar(image, ax=ax, label=metric)
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='SL x TP expectancy / profit-factor surfaces from MFE/MAE')
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='EA trades CSV, bar-replayed *_excursions.csv, or joined trades (.json/.arrow)')
+    parser.add_argument('--sl', default=None, help="SL levels in pips, 'start:stop:step' or 'a,b,c' (default: auto)")
+    parser.add_argument('--tp', default=None, help="TP levels in pips, 'start:stop:step' or 'a,b,c' (default: auto)")
+    parser.add_argument('--min-trades', type=int, default=DEFAULT_MIN_TRADES,
+                        help='Flag groups with fewer trades (default: %(default)s)')
+    parser.add_argument('--json', type=Path, default=None, help='Write the per-group summaries to this JSON file')
+    parser.add_argument('--csv', type=Path, default=None, help='Write every cell of every surface to this CSV')
+    parser.add_argument('--plot-dir', type=Path, default=None, help='Write expectancy heatmaps (PNG) here')
+    args = parser.parse_args()
+
+    sl_levels, tp_levels = parse_levels(args.sl), parse_levels(args.tp)
+    metrics = PipelineMetrics('sltp_surface')
+    results: List[Tuple[Path, SLTPSurface]] = []
+    for path in args.inputs:
+        with metrics.stage('load') as stage:
+            trades = load_excursions(path)
+            stage.rows = len(trades)
+        if trades.empty:
+            print(f"⚠️  {path.name}: no trades with excursion data")
+            continue
+        with metrics.stage('aggregate', rows=len(trades)):
+            found = surfaces(trades, sl_levels, tp_levels)
+        with metrics.stage('render'):
+            print(f"\n📈 {path.name}")
+            for s in found:
+                print(format_summary(s, args.min_trades))
+                results.append((path, s))
+                if args.plot_dir:
+                    args.plot_dir.mkdir(parents=True, exist_ok=True)
+                    name = '_'.join([path.stem, *s.group.values()])
+                    plot_surface(s, args.plot_dir / f"{name}_sltp_expectancy.png")
+
+    if args.json and results:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        summaries = [{'source': path.name, **s.summary(args.min_trades)} for path, s in results]
+        args.json.write_text(json.dumps(summaries, indent=2))
+        print(f"\n📄 Summary: {args.json}")
+    if args.csv and results:
+        args.csv.parent.mkdir(parents=True, exist_ok=True)
+        pd.concat([s.frame().assign(source=path.name) for path, s in results]).to_csv(args.csv, index=False)
+        print(f"📄 Surfaces: {args.csv}")
+    metrics.export()
+    return 0 if results else 1
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'sltp_surface'))
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bar_cache import append_entry, open_entry, read_meta, write_entry  # noqa: E402
+from bar_store import BarArrays  # noqa: E402
+
+MINUTE = 60 * 10**9
+
+
+def _bars(start, stop, close_offset=0.0):
+    ts = np.arange(start, stop, dtype=np.int64) * MINUTE
+    price = np.arange(start, stop, dtype=np.float64) + close_offset
+    return BarArrays('NAS100', ts, price, price + 1, price - 1, price, utc=True)
+
+
+def _cached(tmp_path):
+    meta = read_meta(tmp_path / 'NAS100_M1')
+    bars = open_entry(tmp_path / 'NAS100_M1')
+    return meta, bars
+
+
+def test_append_adds_only_newer_bars(tmp_path):
+    write_entry(_bars(0, 10), 'M1', tmp_path)
+    meta = append_entry(_bars(8, 15, close_offset=0.5), 'M1', tmp_path)
+    cached_meta, bars = _cached(tmp_path)
+    assert meta['appended'] == 5 and cached_meta['rows'] == 15
+    assert cached_meta['last_ns'] == 14 * MINUTE
+    assert np.diff(bars.ts).min() == MINUTE
+    assert bars.close[9] == 9.5  # the bar at the cached last time is replaced in place
+    assert bars.close[8] == 8.0
+
+
+def test_append_of_older_or_overlapping_bars_keeps_header(tmp_path):
+    write_entry(_bars(0, 10), 'M1', tmp_path)
+    before = read_meta(tmp_path / 'NAS100_M1')
+
+    assert append_entry(_bars(0, 5), 'M1', tmp_path)['appended'] == 0
+    assert append_entry(_bars(3, 10), 'M1', tmp_path)['appended'] == 0
+
+    meta, bars = _cached(tmp_path)
+    assert (meta['rows'], meta['last_ns'], meta['last_ts']) == (before['rows'], before['last_ns'], before['last_ts'])
+    assert len(bars) == 10 and np.diff(bars.ts).min() == MINUTE
+
+
+def test_append_of_empty_batch_is_a_no_op(tmp_path):
+    write_entry(_bars(0, 10), 'M1', tmp_path)
+    assert append_entry(_bars(0, 0), 'M1', tmp_path)['appended'] == 0
+    meta, bars = _cached(tmp_path)
+    assert meta['rows'] == 10 and meta['last_ns'] == 9 * MINUTE
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from bar_excursions import replay_trades  # noqa: E402
+
+HIGH = [101, 104, 102, 103, 106, 105, 107, 102, 102, 102]
+LOW = [99, 100, 97, 100, 101, 98, 100, 100, 100, 100]
+
+
+def _bar_dir(tmp_path):
+    """Ten M5 bars in broker time (naive timestamps) as a per-symbol Parquet file."""
+    bars = pd.DataFrame({
+        'time': pd.date_range('2025-10-01 10:00', periods=len(HIGH), freq='5min'),
+        'open': 100.0, 'high': np.array(HIGH, float), 'low': np.array(LOW, float), 'close': 100.0,
+    })
+    bars.to_parquet(tmp_path / 'NAS100.parquet', index=False)
+    return tmp_path
+
+
+def _trades():
+    return pd.DataFrame({
+        'Key': [1, 2, 3], 'Symbol': 'NAS100', 'Direction': ['Long', 'Short', 'Long'],
+        'OpenTime': pd.to_datetime(['2025-10-01 10:02', '2025-10-01 10:10', '2025-10-02 10:00']),
+        'CloseTime': pd.to_datetime(['2025-10-01 10:17', '2025-10-01 10:20', '2025-10-02 10:30']),
+        'OpenPrice': [100.0, 100.0, 100.0], 'ClosePrice': [101.0, 102.0, 100.0],
+    })
+
+
+def test_replay_over_fixed_bars(tmp_path):
+    result = replay_trades(_trades(), _bar_dir(tmp_path), post_exit_bars=3, chart_minutes=5, pip=1.0)
+    long, short, outside = (result.iloc[i] for i in range(3))
+
+    # Long over bars 0-3: high 104 at bar 1, low 97 at bar 2; post-exit bars 4-6
+    assert (long['MFE_Pips'], long['MFE_TimeBars'], long['MAE_Pips'], long['MAE_TimeBars']) == (4, 1, -3, 2)
+    assert (long['RunUp_Pips'], long['RunUp_TimeBars']) == (6, 3)          # 107 at bar 6
+    assert (long['RunDown_Pips'], long['RunDown_TimeBars']) == (-3, 2)     # 98 at bar 5
+    assert (long['Pips'], long['HoldTimeBars'], long['MFE_Price']) == (1, 3, 104)
+
+    # Short over bars 2-4: favourable low 97 at the entry bar, adverse high 106 at bar 4; post-exit bars 5-7
+    assert (short['MFE_Pips'], short['MFE_TimeBars'], short['MAE_Pips'], short['MAE_TimeBars']) == (3, 0, -6, 2)
+    assert (short['RunUp_Pips'], short['RunUp_TimeBars']) == (4, 1)
+    assert (short['RunDown_Pips'], short['RunDown_TimeBars']) == (-5, 2)
+    assert (short['Pips'], short['MAE_Price']) == (-2, 106)
+
+    assert long['Bars_Covered'] and short['Bars_Covered'] and not outside['Bars_Covered']
+    assert outside[['MFE_Pips', 'RunUp_Pips']].isna().all()
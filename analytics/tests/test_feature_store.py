@@ -0,0 +1,85 @@
+import dataclasses
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import feature_store  # noqa: E402
+from feature_store import FEATURES, STORE_DIR_NAME, add_features, materialize  # noqa: E402
+
+pytest.importorskip('pyarrow')
+
+NAMES = ['IsWin', 'ProfitCategory', 'RiskAdjustedReturn']
+
+
+def _trades(tmp_path, name='bt.csv', n=50, seed=3):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({'Profit': rng.normal(1, 8, n).round(2), 'RiskPercent': rng.choice([0.0, 0.5, 1.0], n)})
+    frame.loc[:2, ['Profit', 'RiskPercent']] = 0.0  # breakeven trades without a risk setting
+    path = tmp_path / name
+    frame.to_csv(path, index=False)
+    return frame, path
+
+
+@pytest.fixture
+def computed(monkeypatch):
+    """Names of the features computed (not read from the store) since the fixture was set up."""
+    names = []
+    compute = feature_store.compute
+
+    def spy(frame, name):
+        names.append(name)
+        return compute(frame, name)
+
+    monkeypatch.setattr(feature_store, 'compute', spy)
+    return names
+
+
+def test_only_a_redefined_feature_is_recomputed(tmp_path, monkeypatch, computed):
+    frame, path = _trades(tmp_path)
+    first = materialize(frame, NAMES, sources=[path])
+    assert computed == NAMES
+    assert (first['RiskAdjustedReturn'][frame['RiskPercent'] == 0] == 0).all()  # 0/0 included
+
+    redefined = dataclasses.replace(FEATURES['IsWin'], func=lambda df: (df['Profit'] >= 1).astype('int8'))
+    monkeypatch.setitem(FEATURES, 'IsWin', redefined)
+    computed.clear()
+    second = materialize(frame, NAMES, sources=[path])
+    assert computed == ['IsWin']
+    assert (second['IsWin'] == (frame['Profit'] >= 1)).all()
+    pd.testing.assert_frame_equal(second[NAMES[1:]], first[NAMES[1:]])
+
+
+def test_reordered_frame_fails_the_fingerprint_check(tmp_path, computed):
+    frame, path = _trades(tmp_path)
+    materialize(frame, NAMES, sources=[path])
+
+    reordered = frame.iloc[::-1]
+    computed.clear()
+    features = materialize(reordered, NAMES, sources=[path])
+    assert computed == NAMES
+    assert (features['IsWin'] == (reordered['Profit'] > 0)).all()
+
+
+def test_stale_cleanup_keeps_a_sibling_store(tmp_path):
+    frame, csv_path = _trades(tmp_path, 'bt.csv')
+    json_path = tmp_path / 'bt.json'
+    json_path.write_text(frame.to_json(orient='records'))
+    materialize(frame, NAMES, sources=[csv_path])
+    materialize(frame, NAMES, sources=[json_path])
+
+    frame, csv_path = _trades(tmp_path, 'bt.csv', seed=4)  # new contents: a new bt.csv store
+    materialize(frame, NAMES, sources=[csv_path])
+    stores = sorted(p.name.rsplit('.', 1)[0] for p in (tmp_path / '.cache' / STORE_DIR_NAME).iterdir())
+    assert stores == ['bt.csv.raw', 'bt.json.raw']
+
+
+def test_add_features_returns_the_frame_with_feature_columns(tmp_path):
+    frame, path = _trades(tmp_path)
+    frame['IsWin'] = -1
+    out = add_features(frame, NAMES, sources=[path])
+    assert list(out.columns) == ['Profit', 'RiskPercent', *NAMES]
+    assert (out['IsWin'] == (frame['Profit'] > 0)).all()
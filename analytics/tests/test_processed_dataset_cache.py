@@ -0,0 +1,37 @@
+import json
+import sys
+import warnings
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from processed_dataset_cache import load_processed_dataset  # noqa: E402
+
+pytest.importorskip('pyarrow')
+
+
+def _trades(n=40):
+    trades = [{**{f'IN_Physics_{j}': str(i * j) for j in range(150)},
+               'EA_Profit': str(i - 10), 'Trade_Direction': 'Long', 'DataQuality': {'score': i}}
+              for i in range(n)]
+    trades[5]['EA_Profit'] = 'N/A'  # one stray token in a numeric column
+    return trades
+
+
+def test_numeric_text_columns_survive_a_stray_token(tmp_path):
+    path = tmp_path / 'processed_trades_x.json'
+    path.write_text(json.dumps({'trades': _trades(), 'metadata': {'version': 'x'}}))
+
+    for from_cache in (False, True):
+        dataset = load_processed_dataset(path)
+        assert dataset.from_cache is from_cache
+        trades = dataset.trades
+        assert trades['EA_Profit'].dtype == 'float64'
+        assert trades['EA_Profit'].isna().sum() == 1
+        assert not pd.api.types.is_numeric_dtype(trades['Trade_Direction'])
+        assert json.loads(trades['DataQuality'][3]) == {'score': 3}
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', pd.errors.PerformanceWarning)
+            trades['profit'] = trades['EA_Profit']  # not fragmented by the load
@@ -0,0 +1,43 @@
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from processed_ndjson import read_sections, read_trades  # noqa: E402
+
+
+def _lines(*records):
+    return ''.join(json.dumps(r) + '\n' for r in records)
+
+
+def test_complete_file_has_both_sections(tmp_path):
+    path = tmp_path / 'run.ndjson'
+    path.write_text(_lines(
+        {'__section': 'metadata', 'totalTrades': 2},
+        {'IN_Trade_ID': 1, 'EA_Profit': 5.0},
+        {'IN_Trade_ID': 2, 'EA_Profit': None},
+        {'__section': 'summary', 'statistics': {'dataQualityScore': 90}, 'validation': {}},
+    ))
+    metadata, summary = read_sections(path)
+    assert metadata == {'totalTrades': 2}
+    assert summary['statistics'] == {'dataQualityScore': 90}
+    trades = read_trades(path)
+    assert trades['IN_Trade_ID'].tolist() == [1, 2]
+    assert trades['EA_Profit'].isna().tolist() == [False, True]
+
+
+def test_file_truncated_mid_trade_has_no_summary(tmp_path):
+    path = tmp_path / 'run.ndjson'
+    full = _lines({'__section': 'metadata', 'totalTrades': 2}, {'IN_Trade_ID': 1, 'EA_Profit': 5.0})
+    path.write_text(full + '{"IN_Trade_ID": 2, "EA_Pro')
+
+    metadata, summary = read_sections(path)
+    assert metadata == {'totalTrades': 2}
+    assert summary == {}
+    assert read_trades(path)['IN_Trade_ID'].tolist() == [1]
+
+
+def test_file_cut_inside_the_metadata_line(tmp_path):
+    path = tmp_path / 'run.ndjson'
+    path.write_text('{"__section": "metad')
+    assert read_sections(path) == ({}, {})
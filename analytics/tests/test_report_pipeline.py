@@ -0,0 +1,47 @@
+import importlib
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import report_pipeline  # noqa: E402
+from report_pipeline import ChartJob, job_fingerprint  # noqa: E402
+
+
+def _chart_module(tmp_path, monkeypatch):
+    (tmp_path / 'chart_style.py').write_text("LINE_WIDTH = 1\n")
+    (tmp_path / 'chart_render.py').write_text(
+        "from chart_style import LINE_WIDTH\n\n"
+        "def render(output):\n"
+        "    pass\n"
+    )
+    monkeypatch.setattr(report_pipeline, 'REPO_ROOT', tmp_path.resolve())
+    monkeypatch.syspath_prepend(str(tmp_path))
+    for name in ('chart_render', 'chart_style'):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+    report_pipeline._module_sources.cache_clear()
+    return importlib.import_module('chart_render')
+
+
+def _fingerprint(job):
+    report_pipeline._module_sources.cache_clear()
+    return job_fingerprint(job)
+
+
+def test_fingerprint_follows_repo_local_imports(tmp_path, monkeypatch):
+    module = _chart_module(tmp_path, monkeypatch)
+    job = ChartJob('chart', module.render, tmp_path / 'chart.png')
+    before = _fingerprint(job)
+
+    (tmp_path / 'chart_style.py').write_text("LINE_WIDTH = 2\n")
+    assert _fingerprint(job) != before
+
+
+def test_fingerprint_includes_declared_deps(tmp_path, monkeypatch):
+    module = _chart_module(tmp_path, monkeypatch)
+    theme = tmp_path / 'theme.mplstyle'
+    theme.write_text("lines.linewidth: 1\n")
+    job = ChartJob('chart', module.render, tmp_path / 'chart.png', deps=[theme])
+    before = _fingerprint(job)
+
+    theme.write_text("lines.linewidth: 2\n")
+    assert _fingerprint(job) != before
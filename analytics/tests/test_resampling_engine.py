@@ -0,0 +1,28 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from resampling_engine import PROFIT_FACTOR_CAP, bootstrap_metrics, compare_groups  # noqa: E402
+
+
+def test_profit_factor_without_losses_is_capped_consistently():
+    winners = np.array([5.0, 3.0, 2.0, 4.0])
+    mixed = np.array([1.0, -2.0, 3.0, -1.0, 2.0])
+
+    interval = bootstrap_metrics(winners, n_resamples=500, seed=1)['profit_factor']
+    assert interval.estimate == interval.ci_low == interval.ci_high == PROFIT_FACTOR_CAP
+
+    delta = compare_groups(winners, mixed, n_resamples=2_000, seed=1)['profit_factor']
+    assert delta.estimate == PROFIT_FACTOR_CAP - 2.0
+    assert np.isfinite([delta.ci_low, delta.ci_high, delta.p_value]).all()
+    assert delta.ci_low <= delta.estimate <= delta.ci_high
+    assert delta.dropped == 0
+
+
+def test_all_replicates_kept_for_ordinary_groups():
+    rng = np.random.default_rng(0)
+    result = compare_groups(rng.normal(1, 3, 200), rng.normal(0, 3, 200), n_resamples=1_000, seed=3)
+    assert all(r.dropped == 0 for r in result.values())
+    assert result['expectancy'].ci_low < result['expectancy'].estimate < result['expectancy'].ci_high
@@ -0,0 +1,29 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from sltp_surface import load_excursions  # noqa: E402
+
+HEADER = ('RowType,Ticket,Timestamp,OpenTime,CloseTime,Symbol,Type,Price,OpenPrice,ClosePrice,Profit,'
+          'Pips,MFE_Pips,MAE_Pips,MFE_TimeBars,MAE_TimeBars')
+
+
+def _row(row_type, ticket, minute, second, kind='BUY', pips=10.0):
+    stamp = f'2025.10.01 10:{minute:02d}:{second:02d}'
+    return (f'{row_type},{ticket},{stamp},2025.10.01 10:00:00,{stamp},NAS100,{kind},'
+            f'100,100,101,5,{pips},12,-4,3,1')
+
+
+def test_ea_csv_keeps_one_exit_row_per_ticket(tmp_path):
+    rows = [
+        _row('ENTRY', 1, 0, 0), _row('EXIT', 1, 5, 0), _row('EXIT', 1, 5, 0),  # logged twice
+        _row('ENTRY', 2, 1, 0, 'SELL'), _row('EXIT', 2, 6, 0, 'SELL', -3.0),
+        _row('EXIT', 2, 6, 1, 'SELL', -3.0),  # repeated within the EA's 2s window
+    ]
+    path = tmp_path / 'EA_trades.csv'
+    path.write_text('\n'.join([HEADER, *rows]) + '\n')
+
+    trades = load_excursions(path)
+    assert len(trades) == 2
+    assert sorted(trades['Direction']) == ['Long', 'Short']
+    assert (trades['MAE_Pips'] == 4).all()
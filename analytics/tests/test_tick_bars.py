@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from tick_bars import build_bars  # noqa: E402
+from tick_store import iter_tick_days  # noqa: E402
+
+
+def _ticks(n=3_000, seed=5):
+    """Two broker days of ticks with blank (unchanged) bid/ask fields, as MT5 exports them."""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2025-10-01 22:00:00').value
+    ts = start + np.sort(rng.integers(0, 4 * 3600 * 10**3, n)) * 10**6  # ms resolution, crosses midnight
+    bid = np.round(20_000 + np.cumsum(rng.normal(0, 1, n)), 2)
+    ask = bid + rng.choice([0.5, 1.0], n)
+    volume = rng.integers(1, 5, n).astype(float)
+    unchanged = rng.random(n) < 0.3
+    unchanged[0] = False
+    return pd.DataFrame({'ts': pd.to_datetime(ts), 'bid': bid, 'ask': ask, 'volume': volume,
+                         'bid_blank': unchanged, 'ask_blank': unchanged & (rng.random(n) < 0.5)})
+
+
+def _export(ticks, path):
+    """Write ticks as an MT5 tick export; returns them with blank prices forward-filled, as read back."""
+    bid = ticks['bid'].mask(ticks['bid_blank']).ffill()
+    ask = ticks['ask'].mask(ticks['ask_blank']).ffill()
+    with open(path, 'w') as f:
+        f.write('<DATE>\t<TIME>\t<BID>\t<ASK>\t<LAST>\t<VOLUME>\t<FLAGS>\n')
+        for t, b, a, blank_b, blank_a, v in zip(ticks['ts'], bid, ask, ticks['bid_blank'],
+                                                 ticks['ask_blank'], ticks['volume']):
+            f.write(f"{t:%Y.%m.%d}\t{t:%H:%M:%S}.{t.microsecond // 1000:03d}\t"
+                    f"{'' if blank_b else b}\t{'' if blank_a else a}\t\t{v:g}\t6\n")
+    return ticks.assign(bid=bid, ask=ask)
+
+
+def _collect(path, timeframes):
+    out = {name: [] for name in timeframes}
+    days = 0
+    for tables in build_bars(iter_tick_days(path, block_bytes=16_384), timeframes):
+        assert set(tables) == set(timeframes)
+        days += 1
+        for name in timeframes:
+            out[name].append(tables[name].to_pandas())
+    return {name: pd.concat(frames, ignore_index=True) for name, frames in out.items()}, days
+
+
+def test_time_bars_match_pandas_resample(tmp_path):
+    ticks = _export(_ticks(), tmp_path / 'NAS100_ticks.csv')
+    bars, days = _collect(tmp_path / 'NAS100_ticks.csv', ['M1', 'M5', 'T7'])
+    assert days == 3  # two days plus the tick-bar flush
+
+    for name, rule in (('M1', '1min'), ('M5', '5min')):
+        frame = ticks.set_index('ts')
+        expected = frame['bid'].resample(rule).ohlc()
+        expected['volume'] = frame['volume'].resample(rule).sum()
+        expected['tick_count'] = frame['bid'].resample(rule).count()
+        expected['spread'] = (frame['ask'] - frame['bid']).resample(rule).mean()
+        expected = expected[expected['tick_count'] > 0]
+        got = bars[name].set_index('ts')
+        assert got.index.equals(expected.index.rename('ts'))
+        for column in ('open', 'high', 'low', 'close', 'volume', 'spread'):
+            np.testing.assert_allclose(got[column], expected[column], rtol=0, atol=1e-9)
+        assert (got['tick_count'].to_numpy() == expected['tick_count'].to_numpy()).all()
+
+
+def test_tick_bars_carry_over_across_days(tmp_path):
+    ticks = _export(_ticks(), tmp_path / 'NAS100_ticks.csv')
+    bars, _ = _collect(tmp_path / 'NAS100_ticks.csv', ['T7'])
+    got = bars['T7']
+
+    # Bars of 7 consecutive ticks over the whole export: a bar restarted at midnight would shift them
+    groups = np.arange(len(ticks)) // 7
+    expected = ticks.groupby(groups).agg(ts=('ts', 'first'), open=('bid', 'first'), high=('bid', 'max'),
+                                         low=('bid', 'min'), close=('bid', 'last'),
+                                         volume=('volume', 'sum'), tick_count=('bid', 'size'))
+    assert len(got) == len(expected)
+    assert (got['tick_count'].iloc[:-1] == 7).all()
+    assert (got['ts'].to_numpy() == expected['ts'].to_numpy()).all()
+    for column in ('open', 'high', 'low', 'close', 'volume'):
+        np.testing.assert_allclose(got[column], expected[column], rtol=0, atol=1e-9)
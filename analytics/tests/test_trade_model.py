@@ -0,0 +1,76 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from trade_model import Dataset, build_dataset, train  # noqa: E402
+
+BACKEND = Path(__file__).resolve().parents[2] / 'backend'
+
+
+def _ea_trades(n=240, seed=11, start='2025-10-01 09:00'):
+    """EXIT rows of an EA trades CSV; every third trade shares its open time with the previous one."""
+    rng = np.random.default_rng(seed)
+    steps = np.where(np.arange(n) % 3 == 2, 0, 15)
+    opened = pd.Timestamp(start) + pd.to_timedelta(np.cumsum(steps), unit='min')
+    quality = rng.normal(70, 10, n)
+    speed = rng.normal(0, 800, n)
+    zone = rng.choice(['BULL', 'BEAR', 'TRANSITION'], n)
+    edge = 0.08 * (quality - 70) + 0.001 * speed + np.where(zone == 'BULL', 0.7, -0.3)
+    win = rng.random(n) < 1 / (1 + np.exp(-edge))
+    return pd.DataFrame({
+        'RowType': 'EXIT', 'Ticket': np.arange(1, n + 1), 'Symbol': 'NAS100',
+        'OpenTime': opened.strftime('%Y.%m.%d %H:%M:%S'),
+        'Type': rng.choice(['BUY', 'SELL'], n),
+        'Profit': np.where(win, rng.uniform(5, 50, n), -rng.uniform(5, 50, n)).round(2),
+        'Entry_Quality': quality.round(2), 'Entry_Speed': speed.round(1),
+        'Entry_Zone': zone, 'Entry_Regime': rng.choice(['NORMAL', 'HIGH'], n),
+    })
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    path = tmp_path / 'TP_NAS100_M05_trades.csv'
+    _ea_trades().to_csv(path, index=False)
+    return build_dataset([path], cache_dir=tmp_path / 'cache')
+
+
+@pytest.mark.parametrize('kind', ['logistic', 'gbdt'])
+def test_predictions_match_the_backend_scorer(dataset, kind):
+    pytest.importorskip('prometheus_client')
+    sys.path.insert(0, str(BACKEND))
+    from app.services.scoring import compile_model
+
+    model = train(dataset, kind, trees=20)
+    served = compile_model(model.to_artifact())
+    names = [spec['name'] for spec in model.features]
+    signals = dataset.frame[names].astype(object).where(dataset.frame[names].notna(), None).to_dict('records')
+
+    expected = model.predict_proba(dataset.frame)
+    np.testing.assert_allclose(served.score_many(signals), expected, rtol=0, atol=1e-9)
+    np.testing.assert_allclose([served.score(s) for s in signals[:20]], expected[:20], rtol=0, atol=1e-9)
+
+
+def test_feature_cache_hit_returns_the_same_frame(dataset, tmp_path):
+    cached = build_dataset([Path(p) for p in dataset.sources], cache_dir=tmp_path / 'cache')
+    assert cached.from_cache and not dataset.from_cache
+    assert cached.digest == dataset.digest
+    pd.testing.assert_frame_equal(cached.frame, dataset.frame)
+
+
+def test_warm_start_trains_only_on_unseen_trades(dataset):
+    frame = dataset.frame
+    tie = next(i for i in range(100, len(frame)) if frame['OpenTime'][i] == frame['OpenTime'][i - 1])
+    first = train(Dataset(frame.iloc[:tie].reset_index(drop=True), 'first'), 'logistic', holdout=0)
+    assert first.metadata['trained_trades'] == tie
+
+    # The trade at `tie` opens at the same time as the first model's last trade but was not trained on
+    updated = train(dataset, warm_start=first, holdout=0)
+    assert updated.metadata['trained_trades'] == len(frame)
+    assert updated.metadata['parent_version'] == first.version
+
+    with pytest.raises(ValueError, match='No trades to train on'):
+        train(dataset, warm_start=updated, holdout=0)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Tick Bars
+=========
+Builds bars from ticks in one pass per trading day: time bars (M1, M5, H1,
+...) and tick-count bars (T100, T500, ...), each with OHLC, tick count, real
+volume and spread statistics (mean / min / max of ask - bid in price units),
+which the OHLC-only `candles` table cannot provide.
+
+Ticks come from tick_store.py (MT5 tick exports streamed day by day, or the
+`ticks` hypertable), so memory holds one day of ticks plus the bars, whatever
+the size of the export. Within a day, bar boundaries are found from the tick
+times (time bars) or tick positions (tick bars), and every field is a segment
+reduction (reduceat) over those boundaries; all requested timeframes are
+built from the same day arrays. Tick bars carry their unfinished last bar
+into the next day; after the last day one more dict is yielded holding those
+final tick bars (and empty tables for the time-bar timeframes).
+
+Bars are written to `<SYMBOL>_<TF>.parquet`, one row group per day, in the
+layout bar_store.py reads (ts, open, high, low, close, volume, spread, ...).
+Times stay in the ticks' clock: broker time for exports, UTC for the table.
+
+Usage:
+    from tick_bars import build_bars
+    from tick_store import iter_tick_days
+
+    for tables in build_bars(iter_tick_days('NAS100_ticks.csv'), ['M1', 'T500']):
+        tables['M1']   # pyarrow.Table of that day's M1 bars (empty in the final flush)
+
+    python tick_bars.py NAS100_ticks.csv --timeframe M1 --timeframe M5 --timeframe T500 --out-dir bars/
+    python tick_bars.py --from-db NAS100 --start 2025-10-01 --end 2025-10-31 --timeframe M1
+"""
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+from tick_store import TickDay, iter_db_tick_days, iter_tick_days, symbol_from_name
+
+PRICES = ('bid', 'mid', 'last')
+BAR_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'tick_count', 'spread', 'spread_min', 'spread_max')
+_UNIT_MINUTES = {'M': 1, 'H': 60, 'D': 1440}
+_DAY_MINUTES = 1440
+
+
+@dataclass(frozen=True)
+class Timeframe:
+    """A bar size: `minutes` for time bars or `ticks` for tick-count bars."""
+    name: str
+    minutes: int = 0
+    ticks: int = 0
+
+
+def parse_timeframe(name: str) -> Timeframe:
+    """'M1' / 'M15' / 'H1' / 'D1' (time bars dividing a day) or 'T500' (500-tick bars)."""
+    match = re.fullmatch(r'([MHDT])(\d+)', name.strip().upper())
+    if not match or int(match.group(2)) <= 0:
+        raise ValueError(f"Unknown timeframe '{name}' (expected e.g. M1, M5, H1, D1 or T500)")
+    unit, size = match.group(1), int(match.group(2))
+    if unit == 'T':
+        return Timeframe(f"T{size}", ticks=size)
+    minutes = size * _UNIT_MINUTES[unit]
+    if _DAY_MINUTES % minutes:
+        raise ValueError(f"Timeframe {name} does not divide a day")
+    return Timeframe(f"{unit}{size}", minutes=minutes)
+
+
+# -------------------------------- Reductions -------------------------------- #
+
+def aggregate(starts: np.ndarray, price: np.ndarray, spread: np.ndarray,
+              volume: np.ndarray) -> Dict[str, np.ndarray]:
+    """Bar fields of the tick segments beginning at `starts` (ascending, starts[0] == 0)."""
+    if not len(starts):
+        return {name: np.empty(0, dtype=np.int64 if name == 'tick_count' else np.float64) for name in BAR_FIELDS}
+    ends = np.r_[starts[1:], len(price)]
+    has_spread = ~np.isnan(spread)
+    quoted = np.add.reduceat(has_spread.astype(np.int64), starts)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        spread_mean = np.add.reduceat(np.where(has_spread, spread, 0.0), starts) / quoted
+    return {
+        'open': price[starts],
+        'high': np.maximum.reduceat(price, starts),
+        'low': np.minimum.reduceat(price, starts),
+        'close': price[ends - 1],
+        'volume': np.add.reduceat(volume, starts),
+        'tick_count': (ends - starts).astype(np.int64),
+        'spread': np.where(quoted > 0, spread_mean, np.nan),
+        'spread_min': np.fmin.reduceat(spread, starts),  # fmin/fmax skip NaN spreads
+        'spread_max': np.fmax.reduceat(spread, starts),
+    }
+
+
+def _price(day: TickDay, price: str) -> np.ndarray:
+    if price == 'bid':
+        return day.bid
+    if price == 'mid':
+        return (day.bid + day.ask) / 2.0
+    if price == 'last':
+        return day.last
+    raise ValueError(f"Unknown price '{price}' (expected one of {PRICES})")
+
+
+def time_bars(ts: np.ndarray, price: np.ndarray, spread: np.ndarray, volume: np.ndarray,
+              minutes: int) -> Dict[str, np.ndarray]:
+    """Time bars stamped with their open time; bars without ticks are not emitted (as in MT5)."""
+    period = np.int64(minutes) * 60 * 10**9
+    bucket = ts // period
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]]) if len(ts) else np.empty(0, dtype=np.intp)
+    bars = aggregate(starts, price, spread, volume)
+    bars['ts'] = bucket[starts] * period
+    return bars
+
+
+class TickBarBuilder:
+    """Fixed-size tick bars over consecutive days; the unfinished last bar carries over."""
+
+    def __init__(self, ticks: int):
+        self.ticks = ticks
+        self._carry: Optional[Dict[str, np.ndarray]] = None
+
+    def add(self, ts, price, spread, volume, final: bool = False) -> Dict[str, np.ndarray]:
+        arrays = {'ts': ts, 'price': price, 'spread': spread, 'volume': volume}
+        if self._carry is not None:
+            arrays = {name: np.concatenate([self._carry[name], values]) for name, values in arrays.items()}
+        complete = len(arrays['ts']) if final else len(arrays['ts']) // self.ticks * self.ticks
+        self._carry = {name: values[complete:] for name, values in arrays.items()}
+        starts = np.arange(0, complete, self.ticks)
+        bars = aggregate(starts, arrays['price'][:complete], arrays['spread'][:complete],
+                         arrays['volume'][:complete])
+        bars['ts'] = arrays['ts'][starts]
+        return bars
+
+    def flush(self) -> Dict[str, np.ndarray]:
+        empty = np.empty(0)
+        return self.add(np.empty(0, dtype=np.int64), empty, empty, empty, final=True)
+
+
+def _table(bars: Dict[str, np.ndarray], utc: bool) -> pa.Table:
+    ts_type = pa.timestamp('ns', tz='UTC') if utc else pa.timestamp('ns')
+    return pa.table({'ts': pa.array(bars['ts'].astype('datetime64[ns]')).cast(ts_type),
+                     **{name: pa.array(bars[name]) for name in BAR_FIELDS}})
+
+
+def build_bars(days: Iterable[TickDay], timeframes: Sequence[str], price: str = 'bid',
+               metrics: Optional[PipelineMetrics] = None) -> Iterator[Dict[str, pa.Table]]:
+    """
+    One {timeframe: bars table} per day of ticks, every requested timeframe in each.
+
+    With tick-bar timeframes, a final dict follows the last day: the unfinished
+    tick bars flushed, and empty tables for the time bars.
+    """
+    frames = [parse_timeframe(name) for name in timeframes]
+    builders = {tf.name: TickBarBuilder(tf.ticks) for tf in frames if tf.ticks}
+    metrics = metrics or PipelineMetrics('tick_bars')
+    utc = False
+    for day in days:
+        utc = day.utc
+        with metrics.stage('aggregate', rows=len(day)):
+            values = _price(day, price)
+            keep = ~np.isnan(values)
+            ts, values = day.ts[keep], values[keep]
+            spread = (day.ask - day.bid)[keep]
+            volume = day.volume[keep]
+            tables = {}
+            for tf in frames:
+                bars = builders[tf.name].add(ts, values, spread, volume) if tf.ticks \
+                    else time_bars(ts, values, spread, volume, tf.minutes)
+                tables[tf.name] = _table(bars, utc)
+        yield tables
+    if builders:
+        empty = time_bars(np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0), 1)
+        yield {tf.name: _table(builders[tf.name].flush() if tf.ticks else empty, utc) for tf in frames}
+
+
+def write_bars(days: Iterable[TickDay], symbol: str, timeframes: Sequence[str], out_dir: Path,
+               price: str = 'bid', metrics: Optional[PipelineMetrics] = None) -> Dict[str, int]:
+    """Stream bars into `<out_dir>/<symbol>_<TF>.parquet` (a row group per day); returns bars per timeframe."""
+    metrics = metrics or PipelineMetrics('tick_bars')
+    out_dir.mkdir(parents=True, exist_ok=True)
+    writers: Dict[str, pq.ParquetWriter] = {}
+    counts = {name: 0 for name in (parse_timeframe(t).name for t in timeframes)}
+    try:
+        for tables in build_bars(days, timeframes, price, metrics):
+            with metrics.stage('render') as stage:
+                for name, table in tables.items():
+                    if not table.num_rows:
+                        continue
+                    if name not in writers:
+                        writers[name] = pq.ParquetWriter(out_dir / f"{symbol}_{name}.parquet", table.schema)
+                    writers[name].write_table(table)
+                    counts[name] += table.num_rows
+                    stage.rows += table.num_rows
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return counts
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def main():
+    parser = argparse.ArgumentParser(description='Build time / tick bars with spread statistics from ticks')
+    parser.add_argument('inputs', nargs='*', type=Path, help='MT5 tick export files (tab-separated)')
+    parser.add_argument('--from-db', metavar='SYMBOL', default=None, help='Read ticks of SYMBOL from the ticks table')
+    parser.add_argument('--start', default=None, help='First day (with --from-db)')
+    parser.add_argument('--end', default=None, help='Last day (with --from-db)')
+    parser.add_argument('--dsn', default=None, help='Postgres URL (default: TP_POSTGRES_URL / POSTGRES_URL)')
+    parser.add_argument('--symbol', default=None, help='Symbol for file inputs (default: file name up to the first _)')
+    parser.add_argument('--timeframe', action='append', default=None,
+                        help='M1, M5, H1, D1, T500, ... (repeatable; default: M1)')
+    parser.add_argument('--price', choices=PRICES, default='bid', help='Price the bars are built from (default: bid)')
+    parser.add_argument('--out-dir', type=Path, default=Path('bars'), help='Output directory (default: ./bars)')
+    args = parser.parse_args()
+
+    timeframes = args.timeframe or ['M1']
+    for name in timeframes:
+        parse_timeframe(name)  # fail before reading any ticks
+    if not args.inputs and not args.from_db:
+        parser.error('give tick export files or --from-db SYMBOL')
+    if args.from_db and not (args.start and args.end):
+        parser.error('--from-db needs --start and --end')
+
+    metrics = PipelineMetrics('tick_bars')
+    # Exports of one symbol (e.g. monthly files) are chained into a single bar file, in the given order
+    sources: Dict[str, List[Iterable[TickDay]]] = {}
+    for path in args.inputs:
+        sources.setdefault(args.symbol or symbol_from_name(path), []).append(iter_tick_days(path))
+    if args.from_db:
+        sources.setdefault(args.from_db, []).append(iter_db_tick_days(args.from_db, args.start, args.end, args.dsn))
+    for symbol, parts in sources.items():
+        counts = write_bars(chain.from_iterable(parts), symbol, timeframes, args.out_dir, args.price, metrics)
+        for name, count in counts.items():
+            print(f"✅ {symbol} {name}: {count:,} bars -> {args.out_dir / f'{symbol}_{name}.parquet'}")
+    metrics.export()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'tick_bars'))
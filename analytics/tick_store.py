@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Tick Store
+==========
+Reads MT5 tick exports a trading day at a time and bulk-loads them into the
+backend's `ticks` hypertable with COPY.
+
+An MT5 tick export (Symbols > Ticks > Export) is tab-separated, UTF-8 or
+UTF-16, in broker time:
+
+    <DATE>      <TIME>          <BID>    <ASK>    <LAST>  <VOLUME>  <FLAGS>
+    2025.10.01  00:00:00.095    1.17312  1.17320                    6
+    2025.10.01  00:00:00.316    1.17313                             2
+
+A field is blank when that price did not change on the tick, so bid / ask /
+last are forward-filled (across block and day boundaries). Exports of a few
+hundred million ticks never sit in memory whole: the file is streamed in
+blocks by Arrow's CSV reader, times are parsed with Arrow compute kernels, and
+complete days are handed out one by one (files must be in time order, as MT5
+writes them).
+
+Importing converts broker time to UTC (time_segments.BrokerClock) and, per
+day, deletes what the table already holds for that symbol and day before the
+COPY, in one transaction, so re-importing a file or an overlapping export is
+idempotent. The symbol row is created if missing.
+
+Usage:
+    from tick_store import iter_tick_days, import_ticks
+
+    for day in iter_tick_days('NAS100_ticks.csv'):
+        day.ts, day.bid, day.ask
+
+    python tick_store.py NAS100_ticks.csv --symbol NAS100 --broker-utc-offset 2 --broker-dst us
+"""
+
+import argparse
+import io
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+
+from bar_store import default_dsn
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+from time_segments import DEFAULT_BROKER, BrokerClock, broker_to_utc
+
+try:  # optional: only for the ticks hypertable
+    import psycopg
+except ImportError:
+    psycopg = None
+
+BLOCK_BYTES = 32 << 20          # CSV bytes parsed per block
+TICK_FIELDS = ('bid', 'ask', 'last', 'volume', 'flags')
+_DAY_NS = 86_400 * 10**9
+_MT5_COLUMNS = {'<BID>': 'bid', '<ASK>': 'ask', '<LAST>': 'last', '<VOLUME>': 'volume', '<FLAGS>': 'flags'}
+
+
+@dataclass
+class TickDay:
+    """One trading day of ticks; `ts` is int64 epoch ns (broker time unless `utc`), prices forward-filled."""
+    day: np.datetime64
+    ts: np.ndarray
+    bid: np.ndarray
+    ask: np.ndarray
+    last: np.ndarray
+    volume: np.ndarray
+    flags: np.ndarray
+    utc: bool = False
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+# ------------------------------ MT5 exports --------------------------------- #
+
+def _encoding(path: Path) -> str:
+    with open(path, 'rb') as f:
+        head = f.read(4)
+    if head.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16'
+    return 'utf-8'
+
+
+def _parse_times(dates: pa.ChunkedArray, times: pa.ChunkedArray) -> np.ndarray:
+    """'YYYY.MM.DD' + 'HH:MM:SS[.fff]' columns to int64 ns, without Python-level loops."""
+    days = pc.strptime(dates, format='%Y.%m.%d', unit='s').cast(pa.int64())
+
+    def part(start, stop):
+        return pc.cast(pc.utf8_slice_codeunits(times, start, stop), pa.int64(), safe=False)
+
+    millis = pc.if_else(pc.greater(pc.utf8_length(times), 8), part(9, 12), 0)
+    seconds = pc.add(pc.multiply(pc.add(pc.multiply(part(0, 2), 60), part(3, 5)), 60), part(6, 8))
+    ns = pc.add(pc.multiply(pc.add(days, seconds), 10**9), pc.multiply(millis, 10**6))
+    return ns.to_numpy()
+
+
+def _forward_fill(values: np.ndarray, carry: float) -> np.ndarray:
+    """NaNs take the previous value; leading NaNs take `carry` (the previous block's last value)."""
+    missing = np.isnan(values)
+    if not missing.any():
+        return values
+    index = np.where(missing, 0, np.arange(len(values)))
+    np.maximum.accumulate(index, out=index)
+    filled = values[index]
+    filled[np.isnan(filled)] = carry
+    return filled
+
+
+def _column(batch: pa.RecordBatch, name: str, dtype) -> np.ndarray:
+    if name not in batch.schema.names:
+        return np.full(batch.num_rows, np.nan if dtype == np.float64 else 0, dtype=dtype)
+    column = batch.column(name)
+    if dtype == np.float64:
+        return column.to_numpy(zero_copy_only=False).astype(np.float64)
+    return pc.fill_null(column, 0).to_numpy(zero_copy_only=False).astype(dtype)
+
+
+def iter_tick_days(path, block_bytes: int = BLOCK_BYTES) -> Iterator[TickDay]:
+    """Stream an MT5 tick export as one TickDay per broker calendar day, in order."""
+    path = Path(path)
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_bytes, encoding=_encoding(path)),
+        parse_options=pa_csv.ParseOptions(delimiter='\t'),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={'<DATE>': pa.string(), '<TIME>': pa.string(), '<BID>': pa.float64(),
+                          '<ASK>': pa.float64(), '<LAST>': pa.float64(), '<VOLUME>': pa.float64(),
+                          '<FLAGS>': pa.int16()},
+            strings_can_be_null=True),
+    )
+    names = reader.schema.names
+    if '<DATE>' not in names or '<TIME>' not in names:
+        raise ValueError(f"{path.name}: not an MT5 tick export (columns: {names})")
+
+    carry = {'bid': np.nan, 'ask': np.nan, 'last': np.nan}
+    pending: List[dict] = []
+    current_day = None
+    for batch in reader:
+        if not batch.num_rows:
+            continue
+        batch = batch.rename_columns([_MT5_COLUMNS.get(n, n) for n in batch.schema.names])
+        ts = _parse_times(batch.column('<DATE>'), batch.column('<TIME>'))
+        part = {'ts': ts}
+        for name in ('bid', 'ask', 'last'):
+            part[name] = _forward_fill(_column(batch, name, np.float64), carry[name])
+            carry[name] = part[name][-1]
+        part['volume'] = np.nan_to_num(_column(batch, 'volume', np.float64))
+        part['flags'] = _column(batch, 'flags', np.int16)
+
+        day_of = ts // _DAY_NS
+        cuts = np.flatnonzero(np.diff(day_of)) + 1
+        for lo, hi in zip(np.r_[0, cuts], np.r_[cuts, len(ts)]):
+            day = day_of[lo]
+            if current_day is not None and day != current_day and pending:
+                yield _tick_day(current_day, pending)
+                pending = []
+            current_day = day
+            pending.append({name: values[lo:hi] for name, values in part.items()})
+    if pending:
+        yield _tick_day(current_day, pending)
+
+
+def _tick_day(day: int, parts: List[dict]) -> TickDay:
+    arrays = {name: np.concatenate([p[name] for p in parts]) if len(parts) > 1 else parts[0][name]
+              for name in parts[0]}
+    return TickDay(np.datetime64(int(day), 'D'), arrays['ts'], *(arrays[name] for name in TICK_FIELDS))
+
+
+# ------------------------------ Ticks table --------------------------------- #
+
+def _connect(dsn: Optional[str]):
+    if psycopg is None:
+        raise RuntimeError("psycopg is not installed; install it to use the ticks table")
+    dsn = dsn or default_dsn()
+    if not dsn:
+        raise RuntimeError("No database configured (set TP_POSTGRES_URL or POSTGRES_URL)")
+    return psycopg.connect(dsn)
+
+
+def symbol_id(conn, symbol: str) -> int:
+    """id of `symbol` in the symbols table, inserting it if needed."""
+    with conn.cursor() as cur:
+        cur.execute("INSERT INTO symbols (name) VALUES (%s) ON CONFLICT (name) DO NOTHING", (symbol,))
+        cur.execute("SELECT id FROM symbols WHERE name = %s", (symbol,))
+        return int(cur.fetchone()[0])
+
+
+def _copy_payload(day: TickDay, sid: int, utc_ns: np.ndarray) -> bytes:
+    """The day's rows as COPY csv text (empty field = NULL)."""
+    table = pa.table({
+        'symbol_id': pa.array(np.full(len(day), sid, dtype=np.int32)),
+        'ts': pa.array(utc_ns.view('datetime64[ns]')).cast(pa.timestamp('us', tz='UTC')),
+        **{name: pa.array(getattr(day, name), from_pandas=True) for name in ('bid', 'ask', 'last', 'volume')},
+        'flags': pa.array(day.flags),
+    })
+    buffer = io.BytesIO()
+    pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=False, quoting_style='none'))
+    return buffer.getvalue()
+
+
+def import_ticks(path, symbol: str, dsn: Optional[str] = None, broker: BrokerClock = DEFAULT_BROKER,
+                 metrics: Optional[PipelineMetrics] = None) -> int:
+    """COPY an MT5 tick export into `ticks`, a day per transaction; returns the rows loaded."""
+    metrics = metrics or PipelineMetrics('tick_import')
+    total = 0
+    days = iter_tick_days(path)
+    with _connect(dsn) as conn:
+        sid = symbol_id(conn, symbol)
+        conn.commit()
+        while True:
+            with metrics.stage('parse') as stage:
+                day = next(days, None)
+                stage.rows = len(day) if day is not None else 0
+            if day is None:
+                break
+            with metrics.stage('load', rows=len(day)):
+                utc_ns = broker_to_utc(day.ts.view('datetime64[ns]'), broker).view(np.int64)
+                day_bounds = np.array([day.day, day.day + np.timedelta64(1, 'D')], dtype='datetime64[ns]')
+                lo, hi = (b.astype('datetime64[us]').item() for b in broker_to_utc(day_bounds, broker))
+                payload = _copy_payload(day, sid, utc_ns)
+                with conn.transaction(), conn.cursor() as cur:
+                    cur.execute("DELETE FROM ticks WHERE symbol_id = %s AND ts >= %s AND ts < %s", (sid, lo, hi))
+                    with cur.copy("COPY ticks (symbol_id, ts, bid, ask, last, volume, flags) "
+                                  "FROM STDIN (FORMAT csv)") as copy:
+                        copy.write(payload)
+            total += len(day)
+            print(f"   {symbol} {day.day}: {len(day):,} ticks")
+    return total
+
+
+def iter_db_tick_days(symbol: str, start, end, dsn: Optional[str] = None) -> Iterator[TickDay]:
+    """Ticks of `symbol` from the ticks table, one UTC day per query, for days in [start, end]."""
+    first, last = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    with _connect(dsn) as conn, conn.cursor() as cur:
+        cur.execute("SELECT id FROM symbols WHERE name = %s", (symbol,))
+        row = cur.fetchone()
+        if row is None:
+            return
+        day = first
+        while day <= last:
+            lo = day.astype('datetime64[us]').item()
+            hi = (day + np.timedelta64(1, 'D')).astype('datetime64[us]').item()
+            buffer = io.BytesIO()
+            with cur.copy("COPY (SELECT (extract(epoch FROM ts) * 1000000)::bigint, bid, ask, last, volume, "
+                          "coalesce(flags, 0) FROM ticks WHERE symbol_id = %s AND ts >= %s AND ts < %s "
+                          "ORDER BY ts) TO STDOUT (FORMAT csv)", (row[0], lo, hi)) as copy:
+                for chunk in copy:
+                    buffer.write(chunk)
+            if buffer.tell():
+                names = ['ts_us', *TICK_FIELDS]
+                table = pa_csv.read_csv(io.BytesIO(buffer.getvalue()),
+                                        read_options=pa_csv.ReadOptions(column_names=names),
+                                        convert_options=pa_csv.ConvertOptions(column_types={
+                                            'ts_us': pa.int64(), 'flags': pa.int16(),
+                                            **{n: pa.float64() for n in TICK_FIELDS[:-1]}}))
+                prices = {n: table.column(n).to_numpy(zero_copy_only=False).astype(np.float64)
+                          for n in TICK_FIELDS[:-1]}
+                yield TickDay(day, table.column('ts_us').to_numpy() * 1000, prices['bid'], prices['ask'],
+                              prices['last'], np.nan_to_num(prices['volume']),
+                              table.column('flags').to_numpy().astype(np.int16), utc=True)
+            day += np.timedelta64(1, 'D')
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def symbol_from_name(path: Path) -> str:
+    """`NAS100_ticks.csv` / `NAS100_202510.csv` -> NAS100."""
+    return path.stem.split('_')[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-load MT5 tick exports into the ticks hypertable')
+    parser.add_argument('inputs', nargs='+', type=Path, help='MT5 tick export files (tab-separated)')
+    parser.add_argument('--symbol', default=None, help='Symbol name (default: file name up to the first _)')
+    parser.add_argument('--dsn', default=None, help='Postgres URL (default: TP_POSTGRES_URL / POSTGRES_URL)')
+    parser.add_argument('--broker-utc-offset', type=float, default=DEFAULT_BROKER.utc_offset_hours,
+                        help='Trade server standard UTC offset (default: %(default)s)')
+    parser.add_argument('--broker-dst', choices=['us', 'eu', 'none'], default=DEFAULT_BROKER.dst,
+                        help='Trade server DST rule (default: %(default)s)')
+    args = parser.parse_args()
+
+    broker = BrokerClock(args.broker_utc_offset, args.broker_dst)
+    metrics = PipelineMetrics('tick_import')
+    loaded = 0
+    for path in args.inputs:
+        symbol = args.symbol or symbol_from_name(path)
+        print(f"📥 {path.name} -> ticks ({symbol})")
+        loaded += import_ticks(path, symbol, args.dsn, broker, metrics)
+    print(f"✅ {loaded:,} ticks loaded")
+    metrics.export()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'tick_import'))
@@ -19,13 +19,18 @@ Author: Claude AI
 Date: 2025-11-28
 """
 
-import json
+import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from typing import Dict, List, Tuple
 from collections import defaultdict
 
+from feature_store import add_features, materialize
+from processed_dataset_cache import load_processed_trades
+from time_segments import DEFAULT_BROKER, BrokerClock, categorical_segments
+from trade_join import index_ea_trades, read_ea_trades
+
 # Time segment columns to analyze
 TIME_COLUMNS = {
     'IN_CST_Day_OP_01': 'Day of Week',
@@ -38,55 +43,182 @@ TIME_COLUMNS = {
     'IN_Segment_04H_OP_01': '4-Hour Segment',
 }
 
+# Cross-segment dimensions for heatmaps (row dimension, column dimension)
+CROSS_COLUMNS = [
+    ('IN_CST_Day_OP_01', 'IN_Segment_01H_OP_01'),
+    ('IN_CST_Day_OP_01', 'IN_Segment_15M_OP_01'),
+    ('IN_CST_Month_OP_01', 'IN_CST_Day_OP_01'),
+]
+
 
 def load_trades(json_path: Path) -> pd.DataFrame:
-    """Load trades from processed JSON file."""
-    with open(json_path) as f:
-        data = json.load(f)
-    
-    trades = data.get('trades', [])
-    if not trades:
-        return pd.DataFrame()
-    
-    df = pd.DataFrame(trades)
+    """Load trades from processed JSON file (via the columnar cache)."""
+    df = load_processed_trades(json_path)
+    if df.empty:
+        return df
     
-    # Normalize direction
-    df['direction'] = df['Trade_Direction'].map({'Long': 'BUY', 'Short': 'SELL'})
-    df['outcome'] = df['Trade_Result'].map({'Win': 'TP', 'Loss': 'SL'})
+    # Normalized direction (BUY/SELL) and outcome (TP/SL), shared with the other analyzers
+    df = add_features(df, ['direction', 'outcome'], sources=[json_path])
     df['profit'] = df['EA_Profit']
     
     return df
 
 
+def load_ea_trades(csv_path: Path, broker: BrokerClock = DEFAULT_BROKER) -> pd.DataFrame:
+    """
+    Load a raw EA trades CSV (dual ENTRY/EXIT rows) with the same columns as load_trades.
+
+    Segments, session, day and month are computed from the ENTRY OpenTime as
+    integer-coded categoricals, so no preprocessed JSON is needed.
+    """
+    index = index_ea_trades(read_ea_trades(csv_path))
+    closed = index.has_entry & index.has_exit
+    entry = index.entry[closed].reset_index(drop=True)
+    exit_ = index.exit[closed].reset_index(drop=True)
+
+    df = pd.DataFrame(categorical_segments(entry['OpenTime'], 'IN', broker))
+    profit = pd.to_numeric(exit_['Profit'], errors='coerce').fillna(0.0)
+    df['Ticket'] = entry['Ticket'].to_numpy()
+    features = materialize(pd.DataFrame({'Type': entry['Type'], 'Profit': profit}), ['direction', 'outcome'],
+                           sources=[csv_path], view='ea_trades')
+    df['direction'] = features['direction'].array
+    df['outcome'] = features['outcome'].array
+    df['profit'] = profit.to_numpy()
+    return df
+
+
+def load_any(path: Path, broker: BrokerClock = DEFAULT_BROKER) -> pd.DataFrame:
+    """Processed JSON/NDJSON, trade_join Arrow output, or a raw EA trades CSV."""
+    path = Path(path)
+    return load_ea_trades(path, broker) if path.suffix == '.csv' else load_trades(path)
+
+
+def _profit_factor(gross_gain: np.ndarray, gross_loss: np.ndarray) -> np.ndarray:
+    """Vectorized profit factor with the same edge cases as calculate_pf."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pf = gross_gain / gross_loss
+    return np.where(gross_loss > 0, pf, np.where(gross_gain > 0, np.inf, 0.0))
+
+
+def _segment_frame(keys: Dict[str, np.ndarray], counts: np.ndarray, sums: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """Build the per-segment stats table from bincount results (empty bins dropped)."""
+    present = counts > 0
+    data = {name: values[present] for name, values in keys.items()}
+    trade_count = counts[present]
+    net_profit = sums['profit'][present]
+    gross_gain = sums['gain'][present]
+    gross_loss = sums['loss'][present]
+    wins = sums['win'][present]
+
+    data.update({
+        'net_profit': net_profit,
+        'trade_count': trade_count.astype(np.int64),
+        'avg_profit': net_profit / trade_count,
+        'wins': np.rint(wins).astype(np.int64),
+        'gross_gain': gross_gain,
+        'gross_loss': gross_loss,
+        'win_rate': wins / trade_count * 100,
+        'profit_factor': _profit_factor(gross_gain, gross_loss),
+    })
+    return pd.DataFrame(data)
+
+
+def _segment_result(column, label: str, data: pd.DataFrame) -> Dict:
+    data = data.sort_values('net_profit', ascending=True)
+    return {
+        'column': column,
+        'label': label,
+        'data': data,
+        'total_segments': len(data),
+        'losing_segments': int((data['net_profit'] < 0).sum()),
+        'winning_segments': int((data['net_profit'] > 0).sum()),
+    }
+
+
+def analyze_segments(df: pd.DataFrame,
+                     columns: Dict[str, str] = None,
+                     cross: List[Tuple[str, str]] = None) -> Dict:
+    """
+    Analyze every time dimension (and cross-products) in one pass.
+
+    Each segment column is factorized to integer codes once; per-segment
+    net profit, trade count, wins and gross gains/losses are then produced
+    with np.bincount over those codes. Cross-products (e.g. day x hour) reuse
+    the same codes via code_a * n_b + code_b, so no dimension is re-hashed
+    and no segment re-filters the DataFrame.
+
+    Returns a dict keyed by column name (single dimensions) or by
+    (row_column, col_column) tuple (cross-products). Each value has the
+    same shape as analyze_segment's result.
+    """
+    columns = TIME_COLUMNS if columns is None else columns
+    cross = CROSS_COLUMNS if cross is None else cross
+
+    profit = pd.to_numeric(df['profit'], errors='coerce').fillna(0).to_numpy(dtype=np.float64)
+    weights = {
+        'profit': profit,
+        'gain': np.where(profit > 0, profit, 0.0),
+        'loss': np.where(profit < 0, -profit, 0.0),
+        'win': (df['outcome'] == 'TP').to_numpy(dtype=np.float64),
+    }
+
+    # Factorize each dimension exactly once
+    codes = {}
+    for column in set(columns) | {c for pair in cross for c in pair}:
+        if column in df.columns:
+            codes[column] = pd.factorize(df[column], sort=True)
+
+    def _bincount(idx: np.ndarray, size: int) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        valid = idx >= 0
+        idx = idx[valid]
+        counts = np.bincount(idx, minlength=size)
+        sums = {name: np.bincount(idx, weights=w[valid], minlength=size)
+                for name, w in weights.items()}
+        return counts, sums
+
+    results = {}
+    for column, label in columns.items():
+        if column not in codes:
+            continue
+        col_codes, uniques = codes[column]
+        counts, sums = _bincount(col_codes, len(uniques))
+        data = _segment_frame({column: np.asarray(uniques, dtype=object)}, counts, sums)
+        results[column] = _segment_result(column, label, data)
+
+    for row_col, col_col in cross:
+        if row_col not in codes or col_col not in codes:
+            continue
+        row_codes, row_uniques = codes[row_col]
+        col_codes, col_uniques = codes[col_col]
+        n_rows, n_cols = len(row_uniques), len(col_uniques)
+        combined = np.where((row_codes >= 0) & (col_codes >= 0),
+                            row_codes.astype(np.int64) * n_cols + col_codes, -1)
+        counts, sums = _bincount(combined, n_rows * n_cols)
+        grid = np.arange(n_rows * n_cols)
+        keys = {
+            row_col: np.asarray(row_uniques, dtype=object)[grid // n_cols],
+            col_col: np.asarray(col_uniques, dtype=object)[grid % n_cols],
+        }
+        data = _segment_frame(keys, counts, sums)
+        label = f"{TIME_COLUMNS.get(row_col, row_col)} x {TIME_COLUMNS.get(col_col, col_col)}"
+        results[(row_col, col_col)] = _segment_result((row_col, col_col), label, data)
+
+    return results
+
+
 def analyze_segment(df: pd.DataFrame, column: str, label: str) -> Dict:
     """Analyze performance by segment value."""
     
     if column not in df.columns:
         return None
     
-    # Group by segment
-    grouped = df.groupby(column).agg({
-        'profit': ['sum', 'count', 'mean'],
-        'outcome': lambda x: (x == 'TP').sum()
-    }).reset_index()
-    
-    grouped.columns = [column, 'net_profit', 'trade_count', 'avg_profit', 'wins']
-    grouped['win_rate'] = grouped['wins'] / grouped['trade_count'] * 100
-    grouped['profit_factor'] = grouped.apply(
-        lambda row: calculate_pf(df[df[column] == row[column]]['profit']), axis=1
-    )
-    
-    # Sort by net profit
-    grouped = grouped.sort_values('net_profit', ascending=True)
-    
-    return {
-        'column': column,
-        'label': label,
-        'data': grouped,
-        'total_segments': len(grouped),
-        'losing_segments': len(grouped[grouped['net_profit'] < 0]),
-        'winning_segments': len(grouped[grouped['net_profit'] > 0]),
-    }
+    return analyze_segments(df, {column: label}, cross=[])[column]
+
+
+def cross_segment_matrix(analysis: Dict, value: str = 'net_profit') -> pd.DataFrame:
+    """Pivot a cross-segment analysis into a row x column heatmap matrix."""
+    row_col, col_col = analysis['column']
+    return analysis['data'].pivot(index=row_col, columns=col_col, values=value)
 
 
 def calculate_pf(profits: pd.Series) -> float:
@@ -133,6 +265,17 @@ def calculate_savings(df: pd.DataFrame, column: str, segments_to_avoid: List[str
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Day / time-segment performance analysis')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Processed JSON, *_joined.arrow or raw EA *_trades.csv files '
+                             '(default: BL_*.json in the runs directory)')
+    parser.add_argument('--broker-utc-offset', type=float, default=DEFAULT_BROKER.utc_offset_hours,
+                        help='Trade server standard UTC offset for raw EA CSVs (default: %(default)s)')
+    parser.add_argument('--broker-dst', choices=['us', 'eu', 'none'], default=DEFAULT_BROKER.dst,
+                        help='Trade server DST rule for raw EA CSVs (default: %(default)s)')
+    args = parser.parse_args()
+    broker = BrokerClock(args.broker_utc_offset, args.broker_dst)
+
     print("=" * 80)
     print("TIME SEGMENT ANALYSIS - Day/Hour Performance Patterns")
     print("=" * 80)
@@ -140,12 +283,13 @@ def main():
     
     # Load all baseline files
     data_dir = Path('/Volumes/Vortex_Trading/ai-trading-platform/web/public/data/runs')
+    paths = args.paths or sorted(data_dir.glob('BL_*.json'))
     
     all_trades = []
-    for json_file in data_dir.glob('BL_*.json'):
-        print(f"Loading {json_file.name}...")
-        trades_df = load_trades(json_file)
-        trades_df['source'] = json_file.stem
+    for path in paths:
+        print(f"Loading {path.name}...")
+        trades_df = load_any(path, broker)
+        trades_df['source'] = path.stem
         all_trades.append(trades_df)
     
     if not all_trades:
@@ -168,6 +312,7 @@ def main():
     # =========================================================================
     
     all_recommendations = []
+    analyses = analyze_segments(df)
     
     for column, label in TIME_COLUMNS.items():
         if column not in df.columns:
@@ -178,7 +323,7 @@ def main():
         print(f"ANALYSIS: {label} ({column})")
         print("=" * 80)
         
-        analysis = analyze_segment(df, column, label)
+        analysis = analyses.get(column)
         if not analysis:
             continue
         
@@ -241,6 +386,30 @@ def main():
         
         print()
     
+    # =========================================================================
+    # CROSS-SEGMENT HOTSPOTS (e.g. Day x Hour)
+    # =========================================================================
+    for key in CROSS_COLUMNS:
+        analysis = analyses.get(key)
+        if not analysis:
+            continue
+        
+        worst = find_worst_segments(analysis, min_trades=5)
+        if len(worst) == 0:
+            continue
+        
+        row_col, col_col = key
+        print("=" * 80)
+        print(f"CROSS-SEGMENT: {analysis['label']} (worst cells, min 5 trades)")
+        print("=" * 80)
+        print(f"{'Cell':<26} {'Trades':>8} {'Win%':>8} {'Net P/L':>12} {'PF':>8}")
+        print("-" * 70)
+        for _, row in worst.head(10).iterrows():
+            cell = f"{row[row_col]} / {row[col_col]}"
+            pf_str = f"{row['profit_factor']:.2f}" if row['profit_factor'] != float('inf') else "∞"
+            print(f"{cell:<26} {int(row['trade_count']):>8} {row['win_rate']:>7.1f}% ${row['net_profit']:>10.2f} {pf_str:>8}")
+        print()
+    
     # =========================================================================
     # COMBINED RECOMMENDATION
     # =========================================================================
@@ -0,0 +1,265 @@
+"""
+Time Segments - Vectorized broker -> CST time features
+
+Python counterpart of csv_processing/timeSegmentCalculator.ts. Where the
+TypeScript calculator formats strings per trade ("15-069", "Floor Session",
+"Monday"), this module works on whole datetime64 arrays with integer
+arithmetic and returns small integer codes (int8, -1 for missing times) plus
+label tables to decode them:
+
+    segment_15m  0..95   -> SEGMENT_LABELS['15m'][code]  '15-001'..'15-096'
+    segment_30m  0..47      '30-001'..'30-048'
+    segment_1h   0..23      '1h-001'..'1h-024'
+    segment_2h/3h/4h        '2h-001'.., '3h-001'.., '4h-001'..
+    session      0..4    -> SESSION_LABELS
+    weekday      0..6    -> DAY_LABELS (Monday = 0)
+    month        0..11   -> MONTH_LABELS
+
+Grouping on the codes (np.bincount, Categorical) avoids hashing strings.
+
+Broker -> CST conversion is DST-aware on both sides. The TS calculator
+subtracts a fixed 8 hours. Here broker times go to UTC through a BrokerClock
+(standard UTC offset + DST rule), and UTC goes to US Central (UTC-6, UTC-5
+under US DST). The default clock (GMT+2, US DST: the usual "New York close"
+MT5 server) gives the same -8h as the TS calculator except on the Sundays the
+clocks change. For a GMT+2/+3 server on EU DST rules, use
+BrokerClock(2, 'eu'); it differs by an hour during the weeks between the
+US and EU switches.
+
+Usage:
+    from time_segments import time_features, categorical_segments
+
+    features = time_features(ea['OpenTime'])                  # DataFrame of codes
+    columns = categorical_segments(deals['Time'], side='IN')   # IN_Segment_15M_OP_01, ...
+"""
+
+from dataclasses import dataclass
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Segment name -> minutes per segment, with the TS label prefixes
+SEGMENT_MINUTES = {'15m': 15, '30m': 30, '1h': 60, '2h': 120, '3h': 180, '4h': 240}
+_SEGMENT_PREFIX = {'15m': '15', '30m': '30', '1h': '1h', '2h': '2h', '3h': '3h', '4h': '4h'}
+SEGMENT_LABELS: Dict[str, np.ndarray] = {
+    name: np.array([f"{_SEGMENT_PREFIX[name]}-{i + 1:03d}" for i in range(24 * 60 // minutes)], dtype=object)
+    for name, minutes in SEGMENT_MINUTES.items()
+}
+
+SESSION_LABELS = np.array(['After Hours', 'News', 'Opening Bell', 'Floor Session', 'Closing Bell'], dtype=object)
+# Inclusive CST minute-of-day ranges per session code (see determineSession)
+_SESSION_RANGES = {1: (7 * 60 + 30, 8 * 60), 2: (8 * 60 + 30, 9 * 60),
+                   3: (9 * 60 + 1, 14 * 60 + 44), 4: (14 * 60 + 45, 15 * 60 + 15)}
+DAY_LABELS = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'],
+                      dtype=object)
+MONTH_LABELS = np.array(['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+                         'September', 'October', 'November', 'December'], dtype=object)
+LABELS = {**{f'segment_{name}': labels for name, labels in SEGMENT_LABELS.items()},
+          'session': SESSION_LABELS, 'weekday': DAY_LABELS, 'month': MONTH_LABELS}
+
+
+def _session_table() -> np.ndarray:
+    table = np.zeros(24 * 60, dtype=np.int8)
+    for code, (start, end) in _SESSION_RANGES.items():
+        table[start:end + 1] = code
+    return table
+
+
+_SESSION_BY_MINUTE = _session_table()
+
+# ProcessedTradeData column names per side: feature -> column
+TS_COLUMNS = {
+    'IN': {'weekday': 'IN_CST_Day_OP_01', 'month': 'IN_CST_Month_OP_01',
+           'segment_15m': 'IN_Segment_15M_OP_01', 'segment_30m': 'IN_Segment_30M_OP_01',
+           'segment_1h': 'IN_Segment_01H_OP_01', 'segment_2h': 'IN_Segment_02H_OP_01',
+           'segment_3h': 'IN_Segment_03H_OP_01', 'segment_4h': 'IN_Segment_04H_OP_01',
+           'session': 'IN_Session_Name_OP_02'},
+    'OUT': {'weekday': 'OUT_CST_Day_OP_03', 'month': 'OUT_CST_Month_OP_03',
+            'segment_15m': 'OUT_Segment_15M_OP_03', 'segment_30m': 'OUT_Segment_30M_OP_03',
+            'segment_1h': 'OUT_Segment_01H_OP_03', 'segment_2h': 'OUT_Segment_02H_OP_03',
+            'segment_3h': 'OUT_Segment_03H_OP_03', 'segment_4h': 'OUT_Segment_04H_OP_03',
+            'session': 'OUT_Session_Name_OP_03'},
+}
+
+_NS_PER_MINUTE = 60 * 10**9
+_NS_PER_HOUR = 60 * _NS_PER_MINUTE
+_NAT = np.iinfo(np.int64).min
+CST_STANDARD_OFFSET_HOURS = -6
+
+
+@dataclass(frozen=True)
+class BrokerClock:
+    """Trade server clock: standard UTC offset and DST rule ('us', 'eu' or 'none')."""
+    utc_offset_hours: float = 2.0
+    dst: str = 'us'
+
+
+DEFAULT_BROKER = BrokerClock()
+
+
+# ------------------------------ Time parsing -------------------------------- #
+
+def parse_times(values: pd.Series) -> pd.Series:
+    """'YYYY.MM.DD HH:MM[:SS]' text to datetime64; blanks and the EA's 1970 placeholder become NaT."""
+    text = values.astype('string').str.strip()
+    parsed = pd.to_datetime(text, format='%Y.%m.%d %H:%M:%S', errors='coerce')
+    missing = parsed.isna() & text.fillna('').ne('')
+    if missing.any():
+        parsed[missing] = pd.to_datetime(text[missing], format='%Y.%m.%d %H:%M', errors='coerce')
+        missing = parsed.isna() & text.fillna('').ne('')
+        if missing.any():
+            parsed[missing] = pd.to_datetime(text[missing], format='mixed', errors='coerce')
+    # One resolution everywhere: as-of joins need identical key dtypes
+    parsed = parsed.astype('datetime64[ns]')
+    return parsed.where(parsed.dt.year > 1970)
+
+
+def _as_nanoseconds(times) -> np.ndarray:
+    """int64 nanoseconds since the epoch (NaT -> int64 min) from datetime64 data or MT5 text."""
+    if isinstance(times, pd.Series):
+        series = times
+    else:
+        series = pd.Series(np.asarray(times))
+    if not pd.api.types.is_datetime64_any_dtype(series):
+        series = parse_times(series)
+    values = series.to_numpy(dtype='datetime64[ns]')
+    return values.view(np.int64)
+
+
+# ------------------------------ DST transitions ----------------------------- #
+
+def _weekday(days: np.ndarray) -> np.ndarray:
+    """Monday = 0 for days since 1970-01-01 (a Thursday)."""
+    return (days + 3) % 7
+
+
+def _month_start(years: np.ndarray, month: int) -> np.ndarray:
+    """Days since the epoch of the first of `month` in each year."""
+    months = (years - 1970) * 12 + (month - 1)
+    return months.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+
+
+def _nth_sunday(years: np.ndarray, month: int, n: int) -> np.ndarray:
+    first = _month_start(years, month)
+    return first + (6 - _weekday(first)) % 7 + 7 * (n - 1)
+
+
+def _last_sunday(years: np.ndarray, month: int) -> np.ndarray:
+    last = _month_start(years + (month == 12), month % 12 + 1) - 1
+    return last - (_weekday(last) - 6) % 7
+
+
+def dst_window_utc(years: np.ndarray, rule: str, standard_offset_hours: float) -> tuple:
+    """(start, end) of DST in UTC nanoseconds for each year; empty windows for rule 'none'."""
+    years = np.asarray(years, dtype=np.int64)
+    day_ns = 24 * _NS_PER_HOUR
+    if rule == 'us':  # 2nd Sunday of March 02:00 standard -> 1st Sunday of November 02:00 daylight
+        start = _nth_sunday(years, 3, 2) * day_ns + int((2 - standard_offset_hours) * _NS_PER_HOUR)
+        end = _nth_sunday(years, 11, 1) * day_ns + int((2 - standard_offset_hours - 1) * _NS_PER_HOUR)
+    elif rule == 'eu':  # last Sunday of March -> last Sunday of October, 01:00 UTC
+        start = _last_sunday(years, 3) * day_ns + _NS_PER_HOUR
+        end = _last_sunday(years, 10) * day_ns + _NS_PER_HOUR
+    elif rule == 'none':
+        start = end = np.zeros(len(years), dtype=np.int64)
+    else:
+        raise ValueError(f"Unknown DST rule '{rule}' (expected 'us', 'eu' or 'none')")
+    return start, end
+
+
+def _in_dst(utc_ns: np.ndarray, rule: str, standard_offset_hours: float) -> np.ndarray:
+    """Whether each UTC instant falls in DST; one transition pair per distinct year."""
+    if rule == 'none' or not len(utc_ns):
+        return np.zeros(len(utc_ns), dtype=bool)
+    years = utc_ns.astype('datetime64[ns]').astype('datetime64[Y]').astype(np.int64) + 1970
+    unique_years, inverse = np.unique(years, return_inverse=True)
+    start, end = dst_window_utc(unique_years, rule, standard_offset_hours)
+    return (utc_ns >= start[inverse]) & (utc_ns < end[inverse])
+
+
+# ------------------------------- Conversion --------------------------------- #
+
+def broker_to_utc(times, broker: BrokerClock = DEFAULT_BROKER) -> np.ndarray:
+    """
+    Broker wall-clock times to UTC (datetime64[ns]).
+
+    In the repeated autumn hour the first (daylight) reading is assumed;
+    non-existent spring times are read as standard time.
+    """
+    local = _as_nanoseconds(times)
+    missing = local == _NAT
+    standard = local - int(broker.utc_offset_hours * _NS_PER_HOUR)
+    daylight = standard - _NS_PER_HOUR
+    utc = np.where(_in_dst(daylight, broker.dst, broker.utc_offset_hours), daylight, standard)
+    utc[missing] = _NAT
+    return utc.view('datetime64[ns]')
+
+
+def utc_to_cst(utc) -> np.ndarray:
+    """UTC to US Central wall-clock time (CST, CDT under US DST), datetime64[ns]."""
+    utc_ns = _as_nanoseconds(utc)
+    missing = utc_ns == _NAT
+    offset = CST_STANDARD_OFFSET_HOURS + _in_dst(utc_ns, 'us', CST_STANDARD_OFFSET_HOURS)
+    cst = utc_ns + offset.astype(np.int64) * _NS_PER_HOUR
+    cst[missing] = _NAT
+    return cst.view('datetime64[ns]')
+
+
+def broker_to_cst(times, broker: BrokerClock = DEFAULT_BROKER) -> np.ndarray:
+    """Broker wall-clock times to US Central wall-clock times."""
+    return utc_to_cst(broker_to_utc(times, broker))
+
+
+# -------------------------------- Features ---------------------------------- #
+
+def time_features(times, broker: BrokerClock = DEFAULT_BROKER, convert: bool = True) -> pd.DataFrame:
+    """
+    Integer-coded CST time features for broker times (datetime64 or MT5/EA text).
+
+    Columns: cst_time, minute_of_day (int16), segment_15m .. segment_4h,
+    session, weekday, month (int8 codes, -1 where the time is missing).
+    Pass convert=False when the times are already CST.
+    """
+    cst = broker_to_cst(times, broker) if convert else _as_nanoseconds(times).view('datetime64[ns]')
+    ns = cst.view(np.int64)
+    valid = ns != _NAT
+    minutes = np.where(valid, ns // _NS_PER_MINUTE, 0)
+    days = minutes // (24 * 60)
+    minute_of_day = minutes - days * 24 * 60
+    months = cst.astype('datetime64[M]').astype(np.int64)
+
+    def codes(values) -> np.ndarray:
+        return np.where(valid, values, -1).astype(np.int8)
+
+    features = {'cst_time': cst, 'minute_of_day': np.where(valid, minute_of_day, -1).astype(np.int16)}
+    for name, width in SEGMENT_MINUTES.items():
+        features[f'segment_{name}'] = codes(minute_of_day // width)
+    features['session'] = codes(_SESSION_BY_MINUTE[minute_of_day])
+    features['weekday'] = codes(_weekday(days))
+    features['month'] = codes(np.where(valid, months % 12, 0))
+    index = times.index if isinstance(times, pd.Series) else None
+    return pd.DataFrame(features, index=index)
+
+
+def decode(codes, feature: str) -> np.ndarray:
+    """Labels for integer codes of `feature` (None where the code is -1)."""
+    codes = np.asarray(codes)
+    labels = np.append(LABELS[feature], None)
+    return labels[np.where(codes >= 0, codes, len(labels) - 1)]
+
+
+def as_categorical(codes, feature: str) -> pd.Categorical:
+    """Codes as a Categorical over the full label table (no string building)."""
+    return pd.Categorical.from_codes(np.asarray(codes), categories=LABELS[feature])
+
+
+def categorical_segments(times, side: str = 'IN', broker: BrokerClock = DEFAULT_BROKER) -> Dict[str, object]:
+    """
+    The ProcessedTradeData time columns for one side ('IN' or 'OUT') as
+    Categoricals, plus `<side>_CST_DATE_TIME` (datetime64).
+    """
+    features = time_features(times, broker)
+    columns = {f'{side}_CST_DATE_TIME': features['cst_time'].to_numpy()}
+    for feature, column in TS_COLUMNS[side].items():
+        columns[column] = as_categorical(features[feature].to_numpy(), feature)
+    return columns
@@ -0,0 +1,155 @@
+"""
+Tracing
+=======
+OpenTelemetry spans for the batch analytics and ingestion pipelines, exported
+to the same collector as the API (otelcol -> Tempo/Jaeger).
+
+The provider is configured lazily from the standard OTEL environment, the
+same settings the backend uses:
+
+    OTEL_EXPORTER_OTLP_ENDPOINT   e.g. http://localhost:4318 (unset: tracing off)
+    OTEL_SERVICE_NAME             default 'ai-trading-analytics'
+    OTEL_SDK_DISABLED=true        force off
+
+When a script is launched by the API (or any traced parent), the parent's
+context arrives in the TRACEPARENT / TRACESTATE environment variables and
+becomes the parent of every span in the script. Inside a script, hand the
+context to worker processes explicitly:
+
+    carrier = tracing.inject_context()              # parent, picklable dict
+    ...
+    with tracing.remote_context(carrier):           # worker
+        with tracing.span('dataset', name=name):
+            ...
+    tracing.force_flush()                           # workers exit without atexit
+
+Without opentelemetry installed (or without an endpoint) every helper is a
+cheap no-op. PipelineMetrics.stage() opens a span per stage, so instrumented
+pipelines are traced without further changes.
+"""
+
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+try:  # optional: only the backend requirements install OpenTelemetry
+    from opentelemetry import context as otel_context, trace
+    from opentelemetry.propagate import extract, inject
+except ImportError:
+    trace = None
+
+DEFAULT_SERVICE_NAME = 'ai-trading-analytics'
+ENV_CARRIER_KEYS = {'traceparent': 'TRACEPARENT', 'tracestate': 'TRACESTATE'}
+
+_lock = threading.Lock()
+_configured = False
+_enabled = False
+_provider = None
+
+
+def _disabled_by_env() -> bool:
+    return os.environ.get('OTEL_SDK_DISABLED', '').lower() in ('1', 'true', 'yes')
+
+
+def configure_tracing(service_name: Optional[str] = None) -> bool:
+    """
+    Install the OTLP tracer provider once per process; True when tracing is on.
+
+    Safe to call repeatedly and from worker processes (forked or spawned).
+    """
+    global _configured, _enabled, _provider
+    with _lock:
+        if _configured:
+            return _enabled
+        _configured = True
+        if trace is None or _disabled_by_env() or not os.environ.get('OTEL_EXPORTER_OTLP_ENDPOINT'):
+            return False
+        try:
+            from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+        except ImportError:
+            return False
+
+        name = service_name or os.environ.get('OTEL_SERVICE_NAME') or DEFAULT_SERVICE_NAME
+        _provider = TracerProvider(resource=Resource.create({'service.name': name}))
+        # No endpoint argument: the exporter reads OTEL_EXPORTER_OTLP_* and appends /v1/traces
+        _provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+        trace.set_tracer_provider(_provider)
+        atexit.register(_provider.shutdown)
+
+        # Parent context handed down by the launching process
+        env_context = extract_context(environment_carrier())
+        if env_context is not None:
+            otel_context.attach(env_context)
+        _enabled = True
+        return True
+
+
+def get_tracer(name: str = 'tickphysics.pipeline'):
+    """Tracer from the global provider (a no-op tracer when tracing is off)."""
+    if trace is None:
+        return None
+    configure_tracing()
+    return trace.get_tracer(name)
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """Span around a block; attributes with None values are dropped. Yields the span or None."""
+    tracer = get_tracer()
+    if tracer is None or not _enabled:
+        yield None
+        return
+    with tracer.start_as_current_span(name) as current:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value if isinstance(value, (bool, int, float, str)) else str(value))
+        yield current
+
+
+# ----------------------------- Propagation -------------------------------- #
+
+def inject_context() -> Dict[str, str]:
+    """W3C trace context of the current span as a plain dict (empty when tracing is off)."""
+    carrier: Dict[str, str] = {}
+    if trace is not None and _enabled:
+        inject(carrier)
+    return carrier
+
+
+def extract_context(carrier: Optional[Dict[str, str]]):
+    """Context from a carrier dict, or None when there is nothing to continue."""
+    if trace is None or not carrier:
+        return None
+    return extract(carrier)
+
+
+@contextmanager
+def remote_context(carrier: Optional[Dict[str, str]]):
+    """Make spans in this block children of the span that produced `carrier`."""
+    configure_tracing()
+    ctx = extract_context(carrier) if _enabled else None
+    if ctx is None:
+        yield
+        return
+    token = otel_context.attach(ctx)
+    try:
+        yield
+    finally:
+        otel_context.detach(token)
+
+
+def environment_carrier(environ=None) -> Dict[str, str]:
+    """Trace context passed through TRACEPARENT / TRACESTATE environment variables."""
+    environ = os.environ if environ is None else environ
+    return {key: environ[var] for key, var in ENV_CARRIER_KEYS.items() if environ.get(var)}
+
+
+def force_flush(timeout_millis: int = 5000):
+    """Export buffered spans now (pool workers exit without running atexit handlers)."""
+    if _provider is not None:
+        _provider.force_flush(timeout_millis)
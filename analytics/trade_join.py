@@ -0,0 +1,729 @@
+#!/usr/bin/env python3
+"""
+Trade Join - Vectorized MT5 report + EA trades + EA signals join
+
+Python counterpart of the TypeScript CSVProcessor join (csv_processing/
+csvProcessor.ts): pairs MT5 `in`/`out` deals, attaches the EA's ENTRY/EXIT
+rows by ticket and the nearest preceding signals, and writes the joined trades
+as an Arrow IPC file that processed_dataset_cache.load_processed_dataset()
+memory-maps directly. No Node step and no JSON decode in between.
+
+Every step works on whole columns:
+
+    pairing       consecutive in -> out deals of one symbol (after sorting by Deal)
+    EA by ticket  np.searchsorted of MT5 entry Order ids into the sorted tickets
+    EA fallback   as-of join on entry time (then exit time), same symbol,
+                  within 60s and 0.1% of the MT5 price
+    signals       as-of join backwards from entry / exit time, same symbol and
+                  direction, within 10 minutes
+
+Column names follow ProcessedTradeData (IN_*, OUT_*, EA_*, Signal_*), but the
+columns are typed: times are datetime64, unmatched signal fields are NaN/NaT,
+and EA_Match_Method records how the EA trade was found (ticket / entry_time /
+exit_time / none). The CST day/month/segment/session columns come from
+time_segments.py as categoricals (integer codes on disk).
+
+Differences from the TypeScript join, all deliberate:
+  * When the ticket lookup fails, a trade matched on entry time/price keeps
+    that match; the TS exit-time pass overwrites it with the first EXIT row in
+    the window.
+  * Repeated EA rows of one ticket are de-duplicated against the previous row
+    (TS: against the row kept so far); they only differ for 3+ near-identical
+    rows within 2 seconds.
+  * Signal PhysicsPass / RejectReason stay as written by the EA.
+
+Several optimization passes are joined in parallel (one process per
+triple); a pass whose inputs are unchanged since its output was written is
+skipped.
+
+Usage:
+    python trade_join.py --mt5 X_MT5Report.csv --trades X_trades.csv --signals X_signals.csv
+    python trade_join.py ../MQL5/Backtest_Reports --workers 4 --out-dir joined/
+
+    from trade_join import join_files
+    dataset = join_files(mt5_path, trades_path, signals_path)   # ProcessedDataset
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import tracing
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+from processed_dataset_cache import (ProcessedDataset, pa, read_arrow_sections, source_hash,
+                                     write_arrow_dataset)
+from time_segments import DEFAULT_BROKER, BrokerClock, categorical_segments, parse_times
+
+JOIN_VERSION = '2'
+DATA_MODEL_VERSION = '2.1.0'
+
+EA_TIME_TOLERANCE = pd.Timedelta(seconds=60)
+EA_PRICE_TOLERANCE = 0.001
+EA_DUPLICATE_WINDOW = pd.Timedelta(seconds=2)
+SIGNAL_TOLERANCE = pd.Timedelta(minutes=10)
+
+MT5_NUMERIC = ['Volume', 'Price', 'Commission', 'Swap', 'Profit', 'Balance']
+MT5_SUFFIX = '_MT5Report.csv'
+TRADES_SUFFIX = '_trades.csv'
+SIGNALS_SUFFIX = '_signals.csv'
+OUTPUT_SUFFIX = '_joined.arrow'
+
+# EA row column -> output column (copied from the ENTRY row / the EXIT row)
+_PHYSICS = ['Quality', 'Confluence', 'Momentum', 'Speed', 'Acceleration', 'Entropy', 'Jerk',
+            'PhysicsScore', 'SpeedSlope', 'AccelerationSlope', 'MomentumSlope', 'ConfluenceSlope',
+            'JerkSlope', 'Zone', 'Regime', 'Spread']
+EA_ENTRY_FIELDS = {'Symbol': 'EA_Entry_Symbol',
+                   **{f'Entry_{name}': f'EA_Entry_{name}' for name in _PHYSICS}}
+EA_EXIT_FIELDS = {
+    'ExitReason': 'EA_ExitReason', 'Symbol': 'EA_Exit_Symbol',
+    **{f'Exit_{name}': f'EA_Exit_{name}' for name in _PHYSICS},
+    **{name: f'EA_{name}' for name in [
+        'Profit', 'ProfitPercent', 'Pips', 'HoldTimeBars', 'HoldTimeMinutes', 'RiskPercent', 'RRatio',
+        'MFE', 'MAE', 'MFE_Percent', 'MAE_Percent', 'MFE_Pips', 'MAE_Pips', 'MFE_TimeBars',
+        'MAE_TimeBars', 'MFEUtilization', 'MAEImpact', 'ExcursionEfficiency',
+        'RunUp_Price', 'RunUp_Pips', 'RunUp_Percent', 'RunUp_TimeBars',
+        'RunDown_Price', 'RunDown_Pips', 'RunDown_Percent', 'RunDown_TimeBars',
+        'ExitQualityClass', 'EarlyExitOpportunityCost',
+        'PhysicsScoreDecay', 'SpeedDecay', 'SpeedSlopeDecay', 'ConfluenceDecay', 'ZoneTransitioned']},
+}
+EA_TEXT_FIELDS = {'Symbol', 'Entry_Zone', 'Entry_Regime', 'Exit_Zone', 'Exit_Regime',
+                  'ExitReason', 'ExitQualityClass', 'EAName', 'EAVersion'}
+EA_BOOL_FIELDS = {'ZoneTransitioned'}
+SIGNAL_FIELDS = ['Quality', 'Confluence', 'Speed', 'Acceleration', 'Momentum', 'Entropy', 'Jerk',
+                 'PhysicsScore', 'SpeedSlope', 'AccelerationSlope', 'MomentumSlope', 'ConfluenceSlope',
+                 'JerkSlope', 'Zone', 'Regime', 'PhysicsPass', 'RejectReason']
+
+
+# --------------------------------- Parsing ---------------------------------- #
+
+def parse_numbers(values: pd.Series) -> pd.Series:
+    """MT5/EA numeric text ('24 619.6', '- 3.17', '1,234.5') to float64; blanks become NaN."""
+    if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+        return values.astype('float64')
+    text = values.astype('string').str.replace(r'[\s, ]', '', regex=True).str.replace('−', '-')
+    return pd.to_numeric(text, errors='coerce').astype('float64')
+
+
+def read_mt5_deals(path) -> pd.DataFrame:
+    """
+    Deals of an MT5 report: a cleaned deals CSV, or the raw "Strategy Tester
+    Report" export (its Deals section is extracted). Balance rows are dropped.
+    """
+    path = Path(path)
+    text = path.read_text(encoding='utf-8-sig', errors='replace')
+    if 'Strategy Tester Report' in text.split('\n', 1)[0]:
+        lines = text.splitlines()
+        start = next((i for i, line in enumerate(lines) if line.startswith('Deals,,,')), None)
+        if start is None:
+            raise ValueError(f'Could not find "Deals" section in {path.name}')
+        body = []
+        for line in lines[start + 1:]:
+            if line.startswith('Orders,,,') or line.startswith('Total'):
+                break
+            body.append(line.rstrip(','))
+        text = '\n'.join(body)
+
+    deals = pd.read_csv(io.StringIO(text), dtype=str, keep_default_na=False, skip_blank_lines=True)
+    deals = deals.loc[:, [c for c in deals.columns if c and not c.startswith('Unnamed')]]
+    deals.columns = [c.strip() for c in deals.columns]
+    deals = deals.apply(lambda col: col.str.strip())
+
+    deals['Type'] = deals['Type'].str.lower()
+    deals['Direction'] = deals['Direction'].str.lower()
+    deals = deals[(deals['Type'] != 'balance') & (deals['Direction'] != '')]
+
+    deals['Time'] = parse_times(deals['Time'])
+    for col in ('Deal', 'Order'):
+        deals[col] = parse_numbers(deals[col]).fillna(0).astype('int64')
+    for col in MT5_NUMERIC:
+        if col in deals:
+            deals[col] = parse_numbers(deals[col])
+    if 'Comment' not in deals:
+        deals['Comment'] = ''
+    return deals.reset_index(drop=True)
+
+
+def read_ea_trades(path) -> pd.DataFrame:
+    """Dual-row EA trades CSV with RowType upper-cased, Ticket as int64 and typed times."""
+    ea = pd.read_csv(path, encoding='utf-8-sig', low_memory=False)
+    ea.columns = [c.strip() for c in ea.columns]
+    ea['RowType'] = ea['RowType'].astype('string').str.strip().str.upper().fillna('')
+    ea['Ticket'] = parse_numbers(ea['Ticket']).fillna(0).astype('int64')
+    for col in ('Timestamp', 'OpenTime', 'CloseTime'):
+        if col in ea:
+            ea[col] = parse_times(ea[col])
+    for col in ea.columns:
+        if col in EA_BOOL_FIELDS:
+            ea[col] = ea[col].astype('string').str.strip().str.lower().isin(['true', '1', '1.0'])
+        elif col in EA_TEXT_FIELDS or col in ('RowType', 'Type', 'EAName', 'EAVersion'):
+            ea[col] = ea[col].astype('string').str.strip().fillna('')
+        elif ea[col].dtype == object:
+            numeric = parse_numbers(ea[col])
+            if numeric.notna().sum() == ea[col].replace('', np.nan).notna().sum():
+                ea[col] = numeric
+    return ea
+
+
+def read_ea_signals(path) -> pd.DataFrame:
+    """EA signals CSV with a typed Timestamp and an is_buy flag; rows without either are dropped."""
+    signals = pd.read_csv(path, encoding='utf-8-sig', low_memory=False)
+    signals.columns = [c.strip() for c in signals.columns]
+    signals['Timestamp'] = parse_times(signals['Timestamp'])
+    signal_type = signals['SignalType'].astype('string').str.strip().str.upper()
+    signals['is_buy'] = signal_type.str.contains('BUY', regex=False).fillna(False).astype(bool)
+    signals['Symbol'] = signals['Symbol'].astype('string').str.strip()
+    keep = signals['Timestamp'].notna() & signal_type.fillna('').ne('') & signals['Symbol'].notna()
+    return signals[keep].reset_index(drop=True)
+
+
+# ---------------------------------- Joins ----------------------------------- #
+
+def pair_mt5_deals(deals: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(entry, exit) deal frames, row-aligned: each `in` deal directly followed by an `out` of the same symbol."""
+    deals = deals.sort_values('Deal', kind='stable').reset_index(drop=True)
+    direction = deals['Direction'].to_numpy()
+    symbol = deals['Symbol'].to_numpy()
+    # A paired `out` can never start a pair, so the TS greedy skip needs no extra handling
+    starts = np.flatnonzero((direction[:-1] == 'in') & (direction[1:] == 'out') & (symbol[:-1] == symbol[1:]))
+    return (deals.iloc[starts].reset_index(drop=True),
+            deals.iloc[starts + 1].reset_index(drop=True))
+
+
+@dataclass
+class EATradeIndex:
+    """EA trades keyed by ticket: `entry` / `exit` hold one row per ticket, aligned with `tickets`."""
+    tickets: np.ndarray
+    entry: pd.DataFrame
+    exit: pd.DataFrame
+    has_entry: np.ndarray
+    has_exit: np.ndarray
+    duplicates: int = 0
+
+
+def _first_price(rows: pd.DataFrame, primary: str) -> pd.Series:
+    """`primary || Price` as in the TS fingerprint (zero / missing falls back to Price)."""
+    price = rows['Price'] if 'Price' in rows else pd.Series(np.nan, index=rows.index)
+    if primary not in rows:
+        return price
+    value = rows[primary]
+    return value.where(value.fillna(0) != 0, price)
+
+
+def _latest_rows(rows: pd.DataFrame, time_col: str) -> Tuple[pd.DataFrame, int]:
+    """Last row per ticket, skipping rows within 2s of the previous row of the same ticket."""
+    times = rows[time_col] if time_col in rows else pd.Series(pd.NaT, index=rows.index)
+    if 'Timestamp' in rows:
+        times = times.fillna(rows['Timestamp'])
+    previous = times.groupby(rows['Ticket'].to_numpy()).shift()
+    repeated = ((times - previous).abs() <= EA_DUPLICATE_WINDOW).to_numpy()
+    kept = rows[~repeated]
+    latest = kept.drop_duplicates('Ticket', keep='last')
+    return latest.set_index('Ticket'), int(repeated.sum())
+
+
+def index_ea_trades(ea: pd.DataFrame) -> EATradeIndex:
+    """De-duplicate the dual-row EA trades and align ENTRY/EXIT rows by ticket."""
+    fingerprint = pd.DataFrame({
+        'ticket': ea['Ticket'].to_numpy(),
+        'row_type': ea['RowType'].to_numpy(),
+        'open': _first_price(ea, 'OpenPrice').to_numpy(),
+        'close': _first_price(ea, 'ClosePrice').to_numpy(),
+        'profit': (ea['Profit'].fillna(0) if 'Profit' in ea else pd.Series(0, index=ea.index)).to_numpy(),
+    })
+    exact = fingerprint.duplicated().to_numpy()
+    ea = ea[~exact]
+
+    entry, entry_repeats = _latest_rows(ea[ea['RowType'] == 'ENTRY'], 'OpenTime')
+    exit_, exit_repeats = _latest_rows(ea[ea['RowType'] == 'EXIT'], 'CloseTime')
+    tickets = np.union1d(entry.index.to_numpy(), exit_.index.to_numpy()).astype('int64')
+    return EATradeIndex(
+        tickets=tickets,
+        entry=entry.reindex(tickets).reset_index(),
+        exit=exit_.reindex(tickets).reset_index(),
+        has_entry=np.isin(tickets, entry.index.to_numpy()),
+        has_exit=np.isin(tickets, exit_.index.to_numpy()),
+        duplicates=int(exact.sum()) + entry_repeats + exit_repeats,
+    )
+
+
+def _nearest_within(left: pd.DataFrame, right: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    As-of join (nearest time, same symbol, within 60s), then the 0.1% price check.
+
+    Both frames have time / symbol / price plus `row` (left) or `pos` (right);
+    returns the matched (row, pos) pairs.
+    """
+    left = left.dropna(subset=['time'])
+    right = right.dropna(subset=['time'])
+    if left.empty or right.empty:
+        return np.empty(0, dtype='int64'), np.empty(0, dtype='int64')
+    merged = pd.merge_asof(
+        left.sort_values('time', kind='stable'), right.sort_values('time', kind='stable'),
+        on='time', by='symbol', direction='nearest', tolerance=EA_TIME_TOLERANCE, suffixes=('', '_ea'))
+    price_delta = (merged['price_ea'] - merged['price']).abs() / merged['price']
+    ok = (merged['pos'].notna() & (price_delta <= EA_PRICE_TOLERANCE)).to_numpy()
+    return merged.loc[ok, 'row'].to_numpy('int64'), merged.loc[ok, 'pos'].to_numpy('int64')
+
+
+def match_ea_trades(entries: pd.DataFrame, exits: pd.DataFrame,
+                    index: EATradeIndex) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Position in `index` of the EA trade for every MT5 pair (-1 when none) and how it was found.
+
+    Direct match: MT5 entry Order == EA Ticket (binary search in the sorted
+    tickets). Remaining pairs: nearest EA ENTRY by open time/price, then
+    nearest EA EXIT by close time/price.
+    """
+    n = len(entries)
+    positions = np.full(n, -1, dtype='int64')
+    method = np.full(n, 'none', dtype=object)
+    tickets = index.tickets
+    if n == 0:
+        return positions, method
+
+    if len(tickets):
+        orders = entries['Order'].to_numpy('int64')
+        found = np.minimum(np.searchsorted(tickets, orders), len(tickets) - 1)
+        direct = tickets[found] == orders
+        positions[direct] = found[direct]
+        method[direct] = 'ticket'
+
+    symbol = entries['Symbol'].astype(str).to_numpy()
+    candidates = np.arange(len(tickets))
+    passes = [
+        ('entry_time', entries['Time'], entries['Price'], index.entry, index.has_entry, 'OpenTime', 'OpenPrice'),
+        ('exit_time', exits['Time'], exits['Price'], index.exit, index.has_exit, 'CloseTime', 'ClosePrice'),
+    ]
+    for name, mt5_time, mt5_price, rows, present, time_col, price_col in passes:
+        pending = positions < 0
+        if not pending.any() or not present.any():
+            continue
+        ea_time = rows[time_col] if time_col in rows else pd.Series(pd.NaT, index=rows.index)
+        if name == 'exit_time' and 'Timestamp' in rows:
+            ea_time = ea_time.fillna(rows['Timestamp'])
+        left = pd.DataFrame({'time': mt5_time.to_numpy(), 'symbol': symbol,
+                             'price': mt5_price.to_numpy(), 'row': np.arange(n)})[pending]
+        right = pd.DataFrame({'time': ea_time.to_numpy(), 'symbol': rows['Symbol'].astype(str).to_numpy(),
+                              'price': _first_price(rows, price_col).to_numpy(), 'pos': candidates})[present]
+        matched_rows, matched_pos = _nearest_within(left, right)
+        positions[matched_rows] = matched_pos
+        method[matched_rows] = name
+    return positions, method
+
+
+def match_signals(symbols: pd.Series, times: pd.Series, is_buy: np.ndarray,
+                  signals: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Latest signal at or before each time (same symbol and direction, within
+    10 minutes): positions into `signals` (-1 when none) and the time delta in minutes.
+    """
+    n = len(times)
+    positions = np.full(n, -1, dtype='int64')
+    delta = np.full(n, np.nan)
+    if n == 0 or signals.empty:
+        return positions, delta
+
+    left = pd.DataFrame({'time': times.to_numpy(), 'symbol': symbols.astype(str).to_numpy(),
+                         'is_buy': is_buy, 'row': np.arange(n)}).dropna(subset=['time'])
+    right = pd.DataFrame({'time': signals['Timestamp'].to_numpy(),
+                          'symbol': signals['Symbol'].astype(str).to_numpy(),
+                          'is_buy': signals['is_buy'].to_numpy(), 'pos': np.arange(len(signals))})
+    # Equal timestamps: the first signal in file order wins, as in the TS loop
+    right = right.sort_values('time', kind='stable').drop_duplicates(['time', 'symbol', 'is_buy'])
+    right['signal_time'] = right['time']
+    merged = pd.merge_asof(left.sort_values('time', kind='stable'), right, on='time',
+                           by=['symbol', 'is_buy'], direction='backward', tolerance=SIGNAL_TOLERANCE)
+    ok = merged['pos'].notna().to_numpy()
+    rows = merged.loc[ok, 'row'].to_numpy('int64')
+    positions[rows] = merged.loc[ok, 'pos'].to_numpy('int64')
+    delta[rows] = ((merged.loc[ok, 'time'] - merged.loc[ok, 'signal_time']).dt.total_seconds() / 60).to_numpy()
+    return positions, delta
+
+
+# ------------------------------ Output columns ------------------------------ #
+
+def _take(frame: pd.DataFrame, col: str, positions: np.ndarray, fill) -> pd.Series:
+    """frame[col] gathered at `positions` (-1 and missing values become `fill`)."""
+    if col not in frame:
+        return pd.Series(fill, index=range(len(positions)))
+    source = frame[col].reset_index(drop=True)
+    taken = source.reindex(positions).reset_index(drop=True)
+    if fill is None:
+        return taken
+    if isinstance(fill, bool):
+        return taken.fillna(False).astype(bool)
+    if isinstance(fill, str):
+        return taken.astype('string').fillna(fill)
+    filled = taken.astype('float64').fillna(fill)
+    return filled.astype('int64') if pd.api.types.is_integer_dtype(source) else filled
+
+
+def _present(flags: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """flags[positions] with False for -1."""
+    if not len(flags):
+        return np.zeros(len(positions), dtype=bool)
+    return (positions >= 0) & flags[np.maximum(positions, 0)]
+
+
+def _ea_columns(index: EATradeIndex, positions: np.ndarray) -> Dict[str, pd.Series]:
+    """EA_* columns; like the TS join, a trade without an EA ENTRY row gets defaults only."""
+    usable = np.where(_present(index.has_entry, positions), positions, -1)
+    columns = {}
+    for fields, rows in ((EA_ENTRY_FIELDS, index.entry), (EA_EXIT_FIELDS, index.exit)):
+        for source, target in fields.items():
+            bare = source.split('_', 1)[-1] if source.startswith(('Entry_', 'Exit_')) else source
+            fill = False if source in EA_BOOL_FIELDS else '' if source in EA_TEXT_FIELDS or bare in ('Zone', 'Regime') else 0.0
+            columns[target] = _take(rows, source, usable, fill)
+    columns['Strategy_ID_OP_03'] = _take(index.entry, 'EAName', usable, '').replace('', 'Unknown')
+    columns['Strategy_Version_ID_OP_03'] = _take(index.entry, 'EAVersion', usable, '').replace('', 'Unknown')
+    return columns
+
+
+def _signal_columns(prefix: str, signals: pd.DataFrame, positions: np.ndarray,
+                    delta: np.ndarray) -> Dict[str, pd.Series]:
+    columns = {
+        f'Signal_{prefix}_Matched': pd.Series(positions >= 0),
+        f'Signal_{prefix}_Timestamp': _take(signals, 'Timestamp', positions, None),
+        f'Signal_{prefix}_TimeDelta': pd.Series(delta),
+    }
+    for field in SIGNAL_FIELDS:
+        columns[f'Signal_{prefix}_{field}'] = _take(signals, field, positions, None)
+    return columns
+
+
+def _validation(trades: pd.DataFrame) -> Dict:
+    """The per-trade checks of CSVProcessor.validateTrade, evaluated column-wise."""
+    def issues(mask, kind, severity, message):
+        return [{'type': kind, 'tradeIndex': int(i), 'message': message(i), 'severity': severity}
+                for i in np.flatnonzero(np.asarray(mask))]
+
+    symbol, out_symbol = trades['Symbol_OP_03'], trades['OUT_Symbol']
+    ea_entry, ea_exit = trades['EA_Entry_Symbol'], trades['EA_Exit_Symbol']
+    critical = (
+        issues(symbol != out_symbol, 'SYMBOL_MISMATCH', 'CRITICAL',
+               lambda i: f"Symbol inconsistency: IN={symbol[i]}, OUT={out_symbol[i]}")
+        + issues((ea_entry != '') & (ea_entry != symbol), 'SYMBOL_MISMATCH_EA_ENTRY', 'CRITICAL',
+                 lambda i: f"EA Entry symbol ({ea_entry[i]}) does not match MT5 entry ({symbol[i]})")
+        + issues((ea_exit != '') & (out_symbol != '') & (ea_exit != out_symbol), 'SYMBOL_MISMATCH_EA_EXIT',
+                 'CRITICAL', lambda i: f"EA Exit symbol ({ea_exit[i]}) does not match MT5 exit ({out_symbol[i]})")
+    )
+    warnings = (
+        issues(trades['IN_Trade_ID'] != trades['OUT_Trade_ID'], 'TRADE_ID_MISMATCH', 'WARNING',
+               lambda i: f"Trade ID mismatch: IN={trades['IN_Trade_ID'][i]}, OUT={trades['OUT_Trade_ID'][i]}")
+        + issues(trades['EA_Entry_PhysicsScore'] == 0, 'NO_EA_DATA', 'WARNING',
+                 lambda i: 'No matching EA trade data found')
+        + issues(~trades['Signal_Entry_Matched'], 'NO_ENTRY_SIGNAL_MATCH', 'WARNING',
+                 lambda i: 'No matching entry signal found')
+        + issues(~trades['Signal_Exit_Matched'], 'NO_EXIT_SIGNAL_MATCH', 'WARNING',
+                 lambda i: 'No matching exit signal found')
+    )
+    return {
+        'isValid': not critical,
+        'dataQualityScore': max(0, 100 - len(critical) * 10 - len(warnings) * 2),
+        'criticalErrors': critical,
+        'warnings': warnings,
+    }
+
+
+def join_frames(deals: pd.DataFrame, ea: pd.DataFrame, signals: pd.DataFrame,
+                metrics: Optional[PipelineMetrics] = None, broker: BrokerClock = DEFAULT_BROKER) -> ProcessedDataset:
+    """Join already-loaded frames (see read_mt5_deals / read_ea_trades / read_ea_signals)."""
+    metrics = metrics or PipelineMetrics('trade_join')
+    with metrics.stage('join') as stage:
+        entries, exits = pair_mt5_deals(deals)
+        index = index_ea_trades(ea)
+        ea_pos, ea_method = match_ea_trades(entries, exits, index)
+        entry_signal, entry_delta = match_signals(
+            entries['Symbol'], entries['Time'], (entries['Type'] == 'buy').to_numpy(), signals)
+        # The exit deal's own type (a 'sell' exit looks for a SELL signal), as in the TS join
+        exit_signal, exit_delta = match_signals(
+            exits['Symbol'], exits['Time'], (exits['Type'] == 'buy').to_numpy(), signals)
+        stage.rows = len(entries)
+
+    with metrics.stage('aggregate') as stage:
+        profit = exits['Profit']
+        ea_columns = _ea_columns(index, ea_pos)
+        comment = exits['Comment'].fillna('').astype(str)
+        is_tp = comment.str.contains(r'\btp\b', case=False, regex=True)
+        is_sl = comment.str.contains(r'\bsl\b', case=False, regex=True)
+        ea_columns['EA_ExitReason'] = ea_columns['EA_ExitReason'].mask(is_tp, 'TP').mask(~is_tp & is_sl, 'SL')
+
+        result = np.select([profit.isna(), profit > 0.01, profit < -0.01], ['DataError', 'Win', 'Loss'], 'Breakeven')
+        profit = profit.fillna(0.0)
+        duration = (exits['Time'] - entries['Time']) // pd.Timedelta(minutes=1)
+        columns = {
+            'IN_Deal': entries['Deal'],
+            'Report_Source': 'MT5_Backtest',
+            'IN_Trade_ID': entries['Order'],
+            'IN_MT_MASTER_DATE_TIME': entries['Time'],
+            'OUT_MT_MASTER_DATE_TIME': exits['Time'],
+            **categorical_segments(entries['Time'], 'IN', broker),
+            **categorical_segments(exits['Time'], 'OUT', broker),
+            'Strategy_ID_OP_03': ea_columns.pop('Strategy_ID_OP_03'),
+            'Strategy_Version_ID_OP_03': ea_columns.pop('Strategy_Version_ID_OP_03'),
+            'Optimization_ID_OP_03': '',
+            'Report_Broker_OP_03': 'MT5',
+            'Symbol_OP_03': entries['Symbol'].astype(str),
+            'Chart_TF_OP_01': 'M1',
+            'IN_Order_Type_OP_01': entries['Type'],
+            'IN_Order_Direction': 'in',
+            'Volume_OP_03': entries['Volume'],
+            'IN_Symbol_Price_OP_03': entries['Price'],
+            'IN_Balance_OP_01': entries['Balance'],
+            'OUT_Profit_OP_01': profit,
+            'OUT_Balance_OP_01': exits['Balance'],
+            'OUT_Trade_ID': exits['Order'],
+            'OUT_Deal': exits['Deal'],
+            'OUT_Order_Type': exits['Type'],
+            'OUT_Order_Direction': 'out',
+            'OUT_Symbol_Price_OP_01': exits['Price'],
+            'OUT_Commission': exits['Commission'].fillna(0.0),
+            'OUT_Swap': exits['Swap'].fillna(0.0),
+            'OUT_Comment': comment,
+            'OUT_Symbol': exits['Symbol'].astype(str),
+            'Trade_Result': pd.Categorical(result, categories=['Win', 'Loss', 'Breakeven', 'DataError']),
+            'Trade_Direction': pd.Categorical(np.where(entries['Type'] == 'buy', 'Long', 'Short'),
+                                              categories=['Long', 'Short']),
+            'Trade_Duration_Minutes': duration,
+            'Trade_ROI_Percentage': profit / entries['Balance'] * 100,
+            'Trade_Risk_Reward_Ratio': ea_columns['EA_RRatio'],
+            'Trade_MAE': ea_columns['EA_MAE'],
+            'Trade_MFE': ea_columns['EA_MFE'],
+            **ea_columns,
+            'EA_Match_Method': pd.Categorical(ea_method, categories=['ticket', 'entry_time', 'exit_time', 'none']),
+            **_signal_columns('Entry', signals, entry_signal, entry_delta),
+            **_signal_columns('Exit', signals, exit_signal, exit_delta),
+        }
+        trades = pd.DataFrame({name: (value.reset_index(drop=True) if isinstance(value, pd.Series) else value)
+                               for name, value in columns.items()}, index=range(len(entries)))
+        has_entry = _present(index.has_entry, ea_pos)
+        has_exit = _present(index.has_exit, ea_pos)
+        trades['DataQuality_Score'] = np.maximum(
+            0, 100 - 30 * ~has_entry - 20 * ~has_exit
+            - 15 * ~trades['Signal_Entry_Matched'].to_numpy() - 15 * ~trades['Signal_Exit_Matched'].to_numpy())
+
+        validation = _validation(trades)
+        mt5_net = float((trades['OUT_Profit_OP_01'] + trades['OUT_Commission'] + trades['OUT_Swap']).sum())
+        ea_profit = float(trades['EA_Profit'].sum())
+        difference = abs(mt5_net - ea_profit)
+        statistics = {
+            'totalMT5Trades': int(len(deals)),
+            'pairedTrades': int(len(trades)),
+            'unmatchedTrades': int(len(deals) - 2 * len(trades)),
+            'eaTradesMatched': int((trades['EA_Entry_PhysicsScore'] > 0).sum()),
+            'eaSignalsMatched': int((trades['Signal_Entry_Matched'] | trades['Signal_Exit_Matched']).sum()),
+            'eaDuplicateRows': index.duplicates,
+            'eaMatchMethods': {k: int(v) for k, v in trades['EA_Match_Method'].value_counts().items()},
+            'dataQualityScore': validation['dataQualityScore'],
+            'profitReconciliation': {
+                'mt5NetProfit': round(mt5_net, 2),
+                'eaProfit': round(ea_profit, 2),
+                'difference': round(difference, 2),
+                'matchPercent': round((1 - difference / abs(mt5_net)) * 100, 2) if mt5_net else 0.0,
+            },
+        }
+        stage.rows = len(trades)
+    return ProcessedDataset(trades=trades, statistics=statistics, validation=validation)
+
+
+def _clock_dict(broker: BrokerClock) -> Dict:
+    return {'utcOffsetHours': broker.utc_offset_hours, 'dst': broker.dst}
+
+
+def _source_hashes(mt5_path: Path, trades_path: Path, signals_path: Path) -> Dict[str, str]:
+    return {'mt5Report': source_hash(mt5_path), 'eaTradesCSV': source_hash(trades_path),
+            'eaSignalsCSV': source_hash(signals_path)}
+
+
+def join_files(mt5_path, trades_path, signals_path, metrics: Optional[PipelineMetrics] = None,
+               broker: BrokerClock = DEFAULT_BROKER) -> ProcessedDataset:
+    """Load the three CSVs of one backtest / optimization pass and join them."""
+    metrics = metrics or PipelineMetrics('trade_join')
+    mt5_path, trades_path, signals_path = Path(mt5_path), Path(trades_path), Path(signals_path)
+    start = time.perf_counter()
+    with metrics.stage('load') as stage:
+        deals = read_mt5_deals(mt5_path)
+        ea = read_ea_trades(trades_path)
+        signals = read_ea_signals(signals_path)
+        stage.rows = len(deals) + len(ea) + len(signals)
+
+    dataset = join_frames(deals, ea, signals, metrics, broker)
+    dataset.statistics['processingTimeMs'] = int((time.perf_counter() - start) * 1000)
+    dataset.metadata = {
+        'processingTimestamp': datetime.now(timezone.utc).isoformat(),
+        'dataModelVersion': DATA_MODEL_VERSION,
+        'totalTrades': len(dataset.trades),
+        'sourceFiles': {'mt5Report': mt5_path.name, 'eaTradesCSV': trades_path.name,
+                        'eaSignalsCSV': signals_path.name},
+        'generator': 'trade_join.py',
+        'joinVersion': JOIN_VERSION,
+        'sourceHashes': _source_hashes(mt5_path, trades_path, signals_path),
+        'brokerClock': _clock_dict(broker),
+    }
+    return dataset
+
+
+# ------------------------------ Batch / CLI -------------------------------- #
+
+@dataclass
+class JoinInputs:
+    """The three exports of one backtest / optimization pass."""
+    name: str
+    mt5: Path
+    trades: Path
+    signals: Path
+
+
+def discover_passes(root: Path) -> List[JoinInputs]:
+    """Every `<name>_trades.csv` under root with its `<name>_signals.csv` and `<name>_MT5Report.csv`."""
+    passes = []
+    for trades_path in sorted(Path(root).rglob(f'*{TRADES_SUFFIX}')):
+        name = trades_path.name[:-len(TRADES_SUFFIX)]
+        mt5_path = trades_path.with_name(name + MT5_SUFFIX)
+        signals_path = trades_path.with_name(name + SIGNALS_SUFFIX)
+        if mt5_path.exists() and signals_path.exists():
+            passes.append(JoinInputs(name, mt5_path, trades_path, signals_path))
+    return passes
+
+
+def output_path_for(inputs: JoinInputs, out_dir: Optional[Path]) -> Path:
+    directory = Path(out_dir) if out_dir else inputs.trades.parent
+    return directory / f"{inputs.name}{OUTPUT_SUFFIX if pa is not None else '_joined.csv'}"
+
+
+def is_up_to_date(inputs: JoinInputs, output: Path, broker: BrokerClock = DEFAULT_BROKER) -> bool:
+    """True when `output` was joined from exactly these inputs by this join version and broker clock."""
+    if pa is None or not output.exists():
+        return False
+    try:
+        metadata = read_arrow_sections(output).get('metadata', {})
+    except (OSError, pa.ArrowException, ValueError):
+        return False
+    return (metadata.get('joinVersion') == JOIN_VERSION
+            and metadata.get('brokerClock') == _clock_dict(broker)
+            and metadata.get('sourceHashes') == _source_hashes(inputs.mt5, inputs.trades, inputs.signals))
+
+
+def write_joined(dataset: ProcessedDataset, output: Path) -> Path:
+    """Arrow IPC output; CSV (trades only) when pyarrow is not installed."""
+    if pa is not None:
+        write_arrow_dataset(dataset, output)
+    else:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        dataset.trades.to_csv(output, index=False)
+    return output
+
+
+def join_pass(inputs: JoinInputs, out_dir: Optional[Path] = None, force: bool = False,
+              broker: BrokerClock = DEFAULT_BROKER) -> Dict:
+    """Join and write one pass unless its output is current; returns a small summary."""
+    output = output_path_for(inputs, out_dir)
+    if not force and is_up_to_date(inputs, output, broker):
+        return {'name': inputs.name, 'status': 'up to date', 'output': str(output)}
+
+    metrics = PipelineMetrics('trade_join')
+    dataset = join_files(inputs.mt5, inputs.trades, inputs.signals, metrics, broker)
+    with metrics.stage('render', rows=len(dataset.trades)):
+        write_joined(dataset, output)
+    return {'name': inputs.name, 'status': 'joined', 'output': str(output),
+            'statistics': dataset.statistics, 'timings': metrics.as_dict()}
+
+
+def _join_for_pool(inputs: JoinInputs, out_dir: Optional[Path], force: bool, broker: BrokerClock,
+                   trace_carrier: Dict = None) -> Dict:
+    """Worker entry point; failures are reported, not raised, so other passes finish."""
+    try:
+        with tracing.remote_context(trace_carrier):
+            with tracing.span('trade_join.pass', dataset=inputs.name, pid=os.getpid()):
+                return join_pass(inputs, out_dir, force, broker)
+    except (OSError, ValueError, KeyError) as e:
+        return {'name': inputs.name, 'status': 'failed', 'error': f"{type(e).__name__}: {e}"}
+    finally:
+        tracing.force_flush()
+
+
+def join_all(passes: List[JoinInputs], out_dir: Optional[Path] = None, workers: Optional[int] = None,
+             force: bool = False, metrics: Optional[PipelineMetrics] = None,
+             broker: BrokerClock = DEFAULT_BROKER) -> List[Dict]:
+    """Join many passes, one worker process per pass; results in input order."""
+    carrier = tracing.inject_context()
+    n = len(passes)
+    args = [passes, [out_dir] * n, [force] * n, [broker] * n, [carrier] * n]
+    if workers == 1 or len(passes) <= 1:
+        results = list(map(_join_for_pool, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_join_for_pool, *args))
+    if metrics is not None:
+        for result in results:
+            metrics.merge(result.get('timings'))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Join MT5 report, EA trades and EA signals (vectorized)')
+    parser.add_argument('paths', nargs='*', type=Path,
+                        help='Directories (or *_trades.csv files) holding <name>_{MT5Report,trades,signals}.csv')
+    parser.add_argument('--mt5', type=Path, help='MT5 report CSV (single pass)')
+    parser.add_argument('--trades', type=Path, help='EA trades CSV (single pass)')
+    parser.add_argument('--signals', type=Path, help='EA signals CSV (single pass)')
+    parser.add_argument('--out-dir', type=Path, default=None, help='Output directory (default: next to the inputs)')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true', help='Re-join passes whose output is up to date')
+    parser.add_argument('--broker-utc-offset', type=float, default=DEFAULT_BROKER.utc_offset_hours,
+                        help='Trade server standard UTC offset in hours (default: %(default)s)')
+    parser.add_argument('--broker-dst', choices=['us', 'eu', 'none'], default=DEFAULT_BROKER.dst,
+                        help='Trade server DST rule (default: %(default)s)')
+    args = parser.parse_args()
+    broker = BrokerClock(args.broker_utc_offset, args.broker_dst)
+
+    metrics = PipelineMetrics('trade_join')
+    with metrics.stage('discover') as stage:
+        passes = []
+        if args.mt5 or args.trades or args.signals:
+            if not (args.mt5 and args.trades and args.signals):
+                parser.error('--mt5, --trades and --signals must be given together')
+            name = args.trades.name[:-len(TRADES_SUFFIX)] if args.trades.name.endswith(TRADES_SUFFIX) \
+                else args.trades.stem
+            passes.append(JoinInputs(name, args.mt5, args.trades, args.signals))
+        for path in args.paths:
+            passes.extend(discover_passes(path.parent if path.is_file() else path))
+        stage.rows = len(passes)
+
+    if not passes:
+        print("❌ No MT5 report / trades / signals triples found")
+        return 1
+
+    print(f"🔗 Joining {len(passes)} pass(es)")
+    with tracing.span('trade_join.batch', passes=len(passes)):
+        results = join_all(passes, args.out_dir, args.workers, args.force, metrics, broker)
+
+    failed = 0
+    for result in results:
+        if result['status'] == 'failed':
+            failed += 1
+            print(f"  ❌ {result['name']}: {result['error']}")
+        elif result['status'] == 'up to date':
+            print(f"  ✓ {result['name']}: up to date ({Path(result['output']).name})")
+        else:
+            stats = result['statistics']
+            print(f"  ✅ {result['name']}: {stats['pairedTrades']} trades, "
+                  f"EA matched {stats['eaTradesMatched']}, signals matched {stats['eaSignalsMatched']}, "
+                  f"profit match {stats['profitReconciliation']['matchPercent']}% -> {result['output']}")
+    metrics.export()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'trade_join'))
@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""
+Trade Model
+===========
+Trains a trade-outcome model (P(win) from the signal at entry) and exports
+it as the `tp-signal-model` artifact the backend serves on POST
+/api/v1/score (backend/app/services/scoring.py), filling the EA's
+AIEntryConfidence column.
+
+Pipeline:
+
+    load      EA trades CSVs (EXIT rows; physics from Entry_* columns, or from
+              the sibling *_signals.csv for EA versions that did not copy them),
+              trade_join.py output (.arrow / .json) or merged signal/trade CSVs
+    features  one canonical frame per dataset, vectorized column by column:
+              entry physics + slopes, Spread, Direction, Hour / DayOfWeek,
+              Zone / Regime / TradingSession; the `exit` set adds the decay
+              columns and ZoneTransitioned (exit-time features, for
+              AIExitPrediction-style models only)
+    cache     the frame is stored as Arrow under .cache/features/, keyed by a
+              hash of the sources and the feature definitions, so retraining
+              after a backtest skips the CSV parsing and joins
+    encode    numeric columns filled (median) and standardized, categoricals
+              one-hot; the encoding travels in the artifact
+    fit       L2 logistic regression (Newton) or histogram gradient-boosted
+              trees, NumPy only; the last `holdout` share of trades by open
+              time is scored, not trained on
+    export    <out-dir>/<kind>-<version>.json, written atomically so a backend
+              watching the directory swaps it in
+
+Incremental updates (`--warm-start previous.json`) keep the previous encoding
+and train only on trades after the previous model's last trade (it records
+that trade's open time and how many trained trades share it, so trades
+opening at the same time but not yet seen are kept): the
+logistic model is refitted with its L2 penalty centred on the previous
+coefficients, the tree model gains further trees boosted from the previous
+ensemble's margins.
+
+Usage:
+    from trade_model import build_dataset, train
+
+    data = build_dataset(['X_trades.csv'])
+    model = train(data, kind='gbdt')
+    model.predict_proba(data.frame)
+    model.export('models/')
+
+    python trade_model.py MQL5/Forward_Trading/*_trades.csv --kind logistic --out-dir models/
+    python trade_model.py new_trades.csv --warm-start models/gbdt-20261019T120000Z-ab12cd34.json --out-dir models/
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from cli_profiling import run_cli
+from pipeline_metrics import PipelineMetrics
+from processed_dataset_cache import load_processed_dataset, pa, source_hash
+from trade_join import SIGNALS_SUFFIX, TRADES_SUFFIX, match_signals, read_ea_signals, read_ea_trades
+
+try:  # optional: Arrow feature cache
+    import pyarrow.feather as feather
+except ImportError:  # pragma: no cover
+    feather = None
+
+MODEL_FORMAT = 'tp-signal-model'
+MODEL_FORMAT_VERSION = 1
+MODEL_KINDS = ('logistic', 'gbdt')
+FEATURE_VERSION = '1'
+FEATURE_CACHE_DIR = Path('.cache') / 'features'
+
+PHYSICS = ['Quality', 'Confluence', 'Momentum', 'Speed', 'Acceleration', 'Entropy', 'Jerk', 'PhysicsScore',
+           'SpeedSlope', 'AccelerationSlope', 'MomentumSlope', 'ConfluenceSlope', 'JerkSlope', 'Spread']
+ENTRY_NUMERIC = PHYSICS + ['Direction', 'Hour', 'DayOfWeek']
+ENTRY_CATEGORICAL = ['Zone', 'Regime', 'TradingSession']
+DECAY = ['PhysicsScoreDecay', 'SpeedDecay', 'SpeedSlopeDecay', 'ConfluenceDecay', 'ZoneTransitioned']
+FEATURE_SETS = {
+    'entry': (ENTRY_NUMERIC, ENTRY_CATEGORICAL),
+    'exit': (ENTRY_NUMERIC + DECAY, ENTRY_CATEGORICAL),
+}
+
+# Canonical name -> source columns, first present wins (EA trades CSV,
+# trade_join output, merged signal/trade CSVs, signals CSV)
+_PHYSICS_ALIASES = {name: [f'Entry_{name}', f'EA_Entry_{name}', f'Signal_Entry_{name}', f'Entry{name}', name]
+                    for name in PHYSICS + ['Zone', 'Regime']}
+ALIASES = {
+    **_PHYSICS_ALIASES,
+    'Hour': ['EntryHour', 'Hour'],
+    'DayOfWeek': ['EntryDayOfWeek', 'DayOfWeek'],
+    'TradingSession': ['TradingSession'],
+    **{name: [name, f'EA_{name}'] for name in DECAY},
+    'Symbol': ['Symbol', 'Symbol_trade', 'EA_Entry_Symbol', 'OUT_Symbol'],
+    'OpenTime': ['OpenTime', 'IN_MT_MASTER_DATE_TIME'],
+    'Profit': ['Profit', 'EA_Profit', 'OUT_Profit_OP_01'],
+}
+DIRECTION_COLUMNS = ['Type', 'IN_Order_Type_OP_01', 'Trade_Direction', 'SignalType']
+TEXT_FEATURES = set(ENTRY_CATEGORICAL)
+
+
+# --------------------------------- Loading ---------------------------------- #
+
+def _first(df: pd.DataFrame, candidates: Sequence[str]) -> Optional[pd.Series]:
+    for column in candidates:
+        if column in df:
+            return df[column]
+    return None
+
+
+def _direction(df: pd.DataFrame) -> pd.Series:
+    """+1 for buys, -1 for sells, NaN when unknown (the signals CSV's Signal convention)."""
+    column = _first(df, DIRECTION_COLUMNS)
+    if column is None:
+        if 'Signal' in df:
+            return pd.to_numeric(df['Signal'], errors='coerce').clip(-1, 1)
+        return pd.Series(np.nan, index=df.index)
+    text = column.astype('string').str.strip().str.lower()
+    return pd.Series(np.select([text.str.startswith(('buy', 'long')).fillna(False),
+                                text.str.startswith(('sell', 'short')).fillna(False)], [1.0, -1.0], np.nan),
+                     index=df.index)
+
+
+def canonical_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Canonical feature columns (every FEATURE_SETS name), Symbol, OpenTime, Profit and Win."""
+    out = {}
+    for name, candidates in ALIASES.items():
+        column = _first(df, candidates)
+        if column is None:
+            text = name in TEXT_FEATURES or name == 'Symbol'
+            out[name] = pd.Series(pd.NA if text else np.nan, index=df.index, dtype='string' if text else 'float64')
+        elif name in TEXT_FEATURES or name == 'Symbol':
+            out[name] = column.astype('string').str.strip().str.upper().replace('', pd.NA)
+        elif name == 'OpenTime':
+            out[name] = pd.to_datetime(column, errors='coerce', format='mixed') if column.dtype == object else column
+        elif column.dtype == bool or str(column.dtype) == 'boolean':
+            out[name] = column.astype('float64')
+        else:
+            numeric = column if pd.api.types.is_numeric_dtype(column) else pd.to_numeric(
+                column.astype('string').str.strip().replace({'true': '1', 'false': '0', 'TRUE': '1', 'FALSE': '0'}),
+                errors='coerce')
+            out[name] = numeric.astype('float64')
+    out['Direction'] = _direction(df)
+    frame = pd.DataFrame(out, index=df.index)
+    frame['Win'] = np.where(frame['Profit'].isna(), np.nan, (frame['Profit'] > 0).astype('float64'))
+    return frame.reset_index(drop=True)
+
+
+def _signals_for(path: Path) -> Optional[Path]:
+    if path.name.endswith(TRADES_SUFFIX):
+        candidate = path.with_name(path.name[:-len(TRADES_SUFFIX)] + SIGNALS_SUFFIX)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+def _ea_trades_frame(path: Path) -> pd.DataFrame:
+    """EXIT rows of an EA trades CSV; physics the CSV lacks come from the sibling signals CSV."""
+    ea = read_ea_trades(path)
+    exits = ea[ea['RowType'] == 'EXIT'].reset_index(drop=True)
+    frame = canonical_frame(exits)
+    signals_path = _signals_for(path)
+    missing = [name for name in PHYSICS + ['Zone', 'Regime'] if frame[name].isna().all()]
+    if signals_path is None or not missing or exits.empty:
+        return frame
+    signals = read_ea_signals(signals_path)
+    positions, _ = match_signals(frame['Symbol'], frame['OpenTime'], (frame['Direction'] > 0).to_numpy(), signals)
+    matched = positions >= 0
+    for name in missing:
+        if name in signals:
+            values = signals[name].to_numpy()[np.maximum(positions, 0)]
+            column = pd.Series(values).where(matched)
+            frame[name] = (column.astype('string').str.upper() if name in TEXT_FEATURES
+                           else pd.to_numeric(column, errors='coerce'))
+    return frame
+
+
+def load_frame(path) -> pd.DataFrame:
+    """Canonical frame of one source file."""
+    path = Path(path)
+    if path.suffix in ('.arrow', '.json', '.ndjson'):
+        return canonical_frame(load_processed_dataset(path).trades)
+    header = pd.read_csv(path, nrows=0, encoding='utf-8-sig').columns.str.strip()
+    if 'RowType' in header:
+        return _ea_trades_frame(path)
+    return canonical_frame(pd.read_csv(path, encoding='utf-8-sig', low_memory=False))
+
+
+@dataclass
+class Dataset:
+    """Canonical frame of all sources (rows with a known outcome, by open time) and its hash."""
+    frame: pd.DataFrame
+    digest: str
+    sources: List[str] = field(default_factory=list)
+    from_cache: bool = False
+
+
+def dataset_hash(paths: Sequence[Path]) -> str:
+    """Hash of the source contents (plus signal siblings) and the feature definitions."""
+    digest = hashlib.sha256(f"features-v{FEATURE_VERSION}".encode())
+    digest.update(json.dumps({'aliases': ALIASES, 'sets': FEATURE_SETS}, sort_keys=True).encode())
+    for path in paths:
+        for source in (path, _signals_for(path)):
+            if source is not None:
+                digest.update(source.name.encode())
+                digest.update(source_hash(source).encode())
+    return digest.hexdigest()
+
+
+def build_dataset(paths: Sequence, use_cache: bool = True, cache_dir: Optional[Path] = None,
+                  metrics: Optional[PipelineMetrics] = None) -> Dataset:
+    """Canonical frame of the sources, from the feature cache when it holds this dataset."""
+    metrics = metrics or PipelineMetrics('trade_model')
+    paths = [Path(p) for p in paths]
+    with metrics.stage('discover', rows=len(paths)):
+        digest = dataset_hash(paths)
+    cache_path = (cache_dir or paths[0].parent / FEATURE_CACHE_DIR) / f"{digest[:16]}.arrow"
+    if use_cache and feather is not None and cache_path.exists():
+        with metrics.stage('load') as stage:
+            frame = feather.read_table(cache_path, memory_map=True).to_pandas()
+            stage.rows = len(frame)
+        return Dataset(frame, digest, [str(p) for p in paths], from_cache=True)
+
+    with metrics.stage('load') as stage:
+        frames = [load_frame(path) for path in paths]
+        stage.rows = sum(len(f) for f in frames)
+    with metrics.stage('join') as stage:
+        frame = pd.concat(frames, ignore_index=True) if frames else canonical_frame(pd.DataFrame())
+        frame = frame[frame['Win'].notna()].sort_values('OpenTime', kind='stable').reset_index(drop=True)
+        stage.rows = len(frame)
+    if use_cache and feather is not None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix(f'.tmp{os.getpid()}')
+            feather.write_feather(pa.Table.from_pandas(frame, preserve_index=False), tmp_path,
+                                  compression='uncompressed')
+            os.replace(tmp_path, cache_path)
+        except (OSError, pa.ArrowException) as e:
+            print(f"⚠️  Could not write feature cache: {e}")
+    return Dataset(frame, digest, [str(p) for p in paths])
+
+
+# --------------------------------- Encoding --------------------------------- #
+
+def fit_encoding(frame: pd.DataFrame, feature_set: str = 'entry', min_level_count: int = 5) -> List[Dict]:
+    """Artifact feature specs: fill / center / scale per numeric column, levels per categorical."""
+    numeric, categorical = FEATURE_SETS[feature_set]
+    specs = []
+    for name in numeric:
+        values = frame[name].to_numpy('float64', na_value=np.nan)
+        if np.isnan(values).all():
+            continue
+        fill = float(np.nanmedian(values))
+        filled = np.where(np.isnan(values), fill, values)
+        scale = float(filled.std())
+        specs.append({'name': name, 'type': 'numeric', 'fill': fill, 'center': float(filled.mean()),
+                      'scale': scale if scale > 0 else 1.0})
+    for name in categorical:
+        counts = frame[name].value_counts(dropna=True)
+        levels = sorted(str(level) for level in counts[counts >= min_level_count].index)
+        if levels:
+            specs.append({'name': name, 'type': 'categorical', 'levels': levels})
+    return specs
+
+
+def encode(frame: pd.DataFrame, specs: Sequence[Dict]) -> np.ndarray:
+    """Encoded matrix (numeric columns, then one column per categorical level), as the backend encodes."""
+    numeric = [s for s in specs if s['type'] == 'numeric']
+    categorical = [s for s in specs if s['type'] == 'categorical']
+    width = len(numeric) + sum(len(s['levels']) for s in categorical)
+    matrix = np.zeros((len(frame), width))
+    for column, spec in enumerate(numeric):
+        values = frame[spec['name']].to_numpy('float64', na_value=np.nan) if spec['name'] in frame \
+            else np.full(len(frame), np.nan)
+        matrix[:, column] = (np.where(np.isnan(values), spec['fill'], values) - spec['center']) / spec['scale']
+    column = len(numeric)
+    for spec in categorical:
+        values = frame[spec['name']].astype('string').str.upper() if spec['name'] in frame else None
+        for level in spec['levels']:
+            if values is not None:
+                matrix[:, column] = (values == level.upper()).fillna(False).to_numpy(bool)
+            column += 1
+    return matrix
+
+
+# ---------------------------------- Models ---------------------------------- #
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    with np.errstate(over='ignore'):
+        return 1.0 / (1.0 + np.exp(-z))
+
+
+def fit_logistic(X: np.ndarray, y: np.ndarray, l2: float = 1.0, prior: Optional[np.ndarray] = None,
+                 max_iter: int = 50, tol: float = 1e-8) -> np.ndarray:
+    """
+    [intercept, coef...] of an L2-penalized logistic regression by Newton's
+    method. The penalty pulls the coefficients towards `prior` (an earlier
+    model's, for incremental updates) instead of zero; the intercept is free.
+    """
+    n, d = X.shape
+    design = np.hstack([np.ones((n, 1)), X])
+    prior = np.zeros(d + 1) if prior is None else np.asarray(prior, dtype=float)
+    penalty = np.full(d + 1, l2)
+    penalty[0] = 0.0
+    w = prior.copy()
+    for _ in range(max_iter):
+        p = _sigmoid(design @ w)
+        gradient = design.T @ (p - y) + penalty * (w - prior)
+        hessian = (design * (p * (1 - p))[:, None]).T @ design + np.diag(penalty + 1e-9)
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.abs(step).max() < tol:
+            break
+    return w
+
+
+@dataclass
+class TreeEnsemble:
+    """Flat-array regression trees (artifact layout; children after parents, leaves have feature -1)."""
+    trees: List[Dict[str, list]] = field(default_factory=list)
+
+    def margin(self, X: np.ndarray) -> np.ndarray:
+        total = np.zeros(len(X))
+        rows = np.arange(len(X))
+        for tree in self.trees:
+            feature, threshold = np.asarray(tree['feature']), np.asarray(tree['threshold'])
+            left, right, value = np.asarray(tree['left']), np.asarray(tree['right']), np.asarray(tree['value'])
+            node = np.zeros(len(X), dtype=np.int64)
+            inner = feature[node] >= 0
+            while inner.any():
+                at = node[inner]
+                node[inner] = np.where(X[rows[inner], feature[at]] <= threshold[at], left[at], right[at])
+                inner = feature[node] >= 0
+            total += value[node]
+        return total
+
+
+def _bin_edges(X: np.ndarray, max_bins: int) -> List[np.ndarray]:
+    """Candidate thresholds per column: distinct quantiles (a split sends x <= edge left)."""
+    quantiles = np.linspace(0, 1, max_bins + 1)[1:-1]
+    return [np.unique(np.quantile(column, quantiles)) for column in X.T]
+
+
+def _histograms(cells: np.ndarray, slot: np.ndarray, rows: Optional[np.ndarray], grad: np.ndarray,
+                hess: np.ndarray, nodes: int, width: int):
+    """
+    (gradient, hessian) sums per (node, feature, bin) over `rows` (None: all
+    rows, in the root), each a (nodes, features, bins) array.
+    """
+    if rows is None:
+        rows, index = slice(None), cells.ravel()
+    else:
+        index = (cells[rows] + (slot[rows] * cells.shape[1] * width)[:, None]).ravel()
+    size = nodes * cells.shape[1] * width
+    shape = (nodes, cells.shape[1], width)
+    return (np.bincount(index, weights=np.repeat(grad[rows], cells.shape[1]), minlength=size).reshape(shape),
+            np.bincount(index, weights=np.repeat(hess[rows], cells.shape[1]), minlength=size).reshape(shape))
+
+
+def _grow_tree(bins: np.ndarray, cells: np.ndarray, edges: List[np.ndarray], grad: np.ndarray, hess: np.ndarray,
+               depth: int, l2: float, min_child_weight: float, learning_rate: float) -> Dict[str, list]:
+    """
+    One tree, grown level by level. The gradient / hessian histograms of
+    every (node, feature, bin) of a level come from one bincount over the
+    rows of the smaller child of each split; the larger child's are the
+    parent's minus its sibling's. Split gains come from cumulative sums.
+    """
+    n, n_features = bins.shape
+    width = max((len(e) for e in edges), default=0) + 1
+    tree = {'feature': [-1], 'threshold': [0.0], 'left': [-1], 'right': [-1], 'value': [0.0]}
+    level_nodes = np.zeros(1, dtype=np.int64)   # tree node id of each node of the current level
+    slot = np.zeros(n, dtype=np.int64)          # each row's position in level_nodes (-1: in a leaf)
+    g_hist, h_hist = _histograms(cells, slot, None, grad, hess, 1, width)
+
+    for level in range(depth + 1):
+        k = len(level_nodes)
+        g_total, h_total = g_hist[:, 0, :].sum(axis=1), h_hist[:, 0, :].sum(axis=1)
+        split = np.zeros(k, dtype=bool)
+        if level < depth:
+            g_left, h_left = np.cumsum(g_hist, axis=2), np.cumsum(h_hist, axis=2)
+            g_right, h_right = g_total[:, None, None] - g_left, h_total[:, None, None] - h_left
+            gain = (g_left ** 2 / (h_left + l2) + g_right ** 2 / (h_right + l2)
+                    - (g_total ** 2 / (h_total + l2))[:, None, None])
+            gain[(h_left < min_child_weight) | (h_right < min_child_weight)] = -np.inf
+            best = gain.reshape(k, -1).argmax(axis=1)
+            split = gain.reshape(k, -1)[np.arange(k), best] > 1e-12
+        for i in np.flatnonzero(~split):
+            tree['value'][level_nodes[i]] = float(-g_total[i] / (h_total[i] + l2) * learning_rate)
+        if not split.any():
+            break
+
+        # Children of the splitting nodes, as consecutive (left, right) pairs
+        parents = np.flatnonzero(split)
+        split_feature, split_bin = np.divmod(best[parents], width)
+        first_child = len(tree['feature'])
+        children = first_child + np.arange(2 * len(parents))
+        for node, feature, bin_index, left_id in zip(level_nodes[parents], split_feature, split_bin, children[::2]):
+            tree['feature'][node] = int(feature)
+            tree['threshold'][node] = float(edges[feature][bin_index])
+            tree['left'][node], tree['right'][node] = int(left_id), int(left_id + 1)
+        tree['feature'] += [-1] * len(children)
+        tree['left'] += [-1] * len(children)
+        tree['right'] += [-1] * len(children)
+        tree['threshold'] += [0.0] * len(children)
+        tree['value'] += [0.0] * len(children)
+
+        # Route rows: new slot = 2 * (rank of the parent among the splits) + went right
+        rank = np.full(k, -1, dtype=np.int64)
+        rank[parents] = np.arange(len(parents))
+        rows = np.flatnonzero(slot >= 0)
+        rows = rows[rank[slot[rows]] >= 0]
+        row_rank = rank[slot[rows]]
+        went_right = bins[rows, split_feature[row_rank]] > split_bin[row_rank]
+        slot = np.full(n, -1, dtype=np.int64)
+        slot[rows] = 2 * row_rank + went_right
+
+        counts = np.bincount(slot[rows], minlength=len(children))
+        small = np.zeros(len(children), dtype=bool)
+        left_smaller = counts[::2] <= counts[1::2]
+        small[::2], small[1::2] = left_smaller, ~left_smaller
+        small_rows = rows[small[slot[rows]]]
+        g_next, h_next = _histograms(cells, slot, small_rows, grad, hess, len(children), width)
+        large = np.flatnonzero(~small)
+        g_next[large] = g_hist[parents[large // 2]] - g_next[large ^ 1]
+        h_next[large] = h_hist[parents[large // 2]] - h_next[large ^ 1]
+        level_nodes, g_hist, h_hist = children, g_next, h_next
+    return tree
+
+
+def fit_gbdt(X: np.ndarray, y: np.ndarray, trees: int = 100, depth: int = 3, learning_rate: float = 0.1,
+             l2: float = 1.0, min_child_weight: float = 5.0, max_bins: int = 32,
+             base_margin: Optional[np.ndarray] = None, ensemble: Optional[TreeEnsemble] = None) -> TreeEnsemble:
+    """Gradient-boosted trees on log loss; with `ensemble`/`base_margin` the boosting continues from them."""
+    ensemble = ensemble or TreeEnsemble()
+    edges = _bin_edges(X, max_bins)
+    width = max((len(e) for e in edges), default=0) + 1
+    bins = np.column_stack([np.searchsorted(e, column, side='left') for e, column in zip(edges, X.T)]) \
+        if X.shape[1] else np.zeros((len(X), 0), dtype=np.int64)
+    cells = bins + np.arange(X.shape[1]) * width  # flat (feature, bin) index of every value
+    margin = np.zeros(len(X)) if base_margin is None else base_margin.astype(float).copy()
+    for _ in range(trees):
+        p = _sigmoid(margin)
+        tree = _grow_tree(bins, cells, edges, p - y, p * (1 - p), depth, l2, min_child_weight, learning_rate)
+        ensemble.trees.append(tree)
+        margin += TreeEnsemble([tree]).margin(X)
+    return ensemble
+
+
+def _logit(p: float) -> float:
+    p = min(max(p, 1e-6), 1 - 1e-6)
+    return float(np.log(p / (1 - p)))
+
+
+# -------------------------------- Evaluation -------------------------------- #
+
+def auc(y: np.ndarray, p: np.ndarray) -> float:
+    """ROC AUC via the rank-sum statistic (ties averaged)."""
+    positives = int(y.sum())
+    negatives = len(y) - positives
+    if not positives or not negatives:
+        return float('nan')
+    ranks = pd.Series(p).rank(method='average').to_numpy()
+    return float((ranks[y == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def evaluate(y: np.ndarray, p: np.ndarray) -> Dict[str, float]:
+    if not len(y):
+        return {'trades': 0}
+    clipped = np.clip(p, 1e-12, 1 - 1e-12)
+    return {
+        'trades': int(len(y)),
+        'win_rate': float(y.mean()),
+        'auc': auc(y, p),
+        'log_loss': float(-np.mean(y * np.log(clipped) + (1 - y) * np.log(1 - clipped))),
+        'brier': float(np.mean((p - y) ** 2)),
+        'accuracy': float(np.mean((p >= 0.5) == (y == 1))),
+    }
+
+
+# ------------------------------ Model artifact ------------------------------ #
+
+@dataclass
+class TradeModel:
+    """A trained model with its encoding; `to_artifact` gives the backend's JSON layout."""
+    kind: str
+    features: List[Dict]
+    feature_set: str = 'entry'
+    intercept: float = 0.0
+    coef: Optional[np.ndarray] = None
+    ensemble: Optional[TreeEnsemble] = None
+    metadata: Dict = field(default_factory=dict)
+    version: str = ''
+
+    def margin(self, X: np.ndarray) -> np.ndarray:
+        if self.kind == 'logistic':
+            return self.intercept + X @ self.coef
+        return self.intercept + self.ensemble.margin(X)
+
+    def predict_proba(self, frame: pd.DataFrame) -> np.ndarray:
+        """Win probability per row of a canonical frame (canonical_frame / Dataset.frame)."""
+        return _sigmoid(self.margin(encode(frame, self.features)))
+
+    def score(self, signal: Dict) -> float:
+        """Win probability of one signal given as {feature name: value}."""
+        return float(self.predict_proba(pd.DataFrame([signal]))[0])
+
+    def to_artifact(self) -> Dict:
+        artifact = {'format': MODEL_FORMAT, 'format_version': MODEL_FORMAT_VERSION, 'version': self.version,
+                    'kind': self.kind, 'features': self.features,
+                    'metadata': {**self.metadata, 'feature_set': self.feature_set}}
+        if self.kind == 'logistic':
+            artifact.update(intercept=float(self.intercept), coef=[float(c) for c in self.coef])
+        else:
+            artifact.update(base_score=float(self.intercept), trees=self.ensemble.trees)
+        return artifact
+
+    def export(self, out_dir) -> Path:
+        """Write `<out_dir>/<version>.json` atomically (tmp file + rename) and return its path."""
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        path = out_dir / f"{self.version}.json"
+        tmp_path = out_dir / f".{path.name}.tmp{os.getpid()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.to_artifact(), f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return path
+
+
+def load_model(path) -> TradeModel:
+    with open(path) as f:
+        spec = json.load(f)
+    if spec.get('format') != MODEL_FORMAT or spec.get('format_version') != MODEL_FORMAT_VERSION:
+        raise ValueError(f"{path} is not a {MODEL_FORMAT} v{MODEL_FORMAT_VERSION} artifact")
+    metadata = dict(spec.get('metadata') or {})
+    kind = spec['kind']
+    return TradeModel(
+        kind=kind, features=spec['features'], feature_set=metadata.pop('feature_set', 'entry'),
+        intercept=float(spec.get('intercept' if kind == 'logistic' else 'base_score', 0.0)),
+        coef=np.asarray(spec['coef']) if kind == 'logistic' else None,
+        ensemble=TreeEnsemble(list(spec['trees'])) if kind == 'gbdt' else None,
+        metadata=metadata, version=spec.get('version', ''),
+    )
+
+
+def _version(model: TradeModel) -> str:
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    body = json.dumps({**model.to_artifact(), 'version': ''}, sort_keys=True).encode()
+    return f"{model.kind}-{stamp}-{hashlib.sha256(body).hexdigest()[:8]}"
+
+
+# --------------------------------- Training --------------------------------- #
+
+def _unseen_trades(frame: pd.DataFrame, metadata: Dict) -> pd.DataFrame:
+    """
+    Trades after a model's last trained trade. Of the trades opening at that
+    same time, the first `last_trade_count` (open-time order is stable) were
+    trained on; artifacts without the count skip them all.
+    """
+    last = metadata.get('last_trade_time')
+    if not last:
+        return frame
+    opened = frame['OpenTime']
+    tied = (opened == pd.Timestamp(last)).to_numpy()
+    seen = metadata.get('last_trade_count', int(tied.sum()))
+    keep = (opened > pd.Timestamp(last)).to_numpy() | (tied & (np.cumsum(tied) > seen))
+    return frame[keep].reset_index(drop=True)
+
+
+def train(data: Dataset, kind: str = 'logistic', feature_set: str = 'entry', holdout: float = 0.2,
+          warm_start: Optional[TradeModel] = None, l2: float = 1.0, trees: int = 100, depth: int = 3,
+          learning_rate: float = 0.1, min_child_weight: float = 5.0,
+          metrics: Optional[PipelineMetrics] = None) -> TradeModel:
+    """
+    Fit a model on `data` (the last `holdout` share of trades by open time is
+    only evaluated). With `warm_start`, its encoding is kept, only trades after
+    its last trade are used, and the fit continues from its parameters.
+    """
+    metrics = metrics or PipelineMetrics('trade_model')
+    frame = data.frame
+    parent = None
+    if warm_start is not None:
+        kind, feature_set, parent = warm_start.kind, warm_start.feature_set, warm_start.version
+        frame = _unseen_trades(frame, warm_start.metadata)
+    if kind not in MODEL_KINDS:
+        raise ValueError(f"Unknown model kind '{kind}' (expected one of {MODEL_KINDS})")
+    if frame.empty:
+        raise ValueError('No trades to train on' + (' after the warm-start model' if warm_start else ''))
+
+    with metrics.stage('parse', rows=len(frame)):
+        features = warm_start.features if warm_start else fit_encoding(frame, feature_set)
+        X = encode(frame, features)
+        y = frame['Win'].to_numpy('float64')
+    cut = len(frame) - int(round(len(frame) * holdout)) if 0 < holdout < 1 else len(frame)
+    if cut < 2:
+        raise ValueError(f"Only {cut} training trade(s) after the holdout split")
+
+    model = TradeModel(kind, features, feature_set)
+    with metrics.stage('aggregate', rows=cut):
+        if kind == 'logistic':
+            prior = np.r_[warm_start.intercept, warm_start.coef] if warm_start else None
+            w = fit_logistic(X[:cut], y[:cut], l2, prior)
+            model.intercept, model.coef = float(w[0]), w[1:]
+        else:
+            if warm_start:
+                model.intercept = warm_start.intercept
+                ensemble = TreeEnsemble(list(warm_start.ensemble.trees))
+                base = warm_start.margin(X[:cut])
+            else:
+                model.intercept = _logit(float(y[:cut].mean()))
+                ensemble, base = None, np.full(cut, model.intercept)
+            model.ensemble = fit_gbdt(X[:cut], y[:cut], trees, depth, learning_rate, l2, min_child_weight,
+                                      base_margin=base, ensemble=ensemble)
+
+    with metrics.stage('render', rows=len(frame)):
+        p = _sigmoid(model.margin(X))
+        trained = int((warm_start.metadata.get('trained_trades', 0) if warm_start else 0) + cut)
+        last_time = frame['OpenTime'].iloc[cut - 1]
+        last_count = int((frame['OpenTime'].iloc[:cut] == last_time).sum()) if pd.notna(last_time) else 0
+        if warm_start and last_time == pd.Timestamp(warm_start.metadata.get('last_trade_time') or pd.NaT):
+            last_count += warm_start.metadata.get('last_trade_count', 0)
+        model.metadata = {
+            'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'dataset_hash': data.digest,
+            'sources': [Path(s).name for s in data.sources],
+            'trained_trades': trained,
+            'last_trade_time': str(last_time) if pd.notna(last_time) else None,
+            'last_trade_count': last_count,
+            'parent_version': parent,
+            'params': {'l2': l2} if kind == 'logistic' else {'l2': l2, 'depth': depth, 'learning_rate':
+                                                             learning_rate, 'min_child_weight': min_child_weight,
+                                                             'trees': len(model.ensemble.trees)},
+            'train': evaluate(y[:cut], p[:cut]),
+            'holdout': evaluate(y[cut:], p[cut:]),
+        }
+        model.version = _version(model)
+    return model
+
+
+# ----------------------------------- CLI ------------------------------------ #
+
+def _format_scores(name: str, scores: Dict) -> str:
+    if not scores.get('trades'):
+        return f"   {name:<8} -"
+    return (f"   {name:<8} {scores['trades']:>6,} trades  win {scores['win_rate']:.1%}  AUC {scores['auc']:.3f}  "
+            f"log loss {scores['log_loss']:.4f}  Brier {scores['brier']:.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Train a trade-outcome model and export a scoring artifact')
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='EA trades CSVs (signals CSV picked up alongside), joined .arrow/.json, merged CSVs')
+    parser.add_argument('--kind', choices=MODEL_KINDS, default='logistic', help='Model type (default: logistic)')
+    parser.add_argument('--features', choices=sorted(FEATURE_SETS), default='entry',
+                        help='Feature set: entry (signal at entry) or exit (adds decay columns)')
+    parser.add_argument('--warm-start', type=Path, default=None,
+                        help='Previous artifact: update it with the trades after its last trade')
+    parser.add_argument('--holdout', type=float, default=0.2,
+                        help='Share of the latest trades held out for evaluation (default: %(default)s)')
+    parser.add_argument('--l2', type=float, default=1.0, help='L2 penalty (default: %(default)s)')
+    parser.add_argument('--trees', type=int, default=100, help='Trees to add (gbdt, default: %(default)s)')
+    parser.add_argument('--depth', type=int, default=3, help='Tree depth (gbdt, default: %(default)s)')
+    parser.add_argument('--learning-rate', type=float, default=0.1, help='Shrinkage (gbdt, default: %(default)s)')
+    parser.add_argument('--min-child-weight', type=float, default=5.0,
+                        help='Minimum hessian per leaf (gbdt, default: %(default)s)')
+    parser.add_argument('--out-dir', type=Path, default=Path('models'), help='Artifact directory (default: ./models)')
+    parser.add_argument('--no-cache', action='store_true', help='Rebuild the feature frame from the sources')
+    args = parser.parse_args()
+
+    metrics = PipelineMetrics('trade_model')
+    data = build_dataset(args.inputs, use_cache=not args.no_cache, metrics=metrics)
+    print(f"📊 {len(data.frame):,} trades{' (feature cache)' if data.from_cache else ''}, dataset {data.digest[:12]}")
+    warm_start = load_model(args.warm_start) if args.warm_start else None
+    try:
+        model = train(data, args.kind, args.features, args.holdout, warm_start, args.l2, args.trees, args.depth,
+                      args.learning_rate, args.min_child_weight, metrics)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    with metrics.stage('render'):
+        path = model.export(args.out_dir)
+    print(f"✅ {model.version} ({len(model.features)} features) -> {path}")
+    print(_format_scores('train', model.metadata['train']))
+    print(_format_scores('holdout', model.metadata['holdout']))
+    metrics.export()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(run_cli(main, 'trade_model'))
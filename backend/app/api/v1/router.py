@@ -1,24 +1,27 @@
+import os
+from datetime import datetime, timezone
+from typing import Annotated
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.models.symbol import Symbol
 from app.core.config import settings
-from app.db.session import db_healthcheck
-import os
-from datetime import datetime, timezone
-from app.schemas.symbol import SymbolOut, SymbolCreate, SymbolUpdate
+from app.db.session import db_healthcheck, get_db
+from app.models.symbol import Symbol
+from app.schemas.score import ScoreBatchIn, ScoreBatchOut, ScoreOut, SignalIn
+from app.schemas.symbol import SymbolCreate, SymbolOut, SymbolUpdate
+from app.services.scoring import NoModelError, SignalScorer, get_scorer
 
 router = APIRouter(prefix="/v1")
 
+Scorer = Annotated[SignalScorer, Depends(get_scorer)]
+
+
 @router.get("/symbols")
 async def list_symbols(db: Session = Depends(get_db)):
     # Simple list to validate DB path; production would add pagination
     rows = db.query(Symbol).order_by(Symbol.name.asc()).all()
-    return [
-        {"id": s.id, "name": s.name, "description": s.description}
-        for s in rows
-    ]
+    return [{"id": s.id, "name": s.name, "description": s.description} for s in rows]
 
 
 @router.post("/symbols", response_model=SymbolOut, status_code=201)
@@ -48,7 +51,9 @@ async def update_symbol(symbol_id: int, payload: SymbolUpdate, db: Session = Dep
         raise HTTPException(status_code=404, detail="Not found")
     if payload.name is not None:
         # prevent duplicate names
-        existing = db.query(Symbol).filter(Symbol.name == payload.name, Symbol.id != symbol_id).first()
+        existing = (
+            db.query(Symbol).filter(Symbol.name == payload.name, Symbol.id != symbol_id).first()
+        )
         if existing:
             raise HTTPException(status_code=409, detail="Symbol name already in use")
         obj.name = payload.name
@@ -70,6 +75,45 @@ async def delete_symbol(symbol_id: int, db: Session = Depends(get_db)):
     return {"status": "deleted"}
 
 
+@router.post("/score", response_model=ScoreOut)
+async def score_signal(payload: SignalIn, scorer: Scorer):
+    # Concurrent requests are micro-batched into one model call (see app.services.scoring)
+    try:
+        probability, version = await scorer.score(payload.model_dump())
+    except NoModelError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "probability": probability,
+        "confidence": round(probability * 100.0, 2),
+        "model_version": version,
+    }
+
+
+@router.post("/score/batch", response_model=ScoreBatchOut)
+def score_signals(payload: ScoreBatchIn, scorer: Scorer):
+    # Plain def: FastAPI runs it in the threadpool, so a large batch does not
+    # hold up single /score requests on the event loop
+    try:
+        probabilities, version = scorer.score_many(
+            [signal.model_dump() for signal in payload.signals]
+        )
+    except NoModelError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    return {
+        "probabilities": probabilities,
+        "confidences": [round(p * 100.0, 2) for p in probabilities],
+        "model_version": version,
+    }
+
+
+@router.get("/score/model")
+async def score_model(scorer: Scorer):
+    try:
+        return scorer.current().info()
+    except NoModelError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
 @router.get("/system/info")
 async def system_info():
     # Derive OTEL status from env + settings (best-effort)
@@ -80,6 +124,7 @@ async def system_info():
     version = "0.1.0"
     try:  # pragma: no cover
         from importlib.metadata import version as _version
+
         version = _version("ai-trading-backend")
     except Exception:
         pass
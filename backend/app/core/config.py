@@ -27,6 +27,12 @@ class Settings(BaseSettings):
     TRADELOCKER_LIVE_URL: Optional[str] = None
     TRADELOCKER_LIVE_ACCOUNT_ID: Optional[str] = None
 
+    # Signal scoring (POST /api/v1/score): model artifact file, or a directory
+    # whose newest *.json is served; polled for hot swaps
+    SCORE_MODEL_PATH: str | None = None
+    SCORE_MODEL_POLL_SECONDS: float = 2.0
+    SCORE_MAX_BATCH: int = 256
+
     # Observability
     OTEL_EXPORTER_OTLP_ENDPOINT: Optional[AnyUrl] = None
 
@@ -0,0 +1,100 @@
+"""OpenTelemetry setup shared by the API and the jobs it launches.
+
+The analytics/ingestion scripts configure the same OTLP exporter from the same
+environment (see analytics/tracing.py). Jobs started from a request inherit the
+request's trace through the TRACEPARENT/TRACESTATE environment variables, so a
+slow ingest shows up as one trace from the HTTP call down to its worker spans.
+"""
+
+import logging
+import os
+import sys
+from collections.abc import Mapping
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ENV_CARRIER_KEYS = {"traceparent": "TRACEPARENT", "tracestate": "TRACESTATE"}
+
+
+def otel_disabled() -> bool:
+    """OTEL off: no endpoint, OTEL_SDK_DISABLED set, or running under pytest."""
+    disabled_env = os.getenv("OTEL_SDK_DISABLED", "").lower() in ("1", "true", "yes")
+    running_pytest = ("PYTEST_CURRENT_TEST" in os.environ) or ("pytest" in sys.modules)
+    return not settings.OTEL_EXPORTER_OTLP_ENDPOINT or disabled_env or running_pytest
+
+
+def setup_tracing(app, engine=None, service_name: str = "ai-trading-backend") -> bool:
+    """Install the tracer provider and instrument FastAPI (and the DB engine if given)."""
+    if otel_disabled():
+        return False
+    try:  # best-effort; do not crash app if OTEL not available
+        from opentelemetry import trace
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+        from opentelemetry.instrumentation.logging import LoggingInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor
+    except ImportError as e:  # pragma: no cover - OTEL packages are optional
+        logger.warning(f"OpenTelemetry not available: {e}")
+        return False
+
+    try:  # a bad endpoint or instrumentation failure must not fail the app
+        resource = Resource.create({"service.name": service_name})
+        provider = TracerProvider(resource=resource)
+        span_exporter = OTLPSpanExporter(endpoint=str(settings.OTEL_EXPORTER_OTLP_ENDPOINT))
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        trace.set_tracer_provider(provider)
+
+        FastAPIInstrumentor.instrument_app(app)
+        LoggingInstrumentor().instrument(set_logging_format=True)
+    except (RuntimeError, TypeError, ValueError) as e:  # pragma: no cover
+        logger.warning(f"Failed to initialize OpenTelemetry: {e}")
+        return False
+
+    if engine is not None:
+        instrument_db(engine)
+    logger.info("OpenTelemetry instrumentation enabled")
+    return True
+
+
+def instrument_db(engine) -> bool:
+    """Spans for SQL statements (DB writes included) on the given SQLAlchemy engine."""
+    try:
+        from opentelemetry.instrumentation.sqlalchemy import SQLAlchemyInstrumentor
+    except ImportError as e:  # pragma: no cover - optional instrumentation
+        logger.warning(f"SQLAlchemy tracing disabled: {e}")
+        return False
+    try:
+        SQLAlchemyInstrumentor().instrument(engine=engine)
+    except (RuntimeError, TypeError, ValueError) as e:  # pragma: no cover
+        logger.warning(f"SQLAlchemy tracing disabled: {e}")
+        return False
+    return True
+
+
+def trace_carrier() -> dict[str, str]:
+    """W3C trace context of the current span (empty when there is none)."""
+    carrier: dict[str, str] = {}
+    try:
+        from opentelemetry.propagate import inject
+
+        inject(carrier)
+    except ImportError:  # pragma: no cover
+        pass
+    return carrier
+
+
+def job_environment(environ: Mapping[str, str] | None = None) -> dict[str, str]:
+    """Environment for a job subprocess, carrying the current trace context.
+
+    Pass to subprocess (env=job_environment()) when launching analytics or
+    ingestion scripts; their spans become children of the current request.
+    """
+    env = dict(os.environ if environ is None else environ)
+    for key, value in trace_carrier().items():
+        if key in ENV_CARRIER_KEYS:
+            env[ENV_CARRIER_KEYS[key]] = value
+    return env
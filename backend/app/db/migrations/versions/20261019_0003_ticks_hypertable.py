@@ -0,0 +1,55 @@
+"""ticks hypertable with compression
+
+Revision ID: 20261019_0003
+Revises: 20250809_0002
+Create Date: 2026-10-19 00:00:00.000000
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "20261019_0003"
+down_revision: str | None = "20250809_0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # No surrogate key or unique constraint: ticks are bulk-loaded with COPY, a
+    # day at a time (re-imports replace the day), and can repeat a timestamp.
+    op.create_table(
+        "ticks",
+        sa.Column("symbol_id", sa.Integer(), nullable=False),
+        sa.Column("ts", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("bid", sa.Float(), nullable=True),
+        sa.Column("ask", sa.Float(), nullable=True),
+        sa.Column("last", sa.Float(), nullable=True),
+        sa.Column("volume", sa.Float(), nullable=True),
+        sa.Column("flags", sa.SmallInteger(), nullable=True),
+        sa.ForeignKeyConstraint(["symbol_id"], ["symbols.id"], ondelete="CASCADE"),
+    )
+    op.create_index("ix_ticks_symbol_ts", "ticks", ["symbol_id", sa.text("ts DESC")])
+
+    # Hypertable with daily chunks, compressed per symbol after a week
+    # (TimescaleDB only; plain table otherwise).
+    op.execute("""
+        DO $$
+        BEGIN
+          IF EXISTS (SELECT 1 FROM pg_extension WHERE extname='timescaledb') THEN
+            PERFORM create_hypertable('ticks', 'ts', chunk_time_interval => INTERVAL '1 day',
+                                      if_not_exists => TRUE);
+            ALTER TABLE ticks SET (timescaledb.compress,
+                                   timescaledb.compress_segmentby = 'symbol_id',
+                                   timescaledb.compress_orderby = 'ts');
+            PERFORM add_compression_policy('ticks', INTERVAL '7 days', if_not_exists => TRUE);
+          END IF;
+        END$$;
+        """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ticks_symbol_ts", table_name="ticks")
+    op.drop_table("ticks")
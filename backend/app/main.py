@@ -1,15 +1,19 @@
-from fastapi import FastAPI
-from starlette.responses import Response
-from prometheus_client import CONTENT_TYPE_LATEST, generate_latest, REGISTRY
 import logging
-import sys
 import os
+import sys
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+from starlette.responses import Response
 
-from app.core.config import settings
-from app.db.session import db_healthcheck, engine
 from app.api.v1.router import router as api_v1_router
+from app.core.config import settings
+from app.core.telemetry import setup_tracing
 from app.db.base import Base
-from fastapi.middleware.cors import CORSMiddleware
+from app.db.session import db_healthcheck, engine
+from app.services.scoring import get_scorer
 
 # Structured logging
 handler = logging.StreamHandler(sys.stdout)
@@ -20,7 +24,21 @@ root.setLevel(logging.INFO)
 root.handlers.clear()
 root.addHandler(handler)
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Hot-swap the scoring model while the server runs (not when the app is only imported, e.g. by tests)
+    store = get_scorer().store if settings.SCORE_MODEL_PATH else None
+    if store is not None:
+        store.start()
+    try:
+        yield
+    finally:
+        if store is not None:
+            store.stop()
+
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
 # CORS
 if settings.BACKEND_CORS_ORIGINS:
@@ -82,30 +100,4 @@ except Exception as e:  # pragma: no cover
 
 
 # OpenTelemetry instrumentation (enabled only if endpoint configured and not under tests)
-try:  # best-effort; do not crash app if OTEL not available
-    import sys as _sys
-
-    otel_disabled_env = os.getenv("OTEL_SDK_DISABLED", "").lower() in ("1", "true", "yes")
-    running_pytest = ("PYTEST_CURRENT_TEST" in os.environ) or ("pytest" in _sys.modules)
-    if settings.OTEL_EXPORTER_OTLP_ENDPOINT and not otel_disabled_env and not running_pytest:
-        from opentelemetry import trace
-        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
-        from opentelemetry.sdk.resources import Resource
-        from opentelemetry.sdk.trace import TracerProvider
-        from opentelemetry.sdk.trace.export import BatchSpanProcessor
-        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
-        from opentelemetry.instrumentation.logging import LoggingInstrumentor
-
-        resource = Resource.create({"service.name": "ai-trading-backend"})
-        provider = TracerProvider(resource=resource)
-        span_exporter = OTLPSpanExporter(endpoint=str(settings.OTEL_EXPORTER_OTLP_ENDPOINT))
-        span_processor = BatchSpanProcessor(span_exporter)
-        provider.add_span_processor(span_processor)
-        trace.set_tracer_provider(provider)
-
-        FastAPIInstrumentor.instrument_app(app)
-        LoggingInstrumentor().instrument(set_logging_format=True)
-        _OTEL_ENABLED = True
-        logging.getLogger(__name__).info("OpenTelemetry instrumentation enabled")
-except Exception as e:  # pragma: no cover - do not fail app on OTEL issues
-    logging.getLogger(__name__).warning(f"Failed to initialize OpenTelemetry: {e}")
+_OTEL_ENABLED = setup_tracing(app, engine=engine)
@@ -0,0 +1,50 @@
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SignalIn(BaseModel):
+    """A signal's physics vector, named as in the EA's signals CSV.
+
+    Every field is optional (missing features are filled by the model);
+    extra fields are kept so models can use features added later.
+    """
+
+    model_config = ConfigDict(extra="allow")
+
+    Symbol: str | None = None
+    Direction: int | None = None  # 1 = BUY, -1 = SELL (the CSV's Signal column)
+    Quality: float | None = None
+    Confluence: float | None = None
+    Momentum: float | None = None
+    Speed: float | None = None
+    Acceleration: float | None = None
+    Entropy: float | None = None
+    Jerk: float | None = None
+    PhysicsScore: float | None = None
+    SpeedSlope: float | None = None
+    AccelerationSlope: float | None = None
+    MomentumSlope: float | None = None
+    ConfluenceSlope: float | None = None
+    JerkSlope: float | None = None
+    Zone: str | None = None
+    Regime: str | None = None
+    Spread: float | None = None
+    Hour: int | None = None
+    DayOfWeek: int | None = None
+    TradingSession: str | None = None
+    TimeSegment1H: str | None = None
+
+
+class ScoreOut(BaseModel):
+    probability: float  # win probability, 0..1
+    confidence: float  # the same as a percentage (AIEntryConfidence)
+    model_version: str
+
+
+class ScoreBatchIn(BaseModel):
+    signals: list[SignalIn] = Field(..., min_length=1, max_length=10000)
+
+
+class ScoreBatchOut(BaseModel):
+    probabilities: list[float]
+    confidences: list[float]
+    model_version: str
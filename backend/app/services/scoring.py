@@ -0,0 +1,512 @@
+"""Signal scoring: win probability for a signal's physics vector.
+
+The model is a JSON artifact (written by analytics/trade_model.py) holding the
+feature encoding and either a logistic model or a gradient-boosted tree
+ensemble:
+
+    {"format": "tp-signal-model", "format_version": 1, "version": "...",
+     "kind": "logistic" | "gbdt",
+     "features": [{"name": "Quality", "type": "numeric", "fill": 72.0, "center": 72.0, "scale": 9.5},
+                  {"name": "Zone", "type": "categorical", "levels": ["BEAR", "BULL", ...]}, ...],
+     "intercept": -0.2, "coef": [...],                        # logistic, one per encoded column
+     "base_score": -0.1, "trees": [{"feature": [...], "threshold": [...],
+                                    "left": [...], "right": [...], "value": [...]}]}   # gbdt
+
+Numeric features are filled when missing and standardized; categorical ones
+are one-hot encoded in `levels` order (unknown levels encode to zeros). Tree
+nodes go left when the encoded value is <= threshold; leaves have feature -1.
+
+A model is compiled once on load into plain Python for single signals (the
+linear terms are folded so a score is a handful of multiply-adds) and NumPy
+arrays for batches. The store swaps the compiled model in with one reference
+assignment, so a request sees either the old or the new model, never a mix.
+A watcher thread polls the configured file (or the newest `*.json` in the
+configured directory) and loads a new model when it appears; a file that
+fails to load is logged and the current model is kept.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from prometheus_client import Histogram
+
+try:  # optional: vectorized batch scoring
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+logger = logging.getLogger(__name__)
+
+MODEL_FORMAT = "tp-signal-model"
+MODEL_FORMAT_VERSION = 1
+MODEL_KINDS = ("logistic", "gbdt")
+# Below this many signals the per-row path beats building arrays
+_VECTOR_MIN_ROWS = 16
+
+INFERENCE_SECONDS = Histogram(
+    "tp_score_inference_seconds",
+    "Model inference time per scored batch",
+    buckets=(25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2.5e-3, 5e-3, 10e-3, 50e-3),
+)
+BATCH_SIZE = Histogram(
+    "tp_score_batch_size",
+    "Signals scored per model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 1024),
+)
+
+
+class ModelError(ValueError):
+    """The model artifact is malformed."""
+
+
+def _sigmoid(z: float) -> float:
+    if z >= 0:
+        return 1.0 / (1.0 + math.exp(-z))
+    e = math.exp(z)
+    return e / (1.0 + e)
+
+
+def _number(value: Any) -> float | None:
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(number) else number
+
+
+@dataclass
+class CompiledModel:
+    """A loaded model; `score` / `score_many` map feature dicts to win probabilities."""
+
+    version: str
+    kind: str
+    features: list[str]
+    source: str = ""
+    metadata: dict[str, Any] = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.time)
+    _numeric: list[tuple[str, float, float, float]] = field(default_factory=list, repr=False)
+    _categorical: list[tuple[str, int, dict[str, int]]] = field(default_factory=list, repr=False)
+    _width: int = 0
+    _intercept: float = 0.0
+    _coef: list[float] = field(default_factory=list, repr=False)
+    _linear: list[tuple[float, float]] = field(default_factory=list, repr=False)
+    _trees: list[tuple[list[int], list[float], list[int], list[int], list[float]]] = field(
+        default_factory=list, repr=False
+    )
+    _arrays: dict[str, Any] | None = field(default=None, repr=False)
+
+    # -- single signal ------------------------------------------------------ #
+
+    def _encode(self, signal: Mapping[str, Any]) -> list[float]:
+        row = [0.0] * self._width
+        for column, (name, fill, center, scale) in enumerate(self._numeric):
+            value = _number(signal.get(name))
+            row[column] = ((fill if value is None else value) - center) / scale
+        for name, _, columns in self._categorical:
+            column = columns.get(str(signal.get(name) or "").upper())
+            if column is not None:
+                row[column] = 1.0
+        return row
+
+    def _margin(self, signal: Mapping[str, Any]) -> float:
+        if self.kind == "logistic":
+            z = self._intercept
+            for (name, fill, _, _), (weight, offset) in zip(self._numeric, self._linear):
+                value = _number(signal.get(name))
+                z += weight * (fill if value is None else value) + offset
+            for name, _, columns in self._categorical:
+                column = columns.get(str(signal.get(name) or "").upper())
+                if column is not None:
+                    z += self._coef[column]
+            return z
+        row = self._encode(signal)
+        z = self._intercept
+        for feature, threshold, left, right, value in self._trees:
+            node = 0
+            while feature[node] >= 0:
+                node = left[node] if row[feature[node]] <= threshold[node] else right[node]
+            z += value[node]
+        return z
+
+    def score(self, signal: Mapping[str, Any]) -> float:
+        return _sigmoid(self._margin(signal))
+
+    # -- batches ------------------------------------------------------------ #
+
+    def score_many(self, signals: Sequence[Mapping[str, Any]]) -> list[float]:
+        if np is None or len(signals) < _VECTOR_MIN_ROWS:
+            return [self.score(signal) for signal in signals]
+        arrays = self._arrays
+        n = len(signals)
+        matrix = np.zeros((n, self._width))
+        for column, (name, fill, center, scale) in enumerate(self._numeric):
+            values = np.array([_number(signal.get(name)) for signal in signals], dtype=float)
+            matrix[:, column] = (np.where(np.isnan(values), fill, values) - center) / scale
+        for name, _, columns in self._categorical:
+            for row, signal in enumerate(signals):
+                column = columns.get(str(signal.get(name) or "").upper())
+                if column is not None:
+                    matrix[row, column] = 1.0
+        if self.kind == "logistic":
+            z = self._intercept + matrix @ arrays["coef"]
+        else:
+            # All trees step together over flat node indices: node[i, t] is where
+            # signal i is in tree t; leaves point to themselves, so `depth` steps
+            # reach every leaf.
+            node = np.tile(arrays["roots"], (n, 1))
+            cells = matrix.ravel()
+            row_offsets = (np.arange(n) * self._width)[:, None]
+            for _ in range(arrays["depth"]):
+                goes_left = (
+                    cells[row_offsets + arrays["feature"][node]] <= arrays["threshold"][node]
+                )
+                node = np.where(goes_left, arrays["left"][node], arrays["right"][node])
+            z = self._intercept + arrays["value"][node].sum(axis=1)
+        with np.errstate(over="ignore"):
+            return (1.0 / (1.0 + np.exp(-z))).tolist()
+
+    def info(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "kind": self.kind,
+            "features": self.features,
+            "source": self.source,
+            "loaded_at": self.loaded_at,
+            "metadata": self.metadata,
+        }
+
+
+def compile_model(spec: Mapping[str, Any], source: str = "") -> CompiledModel:
+    """Validate a model artifact and compile it for scoring."""
+    if spec.get("format") != MODEL_FORMAT or spec.get("format_version") != MODEL_FORMAT_VERSION:
+        raise ModelError(f"not a {MODEL_FORMAT} v{MODEL_FORMAT_VERSION} artifact")
+    kind = spec.get("kind")
+    if kind not in MODEL_KINDS:
+        raise ModelError(f"unknown model kind {kind!r} (expected one of {MODEL_KINDS})")
+    features = spec.get("features") or []
+    if not features:
+        raise ModelError("model has no features")
+
+    numeric, categorical = [], []
+    for feature in features:
+        name = feature.get("name")
+        if feature.get("type") == "numeric":
+            scale = float(feature.get("scale") or 1.0)
+            numeric.append(
+                (
+                    name,
+                    float(feature.get("fill", 0.0)),
+                    float(feature.get("center", 0.0)),
+                    scale if scale > 0 else 1.0,
+                )
+            )
+        elif feature.get("type") == "categorical":
+            categorical.append((name, [str(level).upper() for level in feature.get("levels", [])]))
+        else:
+            raise ModelError(f"feature {name!r} has unknown type {feature.get('type')!r}")
+    # Encoded columns: numeric features first, then each categorical level
+    width = len(numeric)
+    compiled_categorical = []
+    for name, levels in categorical:
+        compiled_categorical.append(
+            (name, width, {level: width + i for i, level in enumerate(levels)})
+        )
+        width += len(levels)
+
+    model = CompiledModel(
+        version=str(spec.get("version") or "unversioned"),
+        kind=kind,
+        features=[feature["name"] for feature in features],
+        source=source,
+        metadata=dict(spec.get("metadata") or {}),
+        _numeric=numeric,
+        _categorical=compiled_categorical,
+        _width=width,
+    )
+    if kind == "logistic":
+        coef = [float(c) for c in spec.get("coef", [])]
+        if len(coef) != width:
+            raise ModelError(f"model has {len(coef)} coefficients for {width} encoded columns")
+        model._coef = coef
+        # Fold standardization into the weights: w * (x - c) / s = (w / s) * x - w * c / s
+        model._linear = [
+            (w / scale, -w * center / scale) for (_, _, center, scale), w in zip(numeric, coef)
+        ]
+        model._intercept = float(spec.get("intercept", 0.0))
+        if np is not None:
+            model._arrays = {"coef": np.asarray(coef)}
+    else:
+        trees = []
+        for tree in spec.get("trees", []):
+            nodes = (
+                list(map(int, tree["feature"])),
+                list(map(float, tree["threshold"])),
+                list(map(int, tree["left"])),
+                list(map(int, tree["right"])),
+                list(map(float, tree["value"])),
+            )
+            size = len(nodes[0])
+            if (
+                not size
+                or len({len(part) for part in nodes}) != 1
+                or any(
+                    f >= width
+                    or (f >= 0 and not (i < lft < size and i < r < size))  # children after parents
+                    for i, (f, lft, r) in enumerate(zip(nodes[0], nodes[2], nodes[3]))
+                )
+            ):
+                raise ModelError("malformed tree")
+            trees.append(nodes)
+        model._trees = trees
+        model._intercept = float(spec.get("base_score", 0.0))
+        if np is not None:
+            model._arrays = _stack_trees(trees)
+    return model
+
+
+def _tree_depth(feature: list[int], left: list[int], right: list[int]) -> int:
+    depth, level = 0, [0]
+    while True:
+        level = [
+            child for node in level if feature[node] >= 0 for child in (left[node], right[node])
+        ]
+        if not level:
+            return depth
+        depth += 1
+
+
+def _stack_trees(trees) -> dict[str, Any]:
+    """Trees as flat node arrays (tree t at t * width); leaves and padding loop back to themselves."""
+    width = max((len(tree[0]) for tree in trees), default=1)
+    total = len(trees) * width
+    arrays = {
+        "roots": np.arange(len(trees)) * width,
+        "feature": np.zeros(total, dtype=np.int64),  # leaves read column 0; either branch stays put
+        "threshold": np.zeros(total),
+        "left": np.arange(total),
+        "right": np.arange(total),
+        "value": np.zeros(total),
+        "depth": max((_tree_depth(t[0], t[2], t[3]) for t in trees), default=0),
+    }
+    for i, (feature, threshold, left, right, value) in enumerate(trees):
+        start = i * width
+        nodes = np.arange(start, start + len(feature))
+        inner = np.asarray(feature) >= 0
+        arrays["feature"][nodes[inner]] = np.asarray(feature)[inner]
+        arrays["threshold"][nodes] = threshold
+        arrays["left"][nodes[inner]] = start + np.asarray(left)[inner]
+        arrays["right"][nodes[inner]] = start + np.asarray(right)[inner]
+        arrays["value"][nodes] = value
+    return arrays
+
+
+def load_model(path: Path) -> CompiledModel:
+    with open(path) as f:
+        spec = json.load(f)
+    return compile_model(spec, source=str(path))
+
+
+# ------------------------------- Model store -------------------------------- #
+
+
+class ModelStore:
+    """The current model, replaced atomically when a new artifact appears."""
+
+    def __init__(self, path: str | None = None, poll_seconds: float = 2.0):
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.model: CompiledModel | None = None
+        self._signature: tuple[str, int, int] | None = None
+        self._lock = threading.Lock()
+        self._watcher: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def configure(self, path: str | None, poll_seconds: float | None = None) -> None:
+        """Point the store at a model file or directory and load it now."""
+        self.path = path
+        if poll_seconds is not None:
+            self.poll_seconds = poll_seconds
+        self._signature = None
+        self.model = None
+        self.refresh()
+
+    def _candidate(self) -> Path | None:
+        if not self.path:
+            return None
+        path = Path(self.path)
+        if path.is_dir():
+            # Writers publish with an atomic rename; hidden / temp files are skipped
+            files = [p for p in path.glob("*.json") if not p.name.startswith(".")]
+            return max(files, key=lambda p: p.stat().st_mtime_ns) if files else None
+        return path if path.exists() else None
+
+    def refresh(self) -> bool:
+        """Load the artifact if it changed since the last check; True when a new model was swapped in."""
+        with self._lock:
+            try:
+                candidate = self._candidate()
+                if candidate is None:
+                    return False
+                stat = candidate.stat()
+            except OSError:
+                return False
+            signature = (str(candidate), stat.st_mtime_ns, stat.st_size)
+            if signature == self._signature:
+                return False
+            self._signature = signature
+            try:
+                model = load_model(candidate)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.warning(
+                    "Scoring model %s not loaded (keeping %s): %s",
+                    candidate,
+                    self.model.version if self.model else "none",
+                    e,
+                )
+                return False
+            self.model = model  # single reference swap: readers see the old or the new model
+            logger.info("Scoring model %s loaded from %s", model.version, candidate)
+            return True
+
+    def start(self) -> None:
+        """Start the background watcher (idempotent)."""
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch, name="score-model-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.poll_seconds):
+            self.refresh()
+
+
+# ------------------------------ Micro-batching ------------------------------ #
+
+
+class MicroBatcher:
+    """
+    Scores concurrent single-signal requests together.
+
+    The first request of a burst schedules a flush for the next event-loop
+    iteration; every request that arrives before it runs joins the batch
+    (up to `max_batch`, which flushes immediately). A lone request is
+    therefore scored without waiting, and a burst costs one model call.
+    """
+
+    def __init__(
+        self, score_many: Callable[[Sequence[Mapping[str, Any]]], list[Any]], max_batch: int = 256
+    ):
+        self.score_many = score_many
+        self.max_batch = max_batch
+        self._pending: list[tuple[Mapping[str, Any], asyncio.Future]] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def score(self, signal: Mapping[str, Any]) -> Any:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._pending = loop, []
+        future = loop.create_future()
+        self._pending.append((signal, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif len(self._pending) == 1:
+            loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            scores = self.score_many([signal for signal, _ in pending])
+            if len(scores) != len(pending):
+                raise RuntimeError(f"scored {len(scores)} of {len(pending)} signals")
+        except Exception as e:  # noqa: BLE001 - surfaced to every waiting request
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, future), value in zip(pending, scores):
+            if not future.done():
+                future.set_result(value)
+
+
+class NoModelError(RuntimeError):
+    """No scoring model is loaded."""
+
+
+class SignalScorer:
+    """Model store + micro-batcher behind the score endpoints."""
+
+    def __init__(self, store: ModelStore, max_batch: int = 256):
+        self.store = store
+        self.batcher = MicroBatcher(self._score_batch, max_batch)
+
+    def current(self) -> CompiledModel:
+        model = self.store.model
+        if model is None:
+            raise NoModelError("No scoring model loaded")
+        return model
+
+    def _score(self, signals: Sequence[Mapping[str, Any]]) -> tuple[list[float], str]:
+        model = self.current()  # one model for the whole batch, even across a swap
+        started = time.perf_counter()
+        scores = model.score_many(signals)
+        INFERENCE_SECONDS.observe(time.perf_counter() - started)
+        BATCH_SIZE.observe(len(signals))
+        return scores, model.version
+
+    def _score_batch(self, signals: Sequence[Mapping[str, Any]]) -> list[tuple[float, str]]:
+        scores, version = self._score(signals)
+        return [(score, version) for score in scores]
+
+    async def score(self, signal: Mapping[str, Any]) -> tuple[float, str]:
+        """(win probability, model version) of one signal, micro-batched with concurrent requests."""
+        self.current()  # fail fast without queueing
+        return await self.batcher.score(signal)
+
+    def score_many(self, signals: Sequence[Mapping[str, Any]]) -> tuple[list[float], str]:
+        """Win probabilities of a batch of signals and the model version that scored them."""
+        return self._score(signals)
+
+
+def _store_from_env() -> ModelStore:
+    from app.core.config import settings
+
+    store = ModelStore(settings.SCORE_MODEL_PATH, settings.SCORE_MODEL_POLL_SECONDS)
+    store.refresh()
+    return store
+
+
+_scorer: SignalScorer | None = None
+
+
+def get_scorer() -> SignalScorer:
+    """The process-wide scorer, created (and its model loaded) on first use.
+
+    Used as a FastAPI dependency; the app's lifespan starts its model watcher.
+    """
+    global _scorer
+    if _scorer is None:
+        from app.core.config import settings
+
+        _scorer = SignalScorer(_store_from_env(), settings.SCORE_MAX_BATCH)
+    return _scorer
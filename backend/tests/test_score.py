@@ -0,0 +1,150 @@
+import asyncio
+import json
+import math
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.services.scoring import MicroBatcher, ModelStore, SignalScorer, compile_model, get_scorer
+
+client = TestClient(app)
+
+FEATURES = [
+    {"name": "Quality", "type": "numeric", "fill": 70.0, "center": 70.0, "scale": 10.0},
+    {"name": "Speed", "type": "numeric", "fill": 0.0, "center": 0.0, "scale": 1000.0},
+    {"name": "Zone", "type": "categorical", "levels": ["BEAR", "BULL"]},
+]
+
+
+def _logistic(version, coef=(0.5, 0.2, -0.3, 0.4), intercept=-0.1):
+    return {
+        "format": "tp-signal-model",
+        "format_version": 1,
+        "version": version,
+        "kind": "logistic",
+        "features": FEATURES,
+        "intercept": intercept,
+        "coef": list(coef),
+    }
+
+
+def _gbdt():
+    tree = {
+        "feature": [0, 2, -1, -1, -1],
+        "threshold": [0.5, 0.5, 0, 0, 0],
+        "left": [1, 3, -1, -1, -1],
+        "right": [2, 4, -1, -1, -1],
+        "value": [0, 0, 0.8, -0.2, 0.3],
+    }
+    return {
+        "format": "tp-signal-model",
+        "format_version": 1,
+        "version": "g1",
+        "kind": "gbdt",
+        "features": FEATURES,
+        "base_score": 0.1,
+        "trees": [tree, tree],
+    }
+
+
+def _write(path, spec, mtime=None):
+    tmp = path.parent / f".{path.name}.tmp"
+    tmp.write_text(json.dumps(spec))
+    os.replace(tmp, path)
+    if mtime is not None:
+        os.utime(path, ns=(mtime, mtime))
+
+
+def test_logistic_score_matches_formula():
+    model = compile_model(_logistic("v1"))
+    signal = {"Quality": 85, "Speed": 1500, "Zone": "bull"}
+    z = -0.1 + 0.5 * 1.5 + 0.2 * 1.5 + 0.4
+    assert math.isclose(model.score(signal), 1 / (1 + math.exp(-z)))
+    # Missing numeric -> fill, unknown level -> no one-hot column
+    z = -0.1
+    assert math.isclose(model.score({"Zone": "TRANSITION"}), 1 / (1 + math.exp(-z)))
+
+
+def test_batch_path_matches_single_path():
+    signals = [
+        {"Quality": 50 + i, "Speed": (i - 20) * 100, "Zone": ["BULL", "BEAR", None][i % 3]}
+        for i in range(40)
+    ]
+    for spec in (_logistic("v1"), _gbdt()):
+        model = compile_model(spec)
+        singles = [model.score(s) for s in signals]
+        assert all(math.isclose(a, b) for a, b in zip(model.score_many(signals), singles))
+
+
+@pytest.fixture
+def scorer(tmp_path):
+    """A scorer over its own model directory, served by the endpoints instead of the process-wide one."""
+    scorer = SignalScorer(ModelStore(str(tmp_path)))
+    app.dependency_overrides[get_scorer] = lambda: scorer
+    yield scorer
+    app.dependency_overrides.pop(get_scorer, None)
+
+
+def test_score_endpoints_and_hot_swap(tmp_path, scorer):
+    store = scorer.store
+    r = client.post("/api/v1/score", json={"Quality": 80})
+    assert r.status_code == 503
+
+    _write(tmp_path / "model_v1.json", _logistic("v1"), mtime=1_000_000_000)
+    assert store.refresh()
+    r = client.post("/api/v1/score", json={"Quality": 85, "Speed": 1500, "Zone": "BULL"})
+    assert r.status_code == 200
+    body = r.json()
+    assert body["model_version"] == "v1"
+    assert 0 < body["probability"] < 1
+    assert math.isclose(body["confidence"], round(body["probability"] * 100, 2))
+
+    r = client.post(
+        "/api/v1/score/batch", json={"signals": [{"Quality": 60}, {"Quality": 90, "Zone": "BEAR"}]}
+    )
+    assert r.status_code == 200
+    assert len(r.json()["probabilities"]) == 2
+
+    # A broken artifact is ignored; the next valid one replaces the model
+    _write(tmp_path / "model_v2.json", {"format": "other"}, mtime=2_000_000_000)
+    assert not store.refresh()
+    assert client.get("/api/v1/score/model").json()["version"] == "v1"
+    _write(tmp_path / "model_v3.json", _logistic("v3", intercept=2.0), mtime=3_000_000_000)
+    assert store.refresh()
+    assert not store.refresh()
+    assert client.post("/api/v1/score", json={"Quality": 85}).json()["model_version"] == "v3"
+
+
+def test_micro_batcher_scores_a_burst_in_one_call():
+    calls = []
+
+    def score_many(signals):
+        calls.append(len(signals))
+        return [s["x"] * 2 for s in signals]
+
+    async def burst():
+        batcher = MicroBatcher(score_many, max_batch=4)
+        return await asyncio.gather(*(batcher.score({"x": i}) for i in range(10)))
+
+    assert asyncio.run(burst()) == [i * 2 for i in range(10)]
+    assert calls == [4, 4, 2]
+
+
+@pytest.mark.parametrize("result", [AttributeError("broken model"), [1.0]])
+def test_micro_batcher_fails_every_request_when_scoring_fails(result):
+    def score_many(signals):
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    async def burst():
+        batcher = MicroBatcher(score_many)
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.score({}) for _ in range(3)), return_exceptions=True), 1.0
+        )
+
+    outcomes = asyncio.run(burst())
+    assert len(outcomes) == 3
+    assert all(isinstance(o, (AttributeError, RuntimeError)) for o in outcomes)
@@ -0,0 +1,23 @@
+from opentelemetry.sdk.trace import TracerProvider
+
+from app.core.telemetry import job_environment, otel_disabled
+
+
+def test_otel_disabled_under_pytest():
+    assert otel_disabled() is True
+
+
+def test_job_environment_without_span_adds_nothing():
+    env = job_environment({"PATH": "/bin"})
+    assert env == {"PATH": "/bin"}
+
+
+def test_job_environment_carries_current_trace():
+    # Local provider: spans are recorded without touching the global one
+    tracer = TracerProvider().get_tracer(__name__)
+    with tracer.start_as_current_span("ingest-request") as span:
+        env = job_environment({"PATH": "/bin"})
+        trace_id = format(span.get_span_context().trace_id, "032x")
+
+    assert env["PATH"] == "/bin"
+    assert env["TRACEPARENT"].split("-")[1] == trace_id